@@ -5,13 +5,21 @@
 
 from .loader import (
     load_config, 
+    get_config,
+    get_model_config,
+    config_watcher,
     ensure_config_exists, 
     get_scale_factor,
+    update_config_value,
+    schedule_config_update,
+    flush_config,
     load_model_config,
     ensure_model_config_exists,
     save_model_config
 )
 
+from .watcher import ConfigChange, ConfigWatcher
+
 from .schema import (
     Config,
     RenderConfig,
@@ -19,6 +27,8 @@ from .schema import (
     AnimationSchedulerConfig,
     PerformanceConfig,
     StateConfig,
+    TrackingConfig,
+    MemoryConfig,
     ModelConfigFile,
     APIProviderConfig,
     ModelConfig,
@@ -34,15 +44,27 @@ __all__ = [
     'AnimationSchedulerConfig',
     'PerformanceConfig',
     'StateConfig',
+    'TrackingConfig',
+    'MemoryConfig',
     'load_config', 
+    'get_config',
     'ensure_config_exists', 
     'get_scale_factor',
+    'update_config_value',
+    'schedule_config_update',
+    'flush_config',
     
     # 模型配置
     'ModelConfigFile',
     'load_model_config',
     'ensure_model_config_exists',
     'save_model_config',
+    'get_model_config',
+    
+    # 配置监视
+    'config_watcher',
+    'ConfigChange',
+    'ConfigWatcher',
     
     # 配置模式
     'APIProviderConfig',
@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Optional
 
 from .schema import Config, ModelConfigFile
+from .persistence import ConfigPersistence
+from .watcher import ConfigWatcher
 from src.util.logger import logger
 
 
@@ -160,13 +162,16 @@ def load_config() -> Config:
         with open(CONFIG_FILE, "rb") as f:
             config_data = tomli.load(f)
 
+        # 合并尚未写入文件的运行时修改
+        config_persistence.apply_pending(config_data)
+
         # 验证并创建配置对象
         config = Config(**config_data)
 
-        # 处理多源转换（生成唯一平台 ID）
+        # 处理多源转换（平台 ID 在进程内保持不变，与配置监视器解析的结果一致）
         # 注意：不直接修改传入的 config，而是返回新对象
         if config.allow_multiple_source_conversion:
-            new_platform = config.platform + "-" + str(uuid.uuid4())
+            new_platform = f"{config.platform}-{_SOURCE_ID}"
             # 使用 setattr 设置新值（Pydantic 模型可能不允许直接修改）
             try:
                 config.platform = new_platform
@@ -186,6 +191,63 @@ def load_config() -> Config:
         sys.exit(1)
 
 
+def _parse_config_data(config_data: dict) -> Config:
+    """
+    验证主配置（供配置监视器使用，失败时抛出异常而不是退出程序）
+
+    与 load_config() 一样合并尚未写入文件的运行时修改；
+    多源转换的平台 ID 在进程内保持不变，重新加载配置不会改变它
+    """
+    config_persistence.apply_pending(config_data)
+    config = Config(**config_data)
+    if config.allow_multiple_source_conversion:
+        config.platform = f"{config.platform}-{_SOURCE_ID}"
+    return config
+
+
+def _parse_model_config_data(config_data: dict) -> ModelConfigFile:
+    """验证消息层配置（供配置监视器使用）"""
+    return ModelConfigFile(**config_data)
+
+
+# 多源转换模式下本进程使用的唯一 ID
+_SOURCE_ID = str(uuid.uuid4())
+
+# 配置文件监视器（缓存解析结果，文件变化时通知订阅者）
+config_watcher = ConfigWatcher()
+config_watcher.add_file("config", CONFIG_FILE, _parse_config_data)
+config_watcher.add_file("model_config", MODEL_CONFIG_FILE, _parse_model_config_data)
+
+
+def get_config() -> Config:
+    """
+    获取缓存的主配置（文件变化后由配置监视器自动更新）
+
+    适用于运行中频繁读取配置的地方，避免每次都重新解析文件；
+    缓存不可用（文件缺失或无效）时退回 load_config()
+
+    Returns:
+        Config: 配置对象
+    """
+    config = config_watcher.get("config")
+    if config is None:
+        return load_config()
+    return config
+
+
+def get_model_config() -> ModelConfigFile:
+    """
+    获取缓存的消息层配置（文件变化后由配置监视器自动更新）
+
+    Returns:
+        ModelConfigFile: 消息层配置对象
+    """
+    config = config_watcher.get("model_config")
+    if config is None:
+        return load_model_config()
+    return config
+
+
 def get_scale_factor(config: Config) -> float:
     """
     获取界面缩放倍率
@@ -258,6 +320,10 @@ def _atomic_write_config(config_file: str, config_data: dict) -> bool:
         return False
 
 
+# 运行时配置修改的合并写入服务
+config_persistence = ConfigPersistence(CONFIG_FILE, _atomic_write_config)
+
+
 def save_config(config: Config) -> bool:
     """
     保存配置文件（使用原子写入）
@@ -272,8 +338,9 @@ def save_config(config: Config) -> bool:
         # 将配置对象转换为字典
         config_dict = config.dict()
 
-        # 使用原子写入
-        success = _atomic_write_config(CONFIG_FILE, config_dict)
+        # 使用原子写入（与后台合并写入互斥，尚未写入的修改之后会叠加写入）
+        with config_persistence.write_lock:
+            success = _atomic_write_config(CONFIG_FILE, config_dict)
 
         if success:
             logger.info("配置文件保存成功")
@@ -286,7 +353,9 @@ def save_config(config: Config) -> bool:
 
 def update_config_value(section: Optional[str], key: str, value) -> bool:
     """
-    更新配置文件中的单个值（使用原子写入）
+    更新配置文件中的单个值并立即写入（使用原子写入）
+
+    尚未写入的其他修改会在同一次写入中一起保存
 
     Args:
         section: 配置节（如 'live2d'），如果是 None 则表示根级别
@@ -296,29 +365,38 @@ def update_config_value(section: Optional[str], key: str, value) -> bool:
     Returns:
         bool: 是否更新成功
     """
-    try:
-        # 加载现有配置
-        with open(CONFIG_FILE, "rb") as f:
-            config_data = tomli.load(f)
+    config_persistence.schedule(section, key, value)
+    success = config_persistence.flush()
 
-        # 更新值
-        if section:
-            if section not in config_data:
-                config_data[section] = {}
-            config_data[section][key] = value
-        else:
-            config_data[key] = value
+    if success:
+        logger.info(f"配置更新成功: [{section}]{key} = {value}")
+    else:
+        logger.error(f"配置更新失败: [{section}]{key}（稍后重试写入）")
+    return success
 
-        # 使用原子写入
-        success = _atomic_write_config(CONFIG_FILE, config_data)
 
-        if success:
-            logger.info(f"配置更新成功: [{section}]{key} = {value}")
-        return success
+def schedule_config_update(section: Optional[str], key: str, value):
+    """
+    记录一个配置修改，稍后与其他修改合并写入
 
-    except Exception as e:
-        logger.error(f"配置更新失败: {e}", exc_info=True)
-        return False
+    适用于频繁变化的运行时状态（窗口状态、缩放等），避免每次修改都重写配置文件
+
+    Args:
+        section: 配置节（如 'state'），如果是 None 则表示根级别
+        key: 配置键
+        value: 新值
+    """
+    config_persistence.schedule(section, key, value)
+
+
+def flush_config() -> bool:
+    """
+    立即写入所有尚未写入的配置修改（退出前调用）
+
+    Returns:
+        bool: 是否写入成功
+    """
+    return config_persistence.flush()
 
 
 # ===================================================================
@@ -0,0 +1,198 @@
+"""
+配置持久化服务
+把运行时的配置修改合并在内存中，安静一段时间后一次性原子写入配置文件
+"""
+
+import atexit
+import copy
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import tomli
+
+from src.util.logger import logger
+
+
+# 待写入的键：(配置节, 键名)，配置节为 None 表示根级别
+ConfigKey = Tuple[Optional[str], str]
+
+
+class ConfigPersistence:
+    """
+    防抖的配置持久化服务
+
+    - schedule() 只记录修改，同一个键多次修改只保留最后的值
+    - 最后一次修改后安静 delay 秒写入；持续修改时最多延迟 max_delay 秒
+    - 每次写入只读取一次配置文件，合并所有修改后原子写回
+    - flush() 同步写入所有待写修改（退出时调用）
+    """
+
+    def __init__(self, config_file: str, write_func: Callable[[str, dict], bool],
+                 delay: float = 1.0, max_delay: float = 5.0):
+        """
+        初始化持久化服务
+
+        Args:
+            config_file: 配置文件路径
+            write_func: 原子写入函数 (文件路径, 配置字典) -> 是否成功
+            delay: 安静期（秒）
+            max_delay: 最长延迟（秒）
+        """
+        self.config_file = config_file
+        self.delay = delay
+        self.max_delay = max_delay
+        self._write_func = write_func
+
+        self._pending: Dict[ConfigKey, Any] = {}
+        # 正在写入的修改：写入成功前 apply_pending 仍然合并它们，避免读到旧值
+        self._inflight: Dict[ConfigKey, Any] = {}
+        self._first_change: Optional[float] = None
+        self._last_change = 0.0
+        self._not_before = 0.0
+        self._retry_delay = delay
+
+        self._cond = threading.Condition()
+        # 串行化对配置文件的读改写（后台写入、同步 flush 和其他写入路径共用）
+        self.write_lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._atexit_registered = False
+
+    def schedule(self, section: Optional[str], key: str, value: Any):
+        """
+        记录一个配置修改，稍后写入
+
+        Args:
+            section: 配置节（如 'interface'），None 表示根级别
+            key: 配置键
+            value: 新值
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._pending[(section, key)] = value
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            self._ensure_worker()
+            self._cond.notify()
+
+    def has_pending(self) -> bool:
+        """是否有尚未写入的修改"""
+        with self._cond:
+            return bool(self._pending or self._inflight)
+
+    def apply_pending(self, config_data: dict) -> dict:
+        """
+        把尚未写入（包括正在写入）的修改合并到配置字典（读取配置时使用，保证读到最新的值）
+
+        Args:
+            config_data: 从文件读取的配置字典（会被原地修改）
+        """
+        with self._cond:
+            pending = {**self._inflight, **self._pending}
+        self._apply(config_data, pending)
+        return config_data
+
+    def flush(self) -> bool:
+        """
+        立即同步写入所有待写修改
+
+        Returns:
+            bool: 是否写入成功（没有待写修改时返回 True）
+        """
+        with self.write_lock:
+            with self._cond:
+                pending = self._pending
+                self._inflight = pending
+                self._pending = {}
+                self._first_change = None
+            if not pending:
+                return True
+
+            if self._write(pending):
+                with self._cond:
+                    self._inflight = {}
+                self._retry_delay = self.delay
+                return True
+
+            # 写入失败：放回队列（保留期间更新的值），退避后重试
+            with self._cond:
+                self._inflight = {}
+                for config_key, value in pending.items():
+                    self._pending.setdefault(config_key, value)
+                now = time.monotonic()
+                self._first_change = self._first_change or now
+                self._not_before = now + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, 60.0)
+            return False
+
+    def close(self):
+        """写入剩余修改并停止后台线程"""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    @staticmethod
+    def _apply(config_data: dict, pending: Dict[ConfigKey, Any]):
+        """把修改写入配置字典"""
+        for (section, key), value in pending.items():
+            if section:
+                config_data.setdefault(section, {})[key] = value
+            else:
+                config_data[key] = value
+
+    def _write(self, pending: Dict[ConfigKey, Any]) -> bool:
+        """读取一次配置文件，合并修改后原子写回（内容未变化时不写）"""
+        try:
+            config_data = {}
+            if os.path.exists(self.config_file):
+                with open(self.config_file, "rb") as f:
+                    config_data = tomli.load(f)
+
+            original = copy.deepcopy(config_data)
+            self._apply(config_data, pending)
+            if config_data == original:
+                return True
+
+            if not self._write_func(self.config_file, config_data):
+                return False
+
+            logger.debug(f"配置已保存（合并 {len(pending)} 项修改）")
+            return True
+        except Exception as e:
+            logger.error(f"保存配置修改失败: {e}")
+            return False
+
+    def _ensure_worker(self):
+        """启动后台写入线程（调用时需持有 _cond）"""
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="ConfigPersistence", daemon=True)
+            self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.close)
+            self._atexit_registered = True
+
+    def _run(self):
+        """后台线程：等到安静期结束（或达到最长延迟）后写入"""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+                now = time.monotonic()
+                due = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                due = max(due, self._not_before)
+                if now < due:
+                    self._cond.wait(due - now)
+                    continue
+
+            self.flush()
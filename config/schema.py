@@ -34,6 +34,7 @@ class ModelConfig(BaseModel):
     price_in: float = Field(0.0, description="输入价格")
     price_out: float = Field(0.0, description="输出价格")
     extra_params: Optional[Dict[str, Any]] = Field(None, description="额外参数")
+    context_token_budget: Optional[int] = Field(None, description="请求 token 预算（覆盖 prompt.context_token_budget）")
 
 
 # ===================================================================
@@ -60,6 +61,7 @@ class ModelTaskConfig(BaseModel):
     naming: Optional[TaskConfig] = Field(None, description="取名任务")
     relation: Optional[TaskConfig] = Field(None, description="关系提取任务")
     planner: Optional[TaskConfig] = Field(None, description="决策任务")
+    summary: Optional[TaskConfig] = Field(None, description="对话摘要任务")
 
 
 # ===================================================================
@@ -92,6 +94,13 @@ class DatabaseConfig(BaseModel):
     """数据库配置"""
     type: str = Field("sqlite", description="数据库类型")
     path: str = Field("data/chat.db", description="数据库路径")
+    blob_dir: str = Field("data/blobs", description="消息图片目录（按内容摘要保存，相同图片只保存一份）")
+    retention_max_age_days: int = Field(0, description="消息保留天数，超过的消息移入归档（0 为不限制）")
+    retention_max_rows: int = Field(0, description="数据库最多保留的消息条数（0 为不限制）")
+    retention_max_size_mb: int = Field(0, description="数据库有效数据的大小上限（MB，0 为不限制）")
+    archive_dir: str = Field("data/archive", description="归档目录")
+    maintenance_interval: int = Field(3600, description="后台维护间隔（秒）")
+    maintenance_batch: int = Field(500, description="每批归档的消息条数")
 
 
 class Live2DConfig(BaseModel):
@@ -105,12 +114,19 @@ class Live2DConfig(BaseModel):
     custom_scale: float = Field(1.0, description="自定义缩放")
     custom_offset_x: float = Field(0.0, description="自定义水平偏移")
     custom_offset_y: float = Field(0.0, description="自定义垂直偏移")
+    baked_idle: bool = Field(False, description="是否启用待机动画烘焙")
+    baked_idle_delay: float = Field(10.0, description="无交互多久后播放烘焙帧（秒）")
+    baked_idle_scale: float = Field(0.5, description="烘焙帧缩小比例")
+    baked_idle_fps: int = Field(20, description="烘焙帧率")
+    baked_idle_cache_dir: str = Field("data/cache/baked_idle", description="烘焙帧缓存目录")
 
 
 class RenderConfig(BaseModel):
     """渲染配置"""
     mode: str = Field("static", description="渲染模式: static/live2d")
     allow_switch: bool = Field(True, description="是否允许运行时切换渲染模式")
+    click_through: bool = Field(True, description="点击透明区域时穿透到桌面")
+    hit_mask_interval: int = Field(500, description="命中掩码刷新间隔（毫秒）")
 
 
 class AnimationConfig(BaseModel):
@@ -136,7 +152,7 @@ class PerformanceConfig(BaseModel):
     """性能配置"""
     max_fps: int = Field(60, description="最大帧率限制")
     vsync: bool = Field(True, description="是否启用垂直同步")
-    texture_cache_size: int = Field(256, description="纹理缓存大小 MB")
+    texture_cache_size: int = Field(256, description="纹理缓存大小 MB（含挂起的渲染器）")
 
 
 class StateConfig(BaseModel):
@@ -146,6 +162,15 @@ class StateConfig(BaseModel):
     console_visible: bool = Field(True, description="终端是否可见")
 
 
+class TrackingConfig(BaseModel):
+    """Live2D 鼠标跟踪配置"""
+    enabled: bool = Field(True, description="是否启用头部和眼睛跟随鼠标")
+    head_sensitivity: float = Field(30.0, description="头部转动灵敏度（角度）")
+    eye_sensitivity: float = Field(1.0, description="眼睛转动灵敏度")
+    body_sensitivity: float = Field(0.5, description="身体转动灵敏度")
+    smooth_factor: float = Field(0.1, description="平滑因子（0.01-1.0，越小越平滑）")
+
+
 class PromptConfig(BaseModel):
     """Prompt 拼接配置"""
     persona: str = Field(
@@ -154,8 +179,21 @@ class PromptConfig(BaseModel):
     )
     context_limit: int = Field(8, description="拼接最近上下文消息条数")
     context_message_max_chars: int = Field(500, description="单条上下文最大字符数")
+    context_token_budget: int = Field(4000, description="请求 token 预算（system + 上下文 + 当前消息），0 表示只按条数限制")
     include_time: bool = Field(True, description="是否在 prompt 中拼接当前时间")
     include_context: bool = Field(True, description="是否拼接最近聊天上下文")
+    summary_enabled: bool = Field(True, description="是否把超出最近上下文的旧消息压缩为摘要")
+    summary_trigger: int = Field(12, description="超出最近上下文的未摘要消息达到多少条时生成摘要")
+    summary_max_chars: int = Field(600, description="摘要最长字符数")
+
+
+class MemoryConfig(BaseModel):
+    """语义记忆配置"""
+    enabled: bool = Field(False, description="是否检索相关的历史对话拼接进 prompt")
+    top_k: int = Field(3, description="每次最多拼接的相关历史消息条数")
+    min_score: float = Field(0.3, description="最低相似度（0 ~ 1）")
+    max_entries: int = Field(5000, description="索引最多保存的消息条数")
+    dimension: int = Field(512, description="向量维度")
 
 
 class Config(BaseModel):
@@ -176,4 +214,6 @@ class Config(BaseModel):
     animation_scheduler: Optional[AnimationSchedulerConfig] = Field(None, description="动画调度器配置")
     performance: Optional[PerformanceConfig] = Field(None, description="性能配置")
     state: Optional[StateConfig] = Field(None, description="持久化状态配置")
+    tracking: Optional[TrackingConfig] = Field(None, description="鼠标跟踪配置")
     prompt: Optional[PromptConfig] = Field(None, description="Prompt 拼接配置")
+    memory: Optional[MemoryConfig] = Field(None, description="语义记忆配置")
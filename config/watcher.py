@@ -0,0 +1,322 @@
+"""
+配置文件监视器
+监视 config.toml / model_config.toml 的变化：每次变化只解析、验证一次，
+缓存解析结果，并把字段级的差异通知给订阅者
+
+Linux 上使用 inotify（通过 ctypes 调用 libc），其他平台或 inotify 不可用时使用定时轮询
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import tomli
+
+from src.util.logger import logger
+
+
+# inotify 常量（见 <sys/inotify.h>）
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """一次配置变化"""
+    name: str  # 配置名称（'config' / 'model_config'）
+    old: Any  # 变化前的配置对象
+    new: Any  # 变化后的配置对象
+    changed_fields: FrozenSet[str] = field(default_factory=frozenset)  # 变化的字段路径，如 'prompt.persona'
+
+    def changed(self, path: str) -> bool:
+        """
+        指定字段（或其下的任意字段）是否变化
+
+        Args:
+            path: 字段路径，如 'prompt' 或 'animation_scheduler.group_weights'
+        """
+        prefix = path + "."
+        return any(item == path or item.startswith(prefix) for item in self.changed_fields)
+
+
+def diff_fields(old: Any, new: Any, prefix: str = "") -> FrozenSet[str]:
+    """
+    比较两个配置（pydantic 对象或字典），返回变化的字段路径
+
+    字典逐层比较，其他值（包括列表）整体比较
+    """
+    if hasattr(old, "model_dump"):
+        old = old.model_dump()
+    if hasattr(new, "model_dump"):
+        new = new.model_dump()
+
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return frozenset() if old == new else frozenset([prefix.rstrip(".")])
+
+    changed = set()
+    for key in old.keys() | new.keys():
+        path = f"{prefix}{key}"
+        old_value, new_value = old.get(key), new.get(key)
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            changed |= diff_fields(old_value, new_value, path + ".")
+        else:
+            changed.add(path)
+    return frozenset(changed)
+
+
+class _WatchedFile:
+    """被监视的配置文件"""
+
+    def __init__(self, name: str, path: str, parser: Callable[[dict], Any]):
+        self.name = name
+        self.path = path
+        self.parser = parser
+        self.value: Any = None
+        self.signature: Optional[Tuple[int, int]] = None
+        self.loaded = False
+
+
+class ConfigWatcher:
+    """
+    配置文件监视器
+
+    - get(name) 返回缓存的配置对象（首次访问时同步加载）
+    - subscribe(callback) 订阅变化，回调在监视线程中执行，参数为 ConfigChange
+    - 文件内容无效时保留上一次的配置，不通知订阅者
+    """
+
+    def __init__(self, poll_interval: float = 2.0, debounce: float = 0.2):
+        """
+        初始化监视器
+
+        Args:
+            poll_interval: 轮询间隔（秒，inotify 不可用时使用）
+            debounce: 收到文件事件后等待的时间（秒，合并编辑器的多次写入）
+        """
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._files: Dict[str, _WatchedFile] = {}
+        self._subscribers: List[Tuple[Callable[[ConfigChange], None], Optional[str]]] = []
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._inotify_fd: Optional[int] = None
+
+    def add_file(self, name: str, path: str, parser: Callable[[dict], Any]):
+        """
+        添加要监视的配置文件
+
+        Args:
+            name: 配置名称
+            path: 文件路径
+            parser: 解析函数（TOML 字典 -> 配置对象），验证失败时抛出异常
+        """
+        with self._lock:
+            self._files[name] = _WatchedFile(name, os.path.abspath(path), parser)
+
+    def subscribe(self, callback: Callable[[ConfigChange], None], name: Optional[str] = None):
+        """
+        订阅配置变化
+
+        Args:
+            callback: 回调函数，参数为 ConfigChange（在监视线程中调用）
+            name: 只订阅指定配置，None 表示全部
+        """
+        with self._lock:
+            self._subscribers.append((callback, name))
+
+    def unsubscribe(self, callback: Callable[[ConfigChange], None]):
+        """取消订阅"""
+        with self._lock:
+            self._subscribers = [item for item in self._subscribers if item[0] != callback]
+
+    def get(self, name: str) -> Any:
+        """
+        获取缓存的配置对象
+
+        Returns:
+            配置对象，文件不存在或从未成功解析时返回 None
+        """
+        watched = self._files[name]
+        if not watched.loaded:
+            with self._lock:
+                if not watched.loaded:
+                    self._reload(watched, notify=False)
+        return watched.value
+
+    def reload(self, name: Optional[str] = None) -> List[ConfigChange]:
+        """
+        立即检查文件变化并重新加载（不依赖监视线程）
+
+        Args:
+            name: 只检查指定配置，None 表示全部
+
+        Returns:
+            list: 本次产生的变化
+        """
+        changes = []
+        with self._lock:
+            for watched in list(self._files.values()):
+                if name is not None and watched.name != name:
+                    continue
+                change = self._reload(watched, notify=True)
+                if change:
+                    changes.append(change)
+        return changes
+
+    def start(self):
+        """启动监视线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._inotify_fd = self._init_inotify()
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+        mode = "inotify" if self._inotify_fd is not None else f"轮询 {self.poll_interval}s"
+        logger.info(f"配置文件监视已启动（{mode}）")
+
+    def stop(self):
+        """停止监视线程"""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        if self._inotify_fd is not None:
+            try:
+                os.close(self._inotify_fd)
+            except OSError:
+                pass
+            self._inotify_fd = None
+
+    def is_running(self) -> bool:
+        """监视线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        """文件签名（修改时间、大小），文件不存在时返回 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _reload(self, watched: _WatchedFile, notify: bool) -> Optional[ConfigChange]:
+        """文件签名变化时重新解析，返回变化（调用时需持有 _lock）"""
+        signature = self._signature(watched.path)
+        if watched.loaded and signature == watched.signature:
+            return None
+        watched.signature = signature
+        first_load = not watched.loaded
+        watched.loaded = True
+
+        if signature is None:
+            if not first_load:
+                logger.warning(f"配置文件已被删除，继续使用当前配置: {watched.path}")
+            return None
+
+        try:
+            with open(watched.path, "rb") as f:
+                value = watched.parser(tomli.load(f))
+        except Exception as e:
+            logger.warning(f"配置文件无效，继续使用当前配置: {watched.path}: {e}")
+            return None
+
+        old = watched.value
+        watched.value = value
+        if first_load or old is None:
+            return None
+
+        changed = diff_fields(old, value)
+        if not changed:
+            return None
+
+        change = ConfigChange(watched.name, old, value, changed)
+        logger.info(f"配置已重新加载: {watched.name}，变化: {', '.join(sorted(changed))}")
+        if notify:
+            self._publish(change)
+        return change
+
+    def _publish(self, change: ConfigChange):
+        """通知订阅者（单个订阅者出错不影响其他订阅者）"""
+        for callback, name in list(self._subscribers):
+            if name is not None and name != change.name:
+                continue
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"配置变化回调出错: {e}", exc_info=True)
+
+    def _init_inotify(self) -> Optional[int]:
+        """初始化 inotify，不可用时返回 None（改用轮询）"""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                return None
+
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+            directories = {os.path.dirname(watched.path) for watched in self._files.values()}
+            for directory in directories:
+                if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+                    os.close(fd)
+                    return None
+            return fd
+        except Exception as e:
+            logger.debug(f"inotify 不可用，改用轮询: {e}")
+            return None
+
+    def _read_inotify_names(self) -> set:
+        """读取所有待处理的 inotify 事件，返回涉及的文件名"""
+        names = set()
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _INOTIFY_EVENT.size <= len(data):
+                _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+                offset += length
+        return names
+
+    def _run(self):
+        """监视线程"""
+        watched_names = {os.path.basename(watched.path) for watched in self._files.values()}
+        while not self._stop_event.is_set():
+            try:
+                if self._inotify_fd is None:
+                    self._stop_event.wait(self.poll_interval)
+                else:
+                    readable, _, _ = select.select([self._inotify_fd], [], [], 1.0)
+                    if not readable or not (self._read_inotify_names() & watched_names):
+                        continue
+                    # 编辑器保存时可能连续写入多次，等待片刻后再读取
+                    time.sleep(self.debounce)
+                    self._read_inotify_names()
+
+                if not self._stop_event.is_set():
+                    self.reload()
+            except Exception as e:
+                logger.error(f"配置文件监视出错: {e}", exc_info=True)
+                self._stop_event.wait(self.poll_interval)
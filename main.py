@@ -1,3 +1,6 @@
+import time
+_PROCESS_START = time.perf_counter()
+
 import sys
 import asyncio
 import src.util.except_hook
@@ -17,14 +20,19 @@ async def initialize_database():
         if config and config.database:
             db_type = getattr(config.database, 'type', 'sqlite')
             db_path = getattr(config.database, 'path', 'data/chat.db')
+            blob_dir = getattr(config.database, 'blob_dir', 'data/blobs')
 
             success = await db_manager.initialize(
                 db_type=db_type,
-                path=db_path
+                path=db_path,
+                blob_dir=blob_dir
             )
 
             if success:
                 logger.info(f"数据库初始化成功: {db_type} ({db_path})")
+                start_database_maintenance(config.database)
+                if config.memory and config.memory.enabled:
+                    await _run_phase('memory_index', initialize_memory(config.memory))
             else:
                 logger.warning("数据库初始化失败")
         else:
@@ -33,15 +41,40 @@ async def initialize_database():
         logger.error(f"数据库初始化出错: {e}")
 
 
-async def setup_backend_services():
-    """设置所有后台服务"""
+def start_database_maintenance(database_config):
+    """按保留策略启动数据库后台维护（归档旧消息、回收空间）"""
+    from src.database import db_maintenance
+    from src.core.thread_manager import thread_manager
     from src.util.logger import logger
-    from src.core.chat import chat_manager
 
-    # 初始化数据库
-    await initialize_database()
+    try:
+        if db_maintenance.start(database_config):
+            thread_manager.register_cleanup(db_maintenance.stop)
+    except Exception as e:
+        logger.error(f"数据库后台维护启动出错: {e}", exc_info=True)
+
+
+async def initialize_memory(memory_config):
+    """建立聊天记录语义索引（向量化在后台线程中进行）"""
+    from src.core.memory import memory_index
+    from src.core.prompt import prompt_manager
+    from src.util.logger import logger
+
+    try:
+        await memory_index.start(
+            max_entries=memory_config.max_entries,
+            dimension=memory_config.dimension,
+        )
+        prompt_manager.set_memory_index(memory_index)
+    except Exception as e:
+        logger.error(f"语义记忆索引初始化出错: {e}", exc_info=True)
+
+
+async def initialize_chat():
+    """初始化聊天管理器（预连接当前模型）"""
+    from src.util.logger import logger
+    from src.core.chat import chat_manager
 
-    # 初始化聊天管理器
     try:
         success = await chat_manager.initialize('chat')
         if success:
@@ -52,26 +85,61 @@ async def setup_backend_services():
         logger.error(f"聊天管理器初始化出错: {e}", exc_info=True)
 
 
+async def _run_phase(name: str, coro):
+    """执行一个启动阶段并记录耗时"""
+    from src.util.startup_profiler import startup_profiler
+
+    startup_profiler.start(name)
+    try:
+        return await coro
+    finally:
+        startup_profiler.end(name)
+
+
+async def setup_backend_services():
+    """并行初始化所有后台服务（数据库与聊天连接互不依赖）"""
+    from src.util.startup_profiler import startup_profiler
+
+    startup_profiler.start('backend')
+    try:
+        await asyncio.gather(
+            _run_phase('database', initialize_database()),
+            _run_phase('chat_connect', initialize_chat()),
+        )
+    finally:
+        startup_profiler.end('backend')
+        startup_profiler.log_report()
+
+
 async def main():
-    """初始化后台服务并创建桌面宠物"""
+    """先创建桌面宠物，再在后台初始化服务"""
     from src.util.logger import logger
-    from src.frontend.presentation.pet import DesktopPet
+    from src.util.startup_profiler import startup_profiler
 
-    # 初始化后台服务
-    await setup_backend_services()
+    with startup_profiler.phase('ui_imports'):
+        from src.frontend.presentation.pet import DesktopPet
 
-    # 创建并显示桌面宠物
-    chat_pet = DesktopPet()
+    # 创建并显示桌面宠物（不等待网络连接）
+    with startup_profiler.phase('ui'):
+        chat_pet = DesktopPet()
+        chat_pet.show()
     logger.info("✓ 桌面宠物启动")
-    chat_pet.show()
+
+    # 后台初始化服务，UI 通过 connection_state_changed 信号显示连接状态
+    chat_pet.backend_task = asyncio.ensure_future(setup_backend_services())
 
     return chat_pet
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    loop = qasync.QEventLoop(app)
-    asyncio.set_event_loop(loop)
+    from src.util.startup_profiler import startup_profiler
+    startup_profiler.reset(origin=_PROCESS_START)
+    startup_profiler.end('imports')
+
+    with startup_profiler.phase('qt_app'):
+        app = QApplication(sys.argv)
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
     chat_pet = None
 
     try:
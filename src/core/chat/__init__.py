@@ -3,6 +3,10 @@
 负责聊天逻辑、消息收发和用户交互
 """
 
+from .io_loop import maim_io_loop, MaimIOLoop
+from .connection import MaimConnection, MaimConnectionState
+from .summary import ConversationSummarizer
 from .manager import chat_manager, ChatManager
 
-__all__ = ['chat_manager', 'ChatManager']
\ No newline at end of file
+__all__ = ['chat_manager', 'ChatManager', 'maim_io_loop', 'MaimIOLoop', 'MaimConnection', 'MaimConnectionState',
+           'ConversationSummarizer']
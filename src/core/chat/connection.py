@@ -0,0 +1,303 @@
+"""
+Maim 连接状态机
+
+把 maim_message.Router 包装为带状态的长连接：
+1. 对外暴露 connected / disconnected 事件，调用方等待事件而不是轮询
+2. 连接断开后在后台按指数退避自动重连（断线后首次重连立即进行）
+3. 未连接期间发送的消息进入有界待发送队列，连接恢复后按顺序补发
+
+注意：除 add_listener 外，本类的所有方法都必须在 Maim I/O 事件循环中调用。
+"""
+
+import asyncio
+import random
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, List, Optional
+
+from src.util.logger import logger
+
+
+class MaimConnectionState(Enum):
+    """Maim 连接状态"""
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
+    CLOSED = "closed"
+
+
+class MaimConnection:
+    """Maim 连接状态机（运行于 Maim I/O 事件循环）"""
+
+    # 待发送队列容量，超出时丢弃最早的消息
+    OUTBOX_SIZE = 50
+    # I/O 循环内连接状态检查间隔（秒）
+    WATCH_INTERVAL = 0.05
+    # 断线后给 Socket.IO 内置重连的宽限时间（秒），超时后重建 Router
+    RECONNECT_GRACE = 2.0
+    # 退避上限（秒）
+    MAX_BACKOFF = 60.0
+
+    def __init__(
+        self,
+        router_factory: Callable[[], Any],
+        platform: str,
+        connect_timeout: float = 30.0,
+        retry_interval: float = 5.0,
+        outbox_size: int = OUTBOX_SIZE,
+    ):
+        """
+        Args:
+            router_factory: 创建 Router 的工厂函数（每次重连都会创建新的 Router）
+            platform: Maim 平台标识
+            connect_timeout: 单次连接尝试的超时时间（秒）
+            retry_interval: 退避基数（秒）
+            outbox_size: 待发送队列容量
+        """
+        self._router_factory = router_factory
+        self.platform = platform
+        self.router = None
+        self.state = MaimConnectionState.DISCONNECTED
+        self.last_error: Optional[str] = None
+
+        self.connected = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.disconnected.set()
+
+        self._connect_timeout = max(1.0, float(connect_timeout))
+        self._retry_interval = max(0.1, float(retry_interval))
+        self._outbox: Deque[Any] = deque()
+        self._outbox_size = max(1, int(outbox_size))
+        self._supervisor: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[MaimConnectionState], None]] = []
+
+    # ------------------------------------------------------------------
+    # 状态
+    # ------------------------------------------------------------------
+
+    def is_connected(self) -> bool:
+        """当前是否处于已连接状态"""
+        return self.state == MaimConnectionState.CONNECTED
+
+    def is_closed(self) -> bool:
+        """连接是否已被关闭（不会再重连）"""
+        return self.state == MaimConnectionState.CLOSED
+
+    def pending_count(self) -> int:
+        """待发送队列中的消息数量"""
+        return len(self._outbox)
+
+    def add_listener(self, callback: Callable[[MaimConnectionState], None]):
+        """注册状态变化回调（回调在 I/O 线程中执行，需自行切回 UI 线程）"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def _set_state(self, state: MaimConnectionState):
+        """切换状态并同步事件与回调"""
+        if self.state == state:
+            return
+        previous = self.state
+        self.state = state
+
+        if state == MaimConnectionState.CONNECTED:
+            self.connected.set()
+            self.disconnected.clear()
+        else:
+            self.connected.clear()
+            self.disconnected.set()
+
+        logger.info(f"Maim 连接状态: {previous.value} -> {state.value} ({self.platform})")
+        for callback in list(self._listeners):
+            try:
+                callback(state)
+            except Exception as e:
+                logger.error(f"Maim 连接状态回调执行失败: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """启动后台连接监督任务"""
+        if self._supervisor is None or self._supervisor.done():
+            self._supervisor = asyncio.create_task(
+                self._supervise(), name=f"MaimConnection-{self.platform}"
+            )
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """等待连接建立，超时返回 False"""
+        if self.is_connected():
+            return True
+        try:
+            await asyncio.wait_for(self.connected.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self):
+        """关闭连接，停止重连；未发出的消息将被丢弃"""
+        self._set_state(MaimConnectionState.CLOSED)
+
+        supervisor = self._supervisor
+        self._supervisor = None
+        if supervisor and not supervisor.done():
+            supervisor.cancel()
+            await asyncio.gather(supervisor, return_exceptions=True)
+
+        if self._outbox:
+            logger.warning(f"Maim 连接已关闭，丢弃 {len(self._outbox)} 条未发送消息")
+            self._outbox.clear()
+
+    async def _supervise(self):
+        """连接监督循环：建立连接 -> 监控 -> 断开后退避重连"""
+        attempt = 0
+        while not self.is_closed():
+            self._set_state(
+                MaimConnectionState.CONNECTING if attempt == 0 and self.router is None
+                else MaimConnectionState.RECONNECTING
+            )
+
+            router = self._router_factory()
+            self.router = router
+            router_task = asyncio.create_task(router.run(), name=f"MaimRouter-{self.platform}")
+            try:
+                was_connected = await self._watch(router, router_task)
+            finally:
+                await self._stop_router(router, router_task)
+
+            if self.is_closed():
+                break
+
+            # 成功连接过的会话断开后立即重连；连接失败才进入退避
+            if was_connected:
+                attempt = 0
+                delay = 0.0
+            else:
+                attempt += 1
+                delay = self._backoff_delay(attempt)
+
+            self._set_state(MaimConnectionState.RECONNECTING)
+            if delay > 0:
+                logger.warning(f"Maim 连接失败，{delay:.1f} 秒后第 {attempt} 次重连: {self.last_error or '连接超时'}")
+                await asyncio.sleep(delay)
+            else:
+                logger.warning("Maim 连接已断开，立即重连")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """指数退避（带 ±20% 抖动）"""
+        delay = min(self.MAX_BACKOFF, self._retry_interval * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _watch(self, router, router_task: asyncio.Task) -> bool:
+        """
+        监控一次 Router 会话，直到断线、连接超时或 Router 退出
+
+        Returns:
+            本次会话是否成功连接过
+        """
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        lost_since: Optional[float] = None
+        was_connected = False
+
+        while not router_task.done() and not self.is_closed():
+            try:
+                ok = router.check_connection(self.platform)
+            except Exception as e:
+                logger.debug(f"检查 Maim 连接状态失败: {e}")
+                ok = False
+
+            now = loop.time()
+            if ok:
+                lost_since = None
+                if not self.is_connected():
+                    was_connected = True
+                    self.last_error = None
+                    self._set_state(MaimConnectionState.CONNECTED)
+                    await self._flush_outbox()
+                elif self._outbox:
+                    # 连接期间发送失败留下的积压：不等断线重连，直接重试补发
+                    await self._flush_outbox()
+            elif was_connected:
+                if self.is_connected():
+                    self._set_state(MaimConnectionState.RECONNECTING)
+                lost_since = lost_since or now
+                if now - lost_since > self.RECONNECT_GRACE:
+                    return True
+            elif now - started_at > self._connect_timeout:
+                self.last_error = f"连接超时（{self._connect_timeout:.0f} 秒）"
+                return False
+
+            await asyncio.sleep(self.WATCH_INTERVAL)
+
+        if router_task.done() and not router_task.cancelled() and router_task.exception():
+            self.last_error = str(router_task.exception())
+        return was_connected
+
+    @staticmethod
+    async def _stop_router(router, router_task: asyncio.Task):
+        """停止 Router 并回收其任务"""
+        try:
+            await asyncio.wait_for(router.stop(), timeout=5)
+        except Exception as e:
+            logger.debug(f"停止 Maim Router 时出现异常: {e}")
+        finally:
+            if not router_task.done():
+                router_task.cancel()
+            await asyncio.gather(router_task, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # 发送
+    # ------------------------------------------------------------------
+
+    async def send(self, message) -> bool:
+        """
+        发送消息；未连接（或队列中仍有积压）时放入待发送队列
+
+        Returns:
+            消息是否已发送或已入队；连接已关闭时返回 False
+        """
+        if self.is_closed():
+            logger.warning("Maim 连接已关闭，无法发送消息")
+            return False
+
+        if self.is_connected():
+            # 先补发积压（之前发送失败的消息），保证顺序，积压清空后再直接发送
+            await self._flush_outbox()
+            if not self._outbox and await self._send_now(message):
+                return True
+
+        self._enqueue(message)
+        return True
+
+    async def _send_now(self, message) -> bool:
+        """立即通过当前 Router 发送"""
+        try:
+            result = await self.router.send_message(message)
+            return result is not False
+        except Exception as e:
+            logger.warning(f"Maim 消息发送失败: {e}")
+            return False
+
+    def _enqueue(self, message):
+        """放入有界待发送队列"""
+        if len(self._outbox) >= self._outbox_size:
+            self._outbox.popleft()
+            logger.warning(f"Maim 待发送队列已满（{self._outbox_size}），丢弃最早的一条消息")
+        self._outbox.append(message)
+        logger.info(f"Maim 未连接，消息已加入待发送队列（{len(self._outbox)} 条待发送）")
+
+    async def _flush_outbox(self):
+        """按顺序补发待发送队列（连接恢复后、连接期间有积压时）"""
+        if not self._outbox:
+            return
+
+        total = len(self._outbox)
+        while self._outbox and self.is_connected():
+            if not await self._send_now(self._outbox[0]):
+                break
+            self._outbox.popleft()
+
+        sent = total - len(self._outbox)
+        logger.info(f"Maim 待发送队列已补发 {sent}/{total} 条消息")
@@ -0,0 +1,172 @@
+"""
+Maim 入站消息队列
+
+Router 的消息回调运行在 Maim I/O 事件循环中。这里把消息解析与图片解码
+放到线程池执行，并把短时间窗口内连续到达的消息合并为一次 UI 更新：
+1. 每条消息仍然单独成为一个气泡、单独入库，顺序与到达顺序一致
+2. 同一窗口内的多条消息通过 signals_bus.messages_received 一次性发送给 UI
+"""
+
+import asyncio
+import base64
+from typing import Any, Callable, Dict, List, Optional
+
+from src.util.logger import logger
+
+
+def _decode_image(data) -> Optional[Any]:
+    """把 base64 图片解码为 QImage（QImage 可在非 GUI 线程中创建）"""
+    if not isinstance(data, str) or not data:
+        return None
+    try:
+        from PyQt5.QtGui import QImage
+
+        if data.startswith('data:') and ',' in data:
+            data = data.split(',', 1)[1]
+        image = QImage.fromData(base64.b64decode(data))
+        return None if image.isNull() else image
+    except Exception as e:
+        logger.debug(f"解码 Maim 图片失败: {e}")
+        return None
+
+
+def _seg_field(seg, name: str):
+    """兼容 Seg 对象与字典两种消息段"""
+    if isinstance(seg, dict):
+        return seg.get(name)
+    return getattr(seg, name, None)
+
+
+def convert_maim_message(message) -> Optional[Dict[str, Any]]:
+    """
+    把 Maim 消息转换为 UI 条目（在线程池中执行）
+
+    Returns:
+        {'text': 显示文本, 'image': QImage 或 None, 'seg_type': 消息段类型}，解析失败返回 None
+    """
+    try:
+        if isinstance(message, dict):
+            from maim_message import MessageBase
+            message = MessageBase.from_dict(message)
+
+        message_segment = message.message_segment
+        seg_type = message_segment.type
+        seg_data = message_segment.data
+        image = None
+
+        if seg_type == 'text':
+            # 文本消息
+            reply_content = str(seg_data or '')
+        elif seg_type == 'seglist':
+            # 复合消息（多个段落），取全部文本和第一张图片
+            text_parts = []
+            if isinstance(seg_data, list):
+                for seg in seg_data:
+                    sub_type = _seg_field(seg, 'type')
+                    sub_data = _seg_field(seg, 'data')
+                    if sub_type == 'text':
+                        text_parts.append(sub_data if isinstance(sub_data, str) else str(sub_data))
+                    elif sub_type in ['image', 'emoji'] and image is None:
+                        image = _decode_image(sub_data)
+            if text_parts:
+                reply_content = ''.join(text_parts)
+            else:
+                reply_content = '' if image is not None else '[复合消息]'
+        elif seg_type in ['image', 'emoji']:
+            # 图片或表情包：解码成功则只显示图片
+            image = _decode_image(seg_data)
+            reply_content = '' if image is not None else f'[{seg_type}]'
+        else:
+            # 未知类型
+            reply_content = f'[{seg_type}]'
+
+        logger.info(f"[接收消息] {seg_type} | {(reply_content or f'[{seg_type}]')[:50]}")
+        return {'text': reply_content, 'image': image, 'seg_type': seg_type}
+
+    except Exception as e:
+        logger.error(f"处理 Maim 消息失败: {e}", exc_info=True)
+        return None
+
+
+def _emit_to_ui(items: List[Dict[str, Any]]):
+    """通过全局信号把一批消息发送给 UI（Qt 会自动排队到 GUI 线程）"""
+    try:
+        from src.frontend.signals import signals_bus
+        signals_bus.messages_received.emit(items)
+    except Exception as e:
+        logger.error(f"发送信号失败: messages_received, 错误: {e}")
+
+
+class InboundMessageQueue:
+    """Maim 入站消息队列（运行于 Maim I/O 事件循环）"""
+
+    # 合并窗口（秒）：窗口内到达的消息合并为一次 UI 更新
+    COALESCE_WINDOW = 0.08
+    # 单批最大消息数，达到后立即投递
+    MAX_BATCH = 20
+
+    def __init__(
+        self,
+        emit: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        window: float = COALESCE_WINDOW,
+        max_batch: int = MAX_BATCH,
+    ):
+        """
+        Args:
+            emit: 批量投递回调，默认发送 signals_bus.messages_received
+            window: 合并窗口（秒）
+            max_batch: 单批最大消息数
+        """
+        self._emit = emit or _emit_to_ui
+        self._window = max(0.0, float(window))
+        self._max_batch = max(1, int(max_batch))
+        self._pending: List[asyncio.Future] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._last_delivery: Optional[asyncio.Task] = None
+
+    def put(self, message):
+        """
+        放入一条入站消息（需在 I/O 事件循环中调用，Router 回调即满足）
+
+        解析与解码立即提交到线程池，投递顺序与调用顺序一致。
+        """
+        loop = asyncio.get_running_loop()
+        self._pending.append(loop.run_in_executor(None, convert_maim_message, message))
+
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+
+    def _flush(self):
+        """结束当前窗口，把这一批消息交给投递任务"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self._last_delivery = asyncio.get_running_loop().create_task(
+            self._deliver(batch, self._last_delivery)
+        )
+
+    async def _deliver(self, batch: List[asyncio.Future], previous: Optional[asyncio.Task]):
+        """等待本批解码完成，并在上一批投递之后再投递，保证顺序"""
+        results = await asyncio.gather(*batch, return_exceptions=True)
+        if previous is not None and not previous.done():
+            await asyncio.gather(previous, return_exceptions=True)
+
+        items = [item for item in results if isinstance(item, dict)]
+        if not items:
+            return
+        try:
+            self._emit(items)
+        except Exception as e:
+            logger.error(f"投递入站消息失败: {e}", exc_info=True)
+
+    async def drain(self):
+        """立即投递所有未完成的消息（用于清理或测试）"""
+        self._flush()
+        if self._last_delivery is not None:
+            await asyncio.gather(self._last_delivery, return_exceptions=True)
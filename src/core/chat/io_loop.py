@@ -0,0 +1,160 @@
+"""
+Maim I/O 事件循环服务
+
+整个进程只保留一个长驻的后台线程和 asyncio 事件循环，
+所有 Maim Router 及其重连逻辑都以任务的形式运行在这里。
+切换模型或重连时只需要在该循环上停止旧 Router、启动新 Router，
+不再为每次连接创建/销毁线程和事件循环。
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+from src.util.logger import logger
+
+
+class MaimIOLoop:
+    """长驻 I/O 事件循环服务（单例使用）"""
+
+    def __init__(self, name: str = "MaimIOLoop"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._cleanup_registered = False
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """当前 I/O 事件循环（未启动时为 None）"""
+        return self._loop
+
+    def is_running(self) -> bool:
+        """I/O 事件循环是否正在运行"""
+        return bool(self._loop and self._loop.is_running())
+
+    def in_loop_thread(self) -> bool:
+        """当前代码是否运行在 I/O 线程中"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self, timeout: float = 2.0) -> bool:
+        """
+        启动 I/O 事件循环（幂等）
+
+        Args:
+            timeout: 等待事件循环就绪的最长时间（秒）
+
+        Returns:
+            事件循环是否已就绪
+        """
+        with self._lock:
+            if self.is_running():
+                return True
+
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name=self._name)
+            self._thread.start()
+
+        if not self._ready.wait(timeout=timeout):
+            logger.error(f"{self._name} 事件循环启动超时")
+            return False
+
+        self._register_cleanup()
+        return True
+
+    def _run(self):
+        """I/O 线程入口：创建事件循环并一直运行到 stop()"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        except Exception as e:
+            logger.error(f"{self._name} 事件循环异常退出: {e}", exc_info=True)
+        finally:
+            try:
+                pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            except Exception as cleanup_error:
+                logger.debug(f"{self._name} 事件循环清理异常: {cleanup_error}", exc_info=True)
+            finally:
+                loop.close()
+                if self._loop is loop:
+                    self._loop = None
+                self._ready.clear()
+
+    def _register_cleanup(self):
+        """首次启动时把 stop 注册到线程管理器，随程序退出一起清理"""
+        if self._cleanup_registered:
+            return
+        try:
+            from src.core.thread_manager import thread_manager
+            thread_manager.register_cleanup(self.stop)
+            self._cleanup_registered = True
+        except Exception as e:
+            logger.debug(f"注册 {self._name} 清理函数失败: {e}")
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """
+        从任意线程把协程投递到 I/O 事件循环
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if not self.is_running():
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise RuntimeError(f"{self._name} 事件循环未运行")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        在 I/O 事件循环中执行协程，并在调用方事件循环中等待结果
+
+        已经处于 I/O 线程时直接 await，避免自我投递造成死锁。
+        """
+        if self.in_loop_thread():
+            if timeout:
+                return await asyncio.wait_for(coro, timeout=timeout)
+            return await coro
+
+        wrapped = asyncio.wrap_future(self.submit(coro))
+        if timeout:
+            return await asyncio.wait_for(wrapped, timeout=timeout)
+        return await wrapped
+
+    def call_soon(self, callback: Callable, *args) -> bool:
+        """线程安全地在 I/O 事件循环中调度一个回调"""
+        if not self.is_running():
+            return False
+        self._loop.call_soon_threadsafe(callback, *args)
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        """停止 I/O 事件循环，取消其上所有任务并等待线程结束"""
+        loop = self._loop
+        thread = self._thread
+        if loop is None or thread is None:
+            return
+
+        if loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+
+        if thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"{self._name} 线程未在 {timeout} 秒内结束")
+
+        self._thread = None
+        logger.info(f"{self._name} 事件循环已停止")
+
+
+# 全局单例
+maim_io_loop = MaimIOLoop()
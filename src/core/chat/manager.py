@@ -8,32 +8,44 @@
 3. 管理聊天会话
 """
 
-import aiohttp
 import asyncio
-import threading
 import time
 import uuid
 import concurrent.futures
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from src.core.protocol import protocol_manager
 from src.core.prompt import prompt_manager
+from src.core.chat.io_loop import maim_io_loop
+from src.core.chat.connection import MaimConnection, MaimConnectionState
+from src.core.chat.inbound import InboundMessageQueue
+from src.core.chat.summary import ConversationSummarizer
 from src.util.logger import logger
 
-# maim_message 相关导入
-try:
-    from maim_message import Router, RouteConfig, TargetConfig, MessageBase, BaseMessageInfo, Seg, UserInfo, FormatInfo
-    MAIM_MESSAGE_AVAILABLE = True
-except ImportError:
-    logger.warning("maim_message 库未安装，Maim 协议将不可用")
-    MAIM_MESSAGE_AVAILABLE = False
-    Router = None
-    RouteConfig = None
-    TargetConfig = None
-    MessageBase = None
-    BaseMessageInfo = None
-    Seg = None
-    UserInfo = None
-    FormatInfo = None
+if TYPE_CHECKING:
+    import aiohttp
+
+# maim_message / aiohttp 都是较重的依赖，只在首次使用对应协议时才导入
+_maim_message = None
+MAIM_MESSAGE_AVAILABLE: Optional[bool] = None  # None 表示尚未尝试导入
+
+
+def _load_maim_message():
+    """
+    延迟导入 maim_message
+
+    Returns:
+        maim_message 模块；未安装时返回 None
+    """
+    global _maim_message, MAIM_MESSAGE_AVAILABLE
+    if MAIM_MESSAGE_AVAILABLE is None:
+        try:
+            import maim_message
+            _maim_message = maim_message
+            MAIM_MESSAGE_AVAILABLE = True
+        except ImportError:
+            logger.warning("maim_message 库未安装，Maim 协议将不可用")
+            MAIM_MESSAGE_AVAILABLE = False
+    return _maim_message
 
 
 def _safe_emit_signal(signal_bus, signal_name: str, *args):
@@ -50,6 +62,13 @@ def _safe_emit_signal(signal_bus, signal_name: str, *args):
 
 class ChatManager:
     """聊天管理器"""
+
+    # Maim 首次连接建立的最长等待时间（秒），超时则尝试下一个候选模型
+    _MAIM_CONNECT_TIMEOUT = 5.0
+    # HTTP keep-alive 连接保持时间（秒）
+    _HTTP_KEEPALIVE_TIMEOUT = 60
+    # HTTP 预热请求超时（秒）
+    _HTTP_PREWARM_TIMEOUT = 5
     
     def __init__(self):
         self._protocol_manager = protocol_manager
@@ -57,18 +76,26 @@ class ChatManager:
         self._current_task = 'chat'
         self._current_connection_key: Optional[tuple] = None
         self._switch_lock = asyncio.Lock()
+        self._init_lock = asyncio.Lock()
+
+        # 共享 HTTP 会话（keep-alive），在所属事件循环中复用
+        self._http_session: Optional['aiohttp.ClientSession'] = None
+        self._http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 会话守护任务：在会话所属的事件循环中等待，被取消时（会话被替换或循环结束）关闭会话
+        self._http_session_guard: Optional[asyncio.Task] = None
+        self._http_prewarm_task: Optional[asyncio.Task] = None
 
         # WebSocket Router（用于 maim）
-        self._maim_router: Optional[Router] = None
+        self._maim_connection: Optional[MaimConnection] = None
         self._maim_platform: Optional[str] = None
-        self._maim_thread: Optional[threading.Thread] = None
-        self._maim_loop: Optional[asyncio.AbstractEventLoop] = None
-        self._maim_loop_ready: Optional[threading.Event] = None
-        self._maim_startup_error: Optional[str] = None
+        self._inbound_queue: Optional[InboundMessageQueue] = None
+
+        # 长对话摘要（后台生成，不阻塞发送）
+        self._summarizer = ConversationSummarizer(self._complete_http)
     
     async def initialize(self, task_type: str = 'chat') -> bool:
         """
-        初始化聊天管理器
+        初始化聊天管理器（启动时在后台执行，并发调用会等待同一次初始化）
         
         Args:
             task_type: 任务类型，默认 'chat'
@@ -76,34 +103,62 @@ class ChatManager:
         Returns:
             是否初始化成功
         """
-        try:
-            # 1. 初始化协议管理器
-            if not self._protocol_manager.is_initialized():
-                success = await self._protocol_manager.initialize()
+        async with self._init_lock:
+            if self._initialized and self._current_task == task_type:
+                return True
+
+            self._emit_connection_state('connecting')
+            try:
+                # 1. 初始化协议管理器
+                if not self._protocol_manager.is_initialized():
+                    success = await self._protocol_manager.initialize()
+                    if not success:
+                        logger.error("协议管理器初始化失败")
+                        self._emit_connection_state('failed')
+                        return False
+
+                success = await self._activate_first_available_model(task_type)
                 if not success:
-                    logger.error("协议管理器初始化失败")
+                    logger.error(f"任务 '{task_type}' 没有可用的聊天连接")
+                    self._initialized = False
+                    self._emit_connection_state('failed')
                     return False
-            
-            success = await self._activate_first_available_model(task_type)
-            if not success:
-                logger.error(f"任务 '{task_type}' 没有可用的聊天连接")
-                self._initialized = False
+
+                self._current_task = task_type
+                self._initialized = True
+
+                connection_info = self._protocol_manager.get_task_connection_info(task_type)
+                logger.info("聊天管理器初始化成功")
+                logger.info(f"  - 任务类型: {task_type}")
+                logger.info(f"  - 协议类型: {connection_info.get('protocol_type') if connection_info else '未知'}")
+                logger.info(f"  - 模型: {connection_info.get('model_name') if connection_info else '未知'}")
+
+                self._emit_connection_state('connected')
+                return True
+
+            except Exception as e:
+                logger.error(f"聊天管理器初始化失败: {e}", exc_info=True)
+                self._emit_connection_state('failed')
                 return False
 
-            self._current_task = task_type
-            self._initialized = True
+    def _emit_connection_state(self, state: str):
+        """
+        通知 UI 连接状态变化（可在任意线程调用）
 
-            connection_info = self._protocol_manager.get_task_connection_info(task_type)
-            logger.info("聊天管理器初始化成功")
-            logger.info(f"  - 任务类型: {task_type}")
-            logger.info(f"  - 协议类型: {connection_info.get('protocol_type') if connection_info else '未知'}")
-            logger.info(f"  - 模型: {connection_info.get('model_name') if connection_info else '未知'}")
+        Args:
+            state: connecting / connected / reconnecting / disconnected / failed
+        """
+        from src.frontend.signals import signals_bus
+        _safe_emit_signal(signals_bus, 'connection_state_changed', state)
 
-            return True
-            
-        except Exception as e:
-            logger.error(f"聊天管理器初始化失败: {e}", exc_info=True)
-            return False
+    def _on_maim_state_changed(self, state: MaimConnectionState):
+        """Maim 连接状态机回调（运行于 I/O 线程）"""
+        if state == MaimConnectionState.CLOSED:
+            return
+        # 首次连接中的状态由 initialize 统一发出，这里只转发之后的断线/重连
+        if state == MaimConnectionState.CONNECTING:
+            return
+        self._emit_connection_state(state.value)
 
     async def _activate_first_available_model(self, task_type: str, start_index: Optional[int] = None) -> bool:
         """从任务候选模型中选择第一个可初始化的连接"""
@@ -169,7 +224,8 @@ class ChatManager:
         """
         初始化 HTTP 客户端（OpenAI/Gemini）
 
-        HTTP 客户端不需要预先初始化，每次请求时临时创建 session
+        创建共享的 keep-alive 会话，并在后台预热到 base_url 的连接（DNS/TCP/TLS），
+        首条消息即可复用已建立的连接。预热失败不影响初始化结果。
 
         Args:
             connection_info: 连接信息
@@ -177,8 +233,103 @@ class ChatManager:
         Returns:
             是否初始化成功
         """
-        logger.info("[OK] HTTP 客户端准备就绪（按需创建）")
+        self._get_http_session()
+        base_url = connection_info.get('base_url')
+        if base_url and (self._http_prewarm_task is None or self._http_prewarm_task.done()):
+            self._http_prewarm_task = asyncio.create_task(
+                self._prewarm_http(base_url, connection_info.get('api_key', ''))
+            )
+        logger.info("[OK] HTTP 客户端准备就绪（keep-alive 会话）")
         return True
+
+    def _get_http_session(self) -> 'aiohttp.ClientSession':
+        """获取当前事件循环中的共享 HTTP 会话（不存在或已关闭时重建）"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._http_session is None
+            or self._http_session.closed
+            or self._http_session_loop is not loop
+        ):
+            self._discard_http_session()
+            connector = aiohttp.TCPConnector(keepalive_timeout=self._HTTP_KEEPALIVE_TIMEOUT)
+            self._http_session = aiohttp.ClientSession(connector=connector)
+            self._http_session_loop = loop
+            self._http_session_guard = loop.create_task(
+                self._hold_http_session(self._http_session), name="HttpSessionGuard"
+            )
+        return self._http_session
+
+    @staticmethod
+    async def _hold_http_session(session: 'aiohttp.ClientSession'):
+        """
+        守护任务：一直等待，被取消时在会话所属的事件循环中关闭会话
+
+        asyncio.run() 结束前会取消并等待所有剩余任务，因此事件循环关闭之前会话总会被关闭
+        """
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            if not session.closed:
+                await session.close()
+
+    def _discard_http_session(self):
+        """关闭将被替换的旧会话（取消它的守护任务，由守护任务在所属事件循环中关闭）"""
+        old_session, old_loop, old_guard = self._http_session, self._http_session_loop, self._http_session_guard
+        self._http_session = None
+        self._http_session_loop = None
+        self._http_session_guard = None
+        if old_session is None or old_session.closed or old_guard is None:
+            return
+
+        if old_loop.is_closed():
+            # 事件循环没有取消剩余任务就被关闭了，会话已经无法关闭
+            logger.debug("旧的 HTTP 会话所属的事件循环已关闭，无法关闭会话")
+            return
+        try:
+            old_loop.call_soon_threadsafe(old_guard.cancel)
+        except RuntimeError as e:
+            logger.debug(f"关闭旧的 HTTP 会话失败: {e}")
+
+    async def _prewarm_http(self, base_url: str, api_key: str):
+        """向 base_url/models 发送轻量请求，提前建立 keep-alive 连接"""
+        try:
+            import aiohttp
+
+            session = self._get_http_session()
+            timeout = aiohttp.ClientTimeout(total=self._HTTP_PREWARM_TIMEOUT)
+            headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+            async with session.get(f"{base_url}/models", headers=headers, timeout=timeout) as response:
+                await response.read()
+                logger.debug(f"HTTP 连接预热完成: {base_url} ({response.status})")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"HTTP 连接预热失败（不影响使用）: {e}")
+
+    async def _close_http_session(self):
+        """关闭共享 HTTP 会话"""
+        if self._http_prewarm_task and not self._http_prewarm_task.done():
+            self._http_prewarm_task.cancel()
+        self._http_prewarm_task = None
+
+        if self._http_session_loop is not asyncio.get_running_loop():
+            # 会话属于其他事件循环，交给它自己的守护任务关闭
+            self._discard_http_session()
+            return
+
+        session, guard = self._http_session, self._http_session_guard
+        self._http_session = None
+        self._http_session_loop = None
+        self._http_session_guard = None
+        if guard is not None:
+            guard.cancel()
+        if session and not session.closed:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"关闭 HTTP 会话失败: {e}")
     
     async def _initialize_maim(self, connection_info: Dict[str, Any]) -> bool:
         """
@@ -190,7 +341,8 @@ class ChatManager:
         Returns:
             是否初始化成功
         """
-        if not MAIM_MESSAGE_AVAILABLE:
+        maim = _load_maim_message()
+        if maim is None:
             logger.error("maim_message 库未安装，无法使用 Maim 协议")
             return False
 
@@ -206,88 +358,57 @@ class ChatManager:
             connection_key = self._connection_key(connection_info)
 
             if (
-                self._maim_router
+                self._maim_connection
+                and not self._maim_connection.is_closed()
                 and self._maim_platform == platform
                 and self._current_connection_key == connection_key
-                and self._is_maim_connected()
             ):
-                logger.info(f"Maim WebSocket 已连接，复用现有连接: {platform}")
+                # 同一连接正在重连时也直接复用，消息会进入待发送队列
+                logger.info(f"Maim WebSocket 复用现有连接: {platform} ({self._maim_connection.state.value})")
                 return True
 
             await self._cleanup_maim()
 
             logger.info(f"初始化 Maim WebSocket 连接: {ws_url}")
 
-            # 创建路由配置
-            target_config = TargetConfig(url=ws_url, token=api_key if api_key else None)
-            route_config = RouteConfig(route_config={platform: target_config})
-
-            # 创建 Router
-            self._maim_router = Router(config=route_config, custom_logger=logger)
-            self._maim_platform = platform
-
-            # 注册消息处理器（接收回复）
-            self._maim_router.register_message_handler(self._handle_maim_message)
-
-            # 线程启动状态跟踪
-            self._maim_startup_error = None
-            self._maim_loop_ready = threading.Event()
-
-            # 在后台线程中启动 Router（run() 是阻塞方法）
-            def run_router():
-                """在后台线程中运行 Router"""
-                loop = asyncio.new_event_loop()
-                self._maim_loop = loop
-                self._maim_loop_ready.set()
-                try:
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(self._maim_router.run())
-                except asyncio.CancelledError:
-                    logger.info("Maim Router 已取消")
-                except Exception as e:
-                    self._maim_startup_error = str(e)
-                    logger.error(f"Router 运行失败: {e}", exc_info=True)
-                finally:
-                    try:
-                        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
-                        for task in pending:
-                            task.cancel()
-                        if pending:
-                            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                        loop.run_until_complete(loop.shutdown_asyncgens())
-                    except Exception as cleanup_error:
-                        logger.debug(f"Maim Router 事件循环清理异常: {cleanup_error}", exc_info=True)
-                    finally:
-                        loop.close()
-                        if self._maim_loop is loop:
-                            self._maim_loop = None
-
-            self._maim_thread = threading.Thread(target=run_router, daemon=True, name="MaimRouter")
-            self._maim_thread.start()
-
-            if not self._maim_loop_ready.wait(timeout=2):
-                logger.error("Maim Router 事件循环启动超时")
+            if not maim_io_loop.start():
+                logger.error("Maim I/O 事件循环启动失败")
                 return False
 
-            # 等待连接建立（使用 asyncio.sleep 保持异步特性）
-            max_wait = 5  # 最多等待 5 秒
-            for i in range(max_wait * 10):
-                if self._maim_startup_error:
-                    logger.error(f"Maim WebSocket 启动失败: {self._maim_startup_error}")
-                    return False
-                if self._is_maim_connected():
-                    logger.info("Maim WebSocket 连接已建立")
-                    logger.info(f"  - 平台: {platform}")
-                    logger.info(f"  - 地址: {ws_url}")
-                    self._current_connection_key = connection_key
-                    return True
-                await asyncio.sleep(0.1)
+            def create_router():
+                """每次（重）连接都创建新的 Router"""
+                target_config = maim.TargetConfig(url=ws_url, token=api_key if api_key else None)
+                route_config = maim.RouteConfig(route_config={platform: target_config})
+                router = maim.Router(config=route_config, custom_logger=logger)
+                router.register_message_handler(self._handle_maim_message)
+                return router
+
+            connection = await maim_io_loop.run(self._start_maim_connection(
+                create_router,
+                platform,
+                listener=self._on_maim_state_changed,
+                connect_timeout=connection_info.get('timeout', 30),
+                retry_interval=connection_info.get('retry_interval', 5),
+            ))
+            self._maim_connection = connection
+            self._maim_platform = platform
 
-            if self._maim_startup_error:
-                logger.error(f"Maim WebSocket 启动失败: {self._maim_startup_error}")
-                return False
+            # 等待 connected 事件，而不是轮询连接状态
+            connected = await maim_io_loop.run(
+                connection.wait_connected(self._MAIM_CONNECT_TIMEOUT),
+                timeout=self._MAIM_CONNECT_TIMEOUT + 1
+            )
+            if connected:
+                logger.info("Maim WebSocket 连接已建立")
+                logger.info(f"  - 平台: {platform}")
+                logger.info(f"  - 地址: {ws_url}")
+                self._current_connection_key = connection_key
+                return True
 
-            logger.warning("Maim WebSocket 连接建立超时")
+            if connection.last_error:
+                logger.error(f"Maim WebSocket 启动失败: {connection.last_error}")
+            else:
+                logger.warning("Maim WebSocket 连接建立超时")
             await self._cleanup_maim()
             return False
 
@@ -296,45 +417,42 @@ class ChatManager:
             await self._cleanup_maim()
             return False
 
+    @staticmethod
+    async def _start_maim_connection(router_factory, platform: str, listener=None, **kwargs) -> MaimConnection:
+        """在 I/O 事件循环中创建并启动连接状态机（运行于 I/O 线程）"""
+        connection = MaimConnection(router_factory, platform, **kwargs)
+        if listener is not None:
+            connection.add_listener(listener)
+        connection.start()
+        return connection
+
     def _is_maim_connected(self) -> bool:
-        """检查当前 Maim Router 是否已经连接"""
-        try:
-            if not self._maim_router or not self._maim_platform:
-                return False
-            return self._maim_router.check_connection(self._maim_platform)
-        except Exception as e:
-            logger.debug(f"检查 Maim 连接状态失败: {e}")
-            return False
+        """检查当前 Maim 连接是否处于已连接状态"""
+        return bool(self._maim_connection and self._maim_connection.is_connected())
 
-    async def _run_on_maim_loop(self, coro, timeout: Optional[float] = None):
-        """把协程投递到 Maim Router 所在线程的事件循环执行"""
-        if not self._maim_loop or not self._maim_loop.is_running():
-            raise RuntimeError("Maim Router 事件循环未运行")
+    def get_maim_state(self) -> Optional[MaimConnectionState]:
+        """获取当前 Maim 连接状态（未使用 Maim 时为 None）"""
+        return self._maim_connection.state if self._maim_connection else None
 
-        future = asyncio.run_coroutine_threadsafe(coro, self._maim_loop)
-        wrapped = asyncio.wrap_future(future)
-        if timeout:
-            return await asyncio.wait_for(wrapped, timeout=timeout)
-        return await wrapped
+    async def _run_on_maim_loop(self, coro, timeout: Optional[float] = None):
+        """把协程投递到 Maim I/O 事件循环执行"""
+        return await maim_io_loop.run(coro, timeout=timeout)
 
     async def _cleanup_maim(self):
-        """清理 Maim Router，确保停止发生在它自己的事件循环里"""
-        router = self._maim_router
-        loop = self._maim_loop
-        thread = self._maim_thread
+        """关闭当前 Maim 连接；共享 I/O 事件循环保持运行，供下一次连接复用"""
+        connection = self._maim_connection
 
-        self._maim_router = None
+        self._maim_connection = None
         self._maim_platform = None
-        self._maim_thread = None
-        self._maim_loop_ready = None
-        self._maim_startup_error = None
         if self._current_connection_key and self._current_connection_key[0] == 'maim':
             self._current_connection_key = None
 
-        if router and loop and loop.is_running():
+        if connection and maim_io_loop.is_running():
             try:
-                future = asyncio.run_coroutine_threadsafe(router.stop(), loop)
-                await asyncio.wait_for(asyncio.wrap_future(future), timeout=5)
+                await maim_io_loop.run(connection.close(), timeout=6)
+                if self._inbound_queue is not None:
+                    # 已收到但尚未投递的消息仍然交给 UI
+                    await maim_io_loop.run(self._inbound_queue.drain(), timeout=2)
                 logger.info("Maim WebSocket 连接已关闭")
             except (asyncio.CancelledError, concurrent.futures.CancelledError):
                 logger.info("Maim WebSocket 清理任务已取消")
@@ -343,13 +461,6 @@ class ChatManager:
             except Exception as e:
                 logger.warning(f"停止 Maim Router 时出现异常: {e}")
 
-        if thread and thread.is_alive():
-            try:
-                running_loop = asyncio.get_running_loop()
-                await running_loop.run_in_executor(None, thread.join, 2)
-            except Exception as e:
-                logger.debug(f"等待 Maim Router 线程结束失败: {e}", exc_info=True)
-    
     async def send_message(self, content: str, user_id: str = '0', user_name: str = '麦麦') -> bool:
         """
         发送消息
@@ -396,7 +507,7 @@ class ChatManager:
                         success = False
 
                     if success:
-                        logger.info(f"[发送成功] {connection_info.get('model_name')} | {content[:30]}...")
+                        logger.info("[发送成功] %s | %.30s...", connection_info.get('model_name'), content)
                         return True
 
                     logger.warning(f"[发送失败] {connection_info.get('model_name')}，准备切换候选")
@@ -427,7 +538,7 @@ class ChatManager:
 
     async def _send_http(self, content: str, connection_info: Dict[str, Any], user_id: str, user_name: str) -> bool:
         """
-        通过 HTTP 发送消息（每次请求临时创建 session）
+        通过 HTTP 发送消息（复用共享 keep-alive 会话）
 
         Args:
             content: 消息内容
@@ -439,30 +550,70 @@ class ChatManager:
             是否发送成功
         """
         try:
-            url = f"{connection_info.get('base_url', '')}/chat/completions"
-            if not url or url == "/chat/completions":
-                logger.error("HTTP 请求缺少 base_url")
-                return False
-
-            headers = {
-                "Authorization": f"Bearer {connection_info.get('api_key', '')}",
-                "Content-Type": "application/json"
-            }
-
             context_limit = prompt_manager.get_context_limit()
             context_fetch_limit = context_limit + 2 if context_limit > 0 else 0
             context_messages = await self._load_prompt_context(context_fetch_limit)
+            self._summarizer.preload()
             messages = prompt_manager.build_messages(
                 content,
                 user_id,
                 user_name,
                 context_messages=context_messages,
+                token_budget=connection_info.get('context_token_budget'),
+                summary=self._summarizer.summary,
             )
 
+            # HTTP 发送日志（一条记录，参数延迟格式化）
+            logger.info("[HTTP发送] %s | 模型: %s | 消息: %.50s",
+                        connection_info.get('base_url', ''), connection_info.get('model_identifier', ''), content)
+
+            reply = await self._complete_http(messages, connection_info)
+            if reply is None:
+                return False
+            if not reply:
+                reply = "[空响应]"
+
+            # HTTP 接收日志
+            logger.info(f"[HTTP接收] {reply[:50]}")
+
+            # 触发 UI 信号（安全发送）
+            from src.frontend.signals import signals_bus
+            _safe_emit_signal(signals_bus, 'message_received', reply)
+
+            # 回复已发出，在后台把溢出最近上下文的旧消息并入摘要
+            self._summarizer.schedule(self._summary_connection_info(connection_info))
+            return True
+
+        except Exception as e:
+            logger.error(f"发送 HTTP 请求失败: {e}", exc_info=True)
+            return False
+
+    async def _complete_http(self, messages: List[Dict[str, Any]], connection_info: Dict[str, Any]) -> Optional[str]:
+        """
+        请求 OpenAI 兼容的 /chat/completions 接口
+
+        Args:
+            messages: 消息列表
+            connection_info: 连接信息
+
+        Returns:
+            回复内容（响应中没有内容时为空字符串）；请求失败返回 None
+        """
+        try:
+            url = f"{connection_info.get('base_url', '')}/chat/completions"
+            if not url or url == "/chat/completions":
+                logger.error("HTTP 请求缺少 base_url")
+                return None
+
             model_identifier = connection_info.get('model_identifier', '')
             if not model_identifier:
                 logger.error("HTTP 请求缺少 model_identifier")
-                return False
+                return None
+
+            headers = {
+                "Authorization": f"Bearer {connection_info.get('api_key', '')}",
+                "Content-Type": "application/json"
+            }
 
             # 构建请求数据
             data = {
@@ -478,93 +629,70 @@ class ChatManager:
             if isinstance(extra_params, dict):
                 data.update(extra_params)
 
-            # HTTP 发送日志
-            logger.info(f"[HTTP发送] {connection_info.get('base_url', '')}")
-            logger.info(f"  模型: {model_identifier}")
-            logger.info(f"  消息: {content[:50]}")
+            # 复用共享 keep-alive 会话，省去每次请求的 TCP/TLS 握手
+            import aiohttp
 
-            # 每次请求临时创建 session，请求完成后自动关闭
             timeout = aiohttp.ClientTimeout(total=connection_info.get('timeout', 30))
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    if response.status == 200:
-                        try:
-                            result = await response.json()
-                            # 防御性检查 API 响应格式
-                            choices = result.get('choices', [])
-                            if not choices:
-                                logger.error("HTTP 响应格式异常: choices 为空")
-                                return False
-                            first_choice = choices[0] if choices else {}
-                            message = first_choice.get('message', {})
-                            reply = message.get('content', '')
-                            if not reply:
-                                logger.warning("HTTP 响应中 content 为空")
-                                reply = "[空响应]"
-                        except Exception as parse_error:
-                            logger.error(f"解析 HTTP 响应失败: {parse_error}")
-                            return False
+            session = self._get_http_session()
+            async with session.post(url, json=data, headers=headers, timeout=timeout) as response:
+                if response.status != 200:
+                    error = await response.text()
+                    logger.error(f"HTTP 请求失败: {response.status} - {error}")
+                    return None
 
-                        # HTTP 接收日志
-                        logger.info(f"[HTTP接收] {reply[:50]}")
-
-                        # 触发 UI 信号（安全发送）
-                        from src.frontend.signals import signals_bus
-                        _safe_emit_signal(signals_bus, 'message_received', reply)
-
-                        return True
-                    else:
-                        error = await response.text()
-                        logger.error(f"HTTP 请求失败: {response.status} - {error}")
-                        return False
+                try:
+                    result = await response.json()
+                    # 防御性检查 API 响应格式
+                    choices = result.get('choices', [])
+                    if not choices:
+                        logger.error("HTTP 响应格式异常: choices 为空")
+                        return None
+                    message = choices[0].get('message', {})
+                    reply = message.get('content', '')
+                    if not reply:
+                        logger.warning("HTTP 响应中 content 为空")
+                    return reply or ''
+                except Exception as parse_error:
+                    logger.error(f"解析 HTTP 响应失败: {parse_error}")
+                    return None
 
         except Exception as e:
             logger.error(f"发送 HTTP 请求失败: {e}", exc_info=True)
-            return False
+            return None
+
+    def _summary_connection_info(self, chat_connection_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        获取生成对话摘要使用的连接信息
+
+        优先使用 model_task_config.summary，未配置时使用当前对话模型；
+        摘要只支持 OpenAI 兼容协议。
+        """
+        connection_info = chat_connection_info
+        if self._protocol_manager.get_task_model_names('summary'):
+            connection_info = self._protocol_manager.get_task_connection_info('summary')
+
+        if not connection_info or connection_info.get('protocol_type') not in ['openai', 'gemini']:
+            return None
+        return connection_info
+
+    def reset_summary(self):
+        """聊天记录被清空后丢弃内存中的对话摘要"""
+        self._summarizer.reset()
     
     def _handle_maim_message(self, message):
         """
-        处理从 Maim WebSocket 接收到的消息
+        处理从 Maim WebSocket 接收到的消息（运行于 Maim I/O 事件循环）
+
+        消息交给入站队列：解析和图片解码在线程池中完成，
+        短时间内连续到达的消息合并为一次 UI 更新。
 
         Args:
-            message: MessageBase 对象
+            message: MessageBase 对象或消息字典
         """
         try:
-            if isinstance(message, dict):
-                message = MessageBase.from_dict(message)
-
-            # 提取消息段
-            message_segment = message.message_segment
-            seg_type = message_segment.type
-            seg_data = message_segment.data
-
-            # 处理不同类型的消息
-            if seg_type == 'text':
-                # 文本消息
-                reply_content = str(seg_data or '')
-            elif seg_type == 'seglist':
-                # 复合消息（多个段落）
-                text_parts = []
-                if isinstance(seg_data, list):
-                    for seg in seg_data:
-                        if hasattr(seg, 'type') and seg.type == 'text':
-                            text_parts.append(seg.data if isinstance(seg.data, str) else str(seg.data))
-                        elif isinstance(seg, dict) and seg.get('type') == 'text':
-                            text_parts.append(seg.get('data', ''))
-                reply_content = ''.join(text_parts) if text_parts else '[复合消息]'
-            elif seg_type in ['image', 'emoji']:
-                # 图片或表情包（暂不支持显示）
-                reply_content = f'[{seg_type}]'
-            else:
-                # 未知类型
-                reply_content = f'[{seg_type}]'
-
-            logger.info(f"[接收消息] {seg_type} | {reply_content[:50]}")
-
-            # 触发 UI 信号（安全发送）
-            from src.frontend.signals import signals_bus
-            _safe_emit_signal(signals_bus, 'message_received', reply_content)
-
+            if self._inbound_queue is None:
+                self._inbound_queue = InboundMessageQueue()
+            self._inbound_queue.put(message)
         except Exception as e:
             logger.error(f"处理 Maim 消息失败: {e}", exc_info=True)
 
@@ -581,11 +709,12 @@ class ChatManager:
         Returns:
             是否发送成功
         """
-        if not MAIM_MESSAGE_AVAILABLE:
+        maim = _load_maim_message()
+        if maim is None:
             logger.error("maim_message 库未安装，无法发送 Maim 消息")
             return False
 
-        seg = Seg(type='text', data=content)
+        seg = maim.Seg(type='text', data=content)
         return await self._send_maim_segment(
             seg=seg,
             raw_message=content,
@@ -604,16 +733,14 @@ class ChatManager:
         user_name: str,
         content_format: Optional[List[str]] = None
     ) -> bool:
-        """发送任意 Maim Seg，确保发送发生在 Router 所在线程"""
-        if not self._maim_router or not self._maim_platform:
+        """发送任意 Maim Seg，确保发送发生在 Maim I/O 事件循环中"""
+        connection = self._maim_connection
+        if not connection or connection.is_closed():
             logger.warning("Maim WebSocket 未初始化或已失效")
             return False
 
-        if not self._is_maim_connected():
-            logger.warning("Maim WebSocket 未连接")
-            return False
-
-        if not MAIM_MESSAGE_AVAILABLE:
+        maim = _load_maim_message()
+        if maim is None:
             logger.error("maim_message 库未安装，无法发送 Maim 消息")
             return False
 
@@ -621,14 +748,14 @@ class ChatManager:
             platform, actual_user_name = self._resolve_maim_identity(connection_info, user_name)
             content_format = content_format or ['text']
 
-            user_info = UserInfo(
+            user_info = maim.UserInfo(
                 platform=platform,
                 user_id=user_id,
                 user_nickname=actual_user_name,
                 user_cardname=''
             )
 
-            format_info = FormatInfo(
+            format_info = maim.FormatInfo(
                 content_format=content_format,
                 accept_format=['text', 'emoji', 'image']
             )
@@ -640,7 +767,7 @@ class ChatManager:
             if isinstance(extra_params, dict):
                 additional_config.update(extra_params)
 
-            message_info = BaseMessageInfo(
+            message_info = maim.BaseMessageInfo(
                 platform=platform,
                 message_id=str(uuid.uuid4()),
                 time=time.time(),
@@ -649,15 +776,16 @@ class ChatManager:
                 additional_config=additional_config
             )
 
-            message = MessageBase(
+            message = maim.MessageBase(
                 message_info=message_info,
                 message_segment=seg,
                 raw_message=raw_message
             )
 
             timeout = max(5, int(connection_info.get('timeout', 30)))
+            # 未连接时消息进入待发送队列，连接恢复后自动补发
             result = await self._run_on_maim_loop(
-                self._maim_router.send_message(message),
+                connection.send(message),
                 timeout=timeout
             )
 
@@ -681,8 +809,8 @@ class ChatManager:
         actual_user_name = fallback_user_name
 
         try:
-            from config import load_config
-            main_config = load_config()
+            from config import get_config
+            main_config = get_config()
             if main_config:
                 user_nickname = getattr(main_config, 'userNickname', None)
                 nickname = getattr(main_config, 'Nickname', None)
@@ -712,7 +840,8 @@ class ChatManager:
 
             connection_info = self._protocol_manager.get_task_connection_info(self._current_task)
             if connection_info and connection_info.get('protocol_type') == 'maim':
-                if not MAIM_MESSAGE_AVAILABLE:
+                maim = _load_maim_message()
+                if maim is None:
                     logger.error("maim_message 库未安装，无法发送图片消息")
                     return False
 
@@ -722,10 +851,10 @@ class ChatManager:
 
                     segs = []
                     if text:
-                        segs.append(Seg(type='text', data=text))
-                    segs.append(Seg(type='image', data=image_base64))
+                        segs.append(maim.Seg(type='text', data=text))
+                    segs.append(maim.Seg(type='image', data=image_base64))
 
-                    seg = Seg(type='seglist', data=segs)
+                    seg = maim.Seg(type='seglist', data=segs)
                     raw_message = text or '[image]'
                     return await self._send_maim_segment(
                         seg=seg,
@@ -980,51 +1109,53 @@ class ChatManager:
             logger.info(f"  模型: {model_identifier}")
             logger.info(f"  任务: {task_type}")
 
+            import aiohttp
+
             timeout = aiohttp.ClientTimeout(total=vision_timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=data, headers=headers) as response:
-                    if response.status == 200:
-                        try:
-                            result = await response.json()
-                            # 防御性检查 API 响应格式
-                            choices = result.get('choices', [])
-                            if not choices:
-                                logger.error("Vision 响应格式异常: choices 为空")
-                                if callback:
-                                    callback(False, task_type, None)
-                                return False
-                            first_choice = choices[0] if choices else {}
-                            message = first_choice.get('message', {})
-                            reply = message.get('content', '')
-                            if not reply:
-                                logger.warning("Vision 响应中 content 为空")
-                                reply = "[空响应]"
-                        except Exception as parse_error:
-                            logger.error(f"解析 Vision 响应失败: {parse_error}")
+            session = self._get_http_session()
+            async with session.post(url, json=data, headers=headers, timeout=timeout) as response:
+                if response.status == 200:
+                    try:
+                        result = await response.json()
+                        # 防御性检查 API 响应格式
+                        choices = result.get('choices', [])
+                        if not choices:
+                            logger.error("Vision 响应格式异常: choices 为空")
                             if callback:
                                 callback(False, task_type, None)
                             return False
-
-                        # Vision 接收日志
-                        logger.info(f"[Vision接收] {reply[:50]}")
-
-                        # 有回调的 Vision 任务（OCR/翻译）由调用方决定如何展示；
-                        # 没有回调的图文聊天则走统一消息信号，显示到聊天 UI。
+                        first_choice = choices[0] if choices else {}
+                        message = first_choice.get('message', {})
+                        reply = message.get('content', '')
+                        if not reply:
+                            logger.warning("Vision 响应中 content 为空")
+                            reply = "[空响应]"
+                    except Exception as parse_error:
+                        logger.error(f"解析 Vision 响应失败: {parse_error}")
                         if callback:
-                            callback(True, task_type, reply)
-                        else:
-                            from src.frontend.signals import signals_bus
-                            _safe_emit_signal(signals_bus, 'message_received', reply)
+                            callback(False, task_type, None)
+                        return False
 
-                        return True
+                    # Vision 接收日志
+                    logger.info(f"[Vision接收] {reply[:50]}")
+
+                    # 有回调的 Vision 任务（OCR/翻译）由调用方决定如何展示；
+                    # 没有回调的图文聊天则走统一消息信号，显示到聊天 UI。
+                    if callback:
+                        callback(True, task_type, reply)
                     else:
-                        error = await response.text()
-                        logger.error(f"Vision 请求失败: {response.status} - {error}")
+                        from src.frontend.signals import signals_bus
+                        _safe_emit_signal(signals_bus, 'message_received', reply)
 
-                        if callback:
-                            callback(False, task_type, None)
+                    return True
+                else:
+                    error = await response.text()
+                    logger.error(f"Vision 请求失败: {response.status} - {error}")
 
-                        return False
+                    if callback:
+                        callback(False, task_type, None)
+
+                    return False
         
         except asyncio.TimeoutError:
             logger.error(f"Vision 请求超时（超过 {vision_timeout} 秒）")
@@ -1042,7 +1173,9 @@ class ChatManager:
     async def cleanup(self):
         """清理资源"""
         try:
+            await self._summarizer.close()
             await self._cleanup_maim()
+            await self._close_http_session()
             self._initialized = False
             self._current_connection_key = None
             logger.info("聊天管理器已清理")
@@ -0,0 +1,218 @@
+"""
+对话摘要
+
+长时间对话时，超出最近上下文（prompt.context_limit）的旧消息不会直接丢弃，
+而是在后台压缩成一份滚动摘要，保存在数据库中，由 PromptManager 拼接在最近上下文之前：
+1. 摘要在消息发送完成后由后台任务生成，不阻塞、不延迟用户的消息
+2. 同一时间只运行一个摘要任务，运行期间的新请求合并为一次补跑
+3. 每次只把新溢出的旧消息和已有摘要合并，不重复处理已经摘要过的消息
+4. 每次 schedule() 最多处理一批（MAX_BATCH 条），积压留给之后的对话轮次；
+   第一次启用时（如升级后已有聊天记录）从最近上下文的起点开始，不回头摘要全部历史
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.util.logger import logger
+
+# 文本补全函数：(messages, 连接信息) -> 回复内容，失败返回 None
+CompletionFunc = Callable[[List[Dict[str, str]], Dict[str, Any]], Awaitable[Optional[str]]]
+
+# 默认会话的摘要 ID
+DEFAULT_SUMMARY_ID = "default"
+
+# 单次摘要最多合并的消息条数（积压更多时留给之后的对话轮次）
+MAX_BATCH = 40
+
+
+class ConversationSummarizer:
+    """滚动对话摘要"""
+
+    def __init__(self, complete: CompletionFunc, prompt=None, summary_id: str = DEFAULT_SUMMARY_ID):
+        """
+        初始化
+
+        Args:
+            complete: 文本补全函数（由聊天管理器提供）
+            prompt: Prompt 管理器，默认使用全局单例
+            summary_id: 摘要 ID
+        """
+        if prompt is None:
+            from src.core.prompt import prompt_manager
+            prompt = prompt_manager
+
+        self._complete = complete
+        self._prompt = prompt
+        self._summary_id = summary_id
+        self._summary = ""
+        self._covered_until = 0.0
+        self._covered_id = ""
+        self._message_count = 0
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._load_task: Optional[asyncio.Task] = None
+        self._pending_connection: Optional[Dict[str, Any]] = None
+
+    @property
+    def summary(self) -> str:
+        """当前摘要（内存中的副本，读取不访问数据库）"""
+        return self._summary
+
+    def is_running(self) -> bool:
+        """是否有摘要任务正在运行"""
+        return self._task is not None and not self._task.done()
+
+    def schedule(self, connection_info: Optional[Dict[str, Any]]) -> bool:
+        """
+        安排一次后台摘要（不等待结果）
+
+        Args:
+            connection_info: 用于生成摘要的连接信息
+
+        Returns:
+            是否启动了新的摘要任务（已有任务运行时只记录补跑请求）
+        """
+        if not connection_info or not self._prompt.get_summary_settings()["enabled"]:
+            return False
+
+        if self.is_running():
+            self._pending_connection = connection_info
+            return False
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("没有运行中的事件循环，跳过对话摘要")
+            return False
+
+        self._task = loop.create_task(self._run(connection_info), name="ConversationSummary")
+        return True
+
+    async def _run(self, connection_info: Dict[str, Any]):
+        """后台任务：处理一批；运行期间有新请求时再补跑一批（每次请求最多一批，避免连续调用模型）"""
+        try:
+            while True:
+                self._pending_connection = None
+                await self.summarize_once(connection_info)
+                if self._pending_connection is None:
+                    break
+                connection_info = self._pending_connection
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"生成对话摘要失败: {e}", exc_info=True)
+
+    def preload(self):
+        """后台读取已保存的摘要（不等待），让重启后的第一轮对话之后就能用上摘要"""
+        if self._loaded or self.is_running() or (self._load_task is not None and not self._load_task.done()):
+            return
+        try:
+            self._load_task = asyncio.get_running_loop().create_task(self.load(), name="ConversationSummaryLoad")
+        except RuntimeError:
+            pass
+
+    async def load(self) -> bool:
+        """
+        从数据库读取已保存的摘要
+
+        还没有摘要记录时，把游标设在最近上下文的起点并保存：之前的历史不再补做摘要，
+        否则已有大量聊天记录时会连续发出大量摘要请求
+        """
+        from src.database import db_manager
+
+        if not db_manager.is_initialized():
+            return False
+
+        record = await db_manager.get_summary(self._summary_id)
+        if record:
+            self._summary = record.get('summary') or ""
+            self._covered_until = float(record.get('covered_until') or 0.0)
+            self._covered_id = record.get('covered_id') or ""
+            self._message_count = int(record.get('message_count') or 0)
+        else:
+            self._summary = ""
+            self._message_count = 0
+            self._covered_until, self._covered_id = await self._recent_window_start()
+            await db_manager.save_summary(self._summary_id, "", self._covered_until, 0, self._covered_id)
+        self._loaded = True
+        return True
+
+    async def _recent_window_start(self) -> Tuple[float, str]:
+        """最近上下文之前的最后一条消息的 (时间戳, ID)，没有更早的消息时返回 (0, "")"""
+        from src.database import db_manager
+
+        keep_recent = self._prompt.get_summary_settings()["keep_recent"]
+        rows = await db_manager.get_messages(limit=1, offset=keep_recent)
+        if not rows:
+            return 0.0, ""
+        return float(rows[0].get('timestamp') or 0.0), rows[0].get('id') or ""
+
+    async def summarize_once(self, connection_info: Dict[str, Any]) -> bool:
+        """
+        把超出最近上下文的未摘要消息并入摘要（执行一次）
+
+        Returns:
+            是否还有积压的消息需要继续处理
+        """
+        from src.database import db_manager
+
+        settings = self._prompt.get_summary_settings()
+        if not settings["enabled"] or not db_manager.is_initialized():
+            return False
+        if not self._loaded and not await self.load():
+            return False
+
+        keep_recent = settings["keep_recent"]
+        fetch_limit = keep_recent + MAX_BATCH
+        pending = await db_manager.get_messages_after(self._covered_until, limit=fetch_limit, after_id=self._covered_id)
+
+        # 最近 keep_recent 条仍以原文拼接，只有更早的消息需要摘要
+        overflow = pending[:max(0, len(pending) - keep_recent)]
+        if len(overflow) < settings["trigger"]:
+            return False
+
+        messages = self._prompt.build_summary_messages(self._summary, overflow)
+        reply = await self._complete(messages, connection_info)
+        summary = (reply or "").strip()
+        if not summary:
+            logger.warning("对话摘要请求没有返回内容，稍后重试")
+            return False
+
+        max_chars = settings["max_chars"]
+        if max_chars > 0:
+            summary = summary[:max_chars]
+
+        # 游标为 (时间戳, ID)，同一时刻的其余消息留到下一批
+        covered_until = float(overflow[-1].get('timestamp') or self._covered_until)
+        covered_id = overflow[-1].get('id') or ""
+        message_count = self._message_count + len(overflow)
+        if not await db_manager.save_summary(self._summary_id, summary, covered_until, message_count, covered_id):
+            return False
+
+        self._summary = summary
+        self._covered_until = covered_until
+        self._covered_id = covered_id
+        self._message_count = message_count
+        logger.info(f"对话摘要已更新：新并入 {len(overflow)} 条消息，累计 {message_count} 条")
+        return len(pending) >= fetch_limit
+
+    def reset(self):
+        """清空内存中的摘要（聊天记录被清空后调用）"""
+        self._summary = ""
+        self._covered_until = 0.0
+        self._covered_id = ""
+        self._message_count = 0
+        self._loaded = False
+
+    async def close(self):
+        """取消正在运行的摘要任务"""
+        tasks = [task for task in (self._task, self._load_task) if task is not None and not task.done()]
+        self._task = self._load_task = None
+        for task in tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.debug(f"停止对话摘要任务时出现异常: {e}")
@@ -0,0 +1,9 @@
+"""
+语义记忆模块
+在本地（纯 CPU）为聊天记录建立向量索引，检索与当前消息相关的历史对话
+"""
+
+from .embedding import HashingEmbedder, TextEmbedder
+from .index import MemoryIndex, memory_index, message_to_record
+
+__all__ = ['HashingEmbedder', 'TextEmbedder', 'MemoryIndex', 'memory_index', 'message_to_record']
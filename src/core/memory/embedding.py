@@ -0,0 +1,85 @@
+"""
+本地文本向量化
+
+默认使用哈希向量化（feature hashing），只依赖 NumPy，不联网、不需要模型文件：
+- 中日韩文字按单字和相邻两字切分，其他文字按单词切分（转小写）
+- 每个片段用 CRC32 哈希到固定维度，并用哈希的最高位决定正负号以抵消冲突
+- 结果做 L2 归一化，向量点积即余弦相似度
+
+也可以替换为其他本地模型，只需提供 dimension 属性和 embed(text) 方法。
+"""
+
+import re
+import zlib
+from typing import List, Protocol
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(
+    "([\u3040-\u30ff"  # 日文假名
+    "\u3400-\u4dbf"  # CJK 扩展 A
+    "\u4e00-\u9fff"  # CJK 统一表意文字
+    "\uac00-\ud7af"  # 韩文音节
+    "\uf900-\ufaff]+)"  # CJK 兼容表意文字
+    "|([0-9A-Za-z\u00c0-\u024f]+)"  # 字母数字单词
+)
+
+# 单字权重低于两字词，减少“的”“了”等常见字的影响
+_UNIGRAM_WEIGHT = 0.5
+_NGRAM_WEIGHT = 1.0
+
+
+class TextEmbedder(Protocol):
+    """文本向量化接口"""
+
+    dimension: int
+
+    def embed(self, text: str) -> np.ndarray:
+        """返回 L2 归一化的 float32 向量（空文本返回全零向量）"""
+        ...
+
+
+class HashingEmbedder:
+    """哈希向量化（纯 CPU，无外部模型）"""
+
+    def __init__(self, dimension: int = 512):
+        """
+        Args:
+            dimension: 向量维度（越大哈希冲突越少，占用内存越多）
+        """
+        self.dimension = max(16, int(dimension))
+
+    def tokenize(self, text: str) -> List[tuple]:
+        """切分文本，返回 (片段, 权重) 列表"""
+        tokens = []
+        for match in _TOKEN_PATTERN.finditer(text or ""):
+            cjk, word = match.groups()
+            if word:
+                tokens.append((word.lower(), _NGRAM_WEIGHT))
+                continue
+            tokens.extend((char, _UNIGRAM_WEIGHT) for char in cjk)
+            tokens.extend((cjk[index:index + 2], _NGRAM_WEIGHT) for index in range(len(cjk) - 1))
+        return tokens
+
+    def embed(self, text: str) -> np.ndarray:
+        tokens = self.tokenize(text)
+        if not tokens:
+            return np.zeros(self.dimension, dtype=np.float32)
+
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for token, _ in tokens),
+            dtype=np.uint32,
+            count=len(tokens),
+        )
+        weights = np.fromiter((weight for _, weight in tokens), dtype=np.float32, count=len(tokens))
+        signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+        vector = np.bincount(
+            (hashes % self.dimension).astype(np.intp),
+            weights=weights * signs,
+            minlength=self.dimension,
+        ).astype(np.float32)
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
@@ -0,0 +1,287 @@
+"""
+聊天记录语义索引
+
+把数据库中的消息向量化后保存在内存里，按语义相似度检索相关的历史消息，
+供 PromptManager 拼接进 prompt：
+- 向量保存在固定大小的 NumPy 矩阵中（第一次加入消息时分配），条数达到上限后
+  覆盖最早加入的消息，内存占用 = 条数上限 × 维度 × 4 字节
+- 消息保存到数据库时增量加入（DatabaseManager 的变化回调），启动时在后台线程中
+  从数据库加载最近的消息
+- 检索为暴力点积（向量已归一化，即余弦相似度），几千条消息在 CPU 上约 1 毫秒
+"""
+
+import asyncio
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.database.rows import MessageRow
+from src.util.logger import logger
+from .embedding import HashingEmbedder, TextEmbedder
+
+# 每条消息保存的最长字符数（只用于拼接 prompt）
+MAX_RECORD_CHARS = 500
+
+
+def message_to_record(message: Any) -> Optional[Dict[str, Any]]:
+    """
+    把消息转换为索引条目（与数据库行相同的字段）
+
+    Args:
+        message: MessageBase、保存格式的消息字典（message_info/message_segment）或数据库行
+
+    Returns:
+        {'id', 'user_id', 'raw_message', 'timestamp'}，没有 ID 或文本时返回 None
+    """
+    if isinstance(message, MessageRow):
+        # 数据库行视图：直接读取字段，只有 raw_message 为空时才会解析消息内容
+        record = {
+            'id': message.id,
+            'user_id': message.user_id,
+            'raw_message': message.text,
+            'timestamp': message.timestamp,
+        }
+        return _finish_record(record)
+
+    if hasattr(message, 'to_dict'):
+        message = message.to_dict()
+    if not isinstance(message, Mapping):
+        return None
+
+    if 'message_info' in message:
+        message_info = message.get('message_info') or {}
+        user_info = message_info.get('user_info') or {}
+        segment = message.get('message_segment') or {}
+        record = {
+            'id': message_info.get('message_id'),
+            'user_id': user_info.get('user_id', ''),
+            'raw_message': message.get('raw_message') or '',
+            'timestamp': message_info.get('time', 0),
+        }
+        if not record['raw_message'] and segment.get('type') == 'text':
+            record['raw_message'] = str(segment.get('data') or '')
+    else:
+        record = {
+            'id': message.get('id'),
+            'user_id': message.get('user_id', ''),
+            'raw_message': message.get('raw_message') or '',
+            'timestamp': message.get('timestamp', 0),
+        }
+        content = message.get('message_content')
+        if not record['raw_message'] and isinstance(content, str):
+            record['raw_message'] = content
+    return _finish_record(record)
+
+
+def _finish_record(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """截断文本并检查必要字段"""
+    record['raw_message'] = str(record['raw_message']).strip()[:MAX_RECORD_CHARS]
+    if not record['id'] or not record['raw_message']:
+        return None
+    record['user_id'] = str(record['user_id'] or '')
+    return record
+
+
+class MemoryIndex:
+    """有容量上限的内存向量索引"""
+
+    def __init__(self, embedder: Optional[TextEmbedder] = None, max_entries: int = 5000):
+        """
+        初始化
+
+        Args:
+            embedder: 向量化器，默认使用 HashingEmbedder
+            max_entries: 最多保存的消息条数
+        """
+        self._lock = threading.Lock()
+        self._listening = False
+        self._configure(embedder or HashingEmbedder(), max_entries)
+
+    def _configure(self, embedder: TextEmbedder, max_entries: int):
+        self._embedder = embedder
+        self._capacity = max(1, int(max_entries))
+        # 向量矩阵在第一次加入消息时才分配
+        self._vectors: Optional[np.ndarray] = None
+        self._records: List[Optional[Dict[str, Any]]] = [None] * self._capacity
+        self._slots: Dict[str, int] = {}
+        self._next_slot = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def memory_usage(self) -> int:
+        """向量矩阵占用的字节数"""
+        return 0 if self._vectors is None else self._vectors.nbytes
+
+    def reconfigure(self, embedder: Optional[TextEmbedder] = None, max_entries: Optional[int] = None):
+        """更换向量化器或容量（会清空索引）"""
+        with self._lock:
+            self._configure(embedder or self._embedder, max_entries or self._capacity)
+
+    def add(self, message: Any) -> bool:
+        """
+        加入一条消息（已存在的 ID 会被更新）
+
+        Returns:
+            是否加入成功（没有文本的消息会被跳过）
+        """
+        record = message_to_record(message)
+        if record is None:
+            return False
+        vector = self._embedder.embed(record['raw_message'])
+        with self._lock:
+            self._store(record, vector)
+        return True
+
+    def add_many(self, messages: Iterable[Any]) -> int:
+        """批量加入消息（按传入顺序，越靠后越晚被覆盖），返回加入的条数"""
+        records = [record for record in map(message_to_record, messages) if record is not None]
+        if len(records) > self._capacity:
+            records = records[-self._capacity:]
+        vectors = [self._embedder.embed(record['raw_message']) for record in records]
+        with self._lock:
+            for record, vector in zip(records, vectors):
+                self._store(record, vector)
+        return len(records)
+
+    def _store(self, record: Dict[str, Any], vector: np.ndarray):
+        if self._vectors is None:
+            self._vectors = np.zeros((self._capacity, self._embedder.dimension), dtype=np.float32)
+        slot = self._slots.get(record['id'])
+        if slot is None:
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self._capacity
+            evicted = self._records[slot]
+            if evicted is not None:
+                self._slots.pop(evicted['id'], None)
+            self._slots[record['id']] = slot
+        self._vectors[slot] = vector
+        self._records[slot] = record
+
+    def remove(self, message_id: str) -> bool:
+        """移除一条消息"""
+        with self._lock:
+            slot = self._slots.pop(message_id, None)
+            if slot is None:
+                return False
+            self._records[slot] = None
+            self._vectors[slot] = 0.0
+            return True
+
+    def clear(self):
+        """清空索引"""
+        with self._lock:
+            self._vectors = None
+            self._records = [None] * self._capacity
+            self._slots.clear()
+            self._next_slot = 0
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 3,
+        min_score: float = 0.0,
+        exclude_ids: Iterable[str] = (),
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        检索语义最相关的消息
+
+        Args:
+            text: 查询文本
+            top_k: 返回条数
+            min_score: 最低相似度（0 ~ 1）
+            exclude_ids: 需要排除的消息 ID（如已经拼接的最近上下文）
+
+        Returns:
+            [(相似度, 消息条目)]，按相似度从高到低排列
+        """
+        if top_k <= 0 or not self._slots:
+            return []
+        query = self._embedder.embed(text)
+        if not query.any():
+            return []
+
+        with self._lock:
+            if self._vectors is None:
+                return []
+            scores = self._vectors @ query
+            excluded = [self._slots[message_id] for message_id in exclude_ids if message_id in self._slots]
+            if excluded:
+                scores[excluded] = -1.0
+
+            count = min(top_k, len(scores))
+            candidates = np.argpartition(-scores, count - 1)[:count]
+            candidates = candidates[np.argsort(-scores[candidates])]
+
+            results = []
+            for slot in candidates:
+                score = float(scores[slot])
+                record = self._records[slot]
+                if record is None or score < min_score or score <= 0.0:
+                    continue
+                results.append((score, record))
+            return results
+
+    # ===================================================================
+    # 与数据库同步
+    # ===================================================================
+
+    async def start(self, max_entries: Optional[int] = None, dimension: Optional[int] = None) -> int:
+        """
+        开始索引数据库中的消息：注册数据库变化回调，并在后台线程中加载最近的消息
+
+        Args:
+            max_entries: 最多保存的消息条数
+            dimension: 哈希向量维度（使用自定义向量化器时忽略）
+
+        Returns:
+            从数据库加载的消息条数
+        """
+        from src.database import db_manager
+
+        if dimension and isinstance(self._embedder, HashingEmbedder) and dimension != self._embedder.dimension:
+            self.reconfigure(HashingEmbedder(dimension), max_entries)
+        elif max_entries and max_entries != self._capacity:
+            self.reconfigure(max_entries=max_entries)
+
+        if not self._listening:
+            db_manager.add_listener(self._on_database_event)
+            self._listening = True
+
+        if not db_manager.is_initialized():
+            return 0
+        messages = await db_manager.get_messages(limit=self._capacity, offset=0)
+        # 数据库按时间倒序返回，按时间正序加入，容量不足时先覆盖最早的消息
+        loaded = await asyncio.to_thread(self.add_many, list(reversed(messages)))
+        logger.info(f"语义记忆索引已加载 {loaded} 条消息（约 {self.memory_usage() / 1024 / 1024:.1f} MB）")
+        return loaded
+
+    def stop(self):
+        """停止同步数据库中的新消息"""
+        from src.database import db_manager
+
+        if self._listening:
+            db_manager.remove_listener(self._on_database_event)
+            self._listening = False
+
+    def _on_database_event(self, event: str, payload: Any):
+        """数据库变化回调：新消息加入索引，删除的消息移出索引"""
+        try:
+            if event == 'saved':
+                self.add(payload)
+            elif event == 'deleted':
+                self.remove(payload)
+            elif event == 'cleared':
+                self.clear()
+        except Exception as e:
+            logger.warning(f"更新语义记忆索引失败: {e}")
+
+
+# 全局单例
+memory_index = MemoryIndex()
@@ -5,10 +5,13 @@ Prompt 管理器。
 桌宠设定和最近上下文。
 """
 
+import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.util.logger import logger
+from .tokens import TokenCounter, TokenEstimator
 
 
 DEFAULT_PERSONA = (
@@ -16,12 +19,33 @@ DEFAULT_PERSONA = (
     "可以有一点桌面宠物的可爱感，但不要影响信息表达。"
 )
 
+SUMMARY_PREFIX = "更早的对话摘要："
+
+MEMORY_PREFIX = "可能相关的历史对话（按相关度排序，仅供参考）："
+
+SUMMARY_INSTRUCTION = (
+    "你负责为桌面宠物和用户的对话维护一份滚动摘要。"
+    "把已有摘要和新的对话合并成一份新的摘要：保留用户的偏好、个人信息、约定和尚未结束的话题，"
+    "省略寒暄和重复内容。使用第三人称，不超过 {max_chars} 字，只输出摘要正文。"
+)
+
+# 缓存的已格式化历史消息条数
+TURN_CACHE_SIZE = 512
+
 
 class PromptManager:
     """Prompt 管理器。"""
 
     def __init__(self):
         self._system_prompt_override: Optional[str] = None
+        self._token_counter = TokenCounter()
+        # 已格式化的历史消息：消息 ID -> (来源指纹, 格式化结果)
+        self._turn_cache: "OrderedDict[Any, Tuple[tuple, Optional[Tuple[bool, str, Dict[str, str]]]]]" = OrderedDict()
+        # system prompt 中不随时间变化的部分：(人设, 桌宠名, 用户昵称) -> 文本
+        self._static_prompt_key: Optional[tuple] = None
+        self._static_prompt = ""
+        # 语义记忆索引（启用 memory 后由启动流程设置）
+        self._memory_index = None
         logger.info("Prompt 管理器初始化完成")
 
     def build_messages(
@@ -30,15 +54,25 @@ class PromptManager:
         user_id: str = "0",
         user_name: str = "用户",
         context_messages: Optional[List[Dict[str, Any]]] = None,
+        token_budget: Optional[int] = None,
+        summary: Optional[str] = None,
     ) -> List[Dict[str, str]]:
         """
         构建 OpenAI 兼容格式的 messages。
 
+        上下文先按 context_limit 条数截取，再从最新一条往前装入 token 预算，
+        超出预算的更早消息被丢弃。更早对话的摘要拼接在最近上下文之前。
+
         Args:
             user_content: 当前用户消息内容
             user_id: 用户 ID
             user_name: 当前调用传入的用户昵称兜底值
             context_messages: 最近历史消息，按时间正序传入
+            token_budget: 本次请求的 token 预算（模型级配置），None 表示使用
+                prompt.context_token_budget，0 表示不限制
+            summary: 更早对话的摘要（不拼接上下文或预算不足时忽略）
+
+        启用语义记忆时，还会检索与当前消息相关的历史消息，拼接在最近上下文之前。
 
         Returns:
             OpenAI 兼容格式的消息列表
@@ -47,14 +81,44 @@ class PromptManager:
         pet_name = self._resolve_pet_name(runtime_config)
         user_nickname = self._resolve_user_name(runtime_config, user_name)
 
-        messages: List[Dict[str, str]] = [
-            {
-                "role": "system",
-                "content": self._build_system_prompt(runtime_config, pet_name, user_nickname),
-            }
-        ]
-
+        # 每次请求只重新生成时间行，其余部分使用缓存
+        time_line, static_prompt = self._system_prompt_parts(runtime_config, pet_name, user_nickname)
+        system_message = {
+            "role": "system",
+            "content": f"{time_line}\n{static_prompt}" if time_line else static_prompt,
+        }
+        user_message = {"role": "user", "content": f"{user_nickname}: {user_content}"}
+
+        # 时间行每次都不同，单独估算且不进入缓存
+        system_tokens = self._token_counter.count_message(static_prompt)
+        if time_line:
+            system_tokens += self._token_counter.count(time_line, cache=False)
+
+        if token_budget is None:
+            token_budget = self._get_int(runtime_config, "context_token_budget", 4000)
+        context_budget: Optional[int] = None
+        if token_budget > 0:
+            context_budget = token_budget - system_tokens - self._token_counter.count_message(user_message["content"])
+
+        messages: List[Dict[str, str]] = [system_message]
         if self._get_bool(runtime_config, "include_context", True):
+            summary_text = str(summary or "").strip()
+            if summary_text:
+                summary_message = {"role": "system", "content": f"{SUMMARY_PREFIX}\n{summary_text}"}
+                summary_tokens = self._token_counter.count_message(summary_message["content"])
+                if context_budget is None or summary_tokens <= context_budget:
+                    messages.append(summary_message)
+                    if context_budget is not None:
+                        context_budget -= summary_tokens
+            memory_message = self._build_memory_message(
+                runtime_config, user_content, context_messages or [], pet_name, user_nickname
+            )
+            if memory_message is not None:
+                memory_tokens = self._token_counter.count_message(memory_message["content"])
+                if context_budget is None or memory_tokens <= context_budget:
+                    messages.append(memory_message)
+                    if context_budget is not None:
+                        context_budget -= memory_tokens
             messages.extend(
                 self._format_context_messages(
                     runtime_config=runtime_config,
@@ -62,17 +126,126 @@ class PromptManager:
                     current_content=user_content,
                     pet_name=pet_name,
                     user_nickname=user_nickname,
+                    token_budget=context_budget,
                 )
             )
 
-        messages.append({"role": "user", "content": f"{user_nickname}: {user_content}"})
-        logger.debug(f"构建 OpenAI messages: {len(messages)} 条")
+        messages.append(user_message)
+        if logger.isEnabledFor(logging.DEBUG):
+            total_tokens = system_tokens + self.count_tokens(messages[1:])
+            logger.debug(f"构建 OpenAI messages: {len(messages)} 条，约 {total_tokens} tokens")
         return messages
 
+    def count_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """估算消息列表的 token 数（按内容缓存，重复的历史消息不会重新估算）。"""
+        return sum(self._token_counter.count_message(message["content"]) for message in messages)
+
+    def set_token_estimator(self, estimator: Optional[TokenEstimator]):
+        """
+        替换 token 估算函数。
+
+        Args:
+            estimator: 文本 -> token 数的函数（如模型自带的分词器），None 表示恢复默认估算
+        """
+        self._token_counter.set_estimator(estimator)
+
     def get_context_limit(self) -> int:
         """读取 prompt 上下文条数配置。"""
         return self._get_context_limit(self._load_runtime_config())
 
+    def set_memory_index(self, index: Any):
+        """
+        设置语义记忆索引（None 表示不检索）。
+
+        Args:
+            index: 提供 search(text, top_k, min_score, exclude_ids) 的索引，如 src.core.memory.memory_index
+        """
+        self._memory_index = index
+
+    def _build_memory_message(
+        self,
+        runtime_config: Any,
+        user_content: str,
+        context_messages: List[Dict[str, Any]],
+        pet_name: str,
+        user_nickname: str,
+    ) -> Optional[Dict[str, str]]:
+        """检索与当前消息相关的历史消息（排除已拼接的最近上下文）。"""
+        memory_config = getattr(runtime_config, "memory", None) if runtime_config else None
+        if self._memory_index is None or memory_config is None or not memory_config.enabled:
+            return None
+
+        exclude_ids = {item.get("id") for item in context_messages if item.get("id") is not None}
+        try:
+            results = self._memory_index.search(
+                user_content,
+                top_k=max(0, int(memory_config.top_k)),
+                min_score=float(memory_config.min_score),
+                exclude_ids=exclude_ids,
+            )
+        except Exception as e:
+            logger.warning(f"检索相关历史对话失败: {e}")
+            return None
+
+        max_chars = self._get_int(runtime_config, "context_message_max_chars", 500)
+        current_text = self._normalize_text(user_content, max_chars)
+        lines = []
+        for _, record in results:
+            turn = self._format_turn(record, max_chars, pet_name, user_nickname)
+            if turn is not None and turn[1] != current_text:
+                lines.append(turn[2]["content"])
+        if not lines:
+            return None
+        return {"role": "system", "content": MEMORY_PREFIX + "\n" + "\n".join(lines)}
+
+    def get_summary_settings(self) -> Dict[str, Any]:
+        """
+        读取对话摘要配置。
+
+        Returns:
+            enabled（是否启用）、keep_recent（保留原文的最近消息条数）、
+            trigger（触发摘要的消息条数）、max_chars（摘要最长字符数）
+        """
+        runtime_config = self._load_runtime_config()
+        keep_recent = self._get_context_limit(runtime_config)
+        return {
+            "enabled": keep_recent > 0 and self._get_bool(runtime_config, "summary_enabled", True),
+            "keep_recent": keep_recent,
+            "trigger": max(1, self._get_int(runtime_config, "summary_trigger", 12)),
+            "max_chars": self._get_int(runtime_config, "summary_max_chars", 600),
+        }
+
+    def build_summary_messages(self, previous_summary: str, history: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        构建生成滚动摘要的请求。
+
+        Args:
+            previous_summary: 已有摘要（可以为空）
+            history: 需要并入摘要的历史消息，按时间正序传入
+
+        Returns:
+            OpenAI 兼容格式的消息列表
+        """
+        runtime_config = self._load_runtime_config()
+        pet_name = self._resolve_pet_name(runtime_config)
+        user_nickname = self._resolve_user_name(runtime_config, "用户")
+        max_chars = self._get_int(runtime_config, "context_message_max_chars", 500)
+        summary_chars = self._get_int(runtime_config, "summary_max_chars", 600)
+
+        lines = []
+        for item in history:
+            turn = self._format_turn(item, max_chars, pet_name, user_nickname)
+            if turn is not None:
+                lines.append(turn[2]["content"])
+
+        return [
+            {"role": "system", "content": SUMMARY_INSTRUCTION.format(max_chars=summary_chars)},
+            {
+                "role": "user",
+                "content": f"已有摘要：\n{previous_summary or '（无）'}\n\n新的对话：\n" + "\n".join(lines),
+            },
+        ]
+
     def set_system_prompt(self, prompt: str):
         """
         设置运行时人设兜底文本。
@@ -90,10 +263,11 @@ class PromptManager:
         return self._build_system_prompt(runtime_config, pet_name, user_nickname)
 
     def _load_runtime_config(self) -> Any:
+        # 使用配置监视器缓存的配置，文件变化时自动更新，不在每次调用时重新解析
         try:
-            from config import load_config
+            from config import get_config
 
-            return load_config()
+            return get_config()
         except SystemExit as e:
             logger.warning(f"读取 prompt 配置触发退出，使用默认人设: {e}")
         except Exception as e:
@@ -101,6 +275,11 @@ class PromptManager:
         return None
 
     def _build_system_prompt(self, runtime_config: Any, pet_name: str, user_nickname: str) -> str:
+        time_line, static_prompt = self._system_prompt_parts(runtime_config, pet_name, user_nickname)
+        return f"{time_line}\n{static_prompt}" if time_line else static_prompt
+
+    def _system_prompt_parts(self, runtime_config: Any, pet_name: str, user_nickname: str) -> Tuple[str, str]:
+        """返回 (时间行, 固定部分)；固定部分按人设和昵称缓存。"""
         persona = self._system_prompt_override or self._get_prompt_value(
             runtime_config,
             "persona",
@@ -109,25 +288,28 @@ class PromptManager:
         if not str(persona).strip():
             persona = DEFAULT_PERSONA
 
-        lines: List[str] = []
+        time_line = ""
         if self._get_bool(runtime_config, "include_time", True):
             now = datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
-            lines.append(f"当前时间：{now}")
-
-        lines.extend(
-            [
-                f"你的名字是：{pet_name}",
-                f"用户昵称是：{user_nickname}",
-                "你是一个运行在用户电脑上的桌面宠物。",
-                f"你的设定：{persona}",
-                "",
-                "对话要求：",
-                "- 结合当前时间和最近上下文自然回复。",
-                "- 保持桌面宠物身份，语气亲切，但不要过度卖萌。",
-                "- 无法确认的信息要直接说明，不要编造。",
-            ]
-        )
-        return "\n".join(lines)
+            time_line = f"当前时间：{now}"
+
+        key = (str(persona), pet_name, user_nickname)
+        if key != self._static_prompt_key:
+            self._static_prompt = "\n".join(
+                [
+                    f"你的名字是：{pet_name}",
+                    f"用户昵称是：{user_nickname}",
+                    "你是一个运行在用户电脑上的桌面宠物。",
+                    f"你的设定：{persona}",
+                    "",
+                    "对话要求：",
+                    "- 结合当前时间和最近上下文自然回复。",
+                    "- 保持桌面宠物身份，语气亲切，但不要过度卖萌。",
+                    "- 无法确认的信息要直接说明，不要编造。",
+                ]
+            )
+            self._static_prompt_key = key
+        return time_line, self._static_prompt
 
     def _format_context_messages(
         self,
@@ -136,38 +318,89 @@ class PromptManager:
         current_content: str,
         pet_name: str,
         user_nickname: str,
+        token_budget: Optional[int] = None,
     ) -> List[Dict[str, str]]:
         max_chars = self._get_int(runtime_config, "context_message_max_chars", 500)
         current_text = self._normalize_text(current_content, max_chars)
-        extracted_context = []
-        for index, item in enumerate(context_messages):
-            text = self._extract_message_text(item, max_chars)
-            if not text:
-                continue
-            extracted_context.append((index, item, text))
+        turns = []
+        for item in context_messages:
+            turn = self._format_turn(item, max_chars, pet_name, user_nickname)
+            if turn is not None:
+                turns.append(turn)
 
         skip_current_index: Optional[int] = None
-        for index, item, text in reversed(extracted_context):
-            if str(item.get("user_id", "")) == "0" and text == current_text:
+        for index in range(len(turns) - 1, -1, -1):
+            is_user_message, text, _ = turns[index]
+            if is_user_message and text == current_text:
                 skip_current_index = index
                 break
 
-        formatted: List[Dict[str, str]] = []
-        for index, item, text in extracted_context:
-            is_user_message = str(item.get("user_id", "")) == "0"
-            if skip_current_index is not None and index == skip_current_index:
-                continue
-
-            role = "user" if is_user_message else "assistant"
-            speaker = user_nickname if is_user_message else pet_name
-            timestamp = self._format_timestamp(item.get("timestamp"))
-            prefix = f"[{timestamp}] {speaker}" if timestamp else speaker
-            formatted.append({"role": role, "content": f"{prefix}: {text}"})
+        formatted: List[Dict[str, str]] = [
+            message for index, (_, _, message) in enumerate(turns) if index != skip_current_index
+        ]
 
         context_limit = self._get_context_limit(runtime_config)
         if context_limit <= 0:
             return []
-        return formatted[-context_limit:]
+        formatted = formatted[-context_limit:]
+        if token_budget is None:
+            return formatted
+        return self._fit_token_budget(formatted, token_budget)
+
+    def _fit_token_budget(self, formatted: List[Dict[str, str]], token_budget: int) -> List[Dict[str, str]]:
+        """从最新一条往前装入预算，遇到装不下的消息即停止（保持上下文连续）。"""
+        used = 0
+        start = len(formatted)
+        for index in range(len(formatted) - 1, -1, -1):
+            tokens = self._token_counter.count_message(formatted[index]["content"])
+            if used + tokens > token_budget:
+                break
+            used += tokens
+            start = index
+        if start > 0:
+            logger.debug(f"上下文超出 token 预算，丢弃较早的 {start} 条消息")
+        return formatted[start:]
+
+    def _format_turn(
+        self,
+        item: Dict[str, Any],
+        max_chars: int,
+        pet_name: str,
+        user_nickname: str,
+    ) -> Optional[Tuple[bool, str, Dict[str, str]]]:
+        """
+        格式化一条历史消息，返回 (是否用户消息, 规范化文本, OpenAI 消息)，空消息返回 None。
+
+        有 ID 的消息按 ID 缓存；消息内容、时间或昵称变化时重新格式化。
+        返回的消息字典会在多次请求间共享，调用方不要修改。
+        """
+        is_user_message = str(item.get("user_id", "")) == "0"
+        speaker = user_nickname if is_user_message else pet_name
+        message_id = item.get("id")
+        raw_message = item.get("raw_message")
+        # 没有 raw_message 时文本取自 message_content，它的变化也要使缓存失效
+        content = None if raw_message else item.get("message_content")
+        fingerprint = (raw_message, content, item.get("timestamp"), is_user_message, speaker, max_chars)
+
+        if message_id is not None:
+            cached = self._turn_cache.get(message_id)
+            if cached is not None and cached[0] == fingerprint:
+                self._turn_cache.move_to_end(message_id)
+                return cached[1]
+
+        turn = None
+        text = self._extract_message_text(item, max_chars)
+        if text:
+            timestamp = self._format_timestamp(item.get("timestamp"))
+            prefix = f"[{timestamp}] {speaker}" if timestamp else speaker
+            role = "user" if is_user_message else "assistant"
+            turn = (is_user_message, text, {"role": role, "content": f"{prefix}: {text}"})
+
+        if message_id is not None:
+            self._turn_cache[message_id] = (fingerprint, turn)
+            if len(self._turn_cache) > TURN_CACHE_SIZE:
+                self._turn_cache.popitem(last=False)
+        return turn
 
     def _extract_message_text(self, item: Dict[str, Any], max_chars: int) -> str:
         raw_message = item.get("raw_message")
@@ -0,0 +1,106 @@
+"""
+Token 估算。
+
+本地快速估算文本的 token 数，用于按预算裁剪上下文，不依赖具体模型的分词器。
+默认估算规则针对中英混合文本：
+- 中日韩文字（含全角标点）每个字符约 1 个 token
+- 其他非空白字符约每 4 个 1 个 token
+- 每条消息额外计入固定开销（角色标记等）
+"""
+
+import re
+from collections import OrderedDict
+from typing import Callable, Optional
+
+# 估算函数：文本 -> token 数
+TokenEstimator = Callable[[str], int]
+
+# 每条消息的固定开销（OpenAI 兼容格式的角色与分隔标记）
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_CJK_PATTERN = re.compile(
+    "[\u3000-\u303f"  # CJK 标点
+    "\u3040-\u30ff"  # 日文假名
+    "\u3400-\u4dbf"  # CJK 扩展 A
+    "\u4e00-\u9fff"  # CJK 统一表意文字
+    "\uac00-\ud7af"  # 韩文音节
+    "\uf900-\ufaff"  # CJK 兼容表意文字
+    "\uff00-\uffef]"  # 全角字符
+)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的 token 数（中日韩字符感知的启发式规则）。
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的 token 数
+    """
+    if not text:
+        return 0
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    other_count = len(_WHITESPACE_PATTERN.sub("", text)) - cjk_count
+    return cjk_count + (other_count + 3) // 4
+
+
+class TokenCounter:
+    """
+    带缓存的 token 计数器。
+
+    同一段文本只估算一次（LRU 缓存），重复构建上下文时不会重新估算历史消息。
+    """
+
+    def __init__(self, estimator: Optional[TokenEstimator] = None, cache_size: int = 2048):
+        """
+        Args:
+            estimator: 估算函数，默认使用 estimate_tokens
+            cache_size: 缓存的文本条数
+        """
+        self._estimator: TokenEstimator = estimator or estimate_tokens
+        self._cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+
+    @property
+    def estimator(self) -> TokenEstimator:
+        return self._estimator
+
+    def set_estimator(self, estimator: Optional[TokenEstimator]):
+        """替换估算函数（None 表示恢复默认），同时清空缓存。"""
+        self._estimator = estimator or estimate_tokens
+        self._cache.clear()
+
+    def count(self, text: str, cache: bool = True) -> int:
+        """
+        估算文本的 token 数。
+
+        Args:
+            text: 文本
+            cache: 是否缓存结果（每次都不同的文本，如时间行，不需要缓存）
+        """
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        tokens = max(0, int(self._estimator(text)))
+        if cache and self._cache_size:
+            self._cache[text] = tokens
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_message(self, content: str) -> int:
+        """估算一条消息的 token 数（含固定开销）。"""
+        return self.count(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def cache_info(self) -> dict:
+        """缓存状态。"""
+        return {"size": len(self._cache), "capacity": self._cache_size}
+
+    def clear(self):
+        """清空缓存。"""
+        self._cache.clear()
@@ -9,7 +9,7 @@
 """
 
 from typing import Optional, Dict, Any, List
-from config import load_model_config
+from config import get_model_config, config_watcher, ConfigChange
 from config.schema import ModelConfigFile, APIProviderConfig, ModelConfig, TaskConfig
 from src.util.logger import logger
 
@@ -21,6 +21,8 @@ class ProtocolManager:
         self._config: Optional[ModelConfigFile] = None
         self._initialized = False
         self._active_model_indices: Dict[str, int] = {}
+        # 消息层配置文件变化时自动更新
+        config_watcher.subscribe(self._on_model_config_changed, "model_config")
     
     async def initialize(self, force_reload: bool = False) -> bool:
         """
@@ -33,14 +35,12 @@ class ProtocolManager:
             if self._initialized and self._config is not None and not force_reload:
                 return True
 
-            # 加载配置
-            self._config = load_model_config()
+            # 加载配置（强制重新加载时先检查文件变化）
+            if force_reload:
+                config_watcher.reload("model_config")
+            self._config = get_model_config()
             self._initialized = True
-            self._active_model_indices = {
-                task_type: index
-                for task_type, index in self._active_model_indices.items()
-                if self._is_valid_task_model_index(task_type, index)
-            }
+            self._prune_active_model_indices()
             
             logger.info("协议管理器初始化成功")
             logger.info(f"  - 供应商数量: {len(self._config.api_providers)}")
@@ -52,6 +52,22 @@ class ProtocolManager:
             logger.error(f"协议管理器初始化失败: {e}", exc_info=True)
             return False
     
+    def _on_model_config_changed(self, change: ConfigChange):
+        """消息层配置文件变化：替换缓存的配置（在配置监视线程中调用）"""
+        if not self._initialized:
+            return
+        self._config = change.new
+        self._prune_active_model_indices()
+        logger.info("协议管理器已应用新的消息层配置")
+
+    def _prune_active_model_indices(self):
+        """移除已失效的任务模型索引"""
+        self._active_model_indices = {
+            task_type: index
+            for task_type, index in self._active_model_indices.items()
+            if self._is_valid_task_model_index(task_type, index)
+        }
+    
     # ===================================================================
     # 核心方法：获取连接信息
     # ===================================================================
@@ -131,6 +147,7 @@ class ProtocolManager:
             'timeout': provider_config.timeout,  # 默认使用供应商的 timeout
             'retry_interval': provider_config.retry_interval,
             'extra_params': model_config.extra_params or {},
+            'context_token_budget': model_config.context_token_budget,
         }
         
         # 如果有任务配置且设置了 timeout，则覆盖供应商的 timeout
@@ -144,8 +161,8 @@ class ProtocolManager:
         # 4. 如果是 maim 协议，添加 platform 信息
         if provider_config.client_type.lower() == 'maim':
             # 从主配置获取 platform
-            from config import load_config
-            main_config = load_config()
+            from config import get_config
+            main_config = get_config()
             connection_info['platform'] = main_config.platform
         
         logger.debug(f"获取连接信息: {model_name} -> {provider_config.client_type}")
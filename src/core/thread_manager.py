@@ -5,7 +5,7 @@
 import threading
 import asyncio
 from typing import Callable, List, Optional
-from src.util.logger import logger
+from src.util.logger import logger, flush_logging
 
 
 class ThreadManager:
@@ -170,6 +170,10 @@ class ThreadManager:
                 logger.info(f"守护线程，无需等待: {thread.name}")
         
         logger.info("线程管理器清理完成")
+        
+        # 等待日志线程写完队列中剩余的日志
+        if not flush_logging():
+            logger.warning("日志队列未能在超时前写完")
     
     def get_thread_info(self) -> List[dict]:
         """
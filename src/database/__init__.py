@@ -6,5 +6,10 @@
 from .factory import DatabaseFactory
 from .base import BaseDatabase
 from .manager import db_manager, DatabaseManager
+from .rows import MessageRow, MessageRowMapper
+from .archive import MessageArchive
+from .blobs import BlobStore
+from .retention import db_maintenance, DatabaseMaintenance
 
-__all__ = ['DatabaseFactory', 'BaseDatabase', 'DatabaseManager', 'db_manager']
+__all__ = ['DatabaseFactory', 'BaseDatabase', 'DatabaseManager', 'db_manager', 'MessageRow', 'MessageRowMapper',
+           'MessageArchive', 'BlobStore', 'DatabaseMaintenance', 'db_maintenance']
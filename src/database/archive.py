@@ -0,0 +1,187 @@
+"""
+消息归档
+把超出保留策略的消息按月份写入压缩文件，数据库中只保留最近的消息：
+- 每个月一个 gzip 压缩的 JSONL 文件（messages-YYYY-MM.jsonl.gz），每次归档追加一个 gzip 成员
+- message_content 只是 raw_message 的 JSON 编码时不重复保存，读取时还原
+- index.json 记录每个归档文件的条数和时间范围，搜索时跳过不相关的月份
+- 图片只保留引用（"blob:<摘要>"），归档时不释放引用计数，图片文件继续保存在 blob_dir 中
+
+所有方法都是同步的文件操作，应在后台线程中调用（asyncio.to_thread）。
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.util.logger import logger
+from .rows import MessageRow, MESSAGE_COLUMNS
+
+INDEX_FILE = 'index.json'
+
+# 归档文件中的消息行共用的列索引
+_ARCHIVE_INDEX = {column: position for position, column in enumerate(MESSAGE_COLUMNS)}
+
+
+def _month_of(timestamp: float) -> str:
+    return time.strftime('%Y-%m', time.localtime(timestamp or 0))
+
+
+def _compact_record(row: MessageRow) -> Dict[str, Any]:
+    """转换为归档条目（省略与 raw_message 重复的 message_content）"""
+    record = row.to_stored_dict()
+    raw_message = record.get('raw_message')
+    if raw_message and record.get('message_content') == json.dumps(raw_message, ensure_ascii=False):
+        del record['message_content']
+    return record
+
+
+def _restore_row(record: Dict[str, Any]) -> MessageRow:
+    """把归档条目还原为 MessageRow"""
+    if 'message_content' not in record:
+        record['message_content'] = json.dumps(record.get('raw_message') or '', ensure_ascii=False)
+    return MessageRow(tuple(record.get(column) for column in MESSAGE_COLUMNS), _ARCHIVE_INDEX)
+
+
+class MessageArchive:
+    """按月份保存的压缩消息归档"""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: 归档目录
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.directory, file_name)
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        读取归档索引
+
+        Returns:
+            {月份: {'file', 'count', 'first_timestamp', 'last_timestamp'}}
+        """
+        try:
+            with open(self._path(INDEX_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"读取归档索引失败，按空索引处理: {e}")
+            return {}
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]):
+        # 先写临时文件再替换，避免中途退出损坏索引
+        temp_path = self._path(INDEX_FILE + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temp_path, self._path(INDEX_FILE))
+
+    def write(self, rows: List[MessageRow]) -> int:
+        """
+        把消息追加到对应月份的归档文件
+
+        Args:
+            rows: 数据库消息行
+
+        Returns:
+            int: 写入的消息条数
+        """
+        if not rows:
+            return 0
+
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_month.setdefault(_month_of(row.timestamp), []).append(_compact_record(row))
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            index = self.load_index()
+            for month, records in sorted(by_month.items()):
+                file_name = f'messages-{month}.jsonl.gz'
+                lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+                # 追加模式写入一个新的 gzip 成员，读取时 gzip 会自动连接所有成员
+                with gzip.open(self._path(file_name), 'at', encoding='utf-8') as f:
+                    f.write(lines)
+
+                timestamps = [record.get('timestamp') or 0 for record in records]
+                entry = index.setdefault(month, {
+                    'file': file_name,
+                    'count': 0,
+                    'first_timestamp': min(timestamps),
+                    'last_timestamp': max(timestamps),
+                })
+                entry['count'] += len(records)
+                entry['first_timestamp'] = min(entry['first_timestamp'], min(timestamps))
+                entry['last_timestamp'] = max(entry['last_timestamp'], max(timestamps))
+            self._save_index(index)
+        return len(rows)
+
+    def _iter_records(self, month: str) -> Iterator[Dict[str, Any]]:
+        entry = self.load_index().get(month)
+        if not entry:
+            return
+        try:
+            with gzip.open(self._path(entry['file']), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            logger.warning(f"读取归档文件失败: {entry['file']}: {e}")
+
+    def iter_month(self, month: str) -> Iterator[MessageRow]:
+        """按写入顺序读取某个月份的归档消息"""
+        for record in self._iter_records(month):
+            yield _restore_row(record)
+
+    def search(
+        self,
+        keyword: str,
+        limit: int = 100,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[MessageRow]:
+        """
+        搜索归档中包含关键词的消息
+
+        Args:
+            keyword: 搜索关键词（匹配 raw_message 和 message_content）
+            limit: 返回结果数量限制
+            since: 起始时间戳（含），None 表示不限制
+            until: 结束时间戳（不含），None 表示不限制
+
+        Returns:
+            List[MessageRow]: 匹配的消息（按时间倒序）
+        """
+        if not keyword or limit <= 0:
+            return []
+
+        results: List[MessageRow] = []
+        index = self.load_index()
+        for month in sorted(index, reverse=True):
+            entry = index[month]
+            # 根据索引中的时间范围跳过整个文件
+            if since is not None and entry['last_timestamp'] < since:
+                continue
+            if until is not None and entry['first_timestamp'] >= until:
+                continue
+
+            matched = []
+            for record in self._iter_records(month):
+                timestamp = record.get('timestamp') or 0
+                if since is not None and timestamp < since:
+                    continue
+                if until is not None and timestamp >= until:
+                    continue
+                if keyword in (record.get('raw_message') or '') or keyword in (record.get('message_content') or ''):
+                    matched.append(_restore_row(record))
+            matched.sort(key=lambda row: row.timestamp, reverse=True)
+            results.extend(matched)
+            if len(results) >= limit:
+                break
+        return results[:limit]
@@ -7,6 +7,9 @@ from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any, TYPE_CHECKING
 import json
 
+from .blobs import THUMBNAIL_SIZE
+from .rows import MessageRow
+
 if TYPE_CHECKING:
     from src.shared.models.message import MessageBase
 
@@ -43,7 +46,7 @@ class BaseDatabase(ABC):
         pass
     
     @abstractmethod
-    async def get_messages(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def get_messages(self, limit: int = 100, offset: int = 0) -> List[MessageRow]:
         """
         获取消息历史记录
         
@@ -52,12 +55,12 @@ class BaseDatabase(ABC):
             offset: 偏移量
             
         Returns:
-            List[Dict]: 消息列表
+            List[MessageRow]: 消息列表
         """
         pass
     
     @abstractmethod
-    async def get_message_by_id(self, message_id: str) -> Optional[Dict[str, Any]]:
+    async def get_message_by_id(self, message_id: str) -> Optional[MessageRow]:
         """
         根据ID获取单条消息
         
@@ -65,7 +68,7 @@ class BaseDatabase(ABC):
             message_id: 消息ID
             
         Returns:
-            Optional[Dict]: 消息字典，如果不存在返回 None
+            Optional[MessageRow]: 消息行，如果不存在返回 None
         """
         pass
     
@@ -103,7 +106,7 @@ class BaseDatabase(ABC):
         pass
     
     @abstractmethod
-    async def search_messages(self, keyword: str, limit: int = 100) -> List[Dict[str, Any]]:
+    async def search_messages(self, keyword: str, limit: int = 100) -> List[MessageRow]:
         """
         搜索包含关键词的消息
         
@@ -112,6 +115,142 @@ class BaseDatabase(ABC):
             limit: 返回结果数量限制
             
         Returns:
-            List[Dict]: 匹配的消息列表
+            List[MessageRow]: 匹配的消息列表
+        """
+        pass
+
+    @abstractmethod
+    async def get_messages_after(self, timestamp: float, limit: int = 100, after_id: str = '') -> List[MessageRow]:
+        """
+        获取 (timestamp, id) 游标之后的消息（按时间、ID 正序）
+
+        同一时间戳有多条消息时，ID 作为第二排序键，分批读取不会漏掉同一时刻的其余消息
+
+        Args:
+            timestamp: 游标时间戳
+            limit: 返回消息数量限制
+            after_id: 游标消息 ID（空字符串表示包含该时间戳的所有消息）
+
+        Returns:
+            List[MessageRow]: 消息列表
+        """
+        pass
+
+    @abstractmethod
+    async def get_summary(self, summary_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取对话摘要
+
+        Args:
+            summary_id: 摘要ID
+
+        Returns:
+            Optional[Dict]: 摘要字典（summary, covered_until, covered_id, message_count, updated_at），不存在返回 None
+        """
+        pass
+
+    @abstractmethod
+    async def save_summary(self, summary_id: str, summary: str, covered_until: float, message_count: int,
+                           covered_id: str = '') -> bool:
+        """
+        保存对话摘要
+
+        Args:
+            summary_id: 摘要ID
+            summary: 摘要内容
+            covered_until: 摘要覆盖到的最后一条消息时间戳
+            message_count: 摘要累计覆盖的消息条数
+            covered_id: 摘要覆盖到的最后一条消息 ID（与 covered_until 组成游标）
+
+        Returns:
+            bool: 是否保存成功
+        """
+        pass
+
+    @abstractmethod
+    async def get_oldest_messages(self, limit: int = 100, before: Optional[float] = None) -> List[MessageRow]:
+        """
+        获取最早的消息（按时间正序，供归档使用）
+
+        Args:
+            limit: 返回消息数量限制
+            before: 只返回该时间戳之前的消息（不含），None 表示不限制
+
+        Returns:
+            List[MessageRow]: 消息列表
+        """
+        pass
+
+    @abstractmethod
+    async def delete_messages(self, message_ids: List[str], keep_blobs: bool = False) -> int:
+        """
+        批量删除消息
+
+        Args:
+            message_ids: 消息ID列表
+            keep_blobs: 保留图片引用（消息移入归档时使用，归档中的引用仍然有效）
+
+        Returns:
+            int: 删除的消息条数
+        """
+        pass
+
+    @abstractmethod
+    async def get_storage_stats(self) -> Dict[str, int]:
+        """
+        获取存储占用
+
+        Returns:
+            Dict: {'file_bytes': 文件大小, 'used_bytes': 有效数据大小, 'free_pages': 空闲页数}
+        """
+        pass
+
+    @abstractmethod
+    async def compact(self, max_pages: int = 0) -> int:
+        """
+        回收空闲空间（增量进行，不阻塞其他查询太久）
+
+        Args:
+            max_pages: 本次最多回收的页数，0 表示全部
+
+        Returns:
+            int: 回收的页数
+        """
+        pass
+
+    @abstractmethod
+    async def get_blob(self, digest: str) -> Optional[bytes]:
+        """
+        读取消息引用的图片
+
+        Args:
+            digest: 图片摘要（消息内容中的 "blob:<摘要>"）
+
+        Returns:
+            Optional[bytes]: 图片数据，不存在返回 None
+        """
+        pass
+
+    @abstractmethod
+    async def get_thumbnail(self, digest: str, max_size: int = THUMBNAIL_SIZE) -> Optional[str]:
+        """
+        获取图片缩略图路径（第一次请求时生成）
+
+        Args:
+            digest: 图片摘要
+            max_size: 最长边像素
+
+        Returns:
+            Optional[str]: 缩略图路径，图片不存在返回 None
+        """
+        pass
+
+    @abstractmethod
+    async def collect_garbage(self) -> int:
+        """
+        清理不再被任何消息引用的图片
+
+        Returns:
+            int: 删除的图片数量
         """
         pass
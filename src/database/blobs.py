@@ -0,0 +1,240 @@
+"""
+图片内容寻址存储
+消息中的图片（base64）保存时不再内联在 message_content 里，而是解码后按 SHA-256 存成文件，
+消息中只保留引用（"blob:<摘要>"）：
+- 相同的图片只保存一份，引用计数记录在数据库的 blobs 表中，计数归零时删除文件
+- 文件按摘要的前两位分目录保存（<目录>/ab/abcdef...），写入使用临时文件 + 替换
+- 缩略图在第一次请求时生成（<目录>/thumbs/<摘要>-<尺寸>.png），供 UI 显示历史消息
+
+BlobStore 的方法都是同步的文件操作，应在后台线程中调用（asyncio.to_thread）。
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import re
+import time
+from typing import Any, Iterator, List, Optional, Tuple
+
+from src.util.logger import logger
+
+# 消息中图片引用的前缀
+BLOB_PREFIX = 'blob:'
+
+# 保存为文件的消息段类型
+BLOB_SEGMENT_TYPES = ('image', 'emoji')
+
+# 短于该长度的数据不是图片（如已经是引用、URL 或占位文本），保持原样
+MIN_INLINE_LENGTH = 64
+
+# 默认缩略图最长边（像素）
+THUMBNAIL_SIZE = 160
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_digest(value: str) -> bool:
+    """是否为合法的摘要（防止拼接出目录之外的路径）"""
+    return isinstance(value, str) and bool(_DIGEST_PATTERN.match(value))
+
+
+def find_blob_refs(segment_type: str, data: Any) -> List[str]:
+    """
+    查找消息段中引用的图片摘要
+
+    Args:
+        segment_type: 消息段类型
+        data: 已解析的消息段数据（seglist 为消息段列表）
+
+    Returns:
+        摘要列表（同一消息中重复引用会出现多次，与引用计数一致）
+    """
+    if segment_type == 'seglist' and isinstance(data, list):
+        digests = []
+        for item in data:
+            if isinstance(item, dict):
+                digests.extend(find_blob_refs(item.get('type', ''), item.get('data')))
+        return digests
+    if segment_type in BLOB_SEGMENT_TYPES and isinstance(data, str) and data.startswith(BLOB_PREFIX):
+        digest = data[len(BLOB_PREFIX):]
+        if is_digest(digest):
+            return [digest]
+    return []
+
+
+def _decode_image(data: Any) -> Optional[bytes]:
+    """解码 base64 图片（支持 data:image/...;base64, 前缀），不是图片数据时返回 None"""
+    if not isinstance(data, str) or len(data) < MIN_INLINE_LENGTH or data.startswith(BLOB_PREFIX):
+        return None
+    if data.startswith('data:'):
+        header, _, data = data.partition(',')
+        if ';base64' not in header:
+            return None
+    try:
+        return base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
+class BlobStore:
+    """按内容摘要命名的图片文件目录"""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: 保存目录
+        """
+        self.directory = directory
+        self.thumbnail_directory = os.path.join(directory, 'thumbs')
+
+    def path(self, digest: str) -> str:
+        """图片文件路径（不检查是否存在）"""
+        if not is_digest(digest):
+            raise ValueError(f"无效的图片摘要: {digest!r}")
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data: bytes) -> str:
+        """
+        保存图片（已存在时不重复写入，只更新修改时间）
+
+        更新修改时间使孤立文件清理（iter_digests 的 min_age）不会把刚复用、还没登记引用的文件当成旧文件
+
+        Returns:
+            SHA-256 摘要
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        try:
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """读取图片，不存在时返回 None"""
+        try:
+            with open(self.path(digest), 'rb') as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def delete(self, digest: str):
+        """删除图片及其缩略图"""
+        for path in [self.path(digest), *self._thumbnail_paths(digest)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"删除图片文件失败: {path}: {e}")
+
+    def _thumbnail_paths(self, digest: str) -> List[str]:
+        if not os.path.isdir(self.thumbnail_directory):
+            return []
+        prefix = f'{digest}-'
+        return [os.path.join(self.thumbnail_directory, name)
+                for name in os.listdir(self.thumbnail_directory) if name.startswith(prefix)]
+
+    def thumbnail(self, digest: str, max_size: int = THUMBNAIL_SIZE) -> Optional[str]:
+        """
+        获取缩略图路径（第一次请求时生成）
+
+        Args:
+            digest: 图片摘要
+            max_size: 最长边像素
+
+        Returns:
+            PNG 缩略图路径，图片不存在或无法解码时返回 None
+        """
+        source = self.path(digest)
+        if not os.path.exists(source):
+            return None
+        path = os.path.join(self.thumbnail_directory, f'{digest}-{max_size}.png')
+        if os.path.exists(path):
+            return path
+
+        # QImage 不依赖 QApplication，可以在后台线程中使用
+        from PyQt5.QtCore import Qt
+        from PyQt5.QtGui import QImage
+
+        image = QImage(source)
+        if image.isNull():
+            logger.warning(f"无法解码图片，跳过缩略图: {digest}")
+            return None
+        if image.width() > max_size or image.height() > max_size:
+            image = image.scaled(max_size, max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        os.makedirs(self.thumbnail_directory, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp.png'
+        if not image.save(temp_path, 'PNG'):
+            logger.warning(f"保存缩略图失败: {path}")
+            return None
+        os.replace(temp_path, path)
+        return path
+
+    def iter_digests(self, min_age: float = 0) -> Iterator[str]:
+        """
+        遍历已保存的图片摘要
+
+        Args:
+            min_age: 只返回修改时间早于该秒数之前的文件（避开正在保存的图片）
+        """
+        if not os.path.isdir(self.directory):
+            return
+        deadline = time.time() - min_age
+        for prefix in os.listdir(self.directory):
+            folder = os.path.join(self.directory, prefix)
+            if len(prefix) != 2 or not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if is_digest(name) and os.path.getmtime(path) <= deadline:
+                    yield name
+
+    def externalize(self, segment_type: str, data: Any) -> Tuple[Any, List[Tuple[str, int]]]:
+        """
+        把消息段中的 base64 图片保存为文件，替换为引用
+
+        Args:
+            segment_type: 消息段类型
+            data: 消息段数据（seglist 为消息段列表）
+
+        Returns:
+            (替换后的数据, [(摘要, 字节数)])，每个引用一项；没有图片时原样返回数据（不复制）
+        """
+        saved: List[Tuple[str, int]] = []
+        new_data = self._externalize(segment_type, data, saved)
+        return new_data, saved
+
+    def _externalize(self, segment_type: str, data: Any, saved: List[Tuple[str, int]]) -> Any:
+        if segment_type == 'seglist' and isinstance(data, list):
+            replaced = [self._externalize_item(item, saved) for item in data]
+            if any(new is not old for new, old in zip(replaced, data)):
+                return replaced
+            return data
+
+        if segment_type in BLOB_SEGMENT_TYPES:
+            image = _decode_image(data)
+            if image is not None:
+                digest = self.put(image)
+                saved.append((digest, len(image)))
+                return BLOB_PREFIX + digest
+        return data
+
+    def _externalize_item(self, item: Any, saved: List[Tuple[str, int]]) -> Any:
+        if not isinstance(item, dict):
+            return item
+        data = item.get('data')
+        new_data = self._externalize(item.get('type', ''), data, saved)
+        if new_data is data:
+            return item
+        # 复制消息段，不修改调用方的消息字典
+        return {**item, 'data': new_data}
@@ -4,8 +4,10 @@
 """
 
 import threading
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from .base import BaseDatabase
+from .blobs import THUMBNAIL_SIZE
+from .rows import MessageRow
 from .factory import DatabaseFactory
 from src.util.logger import logger
 
@@ -17,6 +19,7 @@ class DatabaseManager:
     _database: Optional[BaseDatabase] = None
     _lock = threading.Lock()  # 线程安全锁
     _initialized_flag = False  # 初始化标记
+    _listeners: List[Callable[[str, Any], None]] = []  # 数据变化回调
 
     def __new__(cls):
         if cls._instance is None:
@@ -102,6 +105,30 @@ class DatabaseManager:
         """
         return await self.close()
 
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """
+        注册数据变化回调（在保存/删除所在的事件循环中同步调用，回调应尽量轻量）
+
+        回调参数为 (事件, 数据)：
+        - ('saved', 消息字典)
+        - ('deleted', 消息ID)
+        - ('cleared', None)
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, Any], None]):
+        """移除数据变化回调"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event: str, payload: Any = None):
+        for callback in list(self._listeners):
+            try:
+                callback(event, payload)
+            except Exception as e:
+                logger.warning(f"数据库变化回调执行失败: {e}")
+
     def is_initialized(self) -> bool:
         """
         检查数据库是否已初始化
@@ -125,9 +152,14 @@ class DatabaseManager:
             logger.error("数据库未初始化")
             return False
         
-        return await self._database.save_message(message)
+        if hasattr(message, 'to_dict'):
+            message = message.to_dict()
+        saved = await self._database.save_message(message)
+        if saved:
+            self._notify('saved', message)
+        return saved
     
-    async def get_messages(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    async def get_messages(self, limit: int = 100, offset: int = 0) -> List[MessageRow]:
         """
         获取消息历史记录
         
@@ -136,7 +168,7 @@ class DatabaseManager:
             offset: 偏移量
             
         Returns:
-            List[Dict]: 消息列表
+            List[MessageRow]: 消息列表
         """
         if not self._database:
             logger.error("数据库未初始化")
@@ -144,7 +176,7 @@ class DatabaseManager:
         
         return await self._database.get_messages(limit, offset)
     
-    async def get_message_by_id(self, message_id: str) -> Optional[Dict[str, Any]]:
+    async def get_message_by_id(self, message_id: str) -> Optional[MessageRow]:
         """
         根据ID获取单条消息
         
@@ -152,7 +184,7 @@ class DatabaseManager:
             message_id: 消息ID
             
         Returns:
-            Optional[Dict]: 消息字典，如果不存在返回 None
+            Optional[MessageRow]: 消息行，如果不存在返回 None
         """
         if not self._database:
             logger.error("数据库未初始化")
@@ -174,7 +206,10 @@ class DatabaseManager:
             logger.error("数据库未初始化")
             return False
         
-        return await self._database.delete_message(message_id)
+        deleted = await self._database.delete_message(message_id)
+        if deleted:
+            self._notify('deleted', message_id)
+        return deleted
     
     async def clear_all_messages(self) -> bool:
         """
@@ -187,7 +222,10 @@ class DatabaseManager:
             logger.error("数据库未初始化")
             return False
         
-        return await self._database.clear_all_messages()
+        cleared = await self._database.clear_all_messages()
+        if cleared:
+            self._notify('cleared')
+        return cleared
     
     async def get_message_count(self) -> int:
         """
@@ -202,7 +240,7 @@ class DatabaseManager:
         
         return await self._database.get_message_count()
     
-    async def search_messages(self, keyword: str, limit: int = 100) -> List[Dict[str, Any]]:
+    async def search_messages(self, keyword: str, limit: int = 100) -> List[MessageRow]:
         """
         搜索包含关键词的消息
         
@@ -211,7 +249,7 @@ class DatabaseManager:
             limit: 返回结果数量限制
             
         Returns:
-            List[Dict]: 匹配的消息列表
+            List[MessageRow]: 匹配的消息列表
         """
         if not self._database:
             logger.error("数据库未初始化")
@@ -220,5 +258,176 @@ class DatabaseManager:
         return await self._database.search_messages(keyword, limit)
 
 
+    async def get_messages_after(self, timestamp: float, limit: int = 100, after_id: str = '') -> List[MessageRow]:
+        """
+        获取 (timestamp, id) 游标之后的消息（按时间、ID 正序）
+
+        同一时间戳有多条消息时，ID 作为第二排序键，分批读取不会漏掉同一时刻的其余消息
+
+        Args:
+            timestamp: 游标时间戳
+            limit: 返回消息数量限制
+            after_id: 游标消息 ID（空字符串表示包含该时间戳的所有消息）
+
+        Returns:
+            List[MessageRow]: 消息列表
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return []
+
+        return await self._database.get_messages_after(timestamp, limit, after_id)
+
+    async def get_summary(self, summary_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取对话摘要
+
+        Args:
+            summary_id: 摘要ID
+
+        Returns:
+            Optional[Dict]: 摘要字典，不存在返回 None
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return None
+
+        return await self._database.get_summary(summary_id)
+
+    async def save_summary(self, summary_id: str, summary: str, covered_until: float, message_count: int,
+                           covered_id: str = '') -> bool:
+        """
+        保存对话摘要
+
+        Args:
+            summary_id: 摘要ID
+            summary: 摘要内容
+            covered_until: 摘要覆盖到的最后一条消息时间戳
+            message_count: 摘要累计覆盖的消息条数
+            covered_id: 摘要覆盖到的最后一条消息 ID（与 covered_until 组成游标）
+
+        Returns:
+            bool: 是否保存成功
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return False
+
+        return await self._database.save_summary(summary_id, summary, covered_until, message_count, covered_id)
+
+
+    async def get_oldest_messages(self, limit: int = 100, before: Optional[float] = None) -> List[MessageRow]:
+        """
+        获取最早的消息（按时间正序，供归档使用）
+
+        Args:
+            limit: 返回消息数量限制
+            before: 只返回该时间戳之前的消息（不含），None 表示不限制
+
+        Returns:
+            List[MessageRow]: 消息列表
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return []
+
+        return await self._database.get_oldest_messages(limit, before)
+
+    async def delete_messages(self, message_ids: List[str], keep_blobs: bool = False) -> int:
+        """
+        批量删除消息
+
+        Args:
+            message_ids: 消息ID列表
+            keep_blobs: 保留图片引用（消息移入归档时使用，归档中的引用仍然有效）
+
+        Returns:
+            int: 删除的消息条数
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return 0
+
+        deleted = await self._database.delete_messages(message_ids, keep_blobs=keep_blobs)
+        if deleted:
+            for message_id in message_ids:
+                self._notify('deleted', message_id)
+        return deleted
+
+    async def get_storage_stats(self) -> Dict[str, int]:
+        """
+        获取存储占用
+
+        Returns:
+            Dict: {'file_bytes': 文件大小, 'used_bytes': 有效数据大小, 'free_pages': 空闲页数}
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return {}
+
+        return await self._database.get_storage_stats()
+
+    async def compact(self, max_pages: int = 0) -> int:
+        """
+        回收空闲空间
+
+        Args:
+            max_pages: 本次最多回收的页数，0 表示全部
+
+        Returns:
+            int: 回收的页数
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return 0
+
+        return await self._database.compact(max_pages)
+
+    async def get_blob(self, digest: str) -> Optional[bytes]:
+        """
+        读取消息引用的图片
+
+        Args:
+            digest: 图片摘要（MessageRow.blob_digests）
+
+        Returns:
+            Optional[bytes]: 图片数据，不存在返回 None
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return None
+
+        return await self._database.get_blob(digest)
+
+    async def get_thumbnail(self, digest: str, max_size: int = THUMBNAIL_SIZE) -> Optional[str]:
+        """
+        获取图片缩略图路径（第一次请求时生成）
+
+        Args:
+            digest: 图片摘要
+            max_size: 最长边像素
+
+        Returns:
+            Optional[str]: 缩略图路径，图片不存在返回 None
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return None
+
+        return await self._database.get_thumbnail(digest, max_size)
+
+    async def collect_garbage(self) -> int:
+        """
+        清理不再被任何消息引用的图片
+
+        Returns:
+            int: 删除的图片数量
+        """
+        if not self._database:
+            logger.error("数据库未初始化")
+            return 0
+
+        return await self._database.collect_garbage()
+
 # 创建全局数据库管理器实例
 db_manager = DatabaseManager()
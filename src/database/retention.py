@@ -0,0 +1,222 @@
+"""
+数据库保留策略与后台维护
+按 DatabaseConfig 中的保留策略定期整理消息数据库，不阻塞 UI：
+1. 超过保留天数、条数上限或大小上限的最早消息分批写入月度归档（MessageArchive），
+   写入成功后才从数据库删除，归档中的消息仍可通过 search_archive 搜索；
+   删除时保留图片引用，归档消息中的图片仍可通过 db_manager.get_blob 读取
+2. 删除后用增量回收（PRAGMA incremental_vacuum）分批释放空闲页，缩小数据库文件
+3. 文件读写在后台线程中进行，数据库操作本身由 aiosqlite 的线程执行，每批之间让出事件循环
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from src.util.logger import logger
+from .archive import MessageArchive
+from .manager import db_manager
+from .rows import MessageRow
+
+# 启动后等待多久开始第一次维护（秒），避开启动阶段
+STARTUP_DELAY = 60
+
+# 每次增量回收的页数（默认页大小 4KB，约 4MB）
+COMPACT_PAGES = 1000
+
+# 单次维护最多处理的批数（积压很多时留到下一次维护）
+MAX_BATCHES = 200
+
+
+class DatabaseMaintenance:
+    """消息数据库的保留策略与后台维护"""
+
+    def __init__(self):
+        self.max_age_days = 0
+        self.max_rows = 0
+        self.max_size_mb = 0
+        self.interval = 3600
+        self.batch_size = 500
+        self.archive = MessageArchive("data/archive")
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, database_config) -> bool:
+        """
+        读取保留策略
+
+        Args:
+            database_config: DatabaseConfig
+
+        Returns:
+            是否设置了任意一项限制
+        """
+        self.max_age_days = max(0, database_config.retention_max_age_days)
+        self.max_rows = max(0, database_config.retention_max_rows)
+        self.max_size_mb = max(0, database_config.retention_max_size_mb)
+        self.interval = max(60, database_config.maintenance_interval)
+        self.batch_size = max(1, database_config.maintenance_batch)
+        self.archive = MessageArchive(database_config.archive_dir)
+        return self.enabled
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_age_days or self.max_rows or self.max_size_mb)
+
+    def is_running(self) -> bool:
+        """后台维护任务是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self, database_config=None) -> bool:
+        """
+        启动后台维护任务（不等待）
+
+        Args:
+            database_config: DatabaseConfig，None 表示使用当前设置
+
+        Returns:
+            是否启动（没有设置任何限制时不启动）
+        """
+        if database_config is not None:
+            self.configure(database_config)
+        if not self.enabled or self.is_running():
+            return False
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("没有运行中的事件循环，跳过数据库维护")
+            return False
+
+        self._task = loop.create_task(self._loop(), name="DatabaseMaintenance")
+        logger.info(
+            f"数据库后台维护已启动（保留 {self.max_age_days or '不限'} 天 / {self.max_rows or '不限'} 条 / "
+            f"{self.max_size_mb or '不限'} MB，每 {self.interval} 秒一次）"
+        )
+        return True
+
+    def stop(self):
+        """停止后台维护任务"""
+        if self.is_running():
+            self._task.cancel()
+        self._task = None
+
+    async def _loop(self):
+        await asyncio.sleep(STARTUP_DELAY)
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"数据库维护失败: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        执行一次维护
+
+        Returns:
+            {'archived': 归档的消息条数, 'freed_pages': 回收的页数, 'collected_blobs': 清理的图片数}
+        """
+        result = {'archived': 0, 'freed_pages': 0, 'collected_blobs': 0}
+        if not db_manager.is_initialized():
+            return result
+
+        batches = 0
+
+        # 超过保留天数的消息
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            while batches < MAX_BATCHES:
+                archived = await self._archive_batch(await db_manager.get_oldest_messages(self.batch_size, before=cutoff))
+                if not archived:
+                    break
+                result['archived'] += archived
+                batches += 1
+
+        # 超过条数上限的最早消息
+        if self.max_rows:
+            excess = await db_manager.get_message_count() - self.max_rows
+            while excess > 0 and batches < MAX_BATCHES:
+                archived = await self._archive_batch(await db_manager.get_oldest_messages(min(excess, self.batch_size)))
+                if not archived:
+                    break
+                result['archived'] += archived
+                excess -= archived
+                batches += 1
+
+        # 超过大小上限时继续归档最早的消息
+        if self.max_size_mb:
+            limit_bytes = self.max_size_mb * 1024 * 1024
+            while batches < MAX_BATCHES:
+                stats = await db_manager.get_storage_stats()
+                if stats.get('used_bytes', 0) <= limit_bytes:
+                    break
+                archived = await self._archive_batch(await db_manager.get_oldest_messages(self.batch_size))
+                if not archived:
+                    break
+                result['archived'] += archived
+                batches += 1
+
+        result['freed_pages'] = await self._compact()
+        result['collected_blobs'] = await db_manager.collect_garbage()
+        if any(result.values()):
+            logger.info(
+                f"数据库维护完成: 归档 {result['archived']} 条消息，回收 {result['freed_pages']} 页，"
+                f"清理 {result['collected_blobs']} 个图片"
+            )
+        return result
+
+    async def _archive_batch(self, rows: List[MessageRow]) -> int:
+        """先写入归档，成功后再从数据库删除"""
+        if not rows:
+            return 0
+        await asyncio.to_thread(self.archive.write, rows)
+        # 归档中的消息仍引用这些图片，不释放引用计数
+        deleted = await db_manager.delete_messages([row.id for row in rows], keep_blobs=True)
+        # 让出事件循环，UI 和新消息的保存可以插在批次之间
+        await asyncio.sleep(0)
+        return deleted
+
+    async def _compact(self) -> int:
+        """分批回收空闲页"""
+        stats = await db_manager.get_storage_stats()
+        if not stats.get('free_pages'):
+            return 0
+
+        freed_total = 0
+        for _ in range(MAX_BATCHES):
+            freed = await db_manager.compact(COMPACT_PAGES)
+            if freed <= 0:
+                break
+            freed_total += freed
+            await asyncio.sleep(0)
+        return freed_total
+
+    async def search_archive(
+        self,
+        keyword: str,
+        limit: int = 100,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[MessageRow]:
+        """
+        搜索已归档的消息（在后台线程中读取归档文件）
+
+        Args:
+            keyword: 搜索关键词
+            limit: 返回结果数量限制
+            since: 起始时间戳（含）
+            until: 结束时间戳（不含）
+
+        Returns:
+            List[MessageRow]: 匹配的消息（按时间倒序）
+        """
+        return await asyncio.to_thread(self.archive.search, keyword, limit, since, until)
+
+    def archive_summary(self) -> Dict[str, Any]:
+        """归档索引（{月份: {'file', 'count', 'first_timestamp', 'last_timestamp'}}）"""
+        return self.archive.load_index()
+
+
+# 全局单例
+db_maintenance = DatabaseMaintenance()
@@ -0,0 +1,196 @@
+"""
+消息行映射
+把数据库游标返回的元组直接包装成只读的消息视图，所有读取聊天记录的地方共用：
+- 列索引按查询结果的列描述只计算一次，每行只保存原始元组，不逐行构建字典
+- message_content 在第一次访问时才解析 JSON（大多数场景只用 raw_message）
+- 视图实现 Mapping 接口，原来按字典读取行数据的代码（row.get / row['id']）保持不变
+"""
+
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.shared.models.message import MessageBase, BaseMessageInfo, UserInfo, FormatInfo, Seg
+from src.util.logger import logger
+from .blobs import BLOB_PREFIX, find_blob_refs
+
+# messages 表的列（与建表语句的顺序一致）
+MESSAGE_COLUMNS = (
+    'id', 'platform', 'user_id', 'user_nickname', 'user_cardname',
+    'message_type', 'message_content', 'raw_message', 'timestamp', 'created_at',
+)
+
+# message_content 尚未解析的标记
+_UNDECODED = object()
+
+
+class MessageRow(Mapping):
+    """数据库消息行的只读视图"""
+
+    __slots__ = ('_values', '_index', '_content')
+
+    def __init__(self, values: Sequence[Any], index: Dict[str, int]):
+        """
+        Args:
+            values: 游标返回的一行
+            index: 列名 -> 列位置（同一次查询的所有行共用）
+        """
+        self._values = values
+        self._index = index
+        self._content = _UNDECODED
+
+    def _value(self, column: str, default: Any = None) -> Any:
+        position = self._index.get(column)
+        return default if position is None else self._values[position]
+
+    # ===================================================================
+    # 字段
+    # ===================================================================
+
+    @property
+    def id(self) -> str:
+        return self._value('id', '')
+
+    @property
+    def platform(self) -> str:
+        return self._value('platform') or ''
+
+    @property
+    def user_id(self) -> str:
+        return self._value('user_id') or ''
+
+    @property
+    def user_nickname(self) -> str:
+        return self._value('user_nickname') or ''
+
+    @property
+    def user_cardname(self) -> str:
+        return self._value('user_cardname') or ''
+
+    @property
+    def message_type(self) -> str:
+        return self._value('message_type') or ''
+
+    @property
+    def raw_message(self) -> str:
+        return self._value('raw_message') or ''
+
+    @property
+    def timestamp(self) -> float:
+        return self._value('timestamp') or 0.0
+
+    @property
+    def message_content(self) -> Any:
+        """消息内容（第一次访问时解析 JSON，解析失败保留原值）"""
+        if self._content is _UNDECODED:
+            content = self._value('message_content')
+            if content:
+                try:
+                    content = json.loads(content)
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.debug(f"JSON 解析失败，保留原值: {e}")
+            self._content = content
+        return self._content
+
+    @property
+    def is_sent(self) -> bool:
+        """是否为用户发送的消息（user_id 为 "0"）"""
+        return self.user_id == "0"
+
+    @property
+    def blob_digests(self) -> List[str]:
+        """引用的图片摘要（存储内容中没有引用时不解析 JSON）"""
+        stored = self._value('message_content')
+        if not isinstance(stored, str) or BLOB_PREFIX not in stored:
+            return []
+        return find_blob_refs(self.message_type, self.message_content)
+
+    @property
+    def text(self) -> str:
+        """用于显示的文本：优先使用 raw_message，否则从消息内容中提取文本"""
+        raw_message = self.raw_message
+        if raw_message:
+            return raw_message
+
+        content = self.message_content
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            parts = []
+            for part in content:
+                if isinstance(part, dict):
+                    if part.get('type') == 'text' and part.get('data'):
+                        parts.append(str(part['data']))
+                elif isinstance(part, str):
+                    parts.append(part)
+            return ''.join(parts)
+        return str(content) if content else ''
+
+    def to_message(self) -> MessageBase:
+        """转换为 MessageBase（消息内容与当前行共用，不再复制）"""
+        platform = self.platform
+        message_info = BaseMessageInfo(
+            platform=platform,
+            message_id=self.id,
+            time=self.timestamp,
+            user_info=UserInfo(platform, self.user_id, self.user_nickname, self.user_cardname),
+            format_info=FormatInfo(),
+        )
+        return MessageBase(
+            message_info=message_info,
+            message_segment=Seg(type=self.message_type or 'text', data=self.message_content),
+            raw_message=self.raw_message,
+        )
+
+    # ===================================================================
+    # Mapping 接口（兼容按字典读取的代码）
+    # ===================================================================
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'message_content':
+            return self.message_content
+        return self._values[self._index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """复制为普通字典（message_content 已解析）"""
+        return {column: self[column] for column in self._index}
+
+    def to_stored_dict(self) -> Dict[str, Any]:
+        """复制为数据库中保存的原始列值（message_content 保持 JSON 字符串，不解析）"""
+        return {column: self._values[position] for column, position in self._index.items()}
+
+    def __repr__(self) -> str:
+        return f"MessageRow(id={self.id!r}, user_id={self.user_id!r}, raw_message={self.raw_message[:20]!r})"
+
+
+class MessageRowMapper:
+    """把游标返回的元组映射为 MessageRow"""
+
+    def __init__(self):
+        # 列名元组 -> 列索引（不同查询的列相同，共用同一个索引字典）
+        self._indexes: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+    def index_for(self, description: Sequence[Sequence[Any]]) -> Dict[str, int]:
+        """根据游标的列描述获取列索引"""
+        columns = tuple(column[0] for column in description)
+        index = self._indexes.get(columns)
+        if index is None:
+            index = self._indexes[columns] = {name: position for position, name in enumerate(columns)}
+        return index
+
+    def map_rows(self, description: Sequence[Sequence[Any]], rows: Sequence[Sequence[Any]]) -> List[MessageRow]:
+        """映射多行"""
+        index = self.index_for(description)
+        return [MessageRow(row, index) for row in rows]
+
+    def map_row(self, description: Sequence[Sequence[Any]], row: Optional[Sequence[Any]]) -> Optional[MessageRow]:
+        """映射单行（None 原样返回）"""
+        if row is None:
+            return None
+        return MessageRow(row, self.index_for(description))
@@ -4,29 +4,46 @@ SQLite 数据库实现
 """
 
 import sqlite3
+import asyncio
 import json
 import os
+import time
 import aiosqlite
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 from .base import BaseDatabase
+from .blobs import BlobStore, BLOB_SEGMENT_TYPES, THUMBNAIL_SIZE, find_blob_refs
+from .rows import MessageRow, MessageRowMapper
 from src.util.logger import logger
 
 if TYPE_CHECKING:
     from src.shared.models.message import MessageBase
 
+# 批量查询时每条语句最多带的 ID 数量（SQLite 对参数个数有上限）
+ID_CHUNK = 500
+
+# 清理时只删除超过该时间（秒）且没有登记的图片文件，避开正在保存的消息
+ORPHAN_BLOB_AGE = 3600
+
 
 class SQLiteDatabase(BaseDatabase):
     """SQLite 数据库实现类"""
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, blob_dir: Optional[str] = None):
         """
         初始化 SQLite 数据库
 
         Args:
             path: 数据库文件路径
+            blob_dir: 图片文件目录，默认为数据库文件所在目录下的 blobs
         """
         self.db_path = path
         self.connection = None
+        self.blobs = BlobStore(blob_dir or os.path.join(os.path.dirname(path), 'blobs'))
+        # 保存图片、登记引用与释放引用、删除文件的整个过程互斥：
+        # 否则 put() 发现文件已存在而跳过写入后，并发的删除可能在引用登记之前删掉该文件
+        self._blob_lock = asyncio.Lock()
+        # 游标元组 -> MessageRow（列索引按查询缓存）
+        self._row_mapper = MessageRowMapper()
 
     def _ensure_connection(self) -> bool:
         """检查数据库连接是否有效"""
@@ -48,6 +65,8 @@ class SQLiteDatabase(BaseDatabase):
 
             # 启用外键约束
             await self.connection.execute('PRAGMA foreign_keys = ON')
+            # 新建的数据库使用增量回收（必须在建表前设置，已有数据库在第一次回收空间时转换）
+            await self.connection.execute('PRAGMA auto_vacuum = INCREMENTAL')
 
             logger.info(f"成功连接到 SQLite 数据库: {self.db_path}")
             return True
@@ -107,6 +126,34 @@ class SQLiteDatabase(BaseDatabase):
                 ON messages(message_type)
             ''')
 
+            # 长对话的滚动摘要（每个会话一行）
+            await self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    covered_until REAL NOT NULL DEFAULT 0,
+                    covered_id TEXT NOT NULL DEFAULT '',
+                    message_count INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL
+                )
+            ''')
+            # 旧版本创建的摘要表没有 covered_id 列
+            cursor = await self.connection.execute('PRAGMA table_info(conversation_summaries)')
+            if 'covered_id' not in {row[1] for row in await cursor.fetchall()}:
+                await self.connection.execute(
+                    "ALTER TABLE conversation_summaries ADD COLUMN covered_id TEXT NOT NULL DEFAULT ''"
+                )
+
+            # 消息引用的图片（文件保存在 blob_dir，这里只记录引用计数）
+            await self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    ref_count INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL
+                )
+            ''')
+
             await self.connection.commit()
             logger.info("成功初始化 SQLite 数据库表结构")
             return True
@@ -127,42 +174,67 @@ class SQLiteDatabase(BaseDatabase):
         if not self._ensure_connection():
             return False
 
-        try:
-            # 如果是 MessageBase 对象，转换为字典
-            if hasattr(message, 'to_dict'):
-                message_dict = message.to_dict()
-            else:
-                message_dict = message
-
-            message_info = message_dict.get('message_info', {})
-            user_info = message_info.get('user_info', {})
-            message_segment = message_dict.get('message_segment', {})
-
-            await self.connection.execute('''
-                INSERT OR REPLACE INTO messages (
-                    id, platform, user_id, user_nickname, user_cardname,
-                    message_type, message_content, raw_message, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                message_info.get('message_id', ''),
-                message_info.get('platform', ''),
-                user_info.get('user_id', ''),
-                user_info.get('user_nickname', ''),
-                user_info.get('user_cardname', ''),
-                message_segment.get('type', ''),
-                json.dumps(message_segment.get('data', ''), ensure_ascii=False),
-                message_dict.get('raw_message', ''),
-                message_info.get('time', 0)
-            ))
-
-            await self.connection.commit()
-            logger.debug(f"成功保存消息: {message_info.get('message_id', '')}")
-            return True
-        except Exception as e:
-            logger.error(f"保存消息失败: {e}", exc_info=True)
-            return False
-
-    async def get_messages(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        async with self._blob_lock:
+            try:
+                # 如果是 MessageBase 对象，转换为字典
+                if hasattr(message, 'to_dict'):
+                    message_dict = message.to_dict()
+                else:
+                    message_dict = message
+
+                message_info = message_dict.get('message_info', {})
+                user_info = message_info.get('user_info', {})
+                message_segment = message_dict.get('message_segment', {})
+                message_id = message_info.get('message_id', '')
+                segment_type = message_segment.get('type', '')
+                segment_data = message_segment.get('data', '')
+                raw_message = message_dict.get('raw_message', '')
+
+                # base64 图片保存为文件，消息中只保留引用
+                saved_blobs: List[Tuple[str, int]] = []
+                if segment_type == 'seglist' or segment_type in BLOB_SEGMENT_TYPES:
+                    segment_data, saved_blobs = await asyncio.to_thread(self.blobs.externalize, segment_type, segment_data)
+                    if saved_blobs and raw_message == message_segment.get('data'):
+                        raw_message = f'[{segment_type}]'
+
+                # 覆盖同 ID 的消息时先释放旧消息的图片引用
+                released = await self._referenced_blobs('id = ?', (message_id,))
+                await self._release_blobs(released)
+
+                await self.connection.execute('''
+                    INSERT OR REPLACE INTO messages (
+                        id, platform, user_id, user_nickname, user_cardname,
+                        message_type, message_content, raw_message, timestamp
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    message_id,
+                    message_info.get('platform', ''),
+                    user_info.get('user_id', ''),
+                    user_info.get('user_nickname', ''),
+                    user_info.get('user_cardname', ''),
+                    segment_type,
+                    json.dumps(segment_data, ensure_ascii=False),
+                    raw_message,
+                    message_info.get('time', 0)
+                ))
+
+                if saved_blobs:
+                    await self.connection.executemany('''
+                        INSERT INTO blobs (digest, size, ref_count, created_at) VALUES (?, ?, 1, ?)
+                        ON CONFLICT(digest) DO UPDATE SET ref_count = ref_count + 1
+                    ''', [(digest, size, time.time()) for digest, size in saved_blobs])
+
+                dropped = await self._drop_unreferenced_blobs(released)
+                await self.connection.commit()
+                await self._delete_blob_files(dropped)
+                logger.debug(f"成功保存消息: {message_id}")
+                return True
+            except Exception as e:
+                logger.error(f"保存消息失败: {e}", exc_info=True)
+                await self._rollback()
+                return False
+
+    async def get_messages(self, limit: int = 100, offset: int = 0) -> List[MessageRow]:
         """
         获取消息历史记录
 
@@ -171,7 +243,7 @@ class SQLiteDatabase(BaseDatabase):
             offset: 偏移量
 
         Returns:
-            List[Dict]: 消息列表
+            List[MessageRow]: 消息列表
         """
         if not self._ensure_connection():
             return []
@@ -184,25 +256,12 @@ class SQLiteDatabase(BaseDatabase):
             ''', (limit, offset))
 
             rows = await cursor.fetchall()
-            columns = [description[0] for description in cursor.description]
-
-            messages = []
-            for row in rows:
-                message = dict(zip(columns, row))
-                # 解析 JSON 字段
-                try:
-                    if message.get('message_content'):
-                        message['message_content'] = json.loads(message['message_content'])
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.debug(f"JSON 解析失败，保留原值: {e}")
-                messages.append(message)
-
-            return messages
+            return self._row_mapper.map_rows(cursor.description, rows)
         except Exception as e:
             logger.error(f"获取消息失败: {e}", exc_info=True)
             return []
     
-    async def get_message_by_id(self, message_id: str) -> Optional[Dict[str, Any]]:
+    async def get_message_by_id(self, message_id: str) -> Optional[MessageRow]:
         """
         根据ID获取单条消息
 
@@ -210,7 +269,7 @@ class SQLiteDatabase(BaseDatabase):
             message_id: 消息ID
 
         Returns:
-            Optional[Dict]: 消息字典，如果不存在返回 None
+            Optional[MessageRow]: 消息行，如果不存在返回 None
         """
         if not self._ensure_connection():
             return None
@@ -221,17 +280,7 @@ class SQLiteDatabase(BaseDatabase):
             ''', (message_id,))
 
             row = await cursor.fetchone()
-            if row:
-                columns = [description[0] for description in cursor.description]
-                message = dict(zip(columns, row))
-                # 解析 JSON 字段
-                try:
-                    if message.get('message_content'):
-                        message['message_content'] = json.loads(message['message_content'])
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.debug(f"JSON 解析失败，保留原值: {e}")
-                return message
-            return None
+            return self._row_mapper.map_row(cursor.description, row)
         except Exception as e:
             logger.error(f"获取消息失败: {e}", exc_info=True)
             return None
@@ -249,36 +298,56 @@ class SQLiteDatabase(BaseDatabase):
         if not self._ensure_connection():
             return False
 
-        try:
-            await self.connection.execute('''
-                DELETE FROM messages WHERE id = ?
-            ''', (message_id,))
-
-            await self.connection.commit()
-            logger.info(f"成功删除消息: {message_id}")
-            return True
-        except Exception as e:
-            logger.error(f"删除消息失败: {e}", exc_info=True)
-            return False
+        async with self._blob_lock:
+            try:
+                released = await self._referenced_blobs('id = ?', (message_id,))
+                await self.connection.execute('''
+                    DELETE FROM messages WHERE id = ?
+                ''', (message_id,))
+                await self._release_blobs(released)
+                dropped = await self._drop_unreferenced_blobs(released)
+
+                await self.connection.commit()
+                await self._delete_blob_files(dropped)
+                logger.info(f"成功删除消息: {message_id}")
+                return True
+            except Exception as e:
+                logger.error(f"删除消息失败: {e}", exc_info=True)
+                await self._rollback()
+                return False
 
     async def clear_all_messages(self) -> bool:
         """
         清空所有消息记录
 
+        只释放数据库中消息持有的图片引用：归档中的消息仍引用的图片继续保留
+
         Returns:
             bool: 是否清空成功
         """
         if not self._ensure_connection():
             return False
 
-        try:
-            await self.connection.execute('DELETE FROM messages')
-            await self.connection.commit()
-            logger.info("成功清空所有消息记录")
-            return True
-        except Exception as e:
-            logger.error(f"清空消息记录失败: {e}", exc_info=True)
-            return False
+        async with self._blob_lock:
+            try:
+                released = await self._referenced_blobs('1 = 1', ())
+                await self.connection.execute('DELETE FROM messages')
+                # 摘要来自已删除的消息，一并清空
+                await self.connection.execute('DELETE FROM conversation_summaries')
+                await self._release_blobs(released)
+
+                cursor = await self.connection.execute('SELECT digest FROM blobs WHERE ref_count <= 0')
+                dropped = [row[0] for row in await cursor.fetchall()]
+                await self.connection.execute('DELETE FROM blobs WHERE ref_count <= 0')
+
+                await self.connection.commit()
+                await self._delete_blob_files(dropped)
+                logger.info("成功清空所有消息记录")
+                return True
+            except Exception as e:
+                logger.error(f"清空消息记录失败: {e}", exc_info=True)
+                await self._rollback()
+                return False
 
     async def get_message_count(self) -> int:
         """
@@ -298,7 +367,7 @@ class SQLiteDatabase(BaseDatabase):
             logger.error(f"获取消息总数失败: {e}", exc_info=True)
             return 0
 
-    async def search_messages(self, keyword: str, limit: int = 100) -> List[Dict[str, Any]]:
+    async def search_messages(self, keyword: str, limit: int = 100) -> List[MessageRow]:
         """
         搜索包含关键词的消息
 
@@ -307,7 +376,7 @@ class SQLiteDatabase(BaseDatabase):
             limit: 返回结果数量限制
 
         Returns:
-            List[Dict]: 匹配的消息列表
+            List[MessageRow]: 匹配的消息列表
         """
         if not self._ensure_connection():
             return []
@@ -328,20 +397,347 @@ class SQLiteDatabase(BaseDatabase):
             ''', (f'%{escaped_keyword}%', f'%{escaped_keyword}%', limit))
 
             rows = await cursor.fetchall()
-            columns = [description[0] for description in cursor.description]
-
-            messages = []
-            for row in rows:
-                message = dict(zip(columns, row))
-                # 解析 JSON 字段
-                try:
-                    if message.get('message_content'):
-                        message['message_content'] = json.loads(message['message_content'])
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.debug(f"JSON 解析失败，保留原值: {e}")
-                messages.append(message)
-
-            return messages
+            return self._row_mapper.map_rows(cursor.description, rows)
         except Exception as e:
             logger.error(f"搜索消息失败: {e}", exc_info=True)
             return []
+
+    async def get_messages_after(self, timestamp: float, limit: int = 100, after_id: str = '') -> List[MessageRow]:
+        """
+        获取 (timestamp, id) 游标之后的消息（按时间、ID 正序）
+
+        同一时间戳有多条消息时，ID 作为第二排序键，分批读取不会漏掉同一时刻的其余消息
+
+        Args:
+            timestamp: 游标时间戳
+            limit: 返回消息数量限制
+            after_id: 游标消息 ID（空字符串表示包含该时间戳的所有消息）
+
+        Returns:
+            List[MessageRow]: 消息列表
+        """
+        if not self._ensure_connection():
+            return []
+
+        try:
+            cursor = await self.connection.execute('''
+                SELECT * FROM messages
+                WHERE (timestamp, id) > (?, ?)
+                ORDER BY timestamp ASC, id ASC
+                LIMIT ?
+            ''', (timestamp, after_id, limit))
+
+            rows = await cursor.fetchall()
+            return self._row_mapper.map_rows(cursor.description, rows)
+        except Exception as e:
+            logger.error(f"获取消息失败: {e}", exc_info=True)
+            return []
+
+    async def get_summary(self, summary_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取对话摘要
+
+        Args:
+            summary_id: 摘要ID
+
+        Returns:
+            Optional[Dict]: 摘要字典，不存在返回 None
+        """
+        if not self._ensure_connection():
+            return None
+
+        try:
+            cursor = await self.connection.execute('''
+                SELECT summary, covered_until, covered_id, message_count, updated_at
+                FROM conversation_summaries WHERE id = ?
+            ''', (summary_id,))
+
+            row = await cursor.fetchone()
+            if row:
+                columns = [description[0] for description in cursor.description]
+                return dict(zip(columns, row))
+            return None
+        except Exception as e:
+            logger.error(f"获取对话摘要失败: {e}", exc_info=True)
+            return None
+
+    async def save_summary(self, summary_id: str, summary: str, covered_until: float, message_count: int,
+                           covered_id: str = '') -> bool:
+        """
+        保存对话摘要
+
+        Args:
+            summary_id: 摘要ID
+            summary: 摘要内容
+            covered_until: 摘要覆盖到的最后一条消息时间戳
+            message_count: 摘要累计覆盖的消息条数
+            covered_id: 摘要覆盖到的最后一条消息 ID（与 covered_until 组成游标）
+
+        Returns:
+            bool: 是否保存成功
+        """
+        if not self._ensure_connection():
+            return False
+
+        try:
+            await self.connection.execute('''
+                INSERT OR REPLACE INTO conversation_summaries (
+                    id, summary, covered_until, covered_id, message_count, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            ''', (summary_id, summary, covered_until, covered_id, message_count, time.time()))
+
+            await self.connection.commit()
+            logger.debug(f"成功保存对话摘要: {summary_id}")
+            return True
+        except Exception as e:
+            logger.error(f"保存对话摘要失败: {e}", exc_info=True)
+            return False
+
+    async def get_oldest_messages(self, limit: int = 100, before: Optional[float] = None) -> List[MessageRow]:
+        """
+        获取最早的消息（按时间正序，供归档使用）
+
+        Args:
+            limit: 返回消息数量限制
+            before: 只返回该时间戳之前的消息（不含），None 表示不限制
+
+        Returns:
+            List[MessageRow]: 消息列表
+        """
+        if not self._ensure_connection():
+            return []
+
+        try:
+            if before is None:
+                cursor = await self.connection.execute('''
+                    SELECT * FROM messages
+                    ORDER BY timestamp ASC
+                    LIMIT ?
+                ''', (limit,))
+            else:
+                cursor = await self.connection.execute('''
+                    SELECT * FROM messages
+                    WHERE timestamp < ?
+                    ORDER BY timestamp ASC
+                    LIMIT ?
+                ''', (before, limit))
+
+            rows = await cursor.fetchall()
+            return self._row_mapper.map_rows(cursor.description, rows)
+        except Exception as e:
+            logger.error(f"获取最早的消息失败: {e}", exc_info=True)
+            return []
+
+    async def delete_messages(self, message_ids: List[str], keep_blobs: bool = False) -> int:
+        """
+        批量删除消息
+
+        Args:
+            message_ids: 消息ID列表
+            keep_blobs: 保留图片引用（消息移入归档时使用：归档中的 "blob:<摘要>" 引用继续计数，
+                图片文件不会被删除）
+
+        Returns:
+            int: 删除的消息条数
+        """
+        if not self._ensure_connection() or not message_ids:
+            return 0
+
+        async with self._blob_lock:
+            try:
+                released = []
+                chunks = [] if keep_blobs else range(0, len(message_ids), ID_CHUNK)
+                for start in chunks:
+                    chunk = message_ids[start:start + ID_CHUNK]
+                    placeholders = ', '.join('?' * len(chunk))
+                    released.extend(await self._referenced_blobs(f'id IN ({placeholders})', chunk))
+
+                cursor = await self.connection.executemany('''
+                    DELETE FROM messages WHERE id = ?
+                ''', [(message_id,) for message_id in message_ids])
+                deleted = cursor.rowcount
+                await self._release_blobs(released)
+                dropped = await self._drop_unreferenced_blobs(released)
+
+                await self.connection.commit()
+                await self._delete_blob_files(dropped)
+                logger.debug(f"成功删除 {deleted} 条消息")
+                return deleted
+            except Exception as e:
+                logger.error(f"批量删除消息失败: {e}", exc_info=True)
+                await self._rollback()
+                return 0
+
+    async def _pragma(self, name: str) -> int:
+        cursor = await self.connection.execute(f'PRAGMA {name}')
+        row = await cursor.fetchone()
+        return row[0] if row else 0
+
+    async def get_storage_stats(self) -> Dict[str, int]:
+        """
+        获取存储占用
+
+        Returns:
+            Dict: {'file_bytes': 文件大小, 'used_bytes': 有效数据大小, 'free_pages': 空闲页数}
+        """
+        if not self._ensure_connection():
+            return {}
+
+        try:
+            page_size = await self._pragma('page_size')
+            page_count = await self._pragma('page_count')
+            free_pages = await self._pragma('freelist_count')
+            return {
+                'file_bytes': page_count * page_size,
+                'used_bytes': (page_count - free_pages) * page_size,
+                'free_pages': free_pages,
+            }
+        except Exception as e:
+            logger.error(f"获取存储占用失败: {e}", exc_info=True)
+            return {}
+
+    async def compact(self, max_pages: int = 0) -> int:
+        """
+        回收空闲空间
+
+        使用 SQLite 的增量回收（PRAGMA incremental_vacuum），每次只释放一部分空闲页。
+        旧版本创建的数据库没有开启 auto_vacuum，第一次调用时执行一次完整 VACUUM 转换。
+
+        Args:
+            max_pages: 本次最多回收的页数，0 表示全部
+
+        Returns:
+            int: 回收的页数
+        """
+        if not self._ensure_connection():
+            return 0
+
+        try:
+            before = await self._pragma('freelist_count')
+            if await self._pragma('auto_vacuum') != 2:
+                logger.info("数据库未开启增量回收，执行一次完整 VACUUM 进行转换")
+                await self.connection.commit()
+                await self.connection.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                await self.connection.execute('VACUUM')
+                return before
+
+            if before == 0:
+                return 0
+            cursor = await self.connection.execute(f'PRAGMA incremental_vacuum({max(0, int(max_pages))})')
+            await cursor.fetchall()
+            await self.connection.commit()
+            freed = before - await self._pragma('freelist_count')
+            logger.debug(f"回收了 {freed} 个空闲页")
+            return freed
+        except Exception as e:
+            logger.error(f"回收数据库空间失败: {e}", exc_info=True)
+            return 0
+
+    # ===================================================================
+    # 图片存储
+    # ===================================================================
+
+    async def _rollback(self):
+        try:
+            await self.connection.rollback()
+        except Exception:
+            pass
+
+    async def _referenced_blobs(self, where: str, params) -> List[str]:
+        """查询满足条件的消息引用的图片摘要（只解析包含引用的消息内容）"""
+        cursor = await self.connection.execute(
+            f"SELECT message_type, message_content FROM messages WHERE {where} AND message_content LIKE '%blob:%'",
+            tuple(params),
+        )
+        digests = []
+        for message_type, message_content in await cursor.fetchall():
+            try:
+                digests.extend(find_blob_refs(message_type, json.loads(message_content)))
+            except (json.JSONDecodeError, TypeError):
+                continue
+        return digests
+
+    async def _release_blobs(self, digests: List[str]):
+        """减少引用计数（每个引用一次）"""
+        if digests:
+            await self.connection.executemany(
+                'UPDATE blobs SET ref_count = ref_count - 1 WHERE digest = ?',
+                [(digest,) for digest in digests],
+            )
+
+    async def _drop_unreferenced_blobs(self, digests: List[str]) -> List[str]:
+        """删除其中引用计数归零的登记，返回需要删除文件的摘要"""
+        candidates = list(set(digests))
+        if not candidates:
+            return []
+        placeholders = ', '.join('?' * len(candidates))
+        cursor = await self.connection.execute(
+            f'SELECT digest FROM blobs WHERE ref_count <= 0 AND digest IN ({placeholders})', candidates
+        )
+        dropped = [row[0] for row in await cursor.fetchall()]
+        if dropped:
+            await self.connection.executemany('DELETE FROM blobs WHERE digest = ?', [(digest,) for digest in dropped])
+        return dropped
+
+    async def _delete_blob_files(self, digests: List[str]):
+        if digests:
+            await asyncio.to_thread(lambda: [self.blobs.delete(digest) for digest in digests])
+            logger.debug(f"删除了 {len(digests)} 个不再引用的图片")
+
+    async def get_blob(self, digest: str) -> Optional[bytes]:
+        """
+        读取图片
+
+        Args:
+            digest: 图片摘要
+
+        Returns:
+            Optional[bytes]: 图片数据，不存在返回 None
+        """
+        return await asyncio.to_thread(self.blobs.get, digest)
+
+    async def get_thumbnail(self, digest: str, max_size: int = THUMBNAIL_SIZE) -> Optional[str]:
+        """
+        获取图片缩略图路径（第一次请求时生成）
+
+        Args:
+            digest: 图片摘要
+            max_size: 最长边像素
+
+        Returns:
+            Optional[str]: 缩略图路径，图片不存在返回 None
+        """
+        try:
+            return await asyncio.to_thread(self.blobs.thumbnail, digest, max_size)
+        except Exception as e:
+            logger.warning(f"生成缩略图失败: {e}")
+            return None
+
+    async def collect_garbage(self) -> int:
+        """
+        清理不再引用的图片：引用计数归零的登记，以及没有登记的旧文件（保存中途退出留下的）
+
+        Returns:
+            int: 删除的图片数量
+        """
+        if not self._ensure_connection():
+            return 0
+
+        async with self._blob_lock:
+            try:
+                cursor = await self.connection.execute('SELECT digest FROM blobs WHERE ref_count <= 0')
+                dropped = [row[0] for row in await cursor.fetchall()]
+                if dropped:
+                    await self.connection.execute('DELETE FROM blobs WHERE ref_count <= 0')
+                    await self.connection.commit()
+
+                cursor = await self.connection.execute('SELECT digest FROM blobs')
+                known = {row[0] for row in await cursor.fetchall()}
+                files = await asyncio.to_thread(lambda: list(self.blobs.iter_digests(ORPHAN_BLOB_AGE)))
+                dropped.extend(digest for digest in files if digest not in known and digest not in dropped)
+
+                await self._delete_blob_files(dropped)
+                return len(dropped)
+            except Exception as e:
+                logger.error(f"清理图片失败: {e}", exc_info=True)
+                return 0
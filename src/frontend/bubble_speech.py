@@ -254,15 +254,7 @@ class SpeechBubbleList():
         else:
             text_content = message
         
-        new_bubble = SpeechBubble(
-            parent=self.parent,
-            bubble_type=msg_type,
-            text=text_content,
-            pixmap=pixmap,
-            on_click=on_click or self.on_bubble_click
-        )
-        self._active_bubbles.append(new_bubble)
-        new_bubble.show_message()
+        self._append_bubble(text_content, msg_type, pixmap, on_click)
         self.update_position()
         
         # 异步保存到数据库（不阻塞UI）
@@ -272,6 +264,42 @@ class SpeechBubbleList():
             else:
                 self._async_save(self._save_message_to_db(text_content, msg_type))
 
+    def add_messages(self, items: list[dict], msg_type: Literal["received", "sent"] = "received"):
+        """批量添加消息：每条消息单独成气泡、单独入库，但只做一次布局
+        
+        参数:
+            items: 入站消息条目列表，格式 {'text': str, 'image': QImage | None, 'seg_type': str}
+            msg_type: 消息类型
+        """
+        if not items:
+            return
+
+        saved_texts = []
+        for item in items:
+            text_content = item.get('text') or ''
+            image = item.get('image')
+            pixmap = QPixmap.fromImage(image) if isinstance(image, QImage) else None
+            self._append_bubble(text_content, msg_type, pixmap)
+            saved_texts.append(text_content or f"[{item.get('seg_type') or 'image'}]")
+        self.update_position()
+
+        # 按到达顺序逐条入库
+        if self.use_database:
+            self._async_save(self._save_messages_to_db(saved_texts, msg_type))
+
+    def _append_bubble(self, text: str, msg_type: str, pixmap: Optional[QPixmap] = None, on_click=None) -> SpeechBubble:
+        """创建并显示一个气泡（不更新布局）"""
+        new_bubble = SpeechBubble(
+            parent=self.parent,
+            bubble_type=msg_type,
+            text=text,
+            pixmap=pixmap,
+            on_click=on_click or self.on_bubble_click
+        )
+        self._active_bubbles.append(new_bubble)
+        new_bubble.show_message()
+        return new_bubble
+
     def add_notice(self, text: str, on_click=None):
         """添加低调系统提示，不保存到聊天历史。"""
         self.add_message(message=text, msg_type="notice", save_to_db=False, on_click=on_click)
@@ -330,6 +358,11 @@ class SpeechBubbleList():
         except Exception as e:
             logger.error(f"保存消息到数据库失败: {e}")
     
+    async def _save_messages_to_db(self, texts: list[str], msg_type: Literal["received", "sent"]):
+        """按顺序逐条保存一批文本消息"""
+        for text in texts:
+            await self._save_message_to_db(text, msg_type)
+
     async def load_history(self, limit: int = 20):
         """从数据库加载历史消息
         
@@ -350,20 +383,31 @@ class SpeechBubbleList():
             # 按时间顺序显示（从旧到新），所以需要反转列表
             messages = list(reversed(messages))
             
-            for msg_dict in messages:
-                # 从字典创建 MessageBase 对象
-                message_obj = MessageBase.from_dict(msg_dict)
-                
-                # 直接使用 MessageBase 对象添加消息
-                self.add_message(
-                    message=message_obj,
-                    save_to_db=False  # 避免重复保存
-                )
+            for row in messages:
+                # 数据库返回 MessageRow，直接使用显示文本，不构建 MessageBase
+                text = row.text
+                pixmap = await self._load_thumbnail(row)
+                if text or pixmap is not None:
+                    self.add_message(
+                        message=text,
+                        msg_type="sent" if row.is_sent else "received",
+                        pixmap=pixmap,
+                        save_to_db=False  # 避免重复保存
+                    )
             
             logger.info(f"已加载 {len(messages)} 条历史消息")
         except Exception as e:
             logger.error(f"加载历史消息失败: {e}")
     
+    @staticmethod
+    async def _load_thumbnail(row) -> Optional[QPixmap]:
+        """历史消息中第一张图片的缩略图（第一次显示时生成），没有图片返回 None"""
+        digests = row.blob_digests
+        if not digests:
+            return None
+        path = await db_manager.get_thumbnail(digests[0])
+        return QPixmap(path) if path else None
+
     async def search_messages(self, keyword: str, limit: int = 20):
         """从数据库搜索消息并显示
         
@@ -401,6 +445,9 @@ class SpeechBubbleList():
         try:
             # 清空数据库
             await db_manager.clear_all_messages()
+            # 对话摘要随聊天记录一起清空
+            from src.core.chat import chat_manager
+            chat_manager.reset_summary()
             logger.info("已清空数据库中的所有消息")
             return True
         except Exception as e:
@@ -8,7 +8,7 @@ from pathlib import Path
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
                               QPushButton, QScrollArea, QLabel, QApplication)
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QCursor
+from PyQt5.QtGui import QFont, QCursor, QImage, QPixmap
 
 from src.frontend.chat_bubble import ChatBubbleList
 from src.frontend.signals import signals_bus
@@ -221,11 +221,22 @@ class ChatWindow(QWidget):
     def init_signals(self):
         """初始化信号连接"""
         signals_bus.message_received.connect(self._on_message_received)
+        signals_bus.messages_received.connect(self._on_messages_received)
 
     def _on_message_received(self, text: str):
         """接收到新消息"""
         self.add_message(text=text, msg_type="received")
 
+    def _on_messages_received(self, items: list):
+        """接收到一批入站消息，只滚动一次"""
+        for item in items:
+            text = item.get('text') or ''
+            image = item.get('image')
+            pixmap = QPixmap.fromImage(image) if isinstance(image, QImage) else None
+            if text or pixmap is not None:
+                self.bubble_list.add_message(text=text, msg_type="received", pixmap=pixmap)
+        self._scroll_to_bottom()
+
     def add_message(self, text: str, msg_type: str = "received"):
         """向聊天窗口添加一条消息。"""
         if not text:
@@ -280,32 +291,16 @@ class ChatWindow(QWidget):
             messages = await db_manager.get_messages(limit=50)
             messages = list(reversed(messages))  # 从旧到新
 
-            for msg_dict in messages:
-                # 数据库返回的是扁平格式，直接提取字段
-                # 不需要使用 MessageBase.from_dict
-                user_id = msg_dict.get('user_id', '1')
-                message_content = msg_dict.get('message_content', '')
-
-                # 解析 message_content（可能是 JSON）
-                import json
-                try:
-                    if message_content:
-                        message_content = json.loads(message_content)
-                    else:
-                        message_content = ''
-                except (json.JSONDecodeError, TypeError):
-                    pass  # 保持原值
-
-                # 判断消息类型：user_id 为 "0" 表示发送
-                if user_id == "0":
-                    msg_type = "sent"
-                else:
-                    msg_type = "received"
-
-                # 转换为字符串显示
-                text = str(message_content) if message_content else ''
-                if text:
-                    self.bubble_list.add_message(text=text, msg_type=msg_type)
+            for row in messages:
+                # 数据库返回 MessageRow，text 优先使用 raw_message，不需要解析消息内容
+                text = row.text
+                digests = row.blob_digests
+                path = await db_manager.get_thumbnail(digests[0]) if digests else None
+                pixmap = QPixmap(path) if path else None
+                if text or pixmap is not None:
+                    self.bubble_list.add_message(
+                        text=text, msg_type="sent" if row.is_sent else "received", pixmap=pixmap
+                    )
 
             self._scroll_to_bottom()
             logger.info(f"已加载 {len(messages)} 条历史消息")
@@ -3,16 +3,18 @@ Live2D 动画调度器
 负责管理 Live2D 模型的动画播放调度，实现随机动作切换
 """
 
+import bisect
 import random
 import time
 import logging
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Tuple
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
 from ..models.live2d_model_info import (
     Live2DModelInfoExtractor,
     MotionInfo,
-    Live2DModelInfo
+    Live2DModelInfo,
+    get_model_info_index
 )
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,9 @@ class AnimationScheduler(QObject):
     2. 随机时间后执行其他动作
     3. 支持动作组权重配置
     4. 支持动作组白名单和黑名单
+    
+    可选的随机动作及其累计权重预先计算成表，只在过滤条件或权重变化时重建，
+    选择动作时二分查找；下一个随机动作在进入待机时就预先选好
     """
     
     # 信号：动作改变
@@ -69,6 +74,14 @@ class AnimationScheduler(QObject):
         # 可用的随机动作列表（不包括待机动作）
         self.random_motions: List[MotionInfo] = []
         
+        # 预计算的动作表：过滤后的随机动作及累计权重，动作在组内的序号
+        self._eligible_motions: List[MotionInfo] = []
+        self._cumulative_weights: List[float] = []
+        self._motion_numbers: Dict[Tuple[str, str], int] = {}
+        
+        # 预先选好的下一个随机动作
+        self._next_random_motion: Optional[MotionInfo] = None
+        
         # 定时器
         self.idle_timer: Optional[QTimer] = None
         self.random_motion_timer: Optional[QTimer] = None
@@ -97,7 +110,7 @@ class AnimationScheduler(QObject):
     def _load_model_info(self):
         """加载模型信息"""
         try:
-            self.extractor = Live2DModelInfoExtractor(self.model_path)
+            self.extractor = Live2DModelInfoExtractor(self.model_path, index=get_model_info_index())
             self.model_info = self.extractor.extract()
             
             # 提取待机动作
@@ -108,6 +121,14 @@ class AnimationScheduler(QObject):
             idle_motion_names = {m.name for m in self.idle_motions}
             self.random_motions = [m for m in all_motions if m.name not in idle_motion_names]
             
+            # 动作在组内的序号（用于 StartMotion）
+            self._motion_numbers = {
+                (motion.group, motion.file): number
+                for motions in self.model_info.motions.values()
+                for number, motion in enumerate(motions)
+            }
+            self._rebuild_motion_table()
+            
             logger.info(f"模型信息加载成功:")
             logger.info(f"  待机动作: {len(self.idle_motions)} 个")
             logger.info(f"  随机动作: {len(self.random_motions)} 个")
@@ -156,6 +177,7 @@ class AnimationScheduler(QObject):
                      权重越大，被选中的概率越高
         """
         self.group_weights = weights
+        self._rebuild_motion_table()
         logger.info(f"动作组权重已更新: {weights}")
     
     def set_group_whitelist(self, groups: List[str]):
@@ -172,6 +194,7 @@ class AnimationScheduler(QObject):
         else:
             self.group_whitelist = None
             logger.info("已清空动作组白名单")
+        self._rebuild_motion_table()
     
     def set_group_blacklist(self, groups: List[str]):
         """
@@ -187,6 +210,7 @@ class AnimationScheduler(QObject):
         else:
             self.group_blacklist = None
             logger.info("已清空动作组黑名单")
+        self._rebuild_motion_table()
     
     def set_enabled(self, enabled: bool):
         """
@@ -287,20 +311,16 @@ class AnimationScheduler(QObject):
         self.state_changed.emit("idle")
     
     def _play_random_motion(self):
-        """播放随机动作"""
+        """播放随机动作（使用预先选好的动作，并预选下一个）"""
         if not self.random_motions:
             logger.warning("没有可用的随机动作")
             return
         
-        # 过滤动作（根据白名单和黑名单）
-        filtered_motions = self._filter_motions(self.random_motions)
-        
-        if not filtered_motions:
+        motion = self._next_random_motion or self._select_motion_by_weight()
+        if motion is None:
             logger.warning("过滤后没有可用的随机动作")
             return
-        
-        # 根据权重选择动作
-        motion = self._select_motion_by_weight(filtered_motions)
+        self._next_random_motion = self._select_motion_by_weight()
         
         logger.debug(f"播放随机动作: {motion.name} (组: {motion.group})")
         
@@ -332,28 +352,50 @@ class AnimationScheduler(QObject):
         # 没有过滤条件，返回所有动作
         return motions
     
-    def _select_motion_by_weight(self, motions: List[MotionInfo]) -> MotionInfo:
+    def _rebuild_motion_table(self):
+        """重建可选动作表（过滤后的动作和累计权重），并重新预选下一个动作"""
+        eligible = []
+        cumulative = []
+        total = 0.0
+        for motion in self._filter_motions(self.random_motions):
+            weight = self.group_weights.get(motion.group, 1.0)
+            if weight <= 0:
+                continue
+            total += weight
+            eligible.append(motion)
+            cumulative.append(total)
+        
+        self._eligible_motions = eligible
+        self._cumulative_weights = cumulative
+        self._next_random_motion = self._select_motion_by_weight()
+    
+    def _select_motion_by_weight(self) -> Optional[MotionInfo]:
         """
-        根据权重选择动作
+        根据权重从预计算的动作表中选择动作（二分查找累计权重）
         
-        Args:
-            motions: 动作列表
-            
         Returns:
-            选中的动作
+            选中的动作，没有可选动作时返回 None
         """
-        # 如果没有设置权重，随机选择
-        if not self.group_weights:
-            return random.choice(motions)
+        if not self._eligible_motions:
+            return None
         
-        # 计算每个动作的权重
-        weights = []
-        for motion in motions:
-            weight = self.group_weights.get(motion.group, 1.0)
-            weights.append(weight)
+        point = random.random() * self._cumulative_weights[-1]
+        index = bisect.bisect_right(self._cumulative_weights, point)
+        return self._eligible_motions[min(index, len(self._eligible_motions) - 1)]
+    
+    def get_next_motion(self) -> Optional[MotionInfo]:
+        """获取预先选好的下一个随机动作"""
+        return self._next_random_motion
+    
+    def get_motion_number(self, group: str, motion_file: str) -> int:
+        """
+        获取动作在组内的序号（StartMotion 使用的 no 参数）
         
-        # 根据权重选择
-        return random.choices(motions, weights=weights, k=1)[0]
+        Args:
+            group: 动作组名称
+            motion_file: 动作文件路径
+        """
+        return self._motion_numbers.get((group, motion_file), 0)
     
     def _on_idle_timeout(self):
         """待机定时器超时回调"""
@@ -4,6 +4,7 @@
 """
 
 import logging
+import os
 from typing import Optional
 from PyQt5.QtCore import QObject, QPoint, QTimer
 from PyQt5.QtWidgets import QMenu
@@ -99,6 +100,17 @@ class EventManager(QObject):
         elif self.bubble_manager:
             self.bubble_manager.show_message(text, msg_type="received")
     
+    def _hits_pet(self, event) -> bool:
+        """
+        事件位置是否落在桌宠的不透明区域
+        
+        窗口掩码生效时透明区域本来就收不到事件；平台不支持窗口掩码（或掩码尚未生成）时，
+        透明区域的点击在这里忽略，不触发拖动、双击和菜单
+        """
+        if not self.render_manager:
+            return True
+        return self.render_manager.hit_test(event.x(), event.y())
+    
     def handle_mouse_press(self, event):
         """
         处理鼠标按下事件
@@ -106,6 +118,10 @@ class EventManager(QObject):
         Args:
             event: 鼠标事件
         """
+        if not self._hits_pet(event):
+            event.ignore()
+            return
+        
         if event.button() == 1:  # 左键
             self.drag_start_position = event.globalPos() - self.parent.frameGeometry().topLeft()
             
@@ -139,6 +155,7 @@ class EventManager(QObject):
         if self._live2d_tracking_enabled and self.render_manager:
             self._update_live2d_tracking(event)
         
+        # 只有在不透明区域按下时才会开始拖动，透明区域的移动不做其他处理
         if self.drag_start_position:
             # 窗口移动时委托给渲染器处理
             rel_x = event.x() / self.parent.width()
@@ -228,6 +245,36 @@ class EventManager(QObject):
         if smooth is not None:
             self._smooth_factor = max(0.01, min(1.0, smooth))
     
+    def apply_tracking_config(self, config):
+        """
+        应用配置文件中的鼠标跟踪设置
+        
+        Args:
+            config: 主配置对象（没有 [tracking] 节时使用默认值）
+        """
+        tracking_config = getattr(config, 'tracking', None) if config else None
+        if tracking_config is None:
+            return
+        self.set_tracking_sensitivity(
+            head=tracking_config.head_sensitivity,
+            eye=tracking_config.eye_sensitivity,
+            body=tracking_config.body_sensitivity,
+            smooth=tracking_config.smooth_factor
+        )
+        if tracking_config.enabled != self._live2d_tracking_enabled:
+            self.set_tracking_enabled(tracking_config.enabled)
+    
+    def apply_config_change(self, change):
+        """
+        应用运行中修改的配置（由配置监视器通知，需在主线程调用）
+        
+        Args:
+            change: ConfigChange 对象
+        """
+        if change.changed('tracking'):
+            self.apply_tracking_config(change.new)
+            logger.info("鼠标跟踪配置已更新")
+    
     def get_tracking_status(self) -> dict:
         """
         获取当前跟踪状态
@@ -255,6 +302,10 @@ class EventManager(QObject):
         Args:
             event: 鼠标事件
         """
+        if not self._hits_pet(event):
+            event.ignore()
+            return
+        
         if event.button() == 1:  # 左键
             # 触发交互事件（摸摸头）
             logger.info("检测到双击事件，触发摸摸头动作")
@@ -292,6 +343,10 @@ class EventManager(QObject):
         Args:
             event: 鼠标事件
         """
+        if not self._hits_pet(event):
+            event.ignore()
+            return
+        
         # 暂停移动线程
         if self.move_worker:
             self.stop_move_worker()
@@ -370,6 +425,15 @@ class EventManager(QObject):
                 live2d_action.setText("✓ Live2D")
             live2d_action.triggered.connect(lambda: self.switch_render_mode("live2d"))
         
+        # 渲染性能统计
+        if self.render_manager:
+            stats_enabled = self.render_manager.is_frame_stats_enabled()
+            stats_action = menu.addAction("✓ 📊 性能监视" if stats_enabled else "📊 性能监视")
+            stats_action.triggered.connect(self.toggle_frame_stats)
+            if stats_enabled:
+                export_action = menu.addAction("💾 导出性能数据")
+                export_action.triggered.connect(self.export_frame_stats)
+        
         # 退出选项
         exit_action = menu.addAction("❌ 退出")
         exit_action.triggered.connect(self.parent.safe_quit)
@@ -404,21 +468,10 @@ class EventManager(QObject):
     def change_scale(self, new_scale: float):
         """改变界面缩放倍率"""
         try:
-            import tomli
-            import tomli_w
-            
-            # 更新配置文件
-            with open("config.toml", "rb") as f:
-                config_data = tomli.load(f)
-            
-            # 更新缩放倍率
-            if 'interface' not in config_data:
-                config_data['interface'] = {}
-            config_data['interface']['scale_factor'] = new_scale
-            
-            # 写回配置文件
-            with open("config.toml", "w", encoding='utf-8') as f:
-                f.write(tomli_w.dumps(config_data))
+            from config import schedule_config_update
+
+            # 记录缩放倍率，稍后与其他修改合并写入配置文件
+            schedule_config_update('interface', 'scale_factor', new_scale)
             
             self._show_notice(f"缩放已调整为 {new_scale}x，重启程序后生效")
             
@@ -437,6 +490,22 @@ class EventManager(QObject):
                 logger.error(f"切换渲染模式失败: {e}")
                 self._show_notice(f"切换模式失败: {e}")
     
+    def toggle_frame_stats(self):
+        """开启或关闭渲染性能统计悬浮显示"""
+        if self.render_manager:
+            self.render_manager.set_frame_stats_enabled(not self.render_manager.is_frame_stats_enabled())
+    
+    def export_frame_stats(self):
+        """导出渲染性能统计（JSON 和 CSV）"""
+        if not self.render_manager:
+            return
+        
+        paths = self.render_manager.export_frame_stats()
+        if paths:
+            self._show_notice(f"性能数据已导出到 {os.path.dirname(os.path.abspath(paths[0]))}")
+        else:
+            self._show_notice("导出性能数据失败")
+    
     def start_move_worker(self):
         """启动移动工作线程"""
         self.move_worker = MoveWorker(self.drag_start_position, self.parent)
@@ -3,8 +3,7 @@
 负责注册和管理全局热键
 """
 
-from typing import Callable, Optional, Dict
-from pynput import keyboard
+from typing import Callable, Optional, Dict, Any
 from src.util.logger import logger
 
 
@@ -20,7 +19,7 @@ class HotkeyManager:
     
     def __init__(self):
         self.hotkeys = {}  # {快捷键名称: (快捷键字符串, 回调函数)}
-        self.listener: Optional[keyboard.Listener] = None
+        self.listener: Optional[Any] = None  # pynput.keyboard.GlobalHotKeys
         self._is_listening = False
         
         logger.info("热键管理器初始化完成")
@@ -93,7 +92,8 @@ class HotkeyManager:
                 logger.error("没有有效的热键可以注册")
                 return False
             
-            # 创建全局热键监听器
+            # 创建全局热键监听器（pynput 在首次启动监听时才导入）
+            from pynput import keyboard
             self.listener = keyboard.GlobalHotKeys(hotkey_map)
             self.listener.start()
             self._is_listening = True
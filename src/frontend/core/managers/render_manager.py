@@ -5,14 +5,24 @@
 
 import logging
 import os
+import time
+from collections import OrderedDict
 from typing import Optional
 
+from PyQt5.QtCore import QPoint, QTimer
+
 from ..render.interfaces import IRenderer
 from ..render.static_renderer import StaticRenderer
-from ..render.live2d_renderer import Live2DRenderer
+from ..render.hit_mask import AlphaHitMask
+from ..render.frame_stats import FrameStatsOverlay, FrameStatsRecorder
+from src.util.log_throttle import ThrottledLogger
+# Live2DRenderer 依赖 OpenGL/live2d，仅在使用 Live2D 模式时才导入
 
 logger = logging.getLogger(__name__)
 
+# 鼠标跟踪每帧调用的路径：采样（约每秒考虑 1 次）并限流
+_tracking_log = ThrottledLogger(logger, interval=10.0, sample_every=60)
+
 
 class RenderManager:
     """
@@ -20,11 +30,16 @@ class RenderManager:
     
     职责：
     - 创建和管理渲染器
-    - 切换渲染模式
+    - 切换渲染模式（缓存挂起的渲染器，切回时直接恢复）
     - 设置动画状态和表情
     - 处理鼠标移动事件
+    - 按渲染结果的透明区域更新窗口输入掩码（点击穿透）
+    - 可选的渲染性能统计（悬浮显示与导出）
     """
     
+    # 性能统计悬浮显示的刷新间隔（毫秒）
+    FRAME_STATS_INTERVAL_MS = 500
+    
     def __init__(self, parent):
         """
         初始化渲染管理器
@@ -49,6 +64,28 @@ class RenderManager:
         # 动画调度器配置
         self.enable_animation_scheduler: bool = True
         
+        # 待机动画烘焙配置
+        self.baked_idle: bool = False
+        self.baked_idle_delay: float = 10.0
+        self.baked_idle_scale: float = 0.5
+        self.baked_idle_fps: int = 20
+        self.baked_idle_cache_dir: str = "data/cache/baked_idle"
+        
+        # 挂起的渲染器缓存（按最近使用排序）及其内存预算
+        self._renderer_cache: "OrderedDict[str, IRenderer]" = OrderedDict()
+        self.renderer_cache_bytes: int = 256 * 1024 * 1024
+        
+        # 透明区域点击穿透配置与状态
+        self.click_through: bool = True
+        self.hit_mask_interval: int = 500
+        self._hit_mask: Optional[AlphaHitMask] = None
+        self._hit_mask_timer: Optional[QTimer] = None
+        
+        # 渲染性能统计（默认关闭）
+        self.frame_stats: Optional[FrameStatsRecorder] = None
+        self._stats_overlay: Optional[FrameStatsOverlay] = None
+        self._stats_timer: Optional[QTimer] = None
+        
         # 加载配置
         self.load_config()
         
@@ -69,6 +106,8 @@ class RenderManager:
             if render_config:
                 render_mode = getattr(render_config, 'mode', 'static')
                 self.allow_switch = getattr(render_config, 'allow_switch', True)
+                self.click_through = getattr(render_config, 'click_through', True)
+                self.hit_mask_interval = getattr(render_config, 'hit_mask_interval', 500)
                 
                 # 判断是否使用 Live2D
                 self.use_live2d = (render_mode == 'live2d')
@@ -85,6 +124,12 @@ class RenderManager:
                 self.custom_scale = getattr(live2d_config, 'custom_scale', 0.0)
                 self.custom_offset_x = getattr(live2d_config, 'custom_offset_x', 0.0)
                 self.custom_offset_y = getattr(live2d_config, 'custom_offset_y', 0.0)
+                # 加载待机动画烘焙配置
+                self.baked_idle = getattr(live2d_config, 'baked_idle', False)
+                self.baked_idle_delay = getattr(live2d_config, 'baked_idle_delay', 10.0)
+                self.baked_idle_scale = getattr(live2d_config, 'baked_idle_scale', 0.5)
+                self.baked_idle_fps = getattr(live2d_config, 'baked_idle_fps', 20)
+                self.baked_idle_cache_dir = getattr(live2d_config, 'baked_idle_cache_dir', "data/cache/baked_idle")
             else:
                 self.live2d_model_path = ""
                 self.custom_scale = 0.0
@@ -92,33 +137,24 @@ class RenderManager:
                 self.custom_offset_y = 0.0
             
             # 获取动画调度器配置
-            animation_scheduler_config = getattr(config, 'animation_scheduler', None)
-            if animation_scheduler_config:
-                self.enable_animation_scheduler = getattr(animation_scheduler_config, 'enabled', True)
-                # 读取调度器详细配置
-                self.scheduler_idle_interval_min = getattr(animation_scheduler_config, 'idle_interval_min', 30.0)
-                self.scheduler_idle_interval_max = getattr(animation_scheduler_config, 'idle_interval_max', 90.0)
-                self.scheduler_random_motion_duration = getattr(animation_scheduler_config, 'random_motion_duration', 5.0)
-                self.scheduler_group_weights = getattr(animation_scheduler_config, 'group_weights', None) or {}
-                self.scheduler_whitelist = getattr(animation_scheduler_config, 'whitelist', None) or []
-                self.scheduler_blacklist = getattr(animation_scheduler_config, 'blacklist', None) or []
-            else:
-                self.enable_animation_scheduler = True
-                self.scheduler_idle_interval_min = 30.0
-                self.scheduler_idle_interval_max = 90.0
-                self.scheduler_random_motion_duration = 5.0
-                self.scheduler_group_weights = {}
-                self.scheduler_whitelist = []
-                self.scheduler_blacklist = []
+            self._read_scheduler_config(config)
+            
+            # 获取性能配置（渲染器缓存预算）
+            performance_config = getattr(config, 'performance', None)
+            texture_cache_size = getattr(performance_config, 'texture_cache_size', 256) if performance_config else 256
+            self.renderer_cache_bytes = max(0, int(texture_cache_size)) * 1024 * 1024
             
             logger.info(f"加载渲染配置: use_live2d={self.use_live2d}, "
                        f"model_path={self.live2d_model_path}, "
                        f"allow_switch={self.allow_switch}, "
+                       f"click_through={self.click_through}, "
                        f"custom_scale={self.custom_scale}, "
                        f"custom_offset=({self.custom_offset_x}, {self.custom_offset_y}), "
                        f"enable_animation_scheduler={self.enable_animation_scheduler}, "
+                       f"baked_idle={self.baked_idle}, "
                        f"scheduler_config=({self.scheduler_idle_interval_min}-{self.scheduler_idle_interval_max}s, "
-                       f"{self.scheduler_random_motion_duration}s duration)")
+                       f"{self.scheduler_random_motion_duration}s duration), "
+                       f"renderer_cache={texture_cache_size}MB")
         except Exception as e:
             logger.error(f"加载渲染配置失败: {e}")
             # 使用默认配置
@@ -126,28 +162,89 @@ class RenderManager:
             self.live2d_model_path = ""
             self.allow_switch = True
     
+    def _read_scheduler_config(self, config):
+        """读取动画调度器配置"""
+        animation_scheduler_config = getattr(config, 'animation_scheduler', None)
+        if animation_scheduler_config:
+            self.enable_animation_scheduler = getattr(animation_scheduler_config, 'enabled', True)
+            # 读取调度器详细配置
+            self.scheduler_idle_interval_min = getattr(animation_scheduler_config, 'idle_interval_min', 30.0)
+            self.scheduler_idle_interval_max = getattr(animation_scheduler_config, 'idle_interval_max', 90.0)
+            self.scheduler_random_motion_duration = getattr(animation_scheduler_config, 'random_motion_duration', 5.0)
+            self.scheduler_group_weights = getattr(animation_scheduler_config, 'group_weights', None) or {}
+            self.scheduler_whitelist = getattr(animation_scheduler_config, 'whitelist', None) or []
+            self.scheduler_blacklist = getattr(animation_scheduler_config, 'blacklist', None) or []
+        else:
+            self.enable_animation_scheduler = True
+            self.scheduler_idle_interval_min = 30.0
+            self.scheduler_idle_interval_max = 90.0
+            self.scheduler_random_motion_duration = 5.0
+            self.scheduler_group_weights = {}
+            self.scheduler_whitelist = []
+            self.scheduler_blacklist = []
+    
+    def apply_config_change(self, change):
+        """
+        应用运行中修改的配置（由配置监视器通知，需在主线程调用）
+        
+        动画调度器和点击穿透设置立即生效；渲染模式、模型等设置需要重启
+        
+        Args:
+            change: ConfigChange 对象
+        """
+        config = change.new
+        
+        if change.changed('animation_scheduler'):
+            self._read_scheduler_config(config)
+            # 当前渲染器和缓存中挂起的渲染器都需要更新
+            for renderer in [self.renderer, *self._renderer_cache.values()]:
+                get_scheduler = getattr(renderer, 'get_animation_scheduler', None)
+                scheduler = get_scheduler() if get_scheduler else None
+                if not scheduler:
+                    continue
+                try:
+                    scheduler.set_idle_interval(self.scheduler_idle_interval_min, self.scheduler_idle_interval_max)
+                    scheduler.set_random_motion_duration(self.scheduler_random_motion_duration)
+                    scheduler.set_group_weights(self.scheduler_group_weights)
+                    scheduler.set_group_whitelist(self.scheduler_whitelist)
+                    scheduler.set_group_blacklist(self.scheduler_blacklist)
+                    # 挂起的渲染器恢复时会自行启动调度器，这里只切换当前渲染器的开关
+                    if renderer is self.renderer and scheduler.is_enabled() != self.enable_animation_scheduler:
+                        scheduler.set_enabled(self.enable_animation_scheduler)
+                except ValueError as e:
+                    logger.error(f"动画调度器配置无效: {e}")
+            logger.info("动画调度器配置已更新")
+        
+        if change.changed('render.click_through') or change.changed('render.hit_mask_interval'):
+            render_config = getattr(config, 'render', None)
+            self.click_through = getattr(render_config, 'click_through', True)
+            self.hit_mask_interval = getattr(render_config, 'hit_mask_interval', 500)
+            if self._hit_mask_timer:
+                self._hit_mask_timer.stop()
+                self._hit_mask_timer = None
+            if self.click_through:
+                self._start_hit_mask_timer()
+            else:
+                self._hit_mask = None
+                self._apply_window_mask()
+            logger.info(f"点击穿透配置已更新: click_through={self.click_through}")
+        
+        restart_fields = [name for name in ('render.mode', 'live2d', 'performance') if change.changed(name)]
+        if restart_fields:
+            logger.info(f"以下配置修改需要重启后生效: {', '.join(restart_fields)}")
+    
     def create_renderer(self):
         """创建渲染器"""
         # 检查是否使用 Live2D
         if self.use_live2d and self.live2d_model_path:
             # 检查模型文件是否存在
             if os.path.exists(self.live2d_model_path):
+                from ..render.live2d_renderer import Live2DRenderer
+
                 # 检查 Live2D 库是否可用
                 if Live2DRenderer.is_available():
                     try:
-                        self.renderer = Live2DRenderer(
-                            self.live2d_model_path,
-                            custom_scale=self.custom_scale,
-                            custom_offset_x=self.custom_offset_x,
-                            custom_offset_y=self.custom_offset_y,
-                            enable_animation_scheduler=self.enable_animation_scheduler,
-                            scheduler_idle_interval_min=self.scheduler_idle_interval_min,
-                            scheduler_idle_interval_max=self.scheduler_idle_interval_max,
-                            scheduler_random_motion_duration=self.scheduler_random_motion_duration,
-                            scheduler_group_weights=self.scheduler_group_weights,
-                            scheduler_whitelist=self.scheduler_whitelist,
-                            scheduler_blacklist=self.scheduler_blacklist
-                        )
+                        self.renderer = self._build_renderer("live2d")
                         # 初始化渲染器
                         self.renderer.initialize()
                         self.current_mode = "live2d"
@@ -184,13 +281,76 @@ class RenderManager:
         if self.renderer:
             self.renderer.attach(parent)
             logger.info(f"渲染器已附加到父控件")
+            self._start_hit_mask_timer()
         else:
             logger.error("渲染器未创建，无法附加")
     
+    def _start_hit_mask_timer(self):
+        """启动命中掩码刷新定时器（低频刷新，鼠标事件只读取缓存的掩码）"""
+        if not self.click_through or self._hit_mask_timer:
+            return
+        
+        self._hit_mask_timer = QTimer()
+        self._hit_mask_timer.timeout.connect(self.refresh_hit_mask)
+        self._hit_mask_timer.start(max(50, int(self.hit_mask_interval)))
+        self.refresh_hit_mask()
+    
+    def refresh_hit_mask(self):
+        """
+        从渲染器获取命中掩码并应用为窗口的输入掩码
+        
+        掩码不变时不会重新设置窗口掩码；渲染器没有掩码（或掩码为空）时清除窗口掩码
+        """
+        mask = None
+        if self.renderer:
+            try:
+                mask = self.renderer.get_hit_mask()
+            except Exception as e:
+                logger.debug(f"获取命中掩码失败: {e}")
+        
+        if mask is not None and mask.is_empty():
+            mask = None
+        
+        # 渲染器返回的掩码位于渲染容器坐标系，转换到窗口坐标系
+        container = getattr(self.parent, 'render_container', None)
+        if mask is not None and container is not None and container is not self.parent:
+            mask = mask.translated(container.mapTo(self.parent, QPoint(0, 0)))
+        
+        if mask == self._hit_mask:
+            return
+        
+        self._hit_mask = mask
+        self._apply_window_mask()
+    
+    def _apply_window_mask(self):
+        """把当前掩码设置到窗口（性能统计悬浮显示所在区域始终保留）"""
+        if self._hit_mask is None:
+            self.parent.clearMask()
+            return
+        
+        region = self._hit_mask.to_region()
+        if self._stats_overlay and self._stats_overlay.isVisible():
+            region = region.united(self._stats_overlay.geometry())
+        self.parent.setMask(region)
+    
+    def hit_test(self, x: int, y: int) -> bool:
+        """
+        判断窗口坐标 (x, y) 是否落在不透明区域（使用缓存的掩码，不读取渲染结果）
+        
+        Args:
+            x: 窗口坐标 X
+            y: 窗口坐标 Y
+        """
+        if self._hit_mask is None:
+            return True
+        return self._hit_mask.contains(x, y)
+    
     def switch_mode(self, mode: str):
         """
         切换渲染模式
         
+        旧渲染器会被挂起并放入缓存，切回时直接恢复，无需重新加载模型和纹理
+        
         Args:
             mode: 目标模式（"static" 或 "live2d"）
         """
@@ -204,56 +364,239 @@ class RenderManager:
         
         logger.info(f"切换渲染模式: {self.current_mode} -> {mode}")
         
-        # 销毁旧渲染器
+        # 先取出目标渲染器，避免挂起旧渲染器时被一起淘汰
+        cached = self._take_cached_renderer(mode)
+        
+        # 挂起旧渲染器（新画面的掩码在下一次刷新时重新计算）
+        self._hit_mask = None
+        self.parent.clearMask()
         if self.renderer:
-            self.renderer.cleanup()
+            self.renderer.set_frame_stats(None)
+            self._park_renderer(self.current_mode, self.renderer)
             self.renderer = None
         
+        # 优先从缓存恢复
+        if cached:
+            cached.resume()
+            self.renderer = cached
+            self.current_mode = mode
+            self.renderer.set_frame_stats(self.frame_stats)
+            logger.info(f"渲染模式切换成功（从缓存恢复）: {mode}")
+            return
+        
         # 创建新渲染器
         try:
-            if mode == "live2d":
-                if not self.live2d_model_path:
-                    raise ValueError("Live2D 模型路径未配置")
-                
-                if not Live2DRenderer.is_available():
-                    raise ImportError("Live2D 库不可用")
-                
-                self.renderer = Live2DRenderer(
-                    self.live2d_model_path,
-                    custom_scale=self.custom_scale,
-                    custom_offset_x=self.custom_offset_x,
-                    custom_offset_y=self.custom_offset_y,
-                    enable_animation_scheduler=self.enable_animation_scheduler,
-                    scheduler_idle_interval_min=self.scheduler_idle_interval_min,
-                    scheduler_idle_interval_max=self.scheduler_idle_interval_max,
-                    scheduler_random_motion_duration=self.scheduler_random_motion_duration,
-                    scheduler_group_weights=self.scheduler_group_weights,
-                    scheduler_whitelist=self.scheduler_whitelist,
-                    scheduler_blacklist=self.scheduler_blacklist
-                )
-            elif mode == "static":
-                self.renderer = StaticRenderer()
-            else:
-                raise ValueError(f"未知的渲染模式: {mode}")
-            
+            self.renderer = self._build_renderer(mode)
             self.current_mode = mode
             self.renderer.initialize()
             
             # 附加到父控件
+            self.renderer.set_frame_stats(self.frame_stats)
             if hasattr(self.parent, 'render_container'):
                 self.renderer.attach(self.parent.render_container)
             
             logger.info(f"渲染模式切换成功: {mode}")
         except Exception as e:
             logger.error(f"切换渲染模式失败: {e}")
+            if self.renderer:
+                try:
+                    self.renderer.cleanup()
+                except Exception as cleanup_error:
+                    logger.debug(f"清理失败的渲染器出错: {cleanup_error}")
+            
             # 恢复到静态模式
-            self.renderer = StaticRenderer()
             self.current_mode = "static"
-            self.renderer.initialize()
-            if hasattr(self.parent, 'render_container'):
-                self.renderer.attach(self.parent.render_container)
+            self.renderer = self._take_cached_renderer("static")
+            if self.renderer:
+                self.renderer.resume()
+            else:
+                self.renderer = StaticRenderer()
+                self.renderer.initialize()
+                if hasattr(self.parent, 'render_container'):
+                    self.renderer.attach(self.parent.render_container)
             logger.info("已恢复到静态图片模式")
     
+    def _build_renderer(self, mode: str) -> IRenderer:
+        """
+        创建指定模式的渲染器（未初始化）
+        
+        Args:
+            mode: 渲染模式（"static" 或 "live2d"）
+        """
+        if mode == "live2d":
+            if not self.live2d_model_path:
+                raise ValueError("Live2D 模型路径未配置")
+            
+            from ..render.live2d_renderer import Live2DRenderer
+            if not Live2DRenderer.is_available():
+                raise ImportError("Live2D 库不可用")
+            
+            return Live2DRenderer(
+                self.live2d_model_path,
+                custom_scale=self.custom_scale,
+                custom_offset_x=self.custom_offset_x,
+                custom_offset_y=self.custom_offset_y,
+                enable_animation_scheduler=self.enable_animation_scheduler,
+                scheduler_idle_interval_min=self.scheduler_idle_interval_min,
+                scheduler_idle_interval_max=self.scheduler_idle_interval_max,
+                scheduler_random_motion_duration=self.scheduler_random_motion_duration,
+                scheduler_group_weights=self.scheduler_group_weights,
+                scheduler_whitelist=self.scheduler_whitelist,
+                scheduler_blacklist=self.scheduler_blacklist,
+                enable_baked_idle=self.baked_idle,
+                baked_idle_delay=self.baked_idle_delay,
+                baked_idle_scale=self.baked_idle_scale,
+                baked_idle_fps=self.baked_idle_fps,
+                baked_idle_cache_dir=self.baked_idle_cache_dir
+            )
+        if mode == "static":
+            return StaticRenderer()
+        raise ValueError(f"未知的渲染模式: {mode}")
+    
+    def _cache_key(self, mode: str) -> str:
+        """渲染器缓存键（Live2D 渲染器按模型路径区分）"""
+        if mode == "live2d":
+            return f"live2d:{self.live2d_model_path}"
+        return mode
+    
+    def _park_renderer(self, mode: str, renderer: IRenderer):
+        """
+        挂起渲染器并放入缓存
+        
+        Args:
+            mode: 渲染器对应的模式
+            renderer: 渲染器实例
+        """
+        if self.renderer_cache_bytes <= 0:
+            renderer.cleanup()
+            return
+        
+        try:
+            renderer.suspend()
+        except Exception as e:
+            logger.warning(f"挂起渲染器失败，直接清理: {e}")
+            renderer.cleanup()
+            return
+        
+        key = self._cache_key(mode)
+        stale = self._renderer_cache.pop(key, None)
+        if stale and stale is not renderer:
+            stale.cleanup()
+        self._renderer_cache[key] = renderer
+        self._evict_cached_renderers()
+    
+    def _take_cached_renderer(self, mode: str) -> Optional[IRenderer]:
+        """从缓存中取出渲染器（不存在时返回 None）"""
+        return self._renderer_cache.pop(self._cache_key(mode), None)
+    
+    def _evict_cached_renderers(self):
+        """缓存的渲染器超过内存预算时，按最久未使用的顺序清理"""
+        sizes = {key: renderer.estimate_memory_bytes() for key, renderer in self._renderer_cache.items()}
+        total = sum(sizes.values())
+        
+        while self._renderer_cache and total > self.renderer_cache_bytes:
+            key, renderer = self._renderer_cache.popitem(last=False)
+            total -= sizes[key]
+            renderer.cleanup()
+            logger.info(f"渲染器缓存超出预算，已清理: {key} ({sizes[key] / 1024 / 1024:.1f} MB)")
+    
+    def get_cache_info(self) -> dict:
+        """
+        获取渲染器缓存信息
+        
+        Returns:
+            dict: 缓存的渲染器键、估算占用和预算（字节）
+        """
+        return {
+            'renderers': list(self._renderer_cache.keys()),
+            'bytes': sum(renderer.estimate_memory_bytes() for renderer in self._renderer_cache.values()),
+            'budget': self.renderer_cache_bytes,
+        }
+    
+    def set_frame_stats_enabled(self, enabled: bool):
+        """
+        开启或关闭渲染性能统计
+        
+        开启后渲染器逐帧记录更新/绘制耗时、定时器延迟和参数写入次数，
+        管理器定时采样进程 CPU 和内存，并在窗口左上角显示汇总
+        
+        Args:
+            enabled: 是否开启
+        """
+        if enabled == self.is_frame_stats_enabled():
+            return
+        
+        if enabled:
+            self.frame_stats = FrameStatsRecorder()
+            self._stats_overlay = FrameStatsOverlay(self.parent)
+            self._stats_timer = QTimer()
+            self._stats_timer.timeout.connect(self._update_frame_stats_overlay)
+            self._stats_timer.start(self.FRAME_STATS_INTERVAL_MS)
+            if self.renderer:
+                self.renderer.set_frame_stats(self.frame_stats)
+            self._update_frame_stats_overlay()
+            self._stats_overlay.show()
+            logger.info("渲染性能统计已开启")
+        else:
+            if self.renderer:
+                self.renderer.set_frame_stats(None)
+            self._stop_frame_stats()
+            logger.info("渲染性能统计已关闭")
+        
+        if self._hit_mask is not None:
+            self._apply_window_mask()
+    
+    def is_frame_stats_enabled(self) -> bool:
+        """渲染性能统计是否开启"""
+        return self.frame_stats is not None
+    
+    def _update_frame_stats_overlay(self):
+        """采样进程资源并刷新悬浮显示"""
+        if not self.frame_stats:
+            return
+        self.frame_stats.sample_process()
+        if self._stats_overlay:
+            self._stats_overlay.set_text(self.frame_stats.format_summary())
+    
+    def _stop_frame_stats(self):
+        """停止性能统计并移除悬浮显示"""
+        if self._stats_timer:
+            self._stats_timer.stop()
+            self._stats_timer = None
+        if self._stats_overlay:
+            self._stats_overlay.hide()
+            self._stats_overlay.deleteLater()
+            self._stats_overlay = None
+        self.frame_stats = None
+    
+    def export_frame_stats(self, path_base: str = None) -> list:
+        """
+        导出渲染性能统计（同时写出 JSON 和 CSV）
+        
+        Args:
+            path_base: 输出路径（不含扩展名），默认写到 logs/frame_stats_<时间>
+            
+        Returns:
+            list: 写出的文件路径，未开启统计或写入失败时为空列表
+        """
+        if not self.frame_stats:
+            logger.warning("渲染性能统计未开启，无法导出")
+            return []
+        
+        if path_base is None:
+            path_base = os.path.join("logs", f"frame_stats_{time.strftime('%Y%m%d_%H%M%S')}")
+        
+        paths = [f"{path_base}.json", f"{path_base}.csv"]
+        try:
+            self.frame_stats.export_json(paths[0])
+            self.frame_stats.export_csv(paths[1])
+        except OSError as e:
+            logger.error(f"导出渲染性能统计失败: {e}")
+            return []
+        
+        logger.info(f"渲染性能统计已导出: {', '.join(paths)}")
+        return paths
+    
     def set_animation_state(self, state: str):
         """
         设置动画状态
@@ -296,7 +639,7 @@ class RenderManager:
             try:
                 self.renderer.on_mouse_move(x, y)
             except Exception as e:
-                logger.error(f"处理鼠标移动失败: {e}")
+                _tracking_log.error("处理鼠标移动失败: %s", e)
     
     def set_live2d_parameters(self, head_angle_x: float = 0.0, head_angle_y: float = 0.0,
                              eye_angle_x: float = 0.0, eye_angle_y: float = 0.0,
@@ -323,12 +666,22 @@ class RenderManager:
                         body_angle_x=body_angle_x
                     )
                 else:
-                    logger.debug("Live2D 渲染器不支持参数设置")
+                    _tracking_log.debug("Live2D 渲染器不支持参数设置")
             except Exception as e:
-                logger.error(f"设置 Live2D 参数失败: {e}")
+                _tracking_log.error("设置 Live2D 参数失败: %s", e)
     
     def cleanup(self):
         """清理资源"""
+        if self._hit_mask_timer:
+            self._hit_mask_timer.stop()
+            self._hit_mask_timer = None
+        
+        self._stop_frame_stats()
+        
+        while self._renderer_cache:
+            _, renderer = self._renderer_cache.popitem()
+            renderer.cleanup()
+        
         if self.renderer:
             self.renderer.cleanup()
             self.renderer = None
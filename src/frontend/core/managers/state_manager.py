@@ -130,6 +130,7 @@ class StateManager(QObject):
             self.unlock_window()
         else:
             self.lock_window()
+        self.save_state()
     
     def hide_window(self):
         """隐藏窗口"""
@@ -149,6 +150,7 @@ class StateManager(QObject):
             self.hide_window()
         else:
             self.show_window()
+        self.save_state()
     
     def show_console(self):
         """显示终端窗口"""
@@ -188,33 +190,18 @@ class StateManager(QObject):
             self.hide_console()
         else:
             self.show_console()
+        self.save_state()
     
     def save_state(self):
-        """保存当前状态"""
+        """保存当前状态（合并到配置文件，稍后统一写入）"""
         try:
-            import tomli  # 用于读取 TOML
-            import tomli_w  # 用于写入 TOML
-            
-            # 读取现有配置
-            try:
-                with open("config.toml", "rb") as f:
-                    config_data = tomli.load(f)
-            except FileNotFoundError:
-                config_data = {}
-            
-            # 保存状态
-            if 'state' not in config_data:
-                config_data['state'] = {}
-            
-            config_data['state']['window_locked'] = self._is_locked
-            config_data['state']['window_visible'] = self._is_visible
-            config_data['state']['console_visible'] = self._console_visible
-            
-            # 写回文件
-            with open("config.toml", "w", encoding='utf-8') as f:
-                f.write(tomli_w.dumps(config_data))
-            
-            logger.debug("状态已保存")
+            from config import schedule_config_update
+
+            schedule_config_update('state', 'window_locked', self._is_locked)
+            schedule_config_update('state', 'window_visible', self._is_visible)
+            schedule_config_update('state', 'console_visible', self._console_visible)
+
+            logger.debug("状态已记录，等待写入")
         except Exception as e:
             logger.error(f"保存状态失败: {e}")
     
@@ -261,6 +248,11 @@ class StateManager(QObject):
     
     def cleanup(self):
         """清理资源"""
-        # 保存当前状态
+        # 保存当前状态并立即写入（退出流程使用 os._exit，不能依赖 atexit）
         self.save_state()
+        try:
+            from config import flush_config
+            flush_config()
+        except Exception as e:
+            logger.error(f"写入状态失败: {e}")
         logger.info("状态管理器已清理")
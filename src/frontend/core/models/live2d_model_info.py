@@ -5,9 +5,17 @@ Live2D 模型信息提取工具
 """
 
 import json
+import logging
 import os
+import threading
 from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# 模型信息索引的默认位置和格式版本（结构变化时递增以使旧索引失效）
+DEFAULT_INDEX_PATH = "data/cache/live2d_model_index.json"
+INDEX_FORMAT_VERSION = 1
 
 
 @dataclass
@@ -53,29 +61,205 @@ class Live2DModelInfo:
     physics_file: Optional[str] = None
     pose_file: Optional[str] = None
     display_info_file: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        """转换为可 JSON 序列化的字典"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Live2DModelInfo":
+        """从 to_dict() 的结果恢复"""
+        data = dict(data)
+        data['motions'] = {
+            group: [MotionInfo(**motion) for motion in motions]
+            for group, motions in data.get('motions', {}).items()
+        }
+        data['parameters'] = [ParameterInfo(**item) for item in data.get('parameters', [])]
+        data['hit_areas'] = [HitAreaInfo(**item) for item in data.get('hit_areas', [])]
+        return cls(**data)
+
+
+class Live2DModelInfoIndex:
+    """
+    Live2D 模型信息的磁盘索引
+    
+    所有模型的信息保存在同一个 JSON 文件中，按模型路径索引，并记录 model3.json
+    与所有动作文件的修改时间和大小。命中时只需要读取一次索引文件并 stat 这些文件，
+    不必再逐个打开和解析 motion3.json
+    """
+    
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH):
+        """
+        初始化索引
+        
+        Args:
+            index_path: 索引文件路径
+        """
+        self.index_path = index_path
+        self._entries: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(model_path: str) -> str:
+        return os.path.abspath(model_path)
+    
+    @staticmethod
+    def _file_signature(paths: List[str]) -> List[list]:
+        """
+        计算文件签名（路径、修改时间、大小），文件不存在时记为 None
+        
+        Args:
+            paths: 文件路径列表
+        """
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append([path, stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                signature.append([path, None, None])
+        return signature
+    
+    def _load_entries(self) -> Dict[str, dict]:
+        """读取索引文件（只读取一次，之后使用内存中的副本）"""
+        if self._entries is not None:
+            return self._entries
+        
+        self._entries = {}
+        if not os.path.exists(self.index_path):
+            return self._entries
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_FORMAT_VERSION:
+                self._entries = data.get('models', {})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"读取模型信息索引失败，将重新生成: {e}")
+        return self._entries
+    
+    def get(self, model_path: str) -> Optional[Live2DModelInfo]:
+        """
+        读取模型信息，模型文件或动作文件有变化时返回 None
+        
+        Args:
+            model_path: model3.json 路径
+        """
+        with self._lock:
+            entry = self._load_entries().get(self._key(model_path))
+        if not entry:
+            return None
+        
+        files = [path for path, _, _ in entry['files']]
+        if self._file_signature(files) != entry['files']:
+            return None
+        
+        try:
+            info = Live2DModelInfo.from_dict(entry['info'])
+        except (KeyError, TypeError) as e:
+            logger.warning(f"模型信息索引条目损坏: {e}")
+            return None
+        info.model_path = model_path
+        return info
+    
+    def put(self, model_path: str, info: Live2DModelInfo) -> bool:
+        """
+        保存模型信息并写回索引文件（先写临时文件再替换）
+        
+        Args:
+            model_path: model3.json 路径
+            info: 模型信息
+            
+        Returns:
+            bool: 是否写入成功
+        """
+        model_dir = os.path.dirname(model_path)
+        motion_files = [
+            os.path.join(model_dir, motion.file)
+            for motions in info.motions.values()
+            for motion in motions
+        ]
+        entry = {
+            'files': self._file_signature([self._key(model_path)] + [self._key(path) for path in motion_files]),
+            'info': info.to_dict(),
+        }
+        
+        with self._lock:
+            entries = self._load_entries()
+            entries[self._key(model_path)] = entry
+            data = {'version': INDEX_FORMAT_VERSION, 'models': entries}
+            
+            temp_path = f"{self.index_path}.tmp"
+            try:
+                index_dir = os.path.dirname(os.path.abspath(self.index_path))
+                os.makedirs(index_dir, exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, self.index_path)
+                return True
+            except OSError as e:
+                logger.warning(f"写入模型信息索引失败: {e}")
+                return False
+    
+    def clear(self):
+        """清空索引"""
+        with self._lock:
+            self._entries = {}
+            try:
+                os.remove(self.index_path)
+            except OSError:
+                pass
+
+
+# 全局模型信息索引实例
+_model_info_index: Optional[Live2DModelInfoIndex] = None
+
+
+def get_model_info_index() -> Live2DModelInfoIndex:
+    """获取全局模型信息索引"""
+    global _model_info_index
+    if _model_info_index is None:
+        _model_info_index = Live2DModelInfoIndex()
+    return _model_info_index
 
 
 class Live2DModelInfoExtractor:
     """Live2D 模型信息提取器"""
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, index: Optional[Live2DModelInfoIndex] = None):
         """
         初始化提取器
         
         Args:
             model_path: Live2D 模型的 model3.json 文件路径
+            index: 模型信息索引（为空时每次都解析模型文件）
         """
         self.model_path = model_path
         self.model_dir = os.path.dirname(model_path)
         self.model_info: Optional[Live2DModelInfo] = None
+        self.index = index
     
     def extract(self) -> Live2DModelInfo:
         """
-        提取模型信息
+        提取模型信息（优先从索引读取，索引失效时重新解析并写回索引）
         
         Returns:
             Live2DModelInfo: 模型信息对象
         """
+        if self.index:
+            cached = self.index.get(self.model_path)
+            if cached:
+                self.model_info = cached
+                return self.model_info
+        
+        self._parse()
+        
+        if self.index:
+            self.index.put(self.model_path, self.model_info)
+        return self.model_info
+    
+    def _parse(self):
+        """解析 model3.json 和所有动作文件"""
         # 读取模型配置文件
         with open(self.model_path, 'r', encoding='utf-8') as f:
             model_data = json.load(f)
@@ -97,8 +281,6 @@ class Live2DModelInfoExtractor:
         
         # 提取点击区域
         self._extract_hit_areas(model_data)
-        
-        return self.model_info
     
     def _extract_motions(self, model_data: dict):
         """提取动作信息"""
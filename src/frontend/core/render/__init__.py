@@ -1,14 +1,22 @@
 """
 渲染器模块
 包含渲染器接口和各种渲染器实现
+
+Live2DRenderer 依赖 OpenGL/live2d，按需延迟导入。
 """
 
 from .interfaces import IRenderer
 from .static_renderer import StaticRenderer
-from .live2d_renderer import Live2DRenderer
 
 __all__ = [
     'IRenderer',
     'StaticRenderer',
     'Live2DRenderer'
 ]
+
+
+def __getattr__(name):
+    if name == 'Live2DRenderer':
+        from .live2d_renderer import Live2DRenderer
+        return Live2DRenderer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
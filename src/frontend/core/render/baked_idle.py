@@ -0,0 +1,372 @@
+"""
+Live2D 待机动画烘焙
+把待机动作预先渲染成缩小后的帧序列，空闲时用普通的位图绘制代替逐帧的物理与网格计算
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import logging
+from typing import Callable, List, Optional
+
+from PyQt5.QtCore import QObject, QPoint, QRect, QSize, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QBitmap, QImage, QPainter, QPixmap, QRegion
+from PyQt5.QtWidgets import QWidget
+
+logger = logging.getLogger(__name__)
+
+# 磁盘缓存格式版本，格式变化时递增以使旧缓存失效
+BAKE_FORMAT_VERSION = 1
+
+
+def compute_bake_key(model_path: str, files: List[str], params: dict) -> str:
+    """
+    计算烘焙缓存键
+
+    模型文件（路径、修改时间、大小）或烘焙参数变化时，缓存键随之变化
+
+    Args:
+        model_path: model3.json 路径
+        files: 模型引用的文件列表
+        params: 烘焙参数（尺寸、帧率、缩放等）
+    """
+    digest = hashlib.sha1()
+    digest.update(f"v{BAKE_FORMAT_VERSION}".encode())
+    for path in [model_path] + sorted(files):
+        try:
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}\n".encode('utf-8'))
+        except OSError:
+            digest.update(f"{os.path.abspath(path)}|missing\n".encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BakedIdleSequence:
+    """
+    烘焙好的待机帧序列
+
+    所有帧都裁剪到同一个非透明区域内，offset 为裁剪区域在缩小后画布中的位置
+    """
+
+    def __init__(self, frames: List[QImage], fps: float, canvas_size: QSize, offset: QPoint = None):
+        """
+        初始化帧序列
+
+        Args:
+            frames: 帧图像（已缩小、已裁剪）
+            fps: 播放帧率
+            canvas_size: 缩小后的完整画布尺寸
+            offset: 帧在画布中的位置
+        """
+        self.frames = frames
+        self.fps = fps
+        self.canvas_size = canvas_size
+        self.offset = offset or QPoint(0, 0)
+        self._pixmaps: Optional[List[QPixmap]] = None
+
+    @property
+    def frame_count(self) -> int:
+        """帧数"""
+        return len(self.frames)
+
+    @property
+    def memory_bytes(self) -> int:
+        """帧数据占用的内存（字节）"""
+        return sum(frame.byteCount() for frame in self.frames)
+
+    def pixmaps(self) -> List[QPixmap]:
+        """转换为用于绘制的 QPixmap（仅在 GUI 线程调用，结果会缓存）"""
+        if self._pixmaps is None:
+            self._pixmaps = [QPixmap.fromImage(frame) for frame in self.frames]
+        return self._pixmaps
+
+    @classmethod
+    def from_frames(cls, frames: List[QImage], fps: float) -> "BakedIdleSequence":
+        """
+        从完整画布大小的帧创建序列，并裁剪到所有帧共同的非透明区域
+
+        Args:
+            frames: 缩小后的完整画布帧
+            fps: 播放帧率
+        """
+        if not frames:
+            raise ValueError("没有可用的帧")
+
+        canvas_size = frames[0].size()
+        bounds = QRect()
+        for frame in frames:
+            mask = QBitmap.fromImage(frame.createAlphaMask())
+            bounds = bounds.united(QRegion(mask).boundingRect())
+
+        if bounds.isEmpty():
+            bounds = QRect(QPoint(0, 0), canvas_size)
+
+        cropped = [
+            frame.copy(bounds).convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            for frame in frames
+        ]
+        return cls(cropped, fps, canvas_size, bounds.topLeft())
+
+    def save(self, directory: str):
+        """
+        保存到目录（每帧一张 PNG 加 meta.json），先写临时目录再替换，避免留下半成品
+
+        Args:
+            directory: 目标目录
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        temp_dir = f"{directory}.tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+
+        for index, frame in enumerate(self.frames):
+            if not frame.save(os.path.join(temp_dir, f"frame_{index:04d}.png"), "PNG"):
+                raise IOError(f"保存帧失败: {index}")
+
+        meta = {
+            'version': BAKE_FORMAT_VERSION,
+            'fps': self.fps,
+            'frames': self.frame_count,
+            'canvas': [self.canvas_size.width(), self.canvas_size.height()],
+            'offset': [self.offset.x(), self.offset.y()],
+        }
+        with open(os.path.join(temp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temp_dir, directory)
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["BakedIdleSequence"]:
+        """
+        从目录加载，缓存不存在或损坏时返回 None
+
+        Args:
+            directory: 缓存目录
+        """
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != BAKE_FORMAT_VERSION:
+                return None
+
+            frames = []
+            for index in range(meta['frames']):
+                frame = QImage(os.path.join(directory, f"frame_{index:04d}.png"))
+                if frame.isNull():
+                    return None
+                frames.append(frame.convertToFormat(QImage.Format_ARGB32_Premultiplied))
+
+            return cls(
+                frames,
+                meta['fps'],
+                QSize(*meta['canvas']),
+                QPoint(*meta['offset'])
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"读取烘焙缓存失败 {directory}: {e}")
+            return None
+
+
+class BakedIdleCache:
+    """烘焙帧序列的磁盘缓存（按缓存键分目录保存）"""
+
+    def __init__(self, cache_dir: str):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存根目录
+        """
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str) -> Optional[BakedIdleSequence]:
+        """读取缓存的帧序列，不存在时返回 None"""
+        return BakedIdleSequence.load(self._path(key))
+
+    def put(self, key: str, sequence: BakedIdleSequence) -> bool:
+        """
+        写入帧序列
+
+        Returns:
+            bool: 是否写入成功
+        """
+        try:
+            sequence.save(self._path(key))
+            return True
+        except OSError as e:
+            logger.warning(f"写入烘焙缓存失败: {e}")
+            return False
+
+
+class IdleFrameBaker(QObject):
+    """
+    待机帧烘焙器
+
+    按烘焙帧率逐帧推进模型并截取帧（相当于实时录制一遍待机动作），不会阻塞 GUI 线程
+    """
+
+    # 信号：烘焙完成（BakedIdleSequence）
+    finished = pyqtSignal(object)
+
+    # 信号：烘焙失败（错误信息）
+    failed = pyqtSignal(str)
+
+    def __init__(self, step: Callable[[float], None], grab: Callable[[], QImage],
+                 frame_count: int, fps: float, scale: float, parent=None):
+        """
+        初始化烘焙器
+
+        Args:
+            step: 推进模型的函数（参数为帧间隔秒数）
+            grab: 渲染并截取当前帧的函数
+            frame_count: 要烘焙的帧数
+            fps: 烘焙帧率
+            scale: 缩小比例（0-1）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._step = step
+        self._grab = grab
+        self.frame_count = frame_count
+        self.fps = fps
+        self.scale = scale
+        self._frames: List[QImage] = []
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(int(1000 / fps))
+        self._timer.timeout.connect(self._bake_next)
+
+    @property
+    def running(self) -> bool:
+        """是否正在烘焙"""
+        return self._timer.isActive()
+
+    def start(self):
+        """开始烘焙（第一帧立即截取）"""
+        self._frames = []
+        self._timer.start(0)
+
+    def cancel(self):
+        """取消烘焙"""
+        self._timer.stop()
+        self._frames = []
+
+    def _bake_next(self):
+        """烘焙下一帧"""
+        try:
+            self._step(1.0 / self.fps)
+            frame = self._grab()
+            if frame is None or frame.isNull():
+                raise RuntimeError("截取帧失败")
+            if self.scale < 1.0:
+                frame = frame.scaled(
+                    max(1, int(frame.width() * self.scale)),
+                    max(1, int(frame.height() * self.scale)),
+                    Qt.IgnoreAspectRatio,
+                    Qt.SmoothTransformation
+                )
+            self._frames.append(frame)
+        except Exception as e:
+            self._frames = []
+            self.failed.emit(str(e))
+            return
+
+        if len(self._frames) < self.frame_count:
+            self._timer.start(int(1000 / self.fps))
+            return
+
+        try:
+            sequence = BakedIdleSequence.from_frames(self._frames, self.fps)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        finally:
+            self._frames = []
+        self.finished.emit(sequence)
+
+
+class BakedIdlePlayer(QWidget):
+    """
+    烘焙帧播放控件
+
+    按帧率循环绘制帧序列，帧按画布比例缩放到控件大小
+    """
+
+    # 信号：切换到新的一帧（帧序号）
+    frame_advanced = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.sequence: Optional[BakedIdleSequence] = None
+        self.frame_index = 0
+        self._pixmaps: List[QPixmap] = []
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._advance)
+
+    def play(self, sequence: BakedIdleSequence):
+        """
+        开始循环播放
+
+        Args:
+            sequence: 帧序列
+        """
+        self.sequence = sequence
+        self._pixmaps = sequence.pixmaps()
+        self.frame_index = 0
+        self._timer.start(max(1, int(1000 / sequence.fps)))
+        self.show()
+        self.raise_()
+        self.update()
+
+    def stop(self):
+        """停止播放并隐藏"""
+        self._timer.stop()
+        self.hide()
+
+    @property
+    def playing(self) -> bool:
+        """是否正在播放"""
+        return self._timer.isActive()
+
+    def _advance(self):
+        """切换到下一帧"""
+        if not self._pixmaps:
+            return
+        self.frame_index = (self.frame_index + 1) % len(self._pixmaps)
+        self.update()
+        self.frame_advanced.emit(self.frame_index)
+
+    def paintEvent(self, event):
+        """绘制当前帧"""
+        if not self._pixmaps:
+            return
+
+        canvas = self.sequence.canvas_size
+        sx = self.width() / canvas.width()
+        sy = self.height() / canvas.height()
+        pixmap = self._pixmaps[self.frame_index]
+        target = QRect(
+            int(self.sequence.offset.x() * sx),
+            int(self.sequence.offset.y() * sy),
+            int(pixmap.width() * sx),
+            int(pixmap.height() * sy)
+        )
+
+        painter = QPainter(self)
+        painter.drawPixmap(target, pixmap)
+        painter.end()
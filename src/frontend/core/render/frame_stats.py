@@ -0,0 +1,274 @@
+"""
+渲染性能统计
+记录每帧的更新/绘制耗时、定时器延迟、参数写入次数以及进程 CPU 和内存占用，
+提供悬浮显示和 JSON/CSV 导出
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+import logging
+from typing import List, NamedTuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QLabel
+
+logger = logging.getLogger(__name__)
+
+
+class FrameSample(NamedTuple):
+    """单帧统计"""
+    timestamp: float  # 记录时间（time.time()）
+    update_ms: float  # 模型更新耗时（毫秒）
+    draw_ms: float  # 绘制耗时（毫秒，仅 CPU 提交时间）
+    lateness_ms: float  # 更新定时器相对预期间隔的延迟（毫秒）
+    param_writes: int  # 本帧写入的模型参数个数
+
+
+class ProcessSample(NamedTuple):
+    """进程资源采样"""
+    timestamp: float  # 采样时间（time.time()）
+    cpu_percent: float  # 两次采样之间的进程 CPU 占用（单核百分比）
+    rss_bytes: int  # 常驻内存（字节）
+
+
+class RingBuffer:
+    """
+    固定容量的环形缓冲区
+
+    只有一个写入者（GUI 线程）：先写入槽位再递增计数，读取时按计数取快照，不需要加锁
+    """
+
+    def __init__(self, capacity: int):
+        """
+        初始化缓冲区
+
+        Args:
+            capacity: 容量（超出后覆盖最旧的数据）
+        """
+        self.capacity = max(1, int(capacity))
+        self._items: list = [None] * self.capacity
+        self._written = 0
+
+    def append(self, item):
+        """追加一项"""
+        self._items[self._written % self.capacity] = item
+        self._written += 1
+
+    def snapshot(self) -> list:
+        """按时间顺序返回当前保存的所有项"""
+        written = self._written
+        if written <= self.capacity:
+            return self._items[:written]
+        start = written % self.capacity
+        return self._items[start:] + self._items[:start]
+
+    def clear(self):
+        """清空缓冲区"""
+        self._items = [None] * self.capacity
+        self._written = 0
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+
+def read_rss_bytes() -> int:
+    """读取当前进程的常驻内存（字节），无法读取时返回 0"""
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm', 'r') as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return 0
+
+        # macOS 等平台只能取到峰值（ru_maxrss 单位为字节）
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return 0
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """计算百分位数（values 需已排序）"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+class FrameStatsRecorder:
+    """
+    渲染性能记录器
+
+    渲染器每帧调用 record_frame()，管理器定时调用 sample_process() 采样 CPU 和内存
+    """
+
+    def __init__(self, frame_capacity: int = 600, process_capacity: int = 240):
+        """
+        初始化记录器
+
+        Args:
+            frame_capacity: 保留的帧数（默认约 10 秒）
+            process_capacity: 保留的进程采样数
+        """
+        self.frames = RingBuffer(frame_capacity)
+        self.process = RingBuffer(process_capacity)
+        self._last_cpu_time = time.process_time()
+        self._last_wall_time = time.perf_counter()
+
+    def record_frame(self, update_ms: float, draw_ms: float, lateness_ms: float, param_writes: int):
+        """
+        记录一帧
+
+        Args:
+            update_ms: 模型更新耗时（毫秒）
+            draw_ms: 绘制耗时（毫秒）
+            lateness_ms: 定时器延迟（毫秒）
+            param_writes: 参数写入次数
+        """
+        self.frames.append(FrameSample(time.time(), update_ms, draw_ms, lateness_ms, param_writes))
+
+    def sample_process(self) -> ProcessSample:
+        """采样进程 CPU 占用和常驻内存"""
+        cpu_time = time.process_time()
+        wall_time = time.perf_counter()
+        elapsed = wall_time - self._last_wall_time
+        cpu_percent = (cpu_time - self._last_cpu_time) / elapsed * 100.0 if elapsed > 0 else 0.0
+        self._last_cpu_time, self._last_wall_time = cpu_time, wall_time
+
+        sample = ProcessSample(time.time(), cpu_percent, read_rss_bytes())
+        self.process.append(sample)
+        return sample
+
+    def clear(self):
+        """清空所有记录"""
+        self.frames.clear()
+        self.process.clear()
+
+    def summary(self) -> dict:
+        """
+        汇总当前缓冲区内的数据
+
+        Returns:
+            dict: 帧数、帧率、耗时的平均值/P95/最大值、参数写入数和最新的 CPU/内存
+        """
+        frames: List[FrameSample] = self.frames.snapshot()
+        process: List[ProcessSample] = self.process.snapshot()
+        result = {
+            'frames': len(frames),
+            'fps': 0.0,
+            'cpu_percent': process[-1].cpu_percent if process else 0.0,
+            'rss_mb': process[-1].rss_bytes / 1024 / 1024 if process else 0.0,
+        }
+
+        if len(frames) >= 2:
+            span = frames[-1].timestamp - frames[0].timestamp
+            if span > 0:
+                result['fps'] = (len(frames) - 1) / span
+
+        for field in ('update_ms', 'draw_ms', 'lateness_ms'):
+            values = sorted(getattr(frame, field) for frame in frames)
+            result[field] = {
+                'avg': sum(values) / len(values) if values else 0.0,
+                'p95': _percentile(values, 95),
+                'max': values[-1] if values else 0.0,
+            }
+        result['param_writes'] = sum(frame.param_writes for frame in frames) / len(frames) if frames else 0.0
+        return result
+
+    def format_summary(self) -> str:
+        """格式化为悬浮显示的多行文本"""
+        s = self.summary()
+        return (
+            f"FPS {s['fps']:5.1f}  帧 {s['frames']}\n"
+            f"更新 {s['update_ms']['avg']:5.2f} / p95 {s['update_ms']['p95']:5.2f} ms\n"
+            f"绘制 {s['draw_ms']['avg']:5.2f} / p95 {s['draw_ms']['p95']:5.2f} ms\n"
+            f"延迟 {s['lateness_ms']['avg']:5.2f} / max {s['lateness_ms']['max']:5.2f} ms\n"
+            f"参数写入 {s['param_writes']:.1f} /帧\n"
+            f"CPU {s['cpu_percent']:5.1f}%  RSS {s['rss_mb']:.1f} MB"
+        )
+
+    def export_json(self, path: str):
+        """
+        导出为 JSON（汇总、逐帧数据和进程采样）
+
+        Args:
+            path: 输出文件路径
+        """
+        data = {
+            'summary': self.summary(),
+            'frames': [frame._asdict() for frame in self.frames.snapshot()],
+            'process': [sample._asdict() for sample in self.process.snapshot()],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def export_csv(self, path: str):
+        """
+        导出为 CSV（帧数据和进程采样按时间合并，kind 列区分）
+
+        Args:
+            path: 输出文件路径
+        """
+        rows = [('frame', frame.timestamp, frame) for frame in self.frames.snapshot()]
+        rows += [('process', sample.timestamp, sample) for sample in self.process.snapshot()]
+        rows.sort(key=lambda row: row[1])
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'timestamp', 'update_ms', 'draw_ms', 'lateness_ms',
+                             'param_writes', 'cpu_percent', 'rss_bytes'])
+            for kind, timestamp, item in rows:
+                if kind == 'frame':
+                    writer.writerow([kind, f"{timestamp:.6f}", f"{item.update_ms:.4f}", f"{item.draw_ms:.4f}",
+                                     f"{item.lateness_ms:.4f}", item.param_writes, '', ''])
+                else:
+                    writer.writerow([kind, f"{timestamp:.6f}", '', '', '', '',
+                                     f"{item.cpu_percent:.2f}", item.rss_bytes])
+
+
+class FrameStatsOverlay(QLabel):
+    """性能统计悬浮显示（不接收鼠标事件）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "QLabel { background-color: rgba(0, 0, 0, 160); color: #7CFC00;"
+            " font-family: monospace; font-size: 10px; padding: 4px; border-radius: 4px; }"
+        )
+        self.move(4, 4)
+
+    def set_text(self, text: str):
+        """更新显示内容并保持在最上层"""
+        self.setText(text)
+        self.adjustSize()
+        self.raise_()
@@ -0,0 +1,170 @@
+"""
+Alpha 命中掩码
+把渲染结果的透明度降采样成粗粒度的命中网格，用于点击穿透透明区域
+"""
+
+from typing import List, Optional
+
+from PyQt5.QtCore import QPoint, QRect, QSize, Qt
+from PyQt5.QtGui import QImage, QRegion
+
+
+class AlphaHitMask:
+    """
+    降采样的 alpha 命中掩码
+
+    每个单元格对应 cell_size x cell_size 的逻辑像素，每行用一个整数位图表示（第 i 位对应第 i 列）
+    """
+
+    def __init__(self, rows: List[int], columns: int, cell_size: int, offset: QPoint = None):
+        """
+        初始化掩码
+
+        Args:
+            rows: 每行的位图
+            columns: 列数
+            cell_size: 单元格边长（逻辑像素）
+            offset: 掩码左上角在父控件中的位置
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cell_size = cell_size
+        self.offset = offset or QPoint(0, 0)
+        self._region: Optional[QRegion] = None
+
+    @classmethod
+    def from_image(cls, image: QImage, target_size: QSize = None, cell_size: int = 4,
+                   threshold: int = 8, margin: int = 1, offset: QPoint = None) -> "AlphaHitMask":
+        """
+        从图像的 alpha 通道生成掩码
+
+        Args:
+            image: 渲染结果（可以是设备像素尺寸）
+            target_size: 图像对应的逻辑尺寸（默认与图像相同）
+            cell_size: 单元格边长（逻辑像素）
+            threshold: alpha 大于该值视为不透明（0-255）
+            margin: 向外扩张的单元格数，避免边缘和动画间隙被穿透
+            offset: 掩码左上角在父控件中的位置
+        """
+        target_size = target_size or image.size()
+        columns = max(1, -(-target_size.width() // cell_size))
+        row_count = max(1, -(-target_size.height() // cell_size))
+
+        # 平滑缩放相当于对每个单元格的 alpha 取平均，再按阈值二值化
+        small = image.scaled(columns, row_count, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        small = small.convertToFormat(QImage.Format_Alpha8)
+        data = small.constBits().asstring(small.byteCount())
+        stride = small.bytesPerLine()
+
+        table = bytes(ord('1') if value > threshold else ord('0') for value in range(256))
+        rows = [
+            int(data[row * stride: row * stride + columns].translate(table)[::-1], 2)
+            for row in range(row_count)
+        ]
+
+        mask = cls(rows, columns, cell_size, offset)
+        if margin > 0:
+            mask._dilate(margin)
+        return mask
+
+    def _dilate(self, margin: int):
+        """向四周扩张 margin 个单元格"""
+        full = (1 << self.columns) - 1
+        rows = []
+        for bits in self.rows:
+            spread = bits
+            for step in range(1, margin + 1):
+                spread |= (bits << step) | (bits >> step)
+            rows.append(spread & full)
+
+        count = len(rows)
+        self.rows = [
+            self._or_rows(rows[max(0, index - margin): min(count, index + margin + 1)])
+            for index in range(count)
+        ]
+        self._region = None
+
+    @staticmethod
+    def _or_rows(rows: List[int]) -> int:
+        result = 0
+        for bits in rows:
+            result |= bits
+        return result
+
+    def union(self, other: "AlphaHitMask") -> "AlphaHitMask":
+        """
+        合并两个同尺寸的掩码
+
+        Args:
+            other: 另一个掩码（单元格大小、行列数和位置相同）
+        """
+        if (other.columns, len(other.rows), other.cell_size) != (self.columns, len(self.rows), self.cell_size):
+            raise ValueError("掩码尺寸不一致，无法合并")
+        return AlphaHitMask([a | b for a, b in zip(self.rows, other.rows)], self.columns, self.cell_size, self.offset)
+
+    def translated(self, offset: QPoint) -> "AlphaHitMask":
+        """返回平移后的掩码（共享网格数据）"""
+        return AlphaHitMask(self.rows, self.columns, self.cell_size, self.offset + offset)
+
+    def is_empty(self) -> bool:
+        """是否没有任何不透明单元格"""
+        return not any(self.rows)
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        判断父控件坐标 (x, y) 是否命中不透明区域
+
+        Args:
+            x: 父控件坐标 X
+            y: 父控件坐标 Y
+        """
+        column = (x - self.offset.x()) // self.cell_size
+        row = (y - self.offset.y()) // self.cell_size
+        if row < 0 or row >= len(self.rows) or column < 0 or column >= self.columns:
+            return False
+        return bool((self.rows[row] >> column) & 1)
+
+    def to_region(self) -> QRegion:
+        """转换为父控件坐标下的 QRegion（结果会缓存）"""
+        if self._region is not None:
+            return self._region
+
+        cell = self.cell_size
+        origin_x, origin_y = self.offset.x(), self.offset.y()
+        rects = []
+        index = 0
+        while index < len(self.rows):
+            bits = self.rows[index]
+            # 相同的相邻行合并成一个水平带
+            end = index + 1
+            while end < len(self.rows) and self.rows[end] == bits:
+                end += 1
+
+            column = 0
+            while bits:
+                if not bits & 1:
+                    skip = (bits & -bits).bit_length() - 1
+                    bits >>= skip
+                    column += skip
+                    continue
+                run = (~bits & (bits + 1)).bit_length() - 1
+                rects.append(QRect(origin_x + column * cell, origin_y + index * cell,
+                                   run * cell, (end - index) * cell))
+                bits >>= run
+                column += run
+            index = end
+
+        region = QRegion()
+        if rects:
+            region.setRects(rects)
+        self._region = region
+        return region
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AlphaHitMask):
+            return NotImplemented
+        return (self.rows == other.rows and self.columns == other.columns
+                and self.cell_size == other.cell_size and self.offset == other.offset)
+
+    def __hash__(self):
+        return hash((tuple(self.rows), self.columns, self.cell_size, self.offset.x(), self.offset.y()))
@@ -65,7 +65,68 @@ class IRenderer(ABC):
         - 静态渲染器可以实现此方法以重新缩放图片
         """
         pass
-    
+
+    def suspend(self):
+        """
+        挂起渲染器（切换到其他渲染模式时调用）
+
+        在这个方法中应该：
+        - 隐藏渲染控件
+        - 停止定时器和动画
+        - 保留已加载的资源，以便之后通过 resume() 快速恢复
+
+        注意：这是一个可选方法，默认实现为空
+        """
+        pass
+
+    def resume(self):
+        """
+        恢复已挂起的渲染器
+
+        在这个方法中应该：
+        - 重新显示渲染控件
+        - 重新监听父控件的大小变化
+        - 恢复定时器和动画
+
+        注意：这是一个可选方法，默认实现为空
+        """
+        pass
+
+    def estimate_memory_bytes(self) -> int:
+        """
+        估算渲染器占用的图像/纹理内存
+
+        Returns:
+            int: 估算的字节数，用于渲染器缓存的淘汰判断
+
+        注意：这是一个可选方法，默认返回 0
+        """
+        return 0
+
+    def get_hit_mask(self):
+        """
+        获取当前画面的命中掩码（用于透明区域点击穿透）
+
+        Returns:
+            AlphaHitMask: 父控件坐标下的掩码；返回 None 表示整个区域都接收点击
+
+        注意：
+        - 这是一个可选方法，默认返回 None
+        - 会被定时调用，实现应当缓存结果，避免每次都读取渲染结果
+        """
+        return None
+
+    def set_frame_stats(self, recorder):
+        """
+        设置渲染性能记录器
+
+        Args:
+            recorder: FrameStatsRecorder 实例，None 表示停止记录
+
+        注意：这是一个可选方法，默认实现为空（没有逐帧渲染的渲染器无需记录）
+        """
+        pass
+
     @abstractmethod
     def cleanup(self):
         """
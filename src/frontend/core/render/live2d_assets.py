@@ -0,0 +1,193 @@
+"""
+Live2D 模型资源预加载
+在工作线程中解析 model3.json、预读所有引用文件、校验纹理并由 live2d 库解析模型，
+使 GUI 线程上的模型加载只剩下 GL 上传
+"""
+
+import json
+import os
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+from PyQt5.QtGui import QImageReader
+
+logger = logging.getLogger(__name__)
+
+# 预读文件时每次读取的块大小
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class Live2DModelAssets:
+    """预加载完成的 Live2D 模型资源"""
+    model_path: str  # model3.json 路径
+    model_dir: str  # 模型目录
+    moc_file: str  # moc3 文件完整路径
+    texture_files: List[str] = field(default_factory=list)  # 纹理文件完整路径
+    texture_sizes: List[Tuple[int, int]] = field(default_factory=list)  # 纹理尺寸
+    files: List[str] = field(default_factory=list)  # 已预读的所有文件
+    total_bytes: int = 0  # 预读的总字节数
+    missing_files: List[str] = field(default_factory=list)  # 缺失的可选文件
+    model: Any = None  # 工作线程中已解析的 live2d Model（尚未创建渲染器），live2d 库不可用时为 None
+
+
+class Live2DLoadCancelled(Exception):
+    """资源预加载被取消"""
+    pass
+
+
+_framework_lock = threading.Lock()
+_framework_initialized = False
+
+
+def ensure_live2d_framework():
+    """初始化 Live2D 框架（live2d.v3.init，不涉及 OpenGL，可在任意线程调用，只执行一次）"""
+    global _framework_initialized
+    with _framework_lock:
+        if _framework_initialized:
+            return
+        from live2d.v3 import init as live2d_init
+        live2d_init()
+        _framework_initialized = True
+        logger.info("Live2D 框架已全局初始化")
+
+
+def load_live2d_model(model_path: str) -> Any:
+    """
+    解析 Live2D 模型（可在工作线程中调用）
+
+    LoadModelJson 只读取 moc、物理、动作等文件并建立模型数据，不涉及 OpenGL；
+    纹理解码和上传都在 CreateRenderer 中进行，必须留在持有 GL 上下文的 GUI 线程。
+
+    Args:
+        model_path: model3.json 文件路径
+
+    Returns:
+        live2d.v3.Model，live2d 库不可用时返回 None
+    """
+    try:
+        from live2d.v3 import Model
+    except ImportError:
+        logger.debug("live2d 库不可用，跳过工作线程中的模型解析")
+        return None
+
+    ensure_live2d_framework()
+    model = Model()
+    model.LoadModelJson(model_path)
+    return model
+
+
+def _collect_file_references(model_data: dict) -> Tuple[Optional[str], List[str], List[str]]:
+    """
+    收集 model3.json 中引用的文件
+
+    Returns:
+        (moc 文件, 纹理文件列表, 其他文件列表)，均为相对模型目录的路径
+    """
+    refs = model_data.get('FileReferences', {})
+    others = []
+
+    for key in ('Physics', 'Pose', 'DisplayInfo', 'UserData'):
+        if refs.get(key):
+            others.append(refs[key])
+
+    for expression in refs.get('Expressions', []) or []:
+        if expression.get('File'):
+            others.append(expression['File'])
+
+    for motions in (refs.get('Motions', {}) or {}).values():
+        for motion in motions:
+            if motion.get('File'):
+                others.append(motion['File'])
+
+    return refs.get('Moc'), list(refs.get('Textures', []) or []), others
+
+
+def _prefetch_file(path: str, should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """
+    完整读取一次文件，使其进入系统文件缓存
+
+    Returns:
+        int: 读取的字节数
+    """
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            if should_stop and should_stop():
+                raise Live2DLoadCancelled(path)
+            chunk = f.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+    return size
+
+
+def prepare_live2d_assets(model_path: str,
+                          should_stop: Optional[Callable[[], bool]] = None) -> Live2DModelAssets:
+    """
+    预加载 Live2D 模型资源（可在工作线程中调用，不涉及 OpenGL）
+
+    Args:
+        model_path: model3.json 文件路径
+        should_stop: 返回 True 时中止预加载
+
+    Returns:
+        Live2DModelAssets: 预加载结果
+
+    Raises:
+        FileNotFoundError: 模型文件、moc 文件或纹理缺失
+        ValueError: 模型配置或纹理无法解析
+        Live2DLoadCancelled: 预加载被取消
+    """
+    with open(model_path, 'r', encoding='utf-8') as f:
+        try:
+            model_data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"模型配置解析失败 {model_path}: {e}")
+
+    model_dir = os.path.dirname(os.path.abspath(model_path))
+    moc_file, texture_files, other_files = _collect_file_references(model_data)
+    if not moc_file:
+        raise ValueError(f"模型配置缺少 Moc 文件: {model_path}")
+
+    assets = Live2DModelAssets(
+        model_path=model_path,
+        model_dir=model_dir,
+        moc_file=os.path.join(model_dir, moc_file)
+    )
+
+    # moc 与纹理是必需文件，缺失时直接失败，避免进入 GL 阶段后才出错
+    assets.total_bytes += _prefetch_file(assets.moc_file, should_stop)
+    assets.files.append(assets.moc_file)
+
+    for texture in texture_files:
+        texture_path = os.path.join(model_dir, texture)
+        assets.total_bytes += _prefetch_file(texture_path, should_stop)
+
+        # 只读取图片头校验格式和尺寸，完整解码由 live2d 库在 CreateRenderer 中完成
+        reader = QImageReader(texture_path)
+        size = reader.size()
+        if not reader.canRead() or not size.isValid():
+            raise ValueError(f"纹理文件无法解析 {texture_path}: {reader.errorString()}")
+
+        assets.texture_files.append(texture_path)
+        assets.texture_sizes.append((size.width(), size.height()))
+        assets.files.append(texture_path)
+
+    # 其他文件缺失时 live2d 库会跳过，这里只记录
+    for relative_path in other_files:
+        path = os.path.join(model_dir, relative_path)
+        if not os.path.exists(path):
+            assets.missing_files.append(path)
+            continue
+        assets.total_bytes += _prefetch_file(path, should_stop)
+        assets.files.append(path)
+
+    if assets.missing_files:
+        logger.warning(f"Live2D 模型缺少 {len(assets.missing_files)} 个引用文件: {assets.missing_files[:3]}")
+
+    logger.info(f"Live2D 资源预加载完成: {len(assets.files)} 个文件, "
+                f"{assets.total_bytes / 1024:.0f} KB, {len(assets.texture_files)} 张纹理")
+    return assets
@@ -4,16 +4,32 @@ Live2D 渲染器实现
 """
 
 from PyQt5.QtWidgets import QOpenGLWidget
-from PyQt5.QtCore import QTimer
-from PyQt5.QtGui import QSurfaceFormat
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtGui import QSurfaceFormat, QCursor, QImage, QPainter
 import logging
 import os
+import time
 
 from .interfaces import IRenderer
+from .static_renderer import StaticRenderer
+from .hit_mask import AlphaHitMask
+from .live2d_assets import ensure_live2d_framework, load_live2d_model
+from .baked_idle import (
+    BakedIdleCache,
+    BakedIdlePlayer,
+    BakedIdleSequence,
+    IdleFrameBaker,
+    compute_bake_key
+)
 from ..managers.animation_scheduler import AnimationScheduler
+from ..workers.live2d_load_worker import Live2DLoadWorker
+from src.util.log_throttle import ThrottledLogger
 
 logger = logging.getLogger(__name__)
 
+# 每帧/每次缩放都会走到的日志：延迟格式化并按调用位置限流
+_hot_log = ThrottledLogger(logger, interval=5.0)
+
 
 class Live2DRenderer(IRenderer):
     """
@@ -26,6 +42,17 @@ class Live2DRenderer(IRenderer):
     _live2d_available = None
     _live2d_initialized = False
     
+    # 烘焙待机动画的默认时长（秒，无法读取待机动作时长时使用）和上限
+    BAKED_IDLE_DEFAULT_DURATION = 4.0
+    BAKED_IDLE_MAX_DURATION = 8.0
+    
+    # 播放烘焙帧时，鼠标移动超过该距离（像素）视为恢复交互
+    BAKED_IDLE_CURSOR_THRESHOLD = 4
+    
+    # 命中掩码的单元格大小和扩张量（实时画面每次刷新都会变化，扩张多一些以覆盖动作间隙）
+    HIT_MASK_CELL_SIZE = 8
+    HIT_MASK_MARGIN = 2
+    
     def __init__(self, model_path: str, custom_scale: float = 0.0, 
                  custom_offset_x: float = 0.0, custom_offset_y: float = 0.0,
                  enable_animation_scheduler: bool = True,
@@ -34,7 +61,12 @@ class Live2DRenderer(IRenderer):
                  scheduler_random_motion_duration: float = 5.0,
                  scheduler_group_weights: dict = None,
                  scheduler_whitelist: list = None,
-                 scheduler_blacklist: list = None):
+                 scheduler_blacklist: list = None,
+                 enable_baked_idle: bool = False,
+                 baked_idle_delay: float = 10.0,
+                 baked_idle_scale: float = 0.5,
+                 baked_idle_fps: int = 20,
+                 baked_idle_cache_dir: str = "data/cache/baked_idle"):
         """
         初始化 Live2D 渲染器
         
@@ -50,12 +82,27 @@ class Live2DRenderer(IRenderer):
             scheduler_group_weights: 调度器动作组权重
             scheduler_whitelist: 调度器动作组白名单
             scheduler_blacklist: 调度器动作组黑名单
+            enable_baked_idle: 是否启用待机动画烘焙（空闲时播放预渲染帧）
+            baked_idle_delay: 无交互多久后切换到烘焙帧（秒）
+            baked_idle_scale: 烘焙帧缩小比例（0-1）
+            baked_idle_fps: 烘焙帧率
+            baked_idle_cache_dir: 烘焙帧磁盘缓存目录（为空则只保存在内存中）
         """
         self.model_path = model_path
         self.widget: Live2DWidget = None
         self.timer: QTimer = None
         self.animation_scheduler: AnimationScheduler = None
         
+        # 模型加载完成前显示的静态图片
+        self.placeholder: StaticRenderer = None
+        
+        # 父控件与挂起状态（用于渲染器缓存）
+        self.parent = None
+        self._suspended = False
+        
+        # 渲染性能记录器（未启用时为 None）
+        self.frame_stats = None
+        
         # 自定义缩放和偏移参数
         self.custom_scale = custom_scale
         self.custom_offset_x = custom_offset_x
@@ -70,6 +117,23 @@ class Live2DRenderer(IRenderer):
         self._scheduler_whitelist = scheduler_whitelist or []
         self._scheduler_blacklist = scheduler_blacklist or []
         
+        # 待机动画烘焙配置与状态
+        self._enable_baked_idle = enable_baked_idle
+        self._baked_idle_delay = baked_idle_delay
+        self._baked_idle_scale = max(0.1, min(1.0, baked_idle_scale))
+        self._baked_idle_fps = max(1, int(baked_idle_fps))
+        self._baked_idle_cache = BakedIdleCache(baked_idle_cache_dir) if baked_idle_cache_dir else None
+        self._baked_sequence: BakedIdleSequence = None
+        self._baked_key: str = None
+        self._baker: IdleFrameBaker = None
+        self._baked_player: BakedIdlePlayer = None
+        self._baked_cursor = None
+        self._idle_timer: QTimer = None
+        
+        # 烘焙帧的命中掩码缓存（所有帧的并集，按序列和播放尺寸计算一次）
+        self._baked_hit_mask: AlphaHitMask = None
+        self._baked_hit_mask_key = None
+        
         # 检查 Live2D 库是否可用
         if Live2DRenderer._live2d_available is None:
             Live2DRenderer._live2d_available = self._check_live2d_available()
@@ -149,7 +213,12 @@ class Live2DRenderer(IRenderer):
         
         logger.info(f"附加 Live2D 渲染器到父控件，初始大小: {parent.width()}x{parent.height()}")
         
-        # 创建 Live2D Widget，传递自定义缩放和偏移参数
+        self.parent = parent
+        
+        # 模型加载期间先显示静态图片
+        self._attach_placeholder(parent)
+        
+        # 创建 Live2D Widget（在后台开始加载模型），传递自定义缩放和偏移参数
         self.widget = Live2DWidget(
             self.model_path, 
             parent,
@@ -158,9 +227,20 @@ class Live2DRenderer(IRenderer):
             custom_offset_y=self.custom_offset_y
         )
         
+        self.widget.model_ready.connect(self._on_model_ready)
+        self.widget.load_failed.connect(self._on_model_load_failed)
+        self.widget.frame_stats = self.frame_stats
+        
+        # 连接调度器信号
+        if self.animation_scheduler:
+            self.animation_scheduler.motion_changed.connect(self._on_scheduler_motion_changed)
+            self.animation_scheduler.state_changed.connect(self._on_scheduler_state_changed)
+        
         # 设置初始大小
         self.update_size(parent.width(), parent.height())
         self.widget.show()
+        if self.placeholder:
+            self.placeholder.label.raise_()
         
         # 监听父窗口大小变化
         parent.resizeEvent = self._on_parent_resize
@@ -168,18 +248,346 @@ class Live2DRenderer(IRenderer):
         # 启动更新定时器（60 FPS）
         self.timer = QTimer()
         self.timer.timeout.connect(self.widget.update_model)
-        self.timer.start(16)
+        self.timer.start(Live2DWidget.FRAME_INTERVAL_MS)
         
-        # 启动动画调度器
-        if self.animation_scheduler:
-            # 连接调度器信号
-            self.animation_scheduler.motion_changed.connect(self._on_scheduler_motion_changed)
-            
-            # 启动调度器
+        logger.info("Live2D 渲染器已附加并启动更新循环")
+    
+    def _attach_placeholder(self, parent):
+        """
+        附加占位静态图片
+        
+        Args:
+            parent: 父控件（QWidget）
+        """
+        try:
+            self.placeholder = StaticRenderer()
+            self.placeholder.initialize()
+            self.placeholder.attach(parent)
+        except Exception as e:
+            logger.warning(f"加载占位图片失败: {e}")
+            self.placeholder = None
+    
+    def _remove_placeholder(self):
+        """移除占位静态图片"""
+        if self.placeholder:
+            self.placeholder.cleanup()
+            self.placeholder = None
+    
+    def _on_model_ready(self):
+        """模型加载完成：移除占位图片并启动动画调度器"""
+        self._remove_placeholder()
+        
+        # 挂起期间加载完成时，等 resume() 再启动调度器
+        if self.animation_scheduler and not self._suspended:
             self.animation_scheduler.start()
             logger.info("动画调度器已启动")
         
-        logger.info("Live2D 渲染器已附加并启动更新循环")
+        self._start_idle_countdown()
+    
+    def _on_model_load_failed(self, error: str):
+        """模型加载失败：保留占位图片"""
+        if self.widget:
+            self.widget.hide()
+        if self.timer:
+            self.timer.stop()
+        logger.warning(f"Live2D 模型加载失败，继续显示静态图片: {error}")
+    
+    def _on_scheduler_state_changed(self, state: str):
+        """调度器离开待机状态时恢复实时渲染"""
+        if state != "idle":
+            self._note_activity()
+    
+    def _start_idle_countdown(self):
+        """（重新）开始空闲计时，超时后切换到烘焙的待机帧"""
+        if not self._enable_baked_idle or self._suspended or not self.widget or not self.widget.initialized:
+            return
+        
+        if self._idle_timer is None:
+            self._idle_timer = QTimer()
+            self._idle_timer.setSingleShot(True)
+            self._idle_timer.timeout.connect(self._on_idle_timeout)
+        self._idle_timer.start(int(self._baked_idle_delay * 1000))
+    
+    def _note_activity(self):
+        """发生交互：退出烘焙帧播放或取消正在进行的烘焙，并重新开始空闲计时"""
+        if self._baker and self._baker.running:
+            self._baker.cancel()
+            self._baker = None
+            self._resume_live_rendering()
+            logger.debug("检测到交互，取消待机帧烘焙")
+        
+        if self.is_playing_baked_idle():
+            self._baked_player.stop()
+            self._resume_live_rendering()
+            logger.debug("检测到交互，恢复实时渲染")
+        
+        self._start_idle_countdown()
+    
+    def _resume_live_rendering(self):
+        """恢复实时渲染（烘焙或播放烘焙帧结束后调用）"""
+        self.widget.tracking_enabled = True
+        self.widget.show()
+        self.widget.mouse_tracking_timer.start(33)
+        self.timer.start(Live2DWidget.FRAME_INTERVAL_MS)
+    
+    def is_playing_baked_idle(self) -> bool:
+        """是否正在播放烘焙的待机帧"""
+        return bool(self._baked_player and self._baked_player.playing)
+    
+    def _get_idle_bake_plan(self):
+        """
+        获取烘焙参数
+        
+        Returns:
+            (待机动作组, 帧数, 缓存键)
+        """
+        group = self._map_state_to_motion_group("idle")
+        
+        duration = None
+        if self.animation_scheduler and self.animation_scheduler.model_info:
+            motions = self.animation_scheduler.model_info.motions.get(group) or []
+            if motions:
+                duration = motions[0].duration
+        duration = min(duration or self.BAKED_IDLE_DEFAULT_DURATION, self.BAKED_IDLE_MAX_DURATION)
+        frame_count = max(1, round(duration * self._baked_idle_fps))
+        
+        assets = self.widget.assets
+        params = {
+            'group': group,
+            'frames': frame_count,
+            'fps': self._baked_idle_fps,
+            'scale': self._baked_idle_scale,
+            'size': [self.widget.width(), self.widget.height()],
+            'custom': [self.custom_scale, self.custom_offset_x, self.custom_offset_y],
+        }
+        key = compute_bake_key(self.model_path, assets.files if assets else [], params)
+        return group, frame_count, key
+    
+    def _on_idle_timeout(self):
+        """空闲超时：播放烘焙帧（没有可用的帧序列时先烘焙）"""
+        if self._suspended or not self.widget or not self.widget.initialized or self.is_playing_baked_idle():
+            return
+        
+        # 调度器正在播放随机动作时继续等待
+        if self.animation_scheduler and self.animation_scheduler.get_current_state() != "idle":
+            self._start_idle_countdown()
+            return
+        
+        group, frame_count, key = self._get_idle_bake_plan()
+        if self._baked_sequence is None or self._baked_key != key:
+            sequence = self._baked_idle_cache.get(key) if self._baked_idle_cache else None
+            if sequence is None:
+                self._start_baking(group, frame_count, key)
+                return
+            self._baked_sequence, self._baked_key = sequence, key
+            logger.info(f"从磁盘缓存加载烘焙待机帧: {sequence.frame_count} 帧")
+        
+        self._enter_baked_idle()
+    
+    def _start_baking(self, group: str, frame_count: int, key: str):
+        """
+        开始烘焙待机动作（以烘焙帧率实时录制，期间停止鼠标跟踪）
+        
+        Args:
+            group: 待机动作组
+            frame_count: 帧数
+            key: 缓存键
+        """
+        self.timer.stop()
+        self.widget.tracking_enabled = False
+        try:
+            self.widget.model.StartMotion(group, 0)
+        except Exception as e:
+            logger.debug(f"烘焙前播放待机动作失败 {group}: {e}")
+        
+        self._baker = IdleFrameBaker(
+            self.widget.update_model,
+            self.widget.grabFramebuffer,
+            frame_count,
+            self._baked_idle_fps,
+            self._baked_idle_scale,
+            parent=self.widget
+        )
+        self._baker.finished.connect(lambda sequence: self._on_bake_finished(key, sequence))
+        self._baker.failed.connect(self._on_bake_failed)
+        self._baker.start()
+        logger.info(f"开始烘焙待机动作: {group}, {frame_count} 帧 @ {self._baked_idle_fps} FPS")
+    
+    def _on_bake_finished(self, key: str, sequence: BakedIdleSequence):
+        """烘焙完成：保存帧序列并开始播放"""
+        self._baker = None
+        self.widget.tracking_enabled = True
+        self._baked_sequence, self._baked_key = sequence, key
+        logger.info(f"待机动作烘焙完成: {sequence.frame_count} 帧, "
+                    f"{sequence.memory_bytes / 1024 / 1024:.1f} MB")
+        
+        if self._baked_idle_cache:
+            self._baked_idle_cache.put(key, sequence)
+        
+        if self._suspended:
+            return
+        self._enter_baked_idle()
+    
+    def _on_bake_failed(self, error: str):
+        """烘焙失败：关闭烘焙功能，继续实时渲染"""
+        self._baker = None
+        self._enable_baked_idle = False
+        self._resume_live_rendering()
+        logger.warning(f"待机动作烘焙失败，已关闭待机烘焙: {error}")
+    
+    def _enter_baked_idle(self):
+        """停止实时渲染，改为循环播放烘焙帧"""
+        if self._baked_player is None:
+            self._baked_player = BakedIdlePlayer(self.parent)
+            self._baked_player.frame_advanced.connect(self._check_baked_idle_activity)
+        
+        self.timer.stop()
+        self.widget.mouse_tracking_timer.stop()
+        self._baked_player.setGeometry(self.widget.geometry())
+        self._baked_cursor = QCursor.pos()
+        self._baked_player.play(self._baked_sequence)
+        self.widget.hide()
+        logger.debug("切换到烘焙待机帧播放")
+    
+    def _check_baked_idle_activity(self, frame_index: int):
+        """播放烘焙帧期间检查鼠标是否移动"""
+        if (QCursor.pos() - self._baked_cursor).manhattanLength() > self.BAKED_IDLE_CURSOR_THRESHOLD:
+            self._note_activity()
+    
+    def _stop_baked_idle(self):
+        """停止空闲计时、烘焙和烘焙帧播放（不恢复实时渲染）"""
+        if self._idle_timer:
+            self._idle_timer.stop()
+        if self._baker:
+            self._baker.cancel()
+            self._baker = None
+        if self._baked_player:
+            self._baked_player.stop()
+        if self.widget:
+            self.widget.tracking_enabled = True
+    
+    def suspend(self):
+        """挂起渲染器：停止更新和动画，隐藏控件，保留 GL 上下文和已上传的纹理"""
+        if self._suspended:
+            return
+        self._suspended = True
+        
+        self._stop_baked_idle()
+        if self.timer:
+            self.timer.stop()
+        if self.animation_scheduler:
+            self.animation_scheduler.stop()
+        if self.widget:
+            self.widget.mouse_tracking_timer.stop()
+            self.widget.hide()
+        if self.placeholder:
+            self.placeholder.suspend()
+        logger.info("Live2D 渲染器已挂起")
+    
+    def resume(self):
+        """恢复已挂起的渲染器"""
+        if not self._suspended or not self.widget:
+            return
+        self._suspended = False
+        
+        self.parent.resizeEvent = self._on_parent_resize
+        self.update_size(self.parent.width(), self.parent.height())
+        
+        if self.placeholder:
+            # 模型仍在加载（或加载失败），继续显示占位图片
+            self.placeholder.resume()
+            if self.widget.load_error is None:
+                self.widget.show()
+                self.placeholder.label.raise_()
+        else:
+            self.widget.show()
+        
+        if self.widget.load_error is None:
+            self.widget.mouse_tracking_timer.start(33)
+            self.timer.start(Live2DWidget.FRAME_INTERVAL_MS)
+        if self.animation_scheduler and self.widget.initialized:
+            self.animation_scheduler.start()
+        self._start_idle_countdown()
+        logger.info("Live2D 渲染器已恢复")
+    
+    def estimate_memory_bytes(self) -> int:
+        """估算纹理与帧缓冲占用的显存"""
+        total = 0
+        if self.widget:
+            assets = self.widget.assets
+            if assets:
+                total += sum(width * height * 4 for width, height in assets.texture_sizes)
+            # 4x 多重采样帧缓冲（颜色 + 深度模板）加解析后的纹理
+            total += self.widget.width() * self.widget.height() * (4 * 8 + 4)
+        if self.placeholder:
+            total += self.placeholder.estimate_memory_bytes()
+        if self._baked_sequence:
+            total += self._baked_sequence.memory_bytes
+        return total
+    
+    def set_frame_stats(self, recorder):
+        """设置渲染性能记录器（转交给 Live2D 控件逐帧记录）"""
+        self.frame_stats = recorder
+        if self.widget:
+            self.widget.frame_stats = recorder
+    
+    def get_hit_mask(self):
+        """
+        获取当前画面的命中掩码
+        
+        - 模型加载中：使用占位图片的掩码
+        - 播放烘焙帧：使用所有烘焙帧的并集（只计算一次）
+        - 实时渲染：读取一次当前帧（由调用方控制刷新频率）
+        """
+        if self._suspended or not self.widget:
+            return None
+        
+        if self.placeholder:
+            return self.placeholder.get_hit_mask()
+        
+        if self.is_playing_baked_idle():
+            return self._get_baked_hit_mask()
+        
+        if not self.widget.initialized or not self.widget.isVisible():
+            return None
+        
+        try:
+            frame = self.widget.grabFramebuffer()
+        except Exception as e:
+            logger.debug(f"读取 Live2D 画面失败: {e}")
+            return None
+        if frame.isNull():
+            return None
+        
+        return AlphaHitMask.from_image(
+            frame,
+            self.widget.size(),
+            cell_size=self.HIT_MASK_CELL_SIZE,
+            margin=self.HIT_MASK_MARGIN,
+            offset=self.widget.pos()
+        )
+    
+    def _get_baked_hit_mask(self) -> AlphaHitMask:
+        """计算烘焙帧序列的命中掩码（所有帧叠加后的并集）"""
+        player = self._baked_player
+        key = (self._baked_key, player.width(), player.height())
+        if self._baked_hit_mask_key != key:
+            sequence = self._baked_sequence
+            canvas = QImage(sequence.canvas_size, QImage.Format_ARGB32_Premultiplied)
+            canvas.fill(0)
+            painter = QPainter(canvas)
+            for frame in sequence.frames:
+                painter.drawImage(sequence.offset, frame)
+            painter.end()
+            
+            self._baked_hit_mask = AlphaHitMask.from_image(
+                canvas,
+                player.size(),
+                cell_size=self.HIT_MASK_CELL_SIZE,
+                margin=self.HIT_MASK_MARGIN
+            )
+            self._baked_hit_mask_key = key
+        return self._baked_hit_mask.translated(player.pos())
     
     def _on_parent_resize(self, event):
         """
@@ -192,7 +600,8 @@ class Live2DRenderer(IRenderer):
         if hasattr(event, 'oldSize'):
             old_size = event.oldSize()
             new_size = event.size()
-            logger.debug(f"父窗口大小变化: {old_size.width()}x{old_size.height()} -> {new_size.width()}x{new_size.height()}")
+            _hot_log.debug("父窗口大小变化: %dx%d -> %dx%d",
+                           old_size.width(), old_size.height(), new_size.width(), new_size.height())
         
         # 更新 Live2D 渲染器大小
         if self.widget:
@@ -215,6 +624,12 @@ class Live2DRenderer(IRenderer):
         # 更新 widget 几何信息
         self.widget.setGeometry(0, 0, width, height)
         
+        if self.placeholder:
+            self.placeholder.update_size(width, height)
+        
+        if self._baked_player:
+            self._baked_player.setGeometry(0, 0, width, height)
+        
         # 更新模型的视口和缩放
         if self.widget.model:
             # 调整视口大小
@@ -223,10 +638,10 @@ class Live2DRenderer(IRenderer):
             # 使用自定义缩放或自动计算缩放
             if self.custom_scale > 0:
                 scale_factor = self.custom_scale
-                logger.debug(f"使用自定义缩放: {scale_factor}")
+                scale_source = "自定义"
             else:
                 scale_factor = self._calculate_scale_factor(width, height)
-                logger.debug(f"使用自动缩放: {scale_factor}")
+                scale_source = "自动"
             
             self.widget.model.SetScale(scale_factor)
             
@@ -235,16 +650,18 @@ class Live2DRenderer(IRenderer):
                 # 使用自定义偏移
                 offset_x = self.custom_offset_x
                 offset_y = self.custom_offset_y
-                logger.debug(f"使用自定义偏移: ({offset_x}, {offset_y})")
+                offset_source = "自定义"
             else:
                 # 自动计算偏移
                 offset_x = 0.0
                 offset_y = self._calculate_offset_y(height)
-                logger.debug(f"使用自动偏移: ({offset_x}, {offset_y})")
+                offset_source = "自动"
             
             self.widget.model.SetOffset(offset_x, offset_y)
             
-            logger.info(f"Live2D 渲染器大小更新: {width}x{height}, 缩放: {scale_factor}, 偏移: ({offset_x}, {offset_y})")
+            # 拖动缩放窗口时每帧都会调用，限流输出
+            _hot_log.debug("Live2D 渲染器大小更新: %dx%d, 缩放: %s（%s）, 偏移: (%s, %s)（%s）",
+                           width, height, scale_factor, scale_source, offset_x, offset_y, offset_source)
     
     def _calculate_scale_factor(self, width: int, height: int) -> float:
         """
@@ -310,8 +727,9 @@ class Live2DRenderer(IRenderer):
             return
         
         try:
-            self.widget.model.StartMotion(group_name, 0)
-            logger.debug(f"调度器播放动作: {group_name} -> {motion_file}")
+            number = self.animation_scheduler.get_motion_number(group_name, motion_file) if self.animation_scheduler else 0
+            self.widget.model.StartMotion(group_name, number)
+            logger.debug(f"调度器播放动作: {group_name}[{number}] -> {motion_file}")
         except Exception as e:
             logger.warning(f"播放动作失败 {group_name}: {e}")
     
@@ -328,6 +746,16 @@ class Live2DRenderer(IRenderer):
         """清理资源"""
         logger.info("清理 Live2D 渲染器资源")
         
+        # 清理待机烘焙
+        self._stop_baked_idle()
+        self._idle_timer = None
+        self._baked_sequence = None
+        self._baked_hit_mask = None
+        self._baked_hit_mask_key = None
+        if self._baked_player:
+            self._baked_player.deleteLater()
+            self._baked_player = None
+        
         # 清理动画调度器
         if self.animation_scheduler:
             self.animation_scheduler.cleanup()
@@ -338,6 +766,8 @@ class Live2DRenderer(IRenderer):
             self.timer.deleteLater()
             self.timer = None
         
+        self._remove_placeholder()
+        
         if self.widget:
             self.widget.cleanup()
             self.widget.deleteLater()
@@ -361,6 +791,8 @@ class Live2DRenderer(IRenderer):
             logger.warning(f"Live2D 模型未加载，无法设置动画状态: {state}")
             return
         
+        self._note_activity()
+        
         # 根据状态映射到对应的动作组
         motion_group = self._map_state_to_motion_group(state)
         if motion_group:
@@ -381,6 +813,8 @@ class Live2DRenderer(IRenderer):
             logger.warning(f"Live2D 模型未加载，无法设置表情: {expression}")
             return
         
+        self._note_activity()
+        
         # 尝试设置表情
         try:
             self.widget.model.SetExpression(expression)
@@ -397,6 +831,8 @@ class Live2DRenderer(IRenderer):
             y: 鼠标相对位置 Y（0.0 到 1.0）
         """
         if self.widget:
+            self._note_activity()
+            
             # 将归一化的坐标转换为像素坐标
             self.widget.mouse_x = x * self.widget.width()
             self.widget.mouse_y = y * self.widget.height()
@@ -454,8 +890,21 @@ class Live2DWidget(QOpenGLWidget):
     Live2D OpenGL Widget
     
     负责实际的 Live2D 模型渲染
+    
+    模型加载分为两部分：
+    - 工作线程解析配置、预读文件、校验纹理并解析模型（LoadModelJson）
+    - GUI 线程在相邻的事件循环迭代中分步创建渲染器（上传纹理）、设置显示参数
     """
     
+    # 模型更新定时器的间隔（毫秒，约 60 FPS）
+    FRAME_INTERVAL_MS = 16
+    
+    # 信号：模型加载完成，可以开始显示
+    model_ready = pyqtSignal()
+    
+    # 信号：模型加载失败（错误信息）
+    load_failed = pyqtSignal(str)
+    
     def __init__(self, model_path: str, parent=None,
                  custom_scale: float = 0.0,
                  custom_offset_x: float = 0.0,
@@ -464,6 +913,19 @@ class Live2DWidget(QOpenGLWidget):
         self.model_path = model_path
         self.model = None
         self.initialized = False
+        self.load_error: str = None
+        
+        # 异步加载状态
+        self._gl_ready = False
+        self._assets = None
+        self._pending_model = None
+        self._load_steps = None
+        self._load_started = 0.0
+        self._load_worker: Live2DLoadWorker = None
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._run_next_load_step)
         
         # 自定义缩放和偏移参数
         self.custom_scale = custom_scale
@@ -486,10 +948,22 @@ class Live2DWidget(QOpenGLWidget):
         # 平滑移动速度 (0.0-1.0, 越小越慢)
         self.smooth_factor = 0.1
         
+        # 是否跟随鼠标（烘焙待机帧时关闭，保持正面姿态）
+        self.tracking_enabled = True
+        
+        # 渲染性能记录（frame_stats 为 None 时不计时）
+        self.frame_stats = None
+        self._param_writes = 0
+        self._last_tick = None
+        self._pending_frame = None
+        
         # 鼠标跟踪定时器 - 即使窗口非焦点也能跟踪鼠标
         self.mouse_tracking_timer = QTimer(self)
         self.mouse_tracking_timer.timeout.connect(self.update_mouse_tracking)
         self.mouse_tracking_timer.start(33)  # 30 FPS 检查鼠标位置
+        
+        # 立即开始预加载资源，与窗口显示并行
+        self._start_asset_loading()
     
     def set_parameters(self, head_angle_x: float = 0.0, head_angle_y: float = 0.0,
                       eye_angle_x: float = 0.0, eye_angle_y: float = 0.0,
@@ -511,27 +985,98 @@ class Live2DWidget(QOpenGLWidget):
         self.body_angle_x = body_angle_x
     
     def initializeGL(self):
-        """初始化 OpenGL 上下文"""
-        if self.initialized:
+        """初始化 OpenGL 上下文（模型在资源预加载完成后分步加载）"""
+        if self._gl_ready:
             return
         
         # 导入 Live2D 库
-        from live2d.v3 import Model, glInit, init as live2d_init
+        from live2d.v3 import glInit
         
-        # 全局只初始化一次
+        # 全局只初始化一次（框架本身可能已由加载线程初始化，GL 部分必须在这里）
         if not Live2DRenderer._live2d_initialized:
-            live2d_init()
+            ensure_live2d_framework()
             glInit()
             Live2DRenderer._live2d_initialized = True
-            logger.info("Live2D 框架已全局初始化")
         
-        # 加载模型
-        self.model = Model()
-        self.model.LoadModelJson(self.model_path)
-        self.model.CreateRenderer()
-        self._notify_parent_canvas_size()
+        self._gl_ready = True
+        self._maybe_start_model_load()
+    
+    def _start_asset_loading(self):
+        """在工作线程中预加载模型资源"""
+        self._load_worker = Live2DLoadWorker(self.model_path, self)
+        self._load_worker.loaded.connect(self._on_assets_loaded)
+        self._load_worker.failed.connect(self._on_load_failed)
+        self._load_worker.start()
+    
+    def _on_assets_loaded(self, assets):
+        """资源预加载完成（GUI 线程）"""
+        self._assets = assets
+        self._maybe_start_model_load()
+    
+    def _maybe_start_model_load(self):
+        """GL 上下文与资源都就绪后，开始分步加载模型"""
+        if not self._gl_ready or self._assets is None or self._load_steps is not None:
+            return
+        
+        # 每个事件循环迭代只执行一步，步骤之间界面可以继续绘制和响应输入
+        self._load_steps = [
+            self._load_model_json,
+            self._create_model_renderer,
+            self._finish_model_setup,
+        ]
+        self._load_started = time.perf_counter()
+        self._load_timer.start()
+    
+    def _run_next_load_step(self):
+        """执行下一个模型加载步骤"""
+        if not self._load_steps:
+            return
+        
+        step = self._load_steps.pop(0)
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            self._load_steps = []
+            self.model = None
+            self._on_load_failed(f"{step.__name__}: {e}")
+            return
+        logger.debug(f"Live2D 加载步骤 {step.__name__} 耗时: {(time.perf_counter() - started) * 1000:.1f} ms")
+        
+        if self._load_steps:
+            self._load_timer.start()
+            return
+        
+        self.initialized = True
+        logger.info(f"Live2D 模型初始化成功，GUI 线程加载耗时: "
+                    f"{(time.perf_counter() - self._load_started) * 1000:.1f} ms")
+        self.model_ready.emit()
+    
+    def _load_model_json(self):
+        """加载步骤 1：取出工作线程解析好的模型（工作线程未能解析时才在这里解析）"""
+        model = self._assets.model
+        self._assets.model = None
+        if model is None:
+            model = load_live2d_model(self.model_path)
+            if model is None:
+                raise RuntimeError("live2d 库不可用")
+        self._pending_model = model
+    
+    def _create_model_renderer(self):
+        """加载步骤 2：创建渲染器并上传纹理（需要当前 GL 上下文）"""
+        # live2d-py 的 CreateRenderer 会一次性解码并上传所有纹理，没有提供逐张上传的接口，
+        # 这一步无法再拆分；纹理多或尺寸大的模型在这里仍会占用一帧以上的时间
+        self.makeCurrent()
+        try:
+            self._pending_model.CreateRenderer()
+        finally:
+            self.doneCurrent()
+    
+    def _finish_model_setup(self):
+        """加载步骤 3：设置显示位置和大小，模型开始参与绘制"""
+        model = self._pending_model
+        self._pending_model = None
         
-        # 设置模型显示位置和大小
         # 使用自定义缩放或默认值
         if self.custom_scale > 0:
             scale_factor = self.custom_scale
@@ -539,7 +1084,7 @@ class Live2DWidget(QOpenGLWidget):
         else:
             scale_factor = 1.5  # 默认缩放
             logger.debug(f"初始化使用默认缩放: {scale_factor}")
-        self.model.SetScale(scale_factor)
+        model.SetScale(scale_factor)
         
         # 使用自定义偏移或默认值
         if self.custom_offset_x != 0 or self.custom_offset_y != 0:
@@ -550,13 +1095,27 @@ class Live2DWidget(QOpenGLWidget):
             offset_x = 0.0
             offset_y = -0.2  # 默认偏移
             logger.debug(f"初始化使用默认偏移: ({offset_x}, {offset_y})")
-        self.model.SetOffset(offset_x, offset_y)
+        model.SetOffset(offset_x, offset_y)
         
         # 启用自动眨眼
-        self.model.SetAutoBlink(True)
+        model.SetAutoBlink(True)
         
-        self.initialized = True
-        logger.info("Live2D 模型初始化成功")
+        # resizeGL 在模型加载前已经执行过，这里补一次视口设置
+        model.Resize(self.width(), self.height())
+        
+        self.model = model
+        self._notify_parent_canvas_size()
+    
+    def _on_load_failed(self, error: str):
+        """模型加载失败"""
+        logger.error(f"Live2D 模型加载失败: {error}")
+        self.load_error = error
+        self.load_failed.emit(error)
+    
+    @property
+    def assets(self):
+        """工作线程预加载的模型资源（未完成时为 None）"""
+        return self._assets
 
     def _notify_parent_canvas_size(self):
         """把 Live2D 模型画布尺寸通知给桌宠窗口，用于动态调整窗口大小。"""
@@ -635,38 +1194,68 @@ class Live2DWidget(QOpenGLWidget):
     
     def paintGL(self):
         """绘制场景"""
-        if not self.model:
+        if not self._gl_ready:
             return
         
         from live2d.v3 import clearBuffer
         
-        # 清除缓冲区
+        # 清除缓冲区（模型加载完成前保持透明）
         clearBuffer()
         
+        if not self.model:
+            return
+        
         # 绘制模型
+        if self.frame_stats is None:
+            self.model.Draw()
+            return
+        
+        start = time.perf_counter()
         self.model.Draw()
+        draw_ms = (time.perf_counter() - start) * 1000
+        if self._pending_frame:
+            update_ms, lateness_ms, param_writes = self._pending_frame
+            self._pending_frame = None
+            self.frame_stats.record_frame(update_ms, draw_ms, lateness_ms, param_writes)
     
     def resizeGL(self, width, height):
         """调整窗口大小"""
         if self.model:
             self.model.Resize(width, height)
     
-    def update_model(self):
-        """更新模型状态"""
+    def update_model(self, delta_time: float = 0.016):
+        """
+        更新模型状态
+        
+        Args:
+            delta_time: 帧间隔（秒），默认约 60 FPS
+        """
         if not self.model:
             return
         
+        stats = self.frame_stats
+        if stats is not None:
+            start = time.perf_counter()
+            lateness_ms = 0.0
+            # 超过 1 秒的间隔说明更新曾被暂停（挂起或播放烘焙帧），不计入延迟
+            if self._last_tick is not None and start - self._last_tick < 1.0:
+                lateness_ms = max(0.0, (start - self._last_tick) * 1000 - self.FRAME_INTERVAL_MS)
+            self._last_tick = start
+            self._param_writes = 0
+        
         # 先更新模型（计算物理、动画等）
-        delta_time = 0.016  # 约 60 FPS
         self.model.Update(delta_time)
         self.model.UpdateBlink(delta_time)
         
-        # 在 Update 和 Draw 之间更新平滑的鼠标位置（60fps）
-        # 这确保每次渲染都使用最新的 current 参数
-        self._smooth_mouse_position()
-        
-        # 根据当前的平滑位置更新跟踪参数
-        self._update_tracking_from_mouse(use_current=True)
+        if self.tracking_enabled:
+            # 在 Update 和 Draw 之间更新平滑的鼠标位置（60fps）
+            # 这确保每次渲染都使用最新的 current 参数
+            self._smooth_mouse_position()
+            
+            # 根据当前的平滑位置更新跟踪参数
+            self._update_tracking_from_mouse(use_current=True)
+        else:
+            self.set_parameters()
         
         # 在 Update 和 Draw 之间设置参数（正确的顺序）
         # 设置头部旋转
@@ -688,6 +1277,10 @@ class Live2DWidget(QOpenGLWidget):
         # 设置嘴巴（可选）
         self._try_set_parameter('ParamMouthOpenY', 0.0)
         
+        if stats is not None:
+            # 绘制耗时在 paintGL 中补上后一起记录
+            self._pending_frame = ((time.perf_counter() - start) * 1000, lateness_ms, self._param_writes)
+        
         # 重绘（Draw 在 paintGL 中调用）
         self.update()
     
@@ -699,12 +1292,12 @@ class Live2DWidget(QOpenGLWidget):
             param_name: 参数名称
             value: 参数值
         """
+        self._param_writes += 1
         try:
             self.model.SetParameterValueById(param_name, value)
         except Exception as e:
-            # 参数不存在或设置失败，静默忽略
-            logger.debug(f"设置参数失败 {param_name}: {e}")
-            pass
+            # 参数不存在或设置失败，忽略（每帧都会调用，按参数名限流记录）
+            _hot_log.debug("设置参数失败 %s: %s", param_name, e, key=param_name)
     
     def update_mouse_tracking(self):
         """
@@ -813,6 +1406,14 @@ class Live2DWidget(QOpenGLWidget):
             self.mouse_tracking_timer.deleteLater()
             self.mouse_tracking_timer = None
         
+        # 停止未完成的加载
+        self._load_timer.stop()
+        self._load_steps = []
+        self._pending_model = None
+        if self._load_worker:
+            self._load_worker.stop()
+            self._load_worker = None
+        
         if self.model:
             try:
                 from live2d.v3 import glRelease
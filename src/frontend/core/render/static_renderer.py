@@ -9,6 +9,7 @@ from PyQt5.QtCore import Qt
 import logging
 
 from .interfaces import IRenderer
+from .hit_mask import AlphaHitMask
 from src.util.image_util import get_scale_factor
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,10 @@ class StaticRenderer(IRenderer):
         self.scale_factor = get_scale_factor()
         self.pixmap: QPixmap = None
         
+        # 命中掩码缓存（按缩放后的图片计算一次）
+        self._hit_mask: AlphaHitMask = None
+        self._hit_mask_key = None
+        
     def initialize(self):
         """初始化渲染器"""
         logger.info(f"初始化静态图片渲染器: {self.image_path}")
@@ -127,6 +132,44 @@ class StaticRenderer(IRenderer):
         
         logger.debug(f"静态图片大小更新: {width}x{height}, 缩放: {scale_factor:.2f}, 图片: {scaled_pixmap.width()}x{scaled_pixmap.height()}")
     
+    def suspend(self):
+        """挂起渲染器：隐藏图片，保留已加载的图片"""
+        if self.label:
+            self.label.hide()
+
+    def resume(self):
+        """恢复渲染器：重新显示图片并监听父控件大小变化"""
+        if not self.label:
+            return
+
+        self.parent.resizeEvent = self._on_parent_resize
+        self.update_size(self.parent.width(), self.parent.height())
+        self.label.show()
+        self.label.raise_()
+
+    def get_hit_mask(self):
+        """获取图片的命中掩码（每个缩放尺寸只计算一次）"""
+        if not self.label or not self.label.isVisible():
+            return None
+        
+        pixmap = self.label.pixmap()
+        if pixmap is None or pixmap.isNull():
+            return None
+        
+        if self._hit_mask_key != pixmap.cacheKey():
+            self._hit_mask = AlphaHitMask.from_image(pixmap.toImage(), pixmap.size())
+            self._hit_mask_key = pixmap.cacheKey()
+        return self._hit_mask.translated(self.label.pos())
+    
+    def estimate_memory_bytes(self) -> int:
+        """估算图片占用的内存（原图加当前缩放后的图片）"""
+        total = 0
+        if self.pixmap:
+            total += self.pixmap.width() * self.pixmap.height() * 4
+        if self.label and self.label.pixmap():
+            total += self.label.width() * self.label.height() * 4
+        return total
+
     def cleanup(self):
         """清理资源"""
         if self.label:
@@ -0,0 +1,66 @@
+"""
+Live2D 模型加载工作线程
+负责在后台预加载模型资源并解析模型，避免阻塞 GUI 线程
+"""
+
+import logging
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..render.live2d_assets import prepare_live2d_assets, load_live2d_model, Live2DLoadCancelled
+
+logger = logging.getLogger(__name__)
+
+
+class Live2DLoadWorker(QThread):
+    """
+    Live2D 模型加载工作线程
+
+    职责：
+    - 解析模型配置并预读所有引用文件
+    - 校验 moc 与纹理文件
+    - 由 live2d 库解析模型（LoadModelJson），GUI 线程只需创建渲染器
+    - 通过信号把结果交回 GUI 线程
+    """
+
+    # 信号：预加载完成（Live2DModelAssets）
+    loaded = pyqtSignal(object)
+
+    # 信号：预加载失败（错误信息）
+    failed = pyqtSignal(str)
+
+    def __init__(self, model_path: str, parent=None):
+        """
+        初始化加载线程
+
+        Args:
+            model_path: Live2D 模型文件路径（.model3.json）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.model_path = model_path
+
+    def run(self):
+        """线程主体"""
+        started = time.perf_counter()
+        try:
+            assets = prepare_live2d_assets(self.model_path, should_stop=self.isInterruptionRequested)
+            if self.isInterruptionRequested():
+                raise Live2DLoadCancelled(self.model_path)
+            assets.model = load_live2d_model(self.model_path)
+        except Live2DLoadCancelled:
+            logger.debug(f"Live2D 资源预加载已取消: {self.model_path}")
+            return
+        except Exception as e:
+            logger.error(f"Live2D 资源预加载失败: {e}")
+            self.failed.emit(str(e))
+            return
+
+        logger.debug(f"Live2D 资源预加载耗时: {(time.perf_counter() - started) * 1000:.1f} ms")
+        self.loaded.emit(assets)
+
+    def stop(self, timeout_ms: int = 2000):
+        """请求停止并等待线程结束"""
+        self.requestInterruption()
+        self.wait(timeout_ms)
@@ -140,6 +140,9 @@ class DesktopPet(QWidget):
         # 连接信号（保存连接以便后续断开）
         self._signal_connections = []
         self._connect_signal(signals_bus.message_received, self.show_message)
+        self._connect_signal(signals_bus.messages_received, self.show_messages)
+        self._connect_signal(signals_bus.connection_state_changed, self._on_connection_state_changed)
+        self._connection_state = None
 
         # 窥屏功能
         self.is_peeking = False
@@ -237,8 +240,33 @@ class DesktopPet(QWidget):
         from src.core.thread_manager import thread_manager
         thread_manager.register_cleanup(self.hotkey_manager.cleanup)
         
+        # 应用鼠标跟踪配置，并监视配置文件变化
+        self.event_manager.apply_tracking_config(config)
+        self._init_config_watcher()
+        
         logger.info("核心管理器初始化完成")
     
+    def _init_config_watcher(self):
+        """启动配置文件监视，把变化转发到主线程"""
+        try:
+            from config import config_watcher
+            
+            # 监视线程发出信号，槽函数在主线程执行
+            signals_bus.config_changed.connect(self._on_config_changed)
+            config_watcher.subscribe(signals_bus.config_changed.emit, "config")
+            config_watcher.start()
+            thread_manager.register_cleanup(config_watcher.stop)
+        except Exception as e:
+            logger.error(f"启动配置文件监视失败: {e}")
+    
+    def _on_config_changed(self, change):
+        """配置文件在运行中被修改（主线程）"""
+        for manager in (self.render_manager, self.event_manager):
+            try:
+                manager.apply_config_change(change)
+            except Exception as e:
+                logger.error(f"应用配置修改失败: {e}", exc_info=True)
+    
     def init_subsystems(self):
         """初始化子系统"""
         # 气泡系统（传入气泡点击回调）
@@ -507,6 +535,39 @@ class DesktopPet(QWidget):
             return
         self.bubble_manager.show_message(text, msg_type, pixmap)
 
+    def show_messages(self, items: list):
+        """批量显示一组入站消息（一次布局更新）"""
+        if self.is_chat_window_active():
+            logger.debug("聊天窗口已打开，跳过桌宠气泡显示")
+            return
+        self.bubble_manager.show_messages(items)
+
+    # 连接状态对应的提示文本
+    _CONNECTION_NOTICES = {
+        'connecting': "正在连接模型…",
+        'connected': "模型已连接",
+        'reconnecting': "连接已断开，正在重连…",
+        'failed': "模型连接失败，发送消息时将重试",
+    }
+
+    def _on_connection_state_changed(self, state: str):
+        """后台连接状态变化：更新托盘提示并显示轻提示"""
+        previous = self._connection_state
+        if state == previous:
+            return
+        self._connection_state = state
+
+        if getattr(self, 'tray_icon', None):
+            status = self._CONNECTION_NOTICES.get(state, state)
+            self.tray_icon.setToolTip(f"桌面宠物 - {status}")
+
+        # 首次收到的状态若已是 connected，说明没有显示过"连接中"，无需额外提示
+        if state == 'connected' and previous is None:
+            return
+        text = self._CONNECTION_NOTICES.get(state)
+        if text:
+            self.show_notice(text)
+
     def show_notice(self, text: str, on_click=None):
         """显示非聊天系统提示。"""
         if not text:
@@ -576,6 +637,9 @@ class DesktopPet(QWidget):
         
         # 退出应用程序
         logger.info("退出应用程序")
+        # os._exit 不会执行 atexit，先等待日志线程写完剩余日志
+        from src.util.logger import flush_logging
+        flush_logging()
         # 使用 os._exit 强制终止进程，避免等待非守护线程
         import os
         os._exit(0)
@@ -743,6 +807,13 @@ class BubbleManager:
             self.chat_bubbles.add_message(text, msg_type, pixmap)
             QTimer.singleShot(25000, self.del_first_msg)
 
+    def show_messages(self, items: list):
+        """批量显示消息，每条消息仍按各自的时间淡出"""
+        if self.chat_bubbles and items:
+            self.chat_bubbles.add_messages(items)
+            for _ in items:
+                QTimer.singleShot(25000, self.del_first_msg)
+
     def show_notice(self, text: str, on_click=None):
         """显示非聊天系统提示。"""
         if self.chat_bubbles:
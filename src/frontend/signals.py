@@ -3,7 +3,10 @@ from PyQt5.QtCore import QObject, pyqtSignal , QPoint
 class GlobalSignals(QObject):
     # 定义全局信号
     message_received = pyqtSignal(str)  # 参数类型: str
+    messages_received = pyqtSignal(list)  # 参数类型: list[dict]，一批入站消息 {'text', 'image', 'seg_type'}
+    connection_state_changed = pyqtSignal(str)  # 参数: connecting/connected/reconnecting/disconnected/failed
     position_changed = pyqtSignal(QPoint)  # 定义信号，用于传递新位置
+    config_changed = pyqtSignal(object)  # 参数: ConfigChange（配置文件在运行中被修改）
 
 # 创建全局信号总线实例
 signals_bus = GlobalSignals()
\ No newline at end of file
@@ -3,13 +3,31 @@
 兼容 maim_message 库的消息结构 (v0.6.1+)
 """
 
-from dataclasses import dataclass, field, asdict
+from copy import deepcopy
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 import time
 import uuid
 
+# 不可变的基本类型，序列化时不需要复制
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
 
-@dataclass
+
+def _copy_value(value: Any) -> Any:
+    """复制可变的字段值（与 dataclasses.asdict 的深拷贝语义一致），基本类型直接返回"""
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return deepcopy(value)
+
+
+def _default_formats() -> List[str]:
+    return ["text", "image", "emoji"]
+
+
+# 所有消息类都使用 __slots__，并直接按字段逐个（反）序列化，
+# 不经过 dataclasses.asdict 的递归深拷贝，每个嵌套对象只序列化一次。
+
+@dataclass(slots=True)
 class UserInfo:
     """用户信息"""
     platform: str
@@ -19,10 +37,21 @@ class UserInfo:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'platform': self.platform,
+            'user_id': self.user_id,
+            'user_nickname': self.user_nickname,
+            'user_cardname': self.user_cardname,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserInfo':
+        """从字典创建"""
+        get = data.get
+        return cls(get('platform', ''), get('user_id', ''), get('user_nickname', ''), get('user_cardname', ''))
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupInfo:
     """群组信息"""
     group_id: str = ""
@@ -30,21 +59,36 @@ class GroupInfo:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {'group_id': self.group_id, 'group_name': self.group_name}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GroupInfo':
+        """从字典创建"""
+        return cls(data.get('group_id', ''), data.get('group_name', ''))
 
 
-@dataclass
+@dataclass(slots=True)
 class FormatInfo:
     """格式信息"""
-    content_format: List[str] = field(default_factory=lambda: ["text", "image", "emoji"])
-    accept_format: List[str] = field(default_factory=lambda: ["text", "image", "emoji"])
+    content_format: List[str] = field(default_factory=_default_formats)
+    accept_format: List[str] = field(default_factory=_default_formats)
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {'content_format': list(self.content_format), 'accept_format': list(self.accept_format)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FormatInfo':
+        """从字典创建"""
+        content_format = data.get('content_format')
+        accept_format = data.get('accept_format')
+        return cls(
+            content_format if content_format is not None else _default_formats(),
+            accept_format if accept_format is not None else _default_formats(),
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class TemplateInfo:
     """模板信息"""
     template_id: str = ""
@@ -53,10 +97,19 @@ class TemplateInfo:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'template_id': self.template_id,
+            'template_name': self.template_name,
+            'template_data': _copy_value(self.template_data),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TemplateInfo':
+        """从字典创建"""
+        return cls(data.get('template_id', ''), data.get('template_name', ''), data.get('template_data', {}))
 
 
-@dataclass
+@dataclass(slots=True)
 class SenderInfo:
     """发送者信息类"""
     platform: str = ""
@@ -66,10 +119,21 @@ class SenderInfo:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'platform': self.platform,
+            'user_id': self.user_id,
+            'user_nickname': self.user_nickname,
+            'user_cardname': self.user_cardname,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SenderInfo':
+        """从字典创建"""
+        get = data.get
+        return cls(get('platform', ''), get('user_id', ''), get('user_nickname', ''), get('user_cardname', ''))
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiverInfo:
     """接收者信息类"""
     platform: str = ""
@@ -79,10 +143,21 @@ class ReceiverInfo:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'platform': self.platform,
+            'user_id': self.user_id,
+            'user_nickname': self.user_nickname,
+            'user_cardname': self.user_cardname,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReceiverInfo':
+        """从字典创建"""
+        get = data.get
+        return cls(get('platform', ''), get('user_id', ''), get('user_nickname', ''), get('user_cardname', ''))
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseMessageInfo:
     """基础消息信息"""
     platform: str
@@ -98,24 +173,48 @@ class BaseMessageInfo:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        data = asdict(self)
-        # 将嵌套对象也转换为字典
-        if self.user_info:
-            data['user_info'] = self.user_info.to_dict()
-        if self.format_info:
-            data['format_info'] = self.format_info.to_dict()
-        if self.group_info:
-            data['group_info'] = self.group_info.to_dict()
-        if self.template_info:
-            data['template_info'] = self.template_info.to_dict()
-        if self.sender_info:
-            data['sender_info'] = self.sender_info.to_dict()
-        if self.receiver_info:
-            data['receiver_info'] = self.receiver_info.to_dict()
-        return data
-
-
-@dataclass
+        user_info = self.user_info
+        format_info = self.format_info
+        group_info = self.group_info
+        template_info = self.template_info
+        sender_info = self.sender_info
+        receiver_info = self.receiver_info
+        return {
+            'platform': self.platform,
+            'message_id': self.message_id,
+            'time': self.time,
+            'user_info': user_info.to_dict() if user_info is not None else None,
+            'format_info': format_info.to_dict() if format_info is not None else None,
+            'group_info': group_info.to_dict() if group_info is not None else None,
+            'template_info': template_info.to_dict() if template_info is not None else None,
+            'sender_info': sender_info.to_dict() if sender_info is not None else None,
+            'receiver_info': receiver_info.to_dict() if receiver_info is not None else None,
+            'additional_config': _copy_value(self.additional_config),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BaseMessageInfo':
+        """从字典创建（可选的嵌套信息为空时保持 None）"""
+        get = data.get
+        group_info = get('group_info')
+        template_info = get('template_info')
+        sender_info = get('sender_info')
+        receiver_info = get('receiver_info')
+        return cls(
+            get('platform', ''),
+            get('message_id', ''),
+            data['time'] if 'time' in data else time.time(),
+            UserInfo.from_dict(get('user_info') or {}),
+            FormatInfo.from_dict(get('format_info') or {}),
+            GroupInfo.from_dict(group_info) if group_info else None,
+            TemplateInfo.from_dict(template_info) if template_info else None,
+            SenderInfo.from_dict(sender_info) if sender_info else None,
+            ReceiverInfo.from_dict(receiver_info) if receiver_info else None,
+            get('additional_config', {}),
+        )
+
+
+@dataclass(slots=True)
 class Seg:
     """消息段"""
     type: str
@@ -123,10 +222,15 @@ class Seg:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {'type': self.type, 'data': _copy_value(self.data)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Seg':
+        """从字典创建"""
+        return cls(data.get('type', 'text'), data.get('data', ''))
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageBase:
     """消息基类 - 兼容 maim_message 的 MessageBase"""
     message_info: BaseMessageInfo
@@ -135,95 +239,21 @@ class MessageBase:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        data = asdict(self)
-        # 将嵌套对象也转换为字典
-        if self.message_info:
-            data['message_info'] = self.message_info.to_dict()
-        if self.message_segment:
-            data['message_segment'] = self.message_segment.to_dict()
-        return data
+        message_info = self.message_info
+        message_segment = self.message_segment
+        return {
+            'message_info': message_info.to_dict() if message_info is not None else None,
+            'message_segment': message_segment.to_dict() if message_segment is not None else None,
+            'raw_message': self.raw_message,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MessageBase':
         """从字典创建消息对象"""
-        # 解析 message_info
-        message_info_dict = data.get('message_info', {})
-        user_info_dict = message_info_dict.get('user_info', {})
-        format_info_dict = message_info_dict.get('format_info', {})
-        group_info_dict = message_info_dict.get('group_info', {})
-        template_info_dict = message_info_dict.get('template_info', {})
-        sender_info_dict = message_info_dict.get('sender_info', {})
-        receiver_info_dict = message_info_dict.get('receiver_info', {})
-        
-        user_info = UserInfo(
-            platform=user_info_dict.get('platform', ''),
-            user_id=user_info_dict.get('user_id', ''),
-            user_nickname=user_info_dict.get('user_nickname', ''),
-            user_cardname=user_info_dict.get('user_cardname', ''),
-        )
-        
-        format_info = FormatInfo(
-            content_format=format_info_dict.get('content_format', ['text', 'image', 'emoji']),
-            accept_format=format_info_dict.get('accept_format', ['text', 'image', 'emoji']),
-        )
-        
-        group_info = None
-        if group_info_dict:
-            group_info = GroupInfo(
-                group_id=group_info_dict.get('group_id', ''),
-                group_name=group_info_dict.get('group_name', ''),
-            )
-        
-        template_info = None
-        if template_info_dict:
-            template_info = TemplateInfo(
-                template_id=template_info_dict.get('template_id', ''),
-                template_name=template_info_dict.get('template_name', ''),
-                template_data=template_info_dict.get('template_data', {}),
-            )
-        
-        sender_info = None
-        if sender_info_dict:
-            sender_info = SenderInfo(
-                platform=sender_info_dict.get('platform', ''),
-                user_id=sender_info_dict.get('user_id', ''),
-                user_nickname=sender_info_dict.get('user_nickname', ''),
-                user_cardname=sender_info_dict.get('user_cardname', ''),
-            )
-        
-        receiver_info = None
-        if receiver_info_dict:
-            receiver_info = ReceiverInfo(
-                platform=receiver_info_dict.get('platform', ''),
-                user_id=receiver_info_dict.get('user_id', ''),
-                user_nickname=receiver_info_dict.get('user_nickname', ''),
-                user_cardname=receiver_info_dict.get('user_cardname', ''),
-            )
-        
-        message_info = BaseMessageInfo(
-            platform=message_info_dict.get('platform', ''),
-            message_id=message_info_dict.get('message_id', ''),
-            time=message_info_dict.get('time', time.time()),
-            user_info=user_info,
-            format_info=format_info,
-            group_info=group_info,
-            template_info=template_info,
-            sender_info=sender_info,
-            receiver_info=receiver_info,
-            additional_config=message_info_dict.get('additional_config', {}),
-        )
-        
-        # 解析 message_segment
-        segment_dict = data.get('message_segment', {})
-        message_segment = Seg(
-            type=segment_dict.get('type', 'text'),
-            data=segment_dict.get('data', ''),
-        )
-        
         return cls(
-            message_info=message_info,
-            message_segment=message_segment,
-            raw_message=data.get('raw_message', ''),
+            BaseMessageInfo.from_dict(data.get('message_info') or {}),
+            Seg.from_dict(data.get('message_segment') or {}),
+            data.get('raw_message', ''),
         )
     
     @classmethod
@@ -0,0 +1,145 @@
+"""
+热路径日志限流
+
+渲染循环、鼠标跟踪等每帧执行的代码不能无条件写日志：
+- 级别未启用时直接返回，不格式化消息（消息使用 % 参数或无参函数延迟求值）
+- 按调用位置（或指定的 key）限流：每个时间窗口最多输出 burst 条，
+  其余的只计数，下一次输出时附带“已抑制 N 条相似日志”
+- 采样模式：每 N 次调用只考虑 1 次（适合每帧都会走到的分支）
+
+用法:
+    _hot_log = ThrottledLogger(logger, interval=5.0)
+    _hot_log.debug("设置参数失败 %s: %s", name, e, key=name)
+
+    _frame_log = ThrottledLogger(logger, interval=10.0, sample_every=600)
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Union
+
+
+class _CallSiteState:
+    """单个调用位置的限流状态"""
+    __slots__ = ('window_start', 'emitted', 'suppressed', 'calls')
+
+    def __init__(self):
+        self.window_start = 0.0
+        self.emitted = 0
+        self.suppressed = 0
+        self.calls = 0
+
+
+class ThrottledLogger:
+    """
+    带限流和采样的日志包装
+
+    接口与 logging.Logger 的 debug/info/warning/error 相同，额外支持：
+    - msg 可以是无参函数（只在真正输出时调用）
+    - key 关键字参数：限流分组（默认按调用位置分组）
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 5.0, burst: int = 1, sample_every: int = 0):
+        """
+        初始化
+
+        Args:
+            logger: 实际输出的 logger
+            interval: 限流时间窗口（秒），0 表示不限流
+            burst: 每个时间窗口内最多输出的条数
+            sample_every: 采样间隔，每 N 次调用只考虑 1 次（0 或 1 表示不采样）
+        """
+        self.logger = logger
+        self.interval = interval
+        self.burst = max(1, burst)
+        self.sample_every = max(0, sample_every)
+        self._states: Dict[Hashable, _CallSiteState] = {}
+        self._lock = threading.Lock()
+
+    def debug(self, msg: Union[str, Callable[[], str]], *args, **kwargs):
+        self.log(logging.DEBUG, msg, *args, _depth=2, **kwargs)
+
+    def info(self, msg: Union[str, Callable[[], str]], *args, **kwargs):
+        self.log(logging.INFO, msg, *args, _depth=2, **kwargs)
+
+    def warning(self, msg: Union[str, Callable[[], str]], *args, **kwargs):
+        self.log(logging.WARNING, msg, *args, _depth=2, **kwargs)
+
+    def error(self, msg: Union[str, Callable[[], str]], *args, **kwargs):
+        self.log(logging.ERROR, msg, *args, _depth=2, **kwargs)
+
+    def log(self, level: int, msg: Union[str, Callable[[], str]], *args,
+            key: Optional[Hashable] = None, _depth: int = 1, **kwargs):
+        """
+        输出一条限流日志
+
+        Args:
+            level: 日志级别
+            msg: 消息（% 格式字符串，或返回消息的无参函数）
+            *args: 格式化参数
+            key: 限流分组，默认按调用位置（文件名 + 行号）
+            **kwargs: 传给 logger.log 的其他参数（如 exc_info）
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+
+        if key is None:
+            frame = sys._getframe(_depth)
+            key = (frame.f_code.co_filename, frame.f_lineno)
+
+        suppressed = self._acquire(key)
+        if suppressed is None:
+            return
+
+        if callable(msg):
+            msg = msg()
+        if args:
+            msg = msg % args
+        if suppressed:
+            msg = f"{msg}（已抑制 {suppressed} 条相似日志）"
+        kwargs.setdefault('stacklevel', _depth + 1)
+        self.logger.log(level, msg, **kwargs)
+
+    def _acquire(self, key: Hashable) -> Optional[int]:
+        """
+        判断本次调用是否输出
+
+        Returns:
+            输出时返回此前被抑制的条数；不输出时返回 None
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _CallSiteState()
+
+            state.calls += 1
+            if self.sample_every > 1 and (state.calls - 1) % self.sample_every:
+                state.suppressed += 1
+                return None
+
+            if self.interval > 0:
+                now = time.monotonic()
+                if now - state.window_start >= self.interval:
+                    state.window_start = now
+                    state.emitted = 0
+                if state.emitted >= self.burst:
+                    state.suppressed += 1
+                    return None
+                state.emitted += 1
+
+            suppressed, state.suppressed = state.suppressed, 0
+            return suppressed
+
+    def suppressed_count(self, key: Hashable) -> int:
+        """返回指定分组当前被抑制（尚未报告）的条数"""
+        with self._lock:
+            state = self._states.get(key)
+            return state.suppressed if state else 0
+
+    def reset(self):
+        """清空所有限流状态"""
+        with self._lock:
+            self._states.clear()
+
@@ -5,15 +5,34 @@
 1. 主日志文件 (pet.log) - 按天轮转，长期保存
 2. 最近一次启动日志 (last_run.log) - 每次启动清空，仅保存当前运行的日志
 3. 控制台输出 - 实时查看
+
+所有输出都在后台线程完成：各线程调用 logger 时只把记录放入队列（QueueHandler），
+由唯一的 QueueListener 线程批量格式化和写入，每批只刷新一次文件和控制台
 """
 
+import atexit
+import copy
 import logging
+import queue
 import sys
 import os
-from logging.handlers import TimedRotatingFileHandler
+import threading
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
 
+# 日志队列容量
+LOG_QUEUE_SIZE = 10000
+# 队列占用超过该比例时丢弃 DEBUG 日志
+DEBUG_DROP_RATIO = 0.5
+# 队列已满时 WARNING 及以上级别最多等待的时间（秒）
+BLOCK_TIMEOUT = 1.0
+# 每批最多处理的记录数
+BATCH_SIZE = 256
+# 可以原样交给日志线程拼接的参数类型（不可变，str() 没有副作用）
+PLAIN_ARG_TYPES = (str, int, float, bool, type(None))
+
+
 class StreamToLogger:
     """自定义日志处理器，将 print 输出重定向到日志"""
     
@@ -44,6 +63,19 @@ class StreamToLogger:
         raise OSError("StreamToLogger does not expose a file descriptor")
 
 
+class BatchFlushMixin:
+    """
+    批量刷新：emit() 中的 flush() 不立即执行，由日志线程在每批记录写完后调用 flush_batch()
+    """
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        """把本批写入的内容刷新到文件/控制台"""
+        super().flush()
+
+
 class LastRunHandler(logging.FileHandler):
     """
     自定义 Handler，专门用于保存最近一次运行的日志
@@ -87,6 +119,14 @@ class LastRunHandler(logging.FileHandler):
         super().emit(record)
 
 
+class BatchedTimedRotatingFileHandler(BatchFlushMixin, TimedRotatingFileHandler):
+    """按天轮转的主日志文件（批量刷新）"""
+
+
+class BatchedLastRunHandler(BatchFlushMixin, LastRunHandler):
+    """最近一次运行日志（批量刷新）"""
+
+
 class SafeConsoleHandler(logging.StreamHandler):
     """Console handler that tolerates Windows console encoding limits."""
 
@@ -101,6 +141,199 @@ class SafeConsoleHandler(logging.StreamHandler):
             pass
 
 
+class BatchedConsoleHandler(BatchFlushMixin, SafeConsoleHandler):
+    """控制台输出（批量刷新）"""
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    非阻塞的队列 Handler
+
+    丢弃策略：
+    - 队列占用超过 DEBUG_DROP_RATIO 时直接丢弃 DEBUG 日志（防止调试日志刷屏拖慢其他日志）
+    - 队列已满时丢弃 INFO 日志
+    - WARNING 及以上级别在队列已满时最多等待 BLOCK_TIMEOUT 秒（背压），仍然放不下才丢弃
+
+    被丢弃的条数会由日志线程汇总写入一条警告
+
+    记录放入队列前不做格式化（不像 QueueHandler.prepare 那样调用 self.format），
+    %-参数拼接、异常堆栈格式化都由日志线程的 Handler 完成
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._debug_limit = int(log_queue.maxsize * DEBUG_DROP_RATIO) if log_queue.maxsize > 0 else 0
+
+    def prepare(self, record):
+        """
+        只做记录跨线程前必须完成的工作
+
+        - 参数都是简单值（str、数字）时保留 msg 和 args，由日志线程拼接
+        - 其他参数可能在之后被修改，在当前线程先拼成文本
+        - 异常信息保留给日志线程格式化；已经有缓存的文本时才丢弃 exc_info
+        """
+        args = record.args or ()
+        plain = (
+            isinstance(record.msg, str)
+            and isinstance(args, tuple)
+            and all(type(arg) in PLAIN_ARG_TYPES for arg in args)
+        )
+        if plain and (record.exc_text is None or not record.exc_info):
+            return record
+
+        record = copy.copy(record)
+        if not plain:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_text is not None:
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if record.levelno <= logging.DEBUG and self._debug_limit and self.queue.qsize() >= self._debug_limit:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+            try:
+                self.queue.put(record, timeout=BLOCK_TIMEOUT)
+            except queue.Full:
+                self.dropped += 1
+
+
+class _FlushRequest:
+    """放入日志队列的刷新请求，日志线程处理到这里时通知等待者"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    批量处理的日志线程
+
+    每次唤醒后取出队列中已有的记录（最多 BATCH_SIZE 条）一起写入，写完后每个 Handler 只刷新一次
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers, queue_handler: DroppingQueueHandler = None):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self._reported_dropped = 0
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        while True:
+            batch = [q.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            flush_requests = []
+            for item in batch:
+                if item is self._sentinel:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                else:
+                    self.handle(item)
+                if has_task_done:
+                    q.task_done()
+
+            self._report_dropped()
+            self._flush_handlers()
+            for request in flush_requests:
+                request.done.set()
+            if stop:
+                break
+
+    def _report_dropped(self):
+        """汇总被丢弃的日志条数"""
+        if not self.queue_handler:
+            return
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_dropped:
+            count = dropped - self._reported_dropped
+            self._reported_dropped = dropped
+            record = logging.LogRecord(
+                'pet', logging.WARNING, __file__, 0,
+                f"日志队列繁忙，已丢弃 {count} 条日志", None, None
+            )
+            self.handle(record)
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, BatchFlushMixin):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            except Exception:
+                pass
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        等待队列中已有的日志全部写入
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否在超时前写完
+        """
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        try:
+            self.queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+
+# 日志线程（setup_logger 中创建）
+log_listener: BatchingQueueListener = None
+
+
+def flush_logging(timeout: float = 5.0) -> bool:
+    """
+    等待所有已记录的日志写入文件（退出前调用）
+
+    Args:
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        bool: 是否在超时前写完
+    """
+    if log_listener is None:
+        return True
+    return log_listener.flush(timeout)
+
+
+def stop_logging():
+    """写完剩余日志并停止日志线程"""
+    global log_listener
+    listener, log_listener = log_listener, None
+    if listener is not None and listener._thread is not None:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        for handler in listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+
+
 def setup_logger():
     """
     配置并初始化日志系统
@@ -135,14 +368,13 @@ def setup_logger():
     )
     
     # 1. 控制台 Handler（实时输出）
-    console_handler = SafeConsoleHandler(sys.stdout)
+    console_handler = BatchedConsoleHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)  # 控制台只显示 INFO 及以上级别
     console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
     
     # 2. 主日志文件 Handler（长期保存，按天轮转）
     main_log_path = os.path.join(log_dir, 'pet.log')
-    main_handler = TimedRotatingFileHandler(
+    main_handler = BatchedTimedRotatingFileHandler(
         filename=main_log_path,
         when='midnight',  # 每天午夜轮转
         interval=1,
@@ -151,18 +383,30 @@ def setup_logger():
     )
     main_handler.setLevel(logging.DEBUG)  # 文件记录所有级别
     main_handler.setFormatter(detailed_formatter)
-    logger.addHandler(main_handler)
     
     # 3. 最近一次运行日志 Handler（每次启动清空）
     last_run_log_path = os.path.join(log_dir, 'last_run.log')
-    last_run_handler = LastRunHandler(
+    last_run_handler = BatchedLastRunHandler(
         filename=last_run_log_path,
         mode='w',  # 每次启动清空文件
         encoding='utf-8'
     )
     last_run_handler.setLevel(logging.DEBUG)  # 记录所有级别
     last_run_handler.setFormatter(detailed_formatter)
-    logger.addHandler(last_run_handler)
+    
+    # 4. 调用方只把记录放入队列，由日志线程完成格式化和写入
+    global log_listener
+    stop_logging()
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    
+    log_listener = BatchingQueueListener(
+        log_queue, console_handler, main_handler, last_run_handler,
+        queue_handler=queue_handler
+    )
+    log_listener.start()
     
     # 记录初始化完成
     logger.info("=" * 60)
@@ -176,6 +420,7 @@ def setup_logger():
 
 # 初始化 logger
 logger = setup_logger()
+atexit.register(stop_logging)
 
 # 重定向 sys.stdout 和 sys.stderr 到日志记录器
 # 注意：这会影响所有 print 语句
@@ -183,4 +428,4 @@ sys.stdout = StreamToLogger(logger, logging.INFO)
 sys.stderr = StreamToLogger(logger, logging.ERROR)
 
 # 导出 logger
-__all__ = ['logger']
+__all__ = ['logger', 'flush_logging', 'stop_logging']
@@ -0,0 +1,83 @@
+"""
+启动阶段计时工具
+记录启动过程中每个阶段的开始/结束时间，用于启动耗时分析与基准测试
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from src.util.logger import logger
+
+
+class StartupProfiler:
+    """启动阶段计时器"""
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Args:
+            origin: 计时起点（time.perf_counter() 值），默认取创建时刻
+        """
+        self._origin = origin if origin is not None else time.perf_counter()
+        self._phases: Dict[str, Dict[str, Optional[float]]] = {}
+
+    def reset(self, origin: Optional[float] = None):
+        """清空记录并重新设置起点"""
+        self._origin = origin if origin is not None else time.perf_counter()
+        self._phases.clear()
+
+    def start(self, phase: str):
+        """标记阶段开始"""
+        self._phases[phase] = {'start': time.perf_counter(), 'end': None}
+
+    def end(self, phase: str):
+        """标记阶段结束（未调用 start 时以起点作为开始）"""
+        record = self._phases.setdefault(phase, {'start': self._origin, 'end': None})
+        record['end'] = time.perf_counter()
+
+    @contextmanager
+    def phase(self, phase: str):
+        """以上下文管理器的方式记录一个阶段"""
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.end(phase)
+
+    def report(self) -> List[dict]:
+        """
+        生成阶段报告（按开始时间排序）
+
+        Returns:
+            [{'phase', 'start_ms', 'end_ms', 'duration_ms'}]，未结束的阶段 end/duration 为 None
+        """
+        rows = []
+        for name, record in self._phases.items():
+            start_ms = (record['start'] - self._origin) * 1000
+            end_ms = (record['end'] - self._origin) * 1000 if record['end'] is not None else None
+            rows.append({
+                'phase': name,
+                'start_ms': round(start_ms, 1),
+                'end_ms': round(end_ms, 1) if end_ms is not None else None,
+                'duration_ms': round(end_ms - start_ms, 1) if end_ms is not None else None,
+            })
+        rows.sort(key=lambda row: row['start_ms'])
+        return rows
+
+    def log_report(self, title: str = "启动耗时"):
+        """把阶段报告输出到日志"""
+        logger.info("=" * 60)
+        logger.info(title)
+        for row in self.report():
+            if row['duration_ms'] is None:
+                logger.info(f"  {row['phase']:<16} 开始 {row['start_ms']:>8.1f} ms  （未完成）")
+            else:
+                logger.info(
+                    f"  {row['phase']:<16} {row['start_ms']:>8.1f} -> {row['end_ms']:>8.1f} ms"
+                    f"  耗时 {row['duration_ms']:>8.1f} ms"
+                )
+        logger.info("=" * 60)
+
+
+# 全局单例（main.py 在进程启动后尽早重置起点）
+startup_profiler = StartupProfiler()
@@ -0,0 +1,113 @@
+"""
+消息模型基准
+测量 src.shared.models.message 中消息对象的单条开销：
+- MessageBase.to_dict / from_dict（以及 dataclasses.asdict 旧实现的 to_dict 作为对照）
+- MessageBase.create_sent_message
+- 每条消息对象常驻占用的内存
+
+用法:
+    python tests/benchmark_message_model.py
+    python tests/benchmark_message_model.py --json bench.json
+    python tests/benchmark_message_model.py --baseline bench.json --tolerance 1.5
+"""
+
+import sys
+import os
+import json
+import argparse
+import dataclasses
+import tracemalloc
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_render_loop import measure, compare
+from src.shared.models.message import MessageBase
+
+
+def legacy_to_dict(message: MessageBase) -> dict:
+    """旧实现：asdict 递归深拷贝整个对象，再逐个嵌套对象重新序列化一次"""
+    data = dataclasses.asdict(message)
+    info = message.message_info
+    info_data = dataclasses.asdict(info)
+    for name in ('user_info', 'format_info', 'group_info', 'template_info', 'sender_info', 'receiver_info'):
+        value = getattr(info, name)
+        if value:
+            info_data[name] = dataclasses.asdict(value)
+    data['message_info'] = info_data
+    data['message_segment'] = dataclasses.asdict(message.message_segment)
+    return data
+
+
+def measure_resident_bytes(factory, count: int = 2000) -> float:
+    """创建 count 个对象并保持引用，返回平均每个对象占用的字节数"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def run_benchmarks(iterations: int = 20000) -> dict:
+    """运行全部基准，返回 {名称: 统计}"""
+    message = MessageBase.create_sent_message("这是一条用于基准测试的消息" * 3)
+    data = message.to_dict()
+    assert legacy_to_dict(message) == data
+
+    results = {
+        'MessageBase.to_dict': measure(message.to_dict, iterations),
+        'MessageBase.to_dict (asdict 旧实现)': measure(lambda: legacy_to_dict(message), iterations),
+        'MessageBase.from_dict': measure(lambda: MessageBase.from_dict(data), iterations),
+        'MessageBase.create_sent_message': measure(lambda: MessageBase.create_sent_message("你好"), iterations),
+    }
+    resident = measure_resident_bytes(lambda: MessageBase.from_dict(data))
+    results['MessageBase.from_dict'].update(resident_bytes_per_message=resident)
+    return results
+
+
+def print_report(results: dict):
+    """打印结果表"""
+    print("\n" + "=" * 100)
+    print("消息模型基准（单位：微秒/条）")
+    print("=" * 100)
+    print(f"  {'项目':<44}{'p50':>8}{'p95':>8}{'p99':>8}{'峰值分配':>10}{'常驻/条':>10}")
+    for name, stats in results.items():
+        resident = stats.get('resident_bytes_per_message')
+        resident_text = f"{resident:>12.0f}" if resident is not None else f"{'-':>12}"
+        print(f"  {name:<46}{stats['p50_us']:>8.2f}{stats['p95_us']:>8.2f}{stats['p99_us']:>8.2f}"
+              f"{stats['peak_alloc_bytes']:>12}{resident_text}")
+    print("=" * 100)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="消息模型基准")
+    parser.add_argument("--iterations", type=int, default=20000, help="每个项目的调用次数")
+    parser.add_argument("--json", help="把结果写入 JSON 文件（可作为之后的基线）")
+    parser.add_argument("--baseline", help="与基线 JSON 比较 p95，回退时返回非零退出码")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="允许的 p95 回退倍数")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.iterations)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n性能回退:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n与基线相比没有回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+渲染循环基准
+在无界面（offscreen）环境下，用假的 live2d.v3 模块测量热路径的单次调用耗时和内存分配：
+- Live2DWidget.update_model（以及 update_model + paintGL、开启性能统计时的开销）
+- EventManager._smooth_update_live2d
+- SpeechBubbleList.update_position
+- AnimationScheduler 随机动作选择
+
+假模块只提供空实现，测到的是 Python 侧的开销，不需要 GPU 和 live2d-py
+
+用法:
+    python tests/benchmark_render_loop.py
+    python tests/benchmark_render_loop.py --json bench.json
+    python tests/benchmark_render_loop.py --baseline bench.json --tolerance 1.5
+"""
+
+import sys
+import os
+import gc
+import json
+import time
+import types
+import argparse
+import tempfile
+import tracemalloc
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def install_fake_live2d():
+    """注册假的 live2d.v3 模块（所有调用都是空操作）"""
+    v3 = types.ModuleType("live2d.v3")
+
+    def noop(*args, **kwargs):
+        return None
+
+    class Model:
+        """假的 Live2D 模型"""
+
+        def __getattr__(self, name):
+            return noop
+
+        def GetCanvasSizePixel(self):
+            return (2000, 3000)
+
+    v3.init = noop
+    v3.dispose = noop
+    v3.glInit = noop
+    v3.glRelease = noop
+    v3.clearBuffer = noop
+    v3.Model = Model
+
+    package = types.ModuleType("live2d")
+    package.v3 = v3
+    sys.modules["live2d"] = package
+    sys.modules["live2d.v3"] = v3
+
+
+def measure(func, iterations: int, warmup: int = 50) -> dict:
+    """
+    测量函数的单次调用耗时分布和内存分配
+
+    计时和内存统计分两轮进行，避免 tracemalloc 影响计时
+
+    Args:
+        func: 无参数的被测函数
+        iterations: 调用次数
+        warmup: 预热次数
+    """
+    for _ in range(warmup):
+        func()
+
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    timings = []
+    perf_counter = time.perf_counter
+    try:
+        for _ in range(iterations):
+            start = perf_counter()
+            func()
+            timings.append((perf_counter() - start) * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(iterations):
+        func()
+    blocks_after = sys.getallocatedblocks()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+
+    def percentile(percent):
+        return timings[min(len(timings) - 1, int(round(percent / 100.0 * (len(timings) - 1))))]
+
+    return {
+        'iterations': iterations,
+        'mean_us': sum(timings) / len(timings),
+        'p50_us': percentile(50),
+        'p95_us': percentile(95),
+        'p99_us': percentile(99),
+        'max_us': timings[-1],
+        'peak_alloc_bytes': peak - before,
+        'net_alloc_bytes_per_call': (current - before) / iterations,
+        'net_blocks_per_call': (blocks_after - blocks_before) / iterations,
+    }
+
+
+def _make_model(root: str, motion_count: int) -> str:
+    """生成带有大量动作的测试模型，返回 model3.json 路径"""
+    groups = ['Idle', 'Tap', 'Flick', 'Shake', 'Pinch']
+    motions = {group: [] for group in groups}
+    os.makedirs(os.path.join(root, 'motions'), exist_ok=True)
+    for index in range(motion_count):
+        group = groups[index % len(groups)]
+        name = f"motions/{group.lower()}_{index}.motion3.json"
+        motions[group].append({'File': name})
+        with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+            json.dump({'Meta': {'Duration': 3.0, 'Fps': 30.0, 'Loop': False}}, f)
+
+    model_path = os.path.join(root, 'bench.model3.json')
+    with open(model_path, 'w', encoding='utf-8') as f:
+        json.dump({'Version': 3, 'FileReferences': {'Motions': motions}}, f)
+    return model_path
+
+
+def run_benchmarks(iterations: int = 2000) -> dict:
+    """运行全部基准，返回 {名称: 统计}"""
+    install_fake_live2d()
+
+    from PyQt5.QtWidgets import QApplication, QWidget
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from src.frontend.core.models import live2d_model_info
+    from src.frontend.core.models.live2d_model_info import Live2DModelInfoIndex
+    from src.frontend.core.render.live2d_renderer import Live2DRenderer, Live2DWidget
+    from src.frontend.core.render.frame_stats import FrameStatsRecorder
+    from src.frontend.core.managers.animation_scheduler import AnimationScheduler
+    from src.frontend.core.managers.event_manager import EventManager
+    from src.frontend.core.managers.render_manager import RenderManager
+    from src.frontend.bubble_speech import SpeechBubbleList
+    from live2d.v3 import Model
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        # Live2D 控件：跳过资源加载，直接挂上假模型
+        window = QWidget()
+        window.resize(400, 600)
+        widget = Live2DWidget(os.path.join(root, 'missing.model3.json'), window)
+        widget.mouse_tracking_timer.stop()
+        widget.model = Model()
+        widget._gl_ready = True
+
+        results['Live2DWidget.update_model'] = measure(widget.update_model, iterations)
+
+        def update_and_paint():
+            widget.update_model()
+            widget.paintGL()
+
+        results['Live2DWidget.update_model+paintGL'] = measure(update_and_paint, iterations)
+
+        widget.frame_stats = FrameStatsRecorder()
+        results['Live2DWidget.update_model+paintGL (frame_stats)'] = measure(update_and_paint, iterations)
+        widget.frame_stats = None
+
+        # 鼠标跟踪平滑：经由 RenderManager 写入 Live2D 参数
+        class BenchRenderManager(RenderManager):
+            def load_config(self):
+                self.click_through = False
+
+            def create_renderer(self):
+                self.renderer = Live2DRenderer(widget.model_path, enable_animation_scheduler=False)
+                self.renderer.widget = widget
+                self.current_mode = "live2d"
+
+        render_manager = BenchRenderManager(window)
+        event_manager = EventManager(window)
+        event_manager._smooth_timer.stop()
+        event_manager.set_managers(render_manager, None, None, None)
+        event_manager._target_head_angle_x = 20.0
+        event_manager._target_eye_angle_y = -0.5
+        results['EventManager._smooth_update_live2d'] = measure(event_manager._smooth_update_live2d, iterations)
+
+        # 气泡布局
+        bubbles = SpeechBubbleList(parent=window, use_database=False)
+        window.move(600, 500)
+        for index in range(8):
+            bubbles._append_bubble(f"基准消息 {index}" * (index + 1), "received" if index % 2 else "sent")
+        results['SpeechBubbleList.update_position (8 bubbles)'] = measure(bubbles.update_position, iterations // 4)
+
+        # 动画调度器：使用临时索引，避免写入工作目录
+        live2d_model_info._model_info_index = Live2DModelInfoIndex(os.path.join(root, 'index.json'))
+        try:
+            scheduler = AnimationScheduler(
+                _make_model(root, 500),
+                group_weights={'Tap': 3.0, 'Flick': 1.5, 'Shake': 0.5},
+                blacklist=['Pinch']
+            )
+        finally:
+            live2d_model_info._model_info_index = None
+        results['AnimationScheduler._select_motion_by_weight (400 motions)'] = measure(
+            scheduler._select_motion_by_weight, iterations
+        )
+        results['AnimationScheduler._rebuild_motion_table (400 motions)'] = measure(
+            scheduler._rebuild_motion_table, iterations // 10
+        )
+
+        for bubble in list(bubbles._active_bubbles):
+            bubble.deleteLater()
+        event_manager.cleanup()
+        widget.cleanup()
+        app.processEvents()
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    与基线比较 p95 耗时
+
+    Args:
+        results: 本次结果
+        baseline: 基线结果
+        tolerance: 允许的倍数（超过即视为回退）
+
+    Returns:
+        list: 回退的项目描述
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if stats['p95_us'] > base['p95_us'] * tolerance:
+            regressions.append(f"{name}: p95 {base['p95_us']:.1f} -> {stats['p95_us']:.1f} us")
+    return regressions
+
+
+def print_report(results: dict):
+    """打印结果表"""
+    print("\n" + "=" * 110)
+    print("渲染循环基准（单位：微秒/次）")
+    print("=" * 110)
+    print(f"  {'项目':<58}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>9}{'峰值分配':>10}{'净分配/次':>10}")
+    for name, stats in results.items():
+        print(f"  {name:<60}{stats['p50_us']:>8.1f}{stats['p95_us']:>8.1f}{stats['p99_us']:>8.1f}"
+              f"{stats['max_us']:>9.1f}{stats['peak_alloc_bytes']:>12}{stats['net_alloc_bytes_per_call']:>12.1f}")
+    print("=" * 110)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="渲染循环基准")
+    parser.add_argument("--iterations", type=int, default=2000, help="每个项目的调用次数")
+    parser.add_argument("--json", help="把结果写入 JSON 文件（可作为之后的基线）")
+    parser.add_argument("--baseline", help="与基线 JSON 比较 p95，回退时返回非零退出码")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="允许的 p95 回退倍数")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.iterations)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n性能回退:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n与基线相比没有回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
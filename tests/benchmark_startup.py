@@ -0,0 +1,58 @@
+"""
+启动耗时基准
+在无界面（offscreen）环境下运行真实启动流程，等待后台服务完成后输出每个阶段的耗时
+
+用法:
+    QT_QPA_PLATFORM=offscreen python tests/benchmark_startup.py
+"""
+
+import time
+_PROCESS_START = time.perf_counter()
+
+import sys
+import os
+import asyncio
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+import qasync
+
+
+def run_benchmark():
+    """运行一次启动并返回阶段报告"""
+    from src.util.startup_profiler import startup_profiler
+
+    startup_profiler.reset(origin=_PROCESS_START)
+    startup_profiler.end('imports')
+
+    with startup_profiler.phase('qt_app'):
+        app = QApplication(sys.argv)
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
+
+    import main
+
+    async def startup():
+        chat_pet = await main.main()
+        startup_profiler.end('window_shown')
+        await chat_pet.backend_task
+        return chat_pet
+
+    with loop:
+        chat_pet = loop.run_until_complete(startup())
+    chat_pet.cleanup_resources()
+    return startup_profiler.report()
+
+
+if __name__ == "__main__":
+    report = run_benchmark()
+    print("\n" + "=" * 70)
+    print("启动耗时基准")
+    print("=" * 70)
+    for row in report:
+        duration = f"{row['duration_ms']:.1f} ms" if row['duration_ms'] is not None else "未完成"
+        print(f"  {row['phase']:<16} 开始 {row['start_ms']:>8.1f} ms   耗时 {duration}")
+    print("=" * 70)
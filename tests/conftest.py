@@ -0,0 +1,62 @@
+"""
+测试共享的 fixture
+
+- qapp: 测试用 QApplication（整个测试会话共用一个）
+- fixed_prompt_manager: 创建使用固定配置、不读取配置文件的 PromptManager
+
+以脚本方式运行测试文件时，在 __main__ 中用 get_app() / make_prompt_manager() 传入同样的对象
+"""
+
+import sys
+import os
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def get_app():
+    """获取 QApplication（在测试运行时创建，避免与其他测试冲突）"""
+    from PyQt5.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def make_prompt_manager(memory=None, **prompt_options):
+    """
+    创建使用固定配置的 PromptManager（不读取配置文件）
+
+    Args:
+        memory: MemoryConfig 的参数，None 表示使用默认配置
+        **prompt_options: PromptConfig 的参数（默认不包含时间）
+    """
+    from config.schema import Config, MemoryConfig, PromptConfig
+    from src.core.prompt.manager import PromptManager
+
+    class FixedConfigPromptManager(PromptManager):
+        def __init__(self, config):
+            super().__init__()
+            self.config = config
+
+        def _load_runtime_config(self):
+            return self.config
+
+    options = {'Nickname': "麦麦", 'userNickname': "测试",
+               'prompt': PromptConfig(**{'include_time': False, **prompt_options})}
+    if memory is not None:
+        options['memory'] = MemoryConfig(**memory)
+    return FixedConfigPromptManager(Config(**options))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """测试用 QApplication"""
+    return get_app()
+
+
+@pytest.fixture
+def fixed_prompt_manager():
+    """返回 make_prompt_manager，用法：fixed_prompt_manager(context_limit=4, memory={...})"""
+    return make_prompt_manager
@@ -0,0 +1,147 @@
+"""
+待机动画烘焙测试
+验证帧序列裁剪、磁盘缓存、缓存键以及逐帧烘焙与播放
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QPoint, QRect, QTimer
+from PyQt5.QtGui import QColor, QImage, QPainter
+
+from src.frontend.core.render.baked_idle import (
+    BakedIdleCache,
+    BakedIdlePlayer,
+    BakedIdleSequence,
+    IdleFrameBaker,
+    compute_bake_key
+)
+
+
+def _make_frame(index: int, size: int = 100) -> QImage:
+    """生成一帧：透明背景上移动的不透明方块"""
+    frame = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    frame.fill(QColor(0, 0, 0, 0))
+    painter = QPainter(frame)
+    painter.fillRect(QRect(20 + index * 5, 30, 20, 40), QColor(255, 128, 0, 255))
+    painter.end()
+    return frame
+
+
+def test_sequence_crop_and_cache(qapp):
+    """帧裁剪到共同的非透明区域，磁盘缓存可以原样读回"""
+    print("\n" + "=" * 60)
+    print("测试: 烘焙帧序列")
+    print("=" * 60)
+
+    sequence = BakedIdleSequence.from_frames([_make_frame(i) for i in range(4)], fps=20)
+    assert sequence.offset == QPoint(20, 30)
+    assert sequence.frames[0].width() == 35 and sequence.frames[0].height() == 40
+    assert sequence.memory_bytes < 100 * 100 * 4 * 4 / 4
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = BakedIdleCache(os.path.join(root, 'baked'))
+        assert cache.get('key') is None
+        assert cache.put('key', sequence)
+
+        loaded = cache.get('key')
+        assert loaded.frame_count == 4
+        assert loaded.fps == 20
+        assert loaded.offset == sequence.offset
+        assert loaded.canvas_size == sequence.canvas_size
+        assert loaded.frames[2].pixelColor(15, 20) == sequence.frames[2].pixelColor(15, 20)
+    print("✓ 裁剪与磁盘缓存正常")
+
+
+def test_bake_key():
+    """模型文件或烘焙参数变化时缓存键改变"""
+    with tempfile.TemporaryDirectory() as root:
+        model_path = os.path.join(root, 'test.model3.json')
+        texture = os.path.join(root, 'texture.png')
+        for path in (model_path, texture):
+            with open(path, 'w') as f:
+                f.write('x')
+
+        params = {'fps': 20, 'size': [400, 600]}
+        key = compute_bake_key(model_path, [texture], params)
+        assert key == compute_bake_key(model_path, [texture], dict(params))
+        assert key != compute_bake_key(model_path, [texture], {'fps': 24, 'size': [400, 600]})
+
+        stat = os.stat(texture)
+        os.utime(texture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert key != compute_bake_key(model_path, [texture], params)
+    print("✓ 缓存键随模型文件和参数变化")
+
+
+def test_baker_and_player(qapp):
+    """烘焙器按帧率逐帧截取并缩小，播放器循环播放"""
+    steps = []
+
+    def step(delta):
+        steps.append(delta)
+
+    def grab():
+        return _make_frame(len(steps) - 1)
+
+    results = {}
+    loop = QEventLoop()
+    baker = IdleFrameBaker(step, grab, frame_count=6, fps=100, scale=0.5)
+    baker.finished.connect(lambda sequence: (results.__setitem__('sequence', sequence), loop.quit()))
+    baker.failed.connect(lambda error: (results.__setitem__('error', error), loop.quit()))
+    QTimer.singleShot(3000, loop.quit)
+    baker.start()
+    assert baker.running
+    loop.exec_()
+
+    sequence = results.get('sequence')
+    assert sequence is not None, results.get('error')
+    assert sequence.frame_count == 6
+    assert steps == [0.01] * 6
+    assert sequence.canvas_size.width() == 50
+    assert not baker.running
+
+    player = BakedIdlePlayer()
+    player.resize(100, 100)
+    frames = []
+    player.frame_advanced.connect(frames.append)
+    player.play(sequence)
+    deadline = time.time() + 2
+    while len(frames) < 7 and time.time() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    player.grab()
+    player.stop()
+    assert frames[:7] == [1, 2, 3, 4, 5, 0, 1]
+    assert not player.playing
+    print("✓ 烘焙与播放正常")
+
+
+def test_baker_failure(qapp):
+    """截帧失败时发出 failed 信号"""
+    results = {}
+    loop = QEventLoop()
+    baker = IdleFrameBaker(lambda delta: None, lambda: QImage(), frame_count=3, fps=100, scale=1.0)
+    baker.finished.connect(lambda sequence: (results.__setitem__('sequence', sequence), loop.quit()))
+    baker.failed.connect(lambda error: (results.__setitem__('error', error), loop.quit()))
+    QTimer.singleShot(3000, loop.quit)
+    baker.start()
+    loop.exec_()
+    assert 'error' in results and 'sequence' not in results
+    print("✓ 截帧失败处理正常")
+
+
+if __name__ == "__main__":
+    from conftest import get_app
+
+    app = get_app()
+    test_sequence_crop_and_cache(app)
+    test_bake_key()
+    test_baker_and_player(app)
+    test_baker_failure(app)
+    print("\n所有测试通过")
@@ -0,0 +1,208 @@
+"""
+图片内容寻址存储测试
+验证消息图片保存为文件并按摘要引用、引用计数释放、懒生成缩略图、孤立文件清理以及归档后图片仍可读取
+"""
+
+import sys
+import os
+import copy
+import time
+import base64
+import asyncio
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtGui import QImage, QColor
+
+from config.schema import DatabaseConfig
+from src.database import db_manager, BlobStore, DatabaseMaintenance
+from src.database.blobs import BLOB_PREFIX, find_blob_refs
+
+
+def _png_base64(width: int, height: int, color: str) -> str:
+    """生成一张纯色 PNG 的 base64"""
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'image.png')
+        assert image.save(path, 'PNG')
+        with open(path, 'rb') as f:
+            return base64.b64encode(f.read()).decode('ascii')
+
+
+def _image_message(message_id: str, image: str, text: str = '', timestamp: float = None) -> dict:
+    segments = [{'type': 'image', 'data': image}]
+    if text:
+        segments.insert(0, {'type': 'text', 'data': text})
+    return {
+        'message_info': {'message_id': message_id, 'platform': 'desktop-pet', 'time': timestamp or time.time(),
+                         'user_info': {'platform': 'desktop-pet', 'user_id': '0', 'user_nickname': '测试'}},
+        'message_segment': {'type': 'seglist', 'data': segments},
+        'raw_message': text or '[image]',
+    }
+
+
+def test_externalize():
+    """base64 图片替换为引用，相同图片只保存一份，不修改调用方的数据"""
+    print("\n" + "=" * 60)
+    print("测试: 图片内容寻址存储")
+    print("=" * 60)
+
+    image = _png_base64(400, 200, 'red')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = BlobStore(temp_dir)
+        segments = [{'type': 'text', 'data': '看'}, {'type': 'image', 'data': image},
+                    {'type': 'image', 'data': 'data:image/png;base64,' + image}]
+        original = copy.deepcopy(segments)
+
+        data, saved = store.externalize('seglist', segments)
+        assert segments == original
+        assert len(saved) == 2 and saved[0] == saved[1]
+        digest = saved[0][0]
+        assert data[1] == {'type': 'image', 'data': BLOB_PREFIX + digest}
+        assert find_blob_refs('seglist', data) == [digest, digest]
+        assert store.get(digest) == base64.b64decode(image)
+        assert list(store.iter_digests()) == [digest]
+
+        # 文本、短数据和非 base64 保持原样（不复制）
+        plain = [{'type': 'text', 'data': BLOB_PREFIX + digest}, {'type': 'image', 'data': 'http://x/y.png'}]
+        assert store.externalize('seglist', plain) == (plain, [])
+        assert find_blob_refs('text', BLOB_PREFIX + digest) == []
+
+        # 缩略图第一次请求时生成，之后直接复用
+        path = store.thumbnail(digest, max_size=100)
+        thumbnail = QImage(path)
+        assert (thumbnail.width(), thumbnail.height()) == (100, 50)
+        assert store.thumbnail(digest, max_size=100) == path
+        store.delete(digest)
+        assert store.get(digest) is None and not os.path.exists(path)
+    print("✓ 图片替换为引用正常")
+
+
+def test_reference_counting():
+    """消息保存时登记引用，删除最后一个引用时删除文件"""
+    red = _png_base64(64, 64, 'red')
+    blue = _png_base64(64, 64, 'blue')
+
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                first = _image_message('m1', red, text='截图')
+                assert await db_manager.save_message(first)
+                assert first['message_segment']['data'][1]['data'] == red
+                assert await db_manager.save_message(_image_message('m2', red))
+                # 同一 ID 重复保存不重复计数
+                assert await db_manager.save_message(_image_message('m2', red))
+
+                row = await db_manager.get_message_by_id('m1')
+                assert red not in row['message_content'][1]['data']
+                digest = row.blob_digests[0]
+                assert row.text == '截图'
+                assert await db_manager.get_blob(digest) == base64.b64decode(red)
+                assert await db_manager.get_thumbnail(digest)
+
+                # 把 m2 换成另一张图，红色图片只剩 m1 引用
+                assert await db_manager.save_message(_image_message('m2', blue))
+                assert await db_manager.delete_message('m1')
+                assert await db_manager.get_blob(digest) is None
+                assert await db_manager.get_thumbnail(digest) is None
+
+                blue_digest = (await db_manager.get_message_by_id('m2')).blob_digests[0]
+                assert await db_manager.delete_messages(['m2']) == 1
+                assert await db_manager.get_blob(blue_digest) is None
+
+                # 孤立文件（保存中途退出留下的）超过一定时间后才会被清理
+                store = BlobStore(os.path.join(temp_dir, 'blobs'))
+                orphan = store.put(b'orphan' * 20)
+                assert await db_manager.collect_garbage() == 0
+                old = time.time() - 7200
+                os.utime(store.path(orphan), (old, old))
+                assert await db_manager.collect_garbage() == 1
+                assert store.get(orphan) is None
+
+                assert await db_manager.save_message(_image_message('m3', red))
+                assert await db_manager.clear_all_messages()
+                assert await db_manager.get_blob(digest) is None
+                assert list(store.iter_digests()) == []
+            finally:
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ 引用计数正常")
+
+
+def test_concurrent_save_and_delete():
+    """删除最后一个引用的同时保存同一张图片，文件不会被删掉"""
+    red = _png_base64(64, 64, 'red')
+
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                for round_index in range(5):
+                    assert await db_manager.save_message(_image_message(f'a{round_index}', red))
+                    deleted, saved = await asyncio.gather(
+                        db_manager.delete_message(f'a{round_index}'),
+                        db_manager.save_message(_image_message(f'b{round_index}', red)),
+                    )
+                    assert deleted and saved
+                    digest = (await db_manager.get_message_by_id(f'b{round_index}')).blob_digests[0]
+                    assert await db_manager.get_blob(digest) == base64.b64decode(red)
+                    assert await db_manager.delete_message(f'b{round_index}')
+            finally:
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ 并发保存与删除正常")
+
+
+def test_archived_images_kept():
+    """消息移入归档后保留图片引用，可以从归档中读回图片"""
+    red = _png_base64(64, 64, 'red')
+
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                now = time.time()
+                assert await db_manager.save_message(_image_message('old', red, text='旧截图', timestamp=now - 100))
+                assert await db_manager.save_message(_image_message('new', red, text='新截图', timestamp=now))
+
+                maintenance = DatabaseMaintenance()
+                maintenance.configure(DatabaseConfig(
+                    retention_max_rows=1,
+                    archive_dir=os.path.join(temp_dir, 'archive'),
+                ))
+                result = await maintenance.run_once()
+                assert result['archived'] == 1 and result['collected_blobs'] == 0
+
+                # 数据库中剩下的消息删除后，归档中的引用仍让图片保留
+                assert await db_manager.delete_message('new')
+                assert await db_manager.collect_garbage() == 0
+
+                archived = await maintenance.search_archive('旧截图')
+                assert [row.id for row in archived] == ['old']
+                digest = archived[0].blob_digests[0]
+                assert await db_manager.get_blob(digest) == base64.b64decode(red)
+
+                # 清空聊天记录只释放数据库中消息的引用
+                assert await db_manager.save_message(_image_message('again', red))
+                assert await db_manager.clear_all_messages()
+                assert await db_manager.get_blob(digest) == base64.b64decode(red)
+                assert await db_manager.collect_garbage() == 0
+            finally:
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ 归档后图片仍可读取")
+
+
+if __name__ == "__main__":
+    test_externalize()
+    test_reference_counting()
+    test_concurrent_save_and_delete()
+    test_archived_images_kept()
+    print("\n所有测试通过")
@@ -0,0 +1,183 @@
+"""
+配置持久化服务测试
+验证修改合并、防抖写入、同步 flush、写入失败后的重试、写入过程中读取配置，以及配置监视器读取到待写修改
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tomli
+import tomli_w
+
+from config.persistence import ConfigPersistence
+
+
+class RecordingWriter:
+    """记录写入次数的写入函数（可模拟失败）"""
+
+    def __init__(self):
+        self.writes = 0
+        self.fail = False
+
+    def __call__(self, config_file: str, config_data: dict) -> bool:
+        if self.fail:
+            return False
+        self.writes += 1
+        with open(config_file, "w", encoding='utf-8') as f:
+            f.write(tomli_w.dumps(config_data))
+        return True
+
+
+def _make_config(root: str) -> str:
+    """生成测试用配置文件"""
+    path = os.path.join(root, 'config.toml')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(tomli_w.dumps({'platform': 'test', 'interface': {'scale_factor': 1.0}}))
+    return path
+
+
+def _read(path: str) -> dict:
+    with open(path, 'rb') as f:
+        return tomli.load(f)
+
+
+def test_coalesced_flush():
+    """多次修改合并为一次写入，保留其他配置"""
+    print("\n" + "=" * 60)
+    print("测试: 配置持久化")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        path = _make_config(root)
+        writer = RecordingWriter()
+        persistence = ConfigPersistence(path, writer, delay=60.0, max_delay=60.0)
+
+        for index in range(50):
+            persistence.schedule('state', 'window_locked', index % 2 == 0)
+        persistence.schedule('state', 'window_visible', True)
+        persistence.schedule('interface', 'scale_factor', 1.5)
+        assert persistence.has_pending() and writer.writes == 0
+
+        assert persistence.flush()
+        assert writer.writes == 1 and not persistence.has_pending()
+        data = _read(path)
+        assert data['platform'] == 'test'
+        assert data['state'] == {'window_locked': False, 'window_visible': True}
+        assert data['interface']['scale_factor'] == 1.5
+
+        # 值没有变化时不重写文件
+        persistence.schedule('interface', 'scale_factor', 1.5)
+        assert persistence.flush() and writer.writes == 1
+        persistence.close()
+    print("✓ 修改合并写入正常")
+
+
+def test_debounced_background_write():
+    """安静期结束后由后台线程写入"""
+    with tempfile.TemporaryDirectory() as root:
+        path = _make_config(root)
+        writer = RecordingWriter()
+        persistence = ConfigPersistence(path, writer, delay=0.05, max_delay=1.0)
+
+        for scale in (1.1, 1.2, 1.3):
+            persistence.schedule('interface', 'scale_factor', scale)
+
+        deadline = time.monotonic() + 5.0
+        while persistence.has_pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        persistence.close()
+
+        assert writer.writes == 1
+        assert _read(path)['interface']['scale_factor'] == 1.3
+    print("✓ 后台防抖写入正常")
+
+
+def test_failed_write_is_retried():
+    """写入失败时修改保留在队列中，读取配置时仍能看到"""
+    with tempfile.TemporaryDirectory() as root:
+        path = _make_config(root)
+        writer = RecordingWriter()
+        writer.fail = True
+        persistence = ConfigPersistence(path, writer, delay=60.0, max_delay=60.0)
+
+        persistence.schedule('state', 'console_visible', False)
+        assert not persistence.flush()
+        assert persistence.has_pending()
+
+        merged = persistence.apply_pending(_read(path))
+        assert merged['state']['console_visible'] is False
+        assert 'state' not in _read(path)
+
+        writer.fail = False
+        assert persistence.flush()
+        assert _read(path)['state']['console_visible'] is False
+        persistence.close()
+    print("✓ 失败重试正常")
+
+
+def test_inflight_visible_during_write():
+    """写入过程中读取配置仍能看到正在写入的修改"""
+    with tempfile.TemporaryDirectory() as root:
+        path = _make_config(root)
+        seen = []
+
+        class ReadingWriter(RecordingWriter):
+            def __call__(self, config_file, config_data):
+                # 文件尚未替换时读取配置
+                seen.append(persistence.apply_pending(_read(config_file)))
+                return super().__call__(config_file, config_data)
+
+        writer = ReadingWriter()
+        persistence = ConfigPersistence(path, writer, delay=60.0, max_delay=60.0)
+        persistence.schedule('interface', 'scale_factor', 2.0)
+        assert persistence.flush()
+        assert seen[0]['interface']['scale_factor'] == 2.0
+        assert not persistence.has_pending()
+
+        # 写入失败时修改回到队列
+        writer.fail = True
+        persistence.schedule('interface', 'scale_factor', 3.0)
+        assert not persistence.flush()
+        assert persistence.apply_pending(_read(path))['interface']['scale_factor'] == 3.0
+        writer.fail = False
+        persistence.close()
+        assert _read(path)['interface']['scale_factor'] == 3.0
+    print("✓ 写入中的修改可见")
+
+
+def test_watcher_parse_applies_pending():
+    """配置监视器解析配置时合并待写修改，多源转换的平台 ID 与 load_config() 一致"""
+    from config import loader
+
+    with tempfile.TemporaryDirectory() as root:
+        path = _make_config(root)
+        writer = RecordingWriter()
+        persistence = ConfigPersistence(path, writer, delay=60.0, max_delay=60.0)
+        original = loader.config_persistence
+        loader.config_persistence = persistence
+        try:
+            persistence.schedule('interface', 'scale_factor', 1.5)
+            data = _read(path)
+            data['allow_multiple_source_conversion'] = True
+            config = loader._parse_config_data(data)
+            assert config.interface.scale_factor == 1.5
+            assert config.platform == f"test-{loader._SOURCE_ID}"
+            assert writer.writes == 0
+        finally:
+            loader.config_persistence = original
+            persistence.close()
+    print("✓ 监视器读取待写修改正常")
+
+
+if __name__ == "__main__":
+    test_coalesced_flush()
+    test_debounced_background_write()
+    test_failed_write_is_retried()
+    test_inflight_visible_during_write()
+    test_watcher_parse_applies_pending()
+    print("\n所有测试通过")
@@ -0,0 +1,132 @@
+"""
+配置文件监视器测试
+验证缓存、字段级差异、无效文件的处理以及监视线程的自动重新加载
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tomli_w
+
+from config.schema import Config
+from config.watcher import ConfigWatcher, ConfigChange, diff_fields
+
+
+def _write(path: str, data: dict):
+    """写入 TOML 文件，并确保修改时间变化"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(tomli_w.dumps(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class CountingParser:
+    """统计解析次数的解析函数"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, data: dict) -> Config:
+        self.calls += 1
+        return Config(**data)
+
+
+def test_diff_fields():
+    """字典逐层比较，列表整体比较"""
+    print("\n" + "=" * 60)
+    print("测试: 配置文件监视")
+    print("=" * 60)
+
+    old = {'Nickname': 'a', 'prompt': {'persona': 'x', 'context_limit': 8}, 'items': [1, 2]}
+    new = {'Nickname': 'a', 'prompt': {'persona': 'y', 'context_limit': 8}, 'items': [1, 3], 'extra': 1}
+    assert diff_fields(old, new) == {'prompt.persona', 'items', 'extra'}
+
+    change = ConfigChange('config', old, new, diff_fields(old, new))
+    assert change.changed('prompt') and change.changed('prompt.persona')
+    assert not change.changed('prompt.context_limit') and not change.changed('Nickname')
+    print("✓ 字段差异正常")
+
+
+def test_cached_reload_and_invalid_file():
+    """只在文件变化时解析；无效内容保留旧配置"""
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'config.toml')
+        _write(path, {'Nickname': '麦麦', 'prompt': {'persona': '旧人设'}})
+
+        parser = CountingParser()
+        watcher = ConfigWatcher()
+        watcher.add_file('config', path, parser)
+        changes = []
+        watcher.subscribe(changes.append)
+        other = []
+        watcher.subscribe(other.append, 'model_config')
+
+        first = watcher.get('config')
+        assert first.prompt.persona == '旧人设'
+        for _ in range(10):
+            assert watcher.get('config') is first
+        assert watcher.reload() == []
+        assert parser.calls == 1
+
+        _write(path, {'Nickname': '麦麦', 'prompt': {'persona': '新人设'}})
+        result = watcher.reload()
+        assert len(result) == 1 and changes == result and other == []
+        assert result[0].changed_fields == {'prompt.persona'}
+        assert result[0].old is first and watcher.get('config').prompt.persona == '新人设'
+        assert parser.calls == 2
+
+        # 无效内容：不通知，继续使用上一次的配置
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("prompt = [不是合法的 toml")
+        assert watcher.reload() == []
+        assert watcher.get('config').prompt.persona == '新人设'
+        _write(path, {'Nickname': '麦麦', 'prompt': {'context_limit': 'abc'}})
+        assert watcher.reload() == []
+        assert len(changes) == 1
+    print("✓ 缓存与无效文件处理正常")
+
+
+def test_watcher_thread_detects_change():
+    """监视线程自动发现文件变化并通知订阅者"""
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'config.toml')
+        _write(path, {'tracking': {'head_sensitivity': 30.0}})
+
+        watcher = ConfigWatcher(poll_interval=0.1, debounce=0.05)
+        watcher.add_file('config', path, Config.model_validate)
+        assert watcher.get('config').tracking.head_sensitivity == 30.0
+
+        received = threading.Event()
+        changes = []
+
+        def on_change(change):
+            changes.append(change)
+            received.set()
+
+        watcher.subscribe(on_change)
+        watcher.start()
+        try:
+            assert watcher.is_running()
+            time.sleep(0.1)
+            _write(path, {'tracking': {'head_sensitivity': 45.0}})
+            assert received.wait(5.0)
+        finally:
+            watcher.stop()
+
+        assert not watcher.is_running()
+        assert changes[0].changed_fields == {'tracking.head_sensitivity'}
+        assert watcher.get('config').tracking.head_sensitivity == 45.0
+    print("✓ 监视线程正常")
+
+
+if __name__ == "__main__":
+    test_diff_fields()
+    test_cached_reload_and_invalid_file()
+    test_watcher_thread_detects_change()
+    print("\n所有测试通过")
@@ -0,0 +1,231 @@
+"""
+对话摘要测试
+验证旧消息溢出后在后台生成滚动摘要、保存到数据库，以及摘要在 prompt 中的位置
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.prompt.manager import SUMMARY_PREFIX
+from src.core.chat import summary as summary_module
+from src.core.chat.summary import ConversationSummarizer
+from src.database import db_manager
+
+
+class FakeCompletion:
+    """记录摘要请求并返回固定回复"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = None
+
+    async def __call__(self, messages, connection_info):
+        self.calls.append(messages)
+        if self.release is not None:
+            await self.release.wait()
+        return f"摘要 {len(self.calls)}"
+
+
+def _message(index: int, timestamp: float = None):
+    return {
+        'message_info': {
+            'message_id': f"msg-{index:02d}",
+            'platform': 'desktop-pet',
+            'time': timestamp or 1700000000 + index,
+            'user_info': {'user_id': '0' if index % 2 == 0 else 'pet'},
+        },
+        'message_segment': {'type': 'text', 'data': f"第{index}条消息"},
+        'raw_message': f"第{index}条消息",
+    }
+
+
+async def _with_database(scenario):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+        try:
+            await scenario()
+        finally:
+            await db_manager.close()
+
+
+def test_overflow_is_summarized(fixed_prompt_manager):
+    """超出最近上下文的消息达到阈值后才生成摘要，并持久化到数据库"""
+    print("\n" + "=" * 60)
+    print("测试: 对话摘要")
+    print("=" * 60)
+
+    prompt = fixed_prompt_manager(context_limit=4, summary_trigger=3)
+    connection_info = {'protocol_type': 'openai'}
+
+    async def scenario():
+        complete = FakeCompletion()
+        summarizer = ConversationSummarizer(complete, prompt=prompt)
+        assert await summarizer.load()
+        for index in range(6):
+            await db_manager.save_message(_message(index))
+
+        # 只溢出 2 条，未达到阈值
+        assert not await summarizer.summarize_once(connection_info)
+        assert complete.calls == [] and summarizer.summary == ""
+
+        for index in range(6, 8):
+            await db_manager.save_message(_message(index))
+        await summarizer.summarize_once(connection_info)
+        assert summarizer.summary == "摘要 1"
+        request = complete.calls[0][1]["content"]
+        assert "第0条消息" in request and "第3条消息" in request and "第4条消息" not in request
+
+        # 已摘要的消息不会重复处理
+        await summarizer.summarize_once(connection_info)
+        assert len(complete.calls) == 1
+
+        # 重启后从数据库读取
+        restored = ConversationSummarizer(FakeCompletion(), prompt=prompt)
+        assert await restored.load()
+        assert restored.summary == "摘要 1"
+
+        # 清空聊天记录时摘要一并清空
+        await db_manager.clear_all_messages()
+        assert await db_manager.get_summary("default") is None
+
+    asyncio.run(_with_database(scenario))
+    print("✓ 溢出消息摘要正常")
+
+
+def test_schedule_runs_in_background(fixed_prompt_manager):
+    """schedule 不等待摘要完成，运行期间的请求合并为一次补跑"""
+    prompt = fixed_prompt_manager(context_limit=2, summary_trigger=2)
+    connection_info = {'protocol_type': 'openai'}
+
+    async def scenario():
+        complete = FakeCompletion()
+        complete.release = asyncio.Event()
+        summarizer = ConversationSummarizer(complete, prompt=prompt)
+        assert await summarizer.load()
+        for index in range(4):
+            await db_manager.save_message(_message(index))
+
+        assert summarizer.schedule(connection_info)
+        await asyncio.sleep(0.05)
+        assert summarizer.is_running() and summarizer.summary == ""
+
+        for index in range(4, 6):
+            await db_manager.save_message(_message(index))
+        assert not summarizer.schedule(connection_info)
+
+        complete.release.set()
+        await asyncio.wait_for(summarizer._task, timeout=2.0)
+        assert summarizer.summary == "摘要 2"
+        assert "摘要 1" in complete.calls[1][1]["content"]
+        await summarizer.close()
+
+    asyncio.run(_with_database(scenario))
+    print("✓ 后台摘要正常")
+
+
+def test_existing_history_not_backfilled(fixed_prompt_manager):
+    """已有聊天记录时第一次启用摘要不回头处理全部历史，每次 schedule 最多处理一批"""
+    prompt = fixed_prompt_manager(context_limit=4, summary_trigger=3)
+    connection_info = {'protocol_type': 'openai'}
+
+    async def scenario():
+        for index in range(200):
+            await db_manager.save_message(_message(index))
+
+        complete = FakeCompletion()
+        summarizer = ConversationSummarizer(complete, prompt=prompt)
+        assert summarizer.schedule(connection_info)
+        await asyncio.wait_for(summarizer._task, timeout=2.0)
+        assert complete.calls == []
+        assert (await db_manager.get_summary("default"))['covered_id'] == "msg-195"
+
+        # 之后溢出的消息正常摘要
+        for index in range(200, 203):
+            await db_manager.save_message(_message(index))
+        assert summarizer.schedule(connection_info)
+        await asyncio.wait_for(summarizer._task, timeout=2.0)
+        assert len(complete.calls) == 1
+        assert "第196条消息" in complete.calls[0][1]["content"]
+
+        # 积压很多时每次 schedule 只处理一批
+        backlog = ConversationSummarizer(complete, prompt=prompt)
+        backlog._loaded = True
+        for _ in range(2):
+            assert backlog.schedule(connection_info)
+            await asyncio.wait_for(backlog._task, timeout=2.0)
+        assert len(complete.calls) == 3
+        assert backlog._message_count == 2 * summary_module.MAX_BATCH
+        await summarizer.close()
+        await backlog.close()
+
+    asyncio.run(_with_database(scenario))
+    print("✓ 已有历史不回头摘要，每次最多一批")
+
+
+def test_same_timestamp_batches(fixed_prompt_manager):
+    """分批在同一时间戳的消息中间结束时，其余消息在下一批中摘要"""
+    prompt = fixed_prompt_manager(context_limit=2, summary_trigger=1)
+    connection_info = {'protocol_type': 'openai'}
+
+    async def scenario():
+        complete = FakeCompletion()
+        summarizer = ConversationSummarizer(complete, prompt=prompt)
+        assert await summarizer.load()
+        for index in range(8):
+            await db_manager.save_message(_message(index, timestamp=1700000000))
+
+        original_batch = summary_module.MAX_BATCH
+        summary_module.MAX_BATCH = 3
+        try:
+            while await summarizer.summarize_once(connection_info):
+                pass
+        finally:
+            summary_module.MAX_BATCH = original_batch
+
+        # 最近 2 条保留原文，其余 6 条分两批全部并入摘要
+        requests = [call[1]["content"] for call in complete.calls]
+        assert len(requests) == 2
+        for index in range(6):
+            assert sum(f"第{index}条消息" in request for request in requests) == 1
+        assert summarizer._message_count == 6
+
+        restored = ConversationSummarizer(FakeCompletion(), prompt=prompt)
+        assert await restored.load()
+        assert restored._covered_id == "msg-05"
+
+    asyncio.run(_with_database(scenario))
+    print("✓ 同一时间戳的消息分批摘要正常")
+
+
+def test_summary_injected_before_context(fixed_prompt_manager):
+    """摘要位于 system prompt 之后、最近上下文之前，受 token 预算约束"""
+    prompt = fixed_prompt_manager(context_limit=4, context_token_budget=0)
+    history = [{"id": index, "user_id": "0", "raw_message": f"消息{index}"} for index in range(2)]
+
+    messages = prompt.build_messages("问题", context_messages=history, summary="用户喜欢猫")
+    assert [m["role"] for m in messages] == ["system", "system", "user", "user", "user"]
+    assert messages[1]["content"] == f"{SUMMARY_PREFIX}\n用户喜欢猫"
+
+    base = prompt.count_tokens([messages[0], messages[-1]])
+    assert len(prompt.build_messages("问题", context_messages=history, summary="用户喜欢猫", token_budget=base + 1)) == 2
+
+    prompt.config.prompt.include_context = False
+    assert len(prompt.build_messages("问题", context_messages=history, summary="用户喜欢猫")) == 2
+    assert not prompt.get_summary_settings()["enabled"]
+    print("✓ 摘要拼接正常")
+
+
+if __name__ == "__main__":
+    from conftest import make_prompt_manager
+
+    test_overflow_is_summarized(make_prompt_manager)
+    test_schedule_runs_in_background(make_prompt_manager)
+    test_existing_history_not_backfilled(make_prompt_manager)
+    test_same_timestamp_batches(make_prompt_manager)
+    test_summary_injected_before_context(make_prompt_manager)
+    print("\n所有测试通过")
@@ -0,0 +1,145 @@
+"""
+数据库保留策略测试
+验证月度压缩归档、按天数/条数/大小归档旧消息以及增量回收数据库空间
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.schema import DatabaseConfig
+from src.database import db_manager, MessageArchive, DatabaseMaintenance, MessageRowMapper
+from src.database.rows import MESSAGE_COLUMNS
+
+DESCRIPTION = [(name, None, None, None, None, None, None) for name in MESSAGE_COLUMNS]
+
+
+def _message(message_id: str, text: str, timestamp: float) -> dict:
+    return {
+        'message_info': {'message_id': message_id, 'platform': 'desktop-pet', 'time': timestamp,
+                         'user_info': {'platform': 'desktop-pet', 'user_id': '0', 'user_nickname': '测试'}},
+        'message_segment': {'type': 'text', 'data': text},
+        'raw_message': text,
+    }
+
+
+def test_monthly_archive():
+    """按月份写入压缩归档，重复内容不保存，可按关键词和时间搜索"""
+    print("\n" + "=" * 60)
+    print("测试: 数据库保留策略")
+    print("=" * 60)
+
+    march = time.mktime((2024, 3, 15, 12, 0, 0, 0, 0, -1))
+    april = time.mktime((2024, 4, 15, 12, 0, 0, 0, 0, -1))
+    rows = MessageRowMapper().map_rows(DESCRIPTION, [
+        ('a', 'desktop-pet', '0', '', '', 'text', json.dumps('三月的猫', ensure_ascii=False), '三月的猫', march, None),
+        ('b', 'desktop-pet', '1', '', '', 'seglist', json.dumps([{'type': 'text', 'data': '四月的猫'}], ensure_ascii=False), '', april, None),
+    ])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive = MessageArchive(temp_dir)
+        assert archive.write(rows[:1]) == 1 and archive.write(rows[1:]) == 1
+
+        index = archive.load_index()
+        assert sorted(index) == ['2024-03', '2024-04']
+        assert index['2024-03']['count'] == 1 and index['2024-03']['file'] == 'messages-2024-03.jsonl.gz'
+        assert os.path.exists(os.path.join(temp_dir, 'messages-2024-04.jsonl.gz'))
+
+        restored = list(archive.iter_month('2024-03'))
+        assert restored[0].to_stored_dict() == rows[0].to_stored_dict()
+        assert list(archive.iter_month('2024-04'))[0].text == '四月的猫'
+
+        # 按时间倒序返回，时间范围外的月份直接跳过
+        assert [row.id for row in archive.search('猫')] == ['b', 'a']
+        assert [row.id for row in archive.search('猫', limit=1)] == ['b']
+        assert [row.id for row in archive.search('猫', until=april)] == ['a']
+        assert archive.search('狗') == []
+    print("✓ 月度归档正常")
+
+
+def test_retention_policy():
+    """超过天数和条数的最早消息移入归档，之后回收数据库空间"""
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                now = time.time()
+                old = now - 40 * 86400
+                for i in range(5):
+                    await db_manager.save_message(_message(f'old{i}', f'很久以前的消息{i}' + '填充' * 500, old + i))
+                for i in range(10):
+                    await db_manager.save_message(_message(f'new{i}', f'最近的消息{i}' + '填充' * 500, now - 100 + i))
+                before = await db_manager.get_storage_stats()
+
+                maintenance = DatabaseMaintenance()
+                config = DatabaseConfig(
+                    retention_max_age_days=30,
+                    retention_max_rows=8,
+                    archive_dir=os.path.join(temp_dir, 'archive'),
+                    maintenance_batch=3,
+                )
+                assert maintenance.configure(config)
+                result = await maintenance.run_once()
+
+                assert result['archived'] == 7
+                assert await db_manager.get_message_count() == 8
+                remaining = await db_manager.get_messages(limit=20)
+                assert {row.id for row in remaining} == {f'new{i}' for i in range(2, 10)}
+
+                found = await maintenance.search_archive('很久以前')
+                assert sorted(row.id for row in found) == [f'old{i}' for i in range(5)]
+                assert [row.id for row in await maintenance.search_archive('最近的消息')] == ['new1', 'new0']
+
+                after = await db_manager.get_storage_stats()
+                assert result['freed_pages'] > 0 and after['file_bytes'] < before['file_bytes']
+
+                # 已满足策略时不再归档
+                assert (await maintenance.run_once())['archived'] == 0
+            finally:
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ 按天数和条数归档正常")
+
+
+def test_size_limit():
+    """有效数据超过大小上限时继续归档最早的消息"""
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                now = time.time()
+                for i in range(40):
+                    await db_manager.save_message(_message(f'm{i:02d}', '大' * 20000, now + i))
+
+                maintenance = DatabaseMaintenance()
+                maintenance.configure(DatabaseConfig(
+                    retention_max_size_mb=1,
+                    archive_dir=os.path.join(temp_dir, 'archive'),
+                    maintenance_batch=5,
+                ))
+                assert not DatabaseMaintenance().configure(DatabaseConfig())
+
+                result = await maintenance.run_once()
+                assert result['archived'] > 0
+                assert (await db_manager.get_storage_stats())['used_bytes'] <= 1024 * 1024
+                newest = await db_manager.get_messages(limit=1)
+                assert newest[0].id == 'm39'
+            finally:
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ 按大小归档正常")
+
+
+if __name__ == "__main__":
+    test_monthly_archive()
+    test_retention_policy()
+    test_size_limit()
+    print("\n所有测试通过")
@@ -0,0 +1,138 @@
+"""
+渲染性能统计测试
+验证环形缓冲区、汇总与导出，以及渲染管理器的开关与悬浮显示
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QWidget
+
+from src.frontend.core.render.frame_stats import FrameStatsRecorder, RingBuffer, read_rss_bytes
+from src.frontend.core.render.static_renderer import StaticRenderer
+from src.frontend.core.managers.render_manager import RenderManager
+
+
+def test_ring_buffer():
+    """环形缓冲区超出容量后覆盖最旧的数据，快照按时间顺序"""
+    print("\n" + "=" * 60)
+    print("测试: 渲染性能统计")
+    print("=" * 60)
+
+    buffer = RingBuffer(4)
+    assert buffer.snapshot() == [] and len(buffer) == 0
+    for value in range(3):
+        buffer.append(value)
+    assert buffer.snapshot() == [0, 1, 2]
+    for value in range(3, 10):
+        buffer.append(value)
+    assert buffer.snapshot() == [6, 7, 8, 9] and len(buffer) == 4
+    buffer.clear()
+    assert buffer.snapshot() == []
+    print("✓ 环形缓冲区正常")
+
+
+def test_summary_and_export():
+    """汇总统计与 JSON/CSV 导出"""
+    recorder = FrameStatsRecorder(frame_capacity=100)
+    for index in range(20):
+        recorder.record_frame(update_ms=1.0 + index * 0.1, draw_ms=2.0, lateness_ms=0.5, param_writes=9)
+    sample = recorder.sample_process()
+    assert sample.cpu_percent >= 0
+    if sys.platform.startswith('linux'):
+        assert sample.rss_bytes > 0 and read_rss_bytes() > 0
+
+    summary = recorder.summary()
+    assert summary['frames'] == 20
+    assert abs(summary['update_ms']['avg'] - 1.95) < 1e-6
+    assert abs(summary['update_ms']['max'] - 2.9) < 1e-6
+    assert summary['draw_ms']['p95'] == 2.0
+    assert summary['param_writes'] == 9
+    assert "FPS" in recorder.format_summary()
+
+    with tempfile.TemporaryDirectory() as root:
+        json_path = os.path.join(root, 'out', 'stats.json')
+        csv_path = os.path.join(root, 'out', 'stats.csv')
+        recorder.export_json(json_path)
+        recorder.export_csv(csv_path)
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert len(data['frames']) == 20 and len(data['process']) == 1
+        assert data['frames'][0]['param_writes'] == 9
+
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert [row['kind'] for row in rows].count('frame') == 20
+        assert [row['kind'] for row in rows].count('process') == 1
+    print("✓ 汇总与导出正常")
+
+
+class StatsRenderer(StaticRenderer):
+    """记录 set_frame_stats 调用的测试渲染器"""
+
+    def __init__(self):
+        super().__init__()
+        self.recorder = None
+
+    def initialize(self):
+        pass
+
+    def attach(self, parent):
+        pass
+
+    def set_frame_stats(self, recorder):
+        self.recorder = recorder
+
+
+class StatsRenderManager(RenderManager):
+    """使用测试渲染器、不读取配置文件的渲染管理器"""
+
+    def load_config(self):
+        self.click_through = False
+
+    def create_renderer(self):
+        self.renderer = StatsRenderer()
+        self.current_mode = "static"
+
+
+def test_render_manager_toggle(qapp):
+    """开关统计时渲染器收到记录器，悬浮显示出现和移除，可以导出"""
+    window = QWidget()
+    window.resize(200, 200)
+    manager = StatsRenderManager(window)
+    assert not manager.is_frame_stats_enabled()
+    assert manager.export_frame_stats() == []
+
+    manager.set_frame_stats_enabled(True)
+    assert manager.is_frame_stats_enabled()
+    assert manager.renderer.recorder is manager.frame_stats
+    assert manager._stats_overlay is not None and "CPU" in manager._stats_overlay.text()
+
+    manager.frame_stats.record_frame(1.0, 1.0, 0.0, 3)
+    with tempfile.TemporaryDirectory() as root:
+        paths = manager.export_frame_stats(os.path.join(root, 'stats'))
+        assert paths and all(os.path.exists(path) for path in paths)
+
+    manager.set_frame_stats_enabled(False)
+    assert manager.renderer.recorder is None
+    assert manager._stats_overlay is None and manager._stats_timer is None
+    manager.cleanup()
+    print("✓ 渲染管理器开关正常")
+
+
+if __name__ == "__main__":
+    from conftest import get_app
+
+    app = get_app()
+    test_ring_buffer()
+    test_summary_and_export()
+    test_render_manager_toggle(app)
+    print("\n所有测试通过")
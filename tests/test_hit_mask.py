@@ -0,0 +1,211 @@
+"""
+命中掩码测试
+验证 alpha 掩码的生成与命中判断、静态图片掩码缓存、窗口掩码的设置与清除，以及透明区域的点击穿透
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QPoint, QRect, QSize, Qt
+from PyQt5.QtGui import QColor, QImage, QMouseEvent, QPainter
+from PyQt5.QtWidgets import QWidget
+
+from src.frontend.core.render.hit_mask import AlphaHitMask
+from src.frontend.core.render.static_renderer import StaticRenderer
+from src.frontend.core.managers.render_manager import RenderManager
+from src.frontend.core.managers.event_manager import EventManager
+
+
+def _make_image(width: int = 100, height: int = 100, rect: QRect = QRect(20, 40, 30, 20)) -> QImage:
+    """生成透明背景上带一个不透明方块的图像"""
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(0, 0, 0, 0))
+    painter = QPainter(image)
+    painter.fillRect(rect, QColor(255, 0, 0, 255))
+    painter.end()
+    return image
+
+
+def test_mask_from_image(qapp):
+    """掩码只覆盖不透明区域（含扩张边缘），并能转换为区域"""
+    print("\n" + "=" * 60)
+    print("测试: alpha 命中掩码")
+    print("=" * 60)
+
+    image = _make_image()
+
+    mask = AlphaHitMask.from_image(image, cell_size=4, margin=0)
+    assert mask.columns == 25 and len(mask.rows) == 25
+    assert mask.contains(30, 50)
+    assert not mask.contains(5, 5)
+    assert not mask.contains(70, 50)
+    assert not mask.contains(-1, 50) and not mask.contains(30, 200)
+
+    region = mask.to_region()
+    assert region.boundingRect().contains(QRect(20, 40, 30, 20))
+    assert mask.to_region() is region
+
+    dilated = AlphaHitMask.from_image(image, cell_size=4, margin=2)
+    assert dilated.contains(14, 50) and not mask.contains(14, 50)
+    assert dilated.union(mask) == dilated
+
+    moved = mask.translated(QPoint(100, 10))
+    assert moved.contains(130, 60) and not moved.contains(30, 50)
+    assert moved.rows is mask.rows
+
+    # 设备像素尺寸的画面按逻辑尺寸映射
+    hidpi = AlphaHitMask.from_image(_make_image(200, 200, QRect(40, 80, 60, 40)), QSize(100, 100), cell_size=4, margin=0)
+    assert hidpi.columns == 25 and hidpi.contains(30, 50) and not hidpi.contains(5, 5)
+
+    empty = QImage(40, 40, QImage.Format_ARGB32_Premultiplied)
+    empty.fill(QColor(0, 0, 0, 0))
+    assert AlphaHitMask.from_image(empty).is_empty()
+    print("✓ 掩码生成与命中判断正常")
+
+
+def test_static_mask_cached_per_scale(qapp):
+    """静态图片的掩码每个缩放尺寸只计算一次"""
+    with tempfile.TemporaryDirectory() as root:
+        image_path = os.path.join(root, 'pet.png')
+        assert _make_image().save(image_path)
+
+        parent = QWidget()
+        parent.resize(200, 200)
+        renderer = StaticRenderer(image_path)
+        renderer.initialize()
+        renderer.attach(parent)
+        parent.show()
+
+        first = renderer.get_hit_mask()
+        assert first is not None and not first.is_empty()
+        assert renderer.get_hit_mask().rows is first.rows
+
+        renderer.update_size(300, 300)
+        resized = renderer.get_hit_mask()
+        assert resized.rows is not first.rows
+        assert renderer.get_hit_mask().rows is resized.rows
+
+        renderer.suspend()
+        assert renderer.get_hit_mask() is None
+        renderer.cleanup()
+    print("✓ 静态图片掩码按缩放缓存")
+
+
+class MaskRenderer(StaticRenderer):
+    """返回指定掩码的测试渲染器"""
+
+    def __init__(self):
+        super().__init__()
+        self.mask = None
+        self.calls = 0
+
+    def initialize(self):
+        pass
+
+    def attach(self, parent):
+        pass
+
+    def get_hit_mask(self):
+        self.calls += 1
+        return self.mask
+
+
+class MaskRenderManager(RenderManager):
+    """使用测试渲染器、不读取配置文件的渲染管理器"""
+
+    def load_config(self):
+        self.click_through = True
+        self.hit_mask_interval = 60000
+
+    def create_renderer(self):
+        self.renderer = MaskRenderer()
+        self.current_mode = "static"
+
+
+def test_window_mask_applied_and_cleared(qapp):
+    """管理器把掩码应用到窗口，掩码不变时不重复设置，没有掩码时清除"""
+    window = QWidget()
+    window.resize(100, 100)
+    window.render_container = QWidget(window)
+    window.render_container.setGeometry(10, 20, 80, 80)
+
+    manager = MaskRenderManager(window)
+    manager.attach_to(window.render_container)
+    assert manager.renderer.calls == 1
+    assert window.mask().isEmpty()
+    assert manager.hit_test(0, 0)
+
+    manager.renderer.mask = AlphaHitMask.from_image(_make_image(80, 80), cell_size=4, margin=0)
+    manager.refresh_hit_mask()
+    assert not window.mask().isEmpty()
+    assert window.mask().contains(QPoint(40, 70))
+    assert not window.mask().contains(QPoint(5, 5))
+    assert manager.hit_test(40, 70) and not manager.hit_test(5, 5)
+
+    applied = manager._hit_mask
+    manager.refresh_hit_mask()
+    assert manager._hit_mask is applied
+
+    manager.renderer.mask = None
+    manager.refresh_hit_mask()
+    assert window.mask().isEmpty()
+    assert manager.hit_test(5, 5)
+
+    manager.cleanup()
+    assert manager._hit_mask_timer is None
+    print("✓ 窗口掩码设置与清除正常")
+
+
+def _press_event(x: int, y: int) -> QMouseEvent:
+    return QMouseEvent(QEvent.MouseButtonPress, QPoint(x, y), Qt.RightButton, Qt.RightButton, Qt.NoModifier)
+
+
+def test_press_on_transparent_pixels_ignored(qapp):
+    """窗口掩码无法生效时，透明区域的按下事件被忽略，不透明区域正常处理"""
+    window = QWidget()
+    window.resize(100, 100)
+    window.render_container = QWidget(window)
+    window.render_container.setGeometry(10, 20, 80, 80)
+
+    manager = MaskRenderManager(window)
+    manager.attach_to(window.render_container)
+    manager.renderer.mask = AlphaHitMask.from_image(_make_image(80, 80), cell_size=4, margin=0)
+    manager.refresh_hit_mask()
+
+    events = EventManager(window)
+    events.set_managers(manager, None, None, None)
+
+    transparent = _press_event(5, 5)
+    events.handle_mouse_press(transparent)
+    assert not transparent.isAccepted()
+
+    opaque = _press_event(40, 70)
+    events.handle_mouse_press(opaque)
+    assert opaque.isAccepted()
+
+    # 没有掩码时整个窗口都可以点击
+    manager.renderer.mask = None
+    manager.refresh_hit_mask()
+    transparent = _press_event(5, 5)
+    events.handle_mouse_press(transparent)
+    assert transparent.isAccepted()
+
+    events.cleanup()
+    manager.cleanup()
+    print("✓ 透明区域点击穿透正常")
+
+
+if __name__ == "__main__":
+    from conftest import get_app
+
+    app = get_app()
+    test_mask_from_image(app)
+    test_static_mask_cached_per_scale(app)
+    test_window_mask_applied_and_cleared(app)
+    test_press_on_transparent_pixels_ignored(app)
+    print("\n所有测试通过")
@@ -0,0 +1,81 @@
+"""
+冷启动导入耗时回归测试
+使用 python -X importtime 导入启动入口，检查：
+1. 重量级可选依赖没有在启动时被导入（应在首次使用时才加载）
+2. 入口导入总耗时不超过预算（可用环境变量 PET_IMPORT_BUDGET_MS 调整）
+"""
+
+import sys
+import os
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# 启动入口：main 模块 + 桌面宠物主窗口模块
+ENTRY_CODE = "import main; import src.frontend.presentation.pet"
+
+# 启动路径上不应出现的重量级依赖
+LAZY_MODULES = ['aiohttp', 'maim_message', 'pynput', 'live2d', 'OpenGL', 'PIL', 'numpy']
+
+# 导入总耗时预算（毫秒）
+IMPORT_BUDGET_MS = float(os.environ.get('PET_IMPORT_BUDGET_MS', 1500))
+
+
+def _profile_entry_imports():
+    """
+    在子进程中冷导入启动入口
+
+    Returns:
+        (已导入模块集合, 顶层模块累计耗时总和 ms)
+    """
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', ENTRY_CODE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # 没有缩进的条目是被入口直接导入的顶层模块
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    return modules, total_us / 1000
+
+
+def test_heavy_dependencies_are_lazy():
+    """启动入口不导入重量级可选依赖"""
+    print("\n" + "=" * 60)
+    print("测试: 重量级依赖延迟导入")
+    print("=" * 60)
+
+    modules, _ = _profile_entry_imports()
+    eager = [
+        name for name in LAZY_MODULES
+        if any(module == name or module.startswith(name + '.') for module in modules)
+    ]
+    assert not eager, f"启动时被提前导入的依赖: {eager}"
+    print(f"✓ 未导入: {', '.join(LAZY_MODULES)}")
+
+
+def test_entry_import_within_budget():
+    """启动入口冷导入总耗时不超过预算"""
+    _, total_ms = _profile_entry_imports()
+    print(f"入口导入耗时: {total_ms:.0f} ms（预算 {IMPORT_BUDGET_MS:.0f} ms）")
+    assert total_ms <= IMPORT_BUDGET_MS, f"入口导入耗时 {total_ms:.0f} ms 超过预算 {IMPORT_BUDGET_MS:.0f} ms"
+
+
+if __name__ == "__main__":
+    test_heavy_dependencies_are_lazy()
+    test_entry_import_within_budget()
+    print("\n所有测试通过")
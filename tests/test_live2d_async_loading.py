@@ -0,0 +1,133 @@
+"""
+Live2D 异步加载测试
+验证工作线程中的资源预加载：文件预读、纹理校验、失败与取消
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtGui import QImage, QColor
+
+from src.frontend.core.render.live2d_assets import (
+    prepare_live2d_assets,
+    Live2DLoadCancelled
+)
+from src.frontend.core.workers.live2d_load_worker import Live2DLoadWorker
+
+
+def _make_model(root: str, with_texture: bool = True) -> str:
+    """在临时目录中生成一个最小的 model3.json 及其引用文件"""
+    os.makedirs(os.path.join(root, 'textures'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'motions'), exist_ok=True)
+
+    with open(os.path.join(root, 'test.moc3'), 'wb') as f:
+        f.write(b'MOC3' + b'\0' * 4096)
+
+    if with_texture:
+        image = QImage(64, 32, QImage.Format_ARGB32)
+        image.fill(QColor(255, 0, 0, 128))
+        image.save(os.path.join(root, 'textures', 'texture_00.png'))
+
+    with open(os.path.join(root, 'motions', 'idle.motion3.json'), 'w', encoding='utf-8') as f:
+        json.dump({'Version': 3, 'Meta': {'Duration': 1.0}}, f)
+
+    model_path = os.path.join(root, 'test.model3.json')
+    with open(model_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'Version': 3,
+            'FileReferences': {
+                'Moc': 'test.moc3',
+                'Textures': ['textures/texture_00.png'],
+                'Physics': 'test.physics3.json',
+                'Motions': {'Idle': [{'File': 'motions/idle.motion3.json'}]},
+            }
+        }, f)
+    return model_path
+
+
+def test_prepare_assets(qapp):
+    """预读所有引用文件并读取纹理尺寸，可选文件缺失只记录"""
+    print("\n" + "=" * 60)
+    print("测试: Live2D 资源预加载")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        assets = prepare_live2d_assets(_make_model(root))
+
+        assert assets.texture_sizes == [(64, 32)]
+        assert len(assets.files) == 3
+        assert assets.total_bytes > 4096
+        assert assets.missing_files == [os.path.join(assets.model_dir, 'test.physics3.json')]
+    print("✓ 资源预加载正常")
+
+
+def test_prepare_assets_errors(qapp):
+    """纹理缺失或损坏时在工作线程阶段就失败，并支持取消"""
+    with tempfile.TemporaryDirectory() as root:
+        model_path = _make_model(root, with_texture=False)
+        try:
+            prepare_live2d_assets(model_path)
+            assert False, "缺失纹理应当失败"
+        except FileNotFoundError:
+            pass
+
+        with open(os.path.join(root, 'textures', 'texture_00.png'), 'wb') as f:
+            f.write(b'not a png')
+        try:
+            prepare_live2d_assets(model_path)
+            assert False, "损坏纹理应当失败"
+        except ValueError:
+            pass
+
+        try:
+            prepare_live2d_assets(model_path, should_stop=lambda: True)
+            assert False, "应当被取消"
+        except Live2DLoadCancelled:
+            pass
+    print("✓ 错误与取消处理正常")
+
+
+def _run_worker(model_path: str):
+    """运行加载线程，返回 (loaded 结果, failed 结果)"""
+    results = {'loaded': None, 'failed': None}
+    loop = QEventLoop()
+
+    worker = Live2DLoadWorker(model_path)
+    worker.loaded.connect(lambda assets: (results.__setitem__('loaded', assets), loop.quit()))
+    worker.failed.connect(lambda error: (results.__setitem__('failed', error), loop.quit()))
+    QTimer.singleShot(5000, loop.quit)
+    worker.start()
+    loop.exec_()
+    worker.stop()
+    return results['loaded'], results['failed']
+
+
+def test_worker_signals(qapp):
+    """加载线程通过信号把结果交回 GUI 线程"""
+    with tempfile.TemporaryDirectory() as root:
+        model_path = _make_model(root)
+        assets, error = _run_worker(model_path)
+        assert error is None
+        assert assets.texture_sizes == [(64, 32)]
+
+        assets, error = _run_worker(os.path.join(root, 'missing.model3.json'))
+        assert assets is None
+        assert error
+    print("✓ 加载线程信号正常")
+
+
+if __name__ == "__main__":
+    from conftest import get_app
+
+    app = get_app()
+    test_prepare_assets(app)
+    test_prepare_assets_errors(app)
+    test_worker_signals(app)
+    print("\n所有测试通过")
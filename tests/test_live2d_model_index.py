@@ -0,0 +1,129 @@
+"""
+Live2D 模型信息索引测试
+验证索引命中时不再打开动作文件，以及模型或动作文件变化时索引失效
+"""
+
+import sys
+import os
+import json
+import builtins
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.frontend.core.models.live2d_model_info import (
+    Live2DModelInfoExtractor,
+    Live2DModelInfoIndex
+)
+
+
+def _make_model(root: str, motion_count: int = 20) -> str:
+    """生成包含若干动作文件的测试模型，返回 model3.json 路径"""
+    motions = {'Idle': [], 'Tap': []}
+    for index in range(motion_count):
+        group = 'Idle' if index % 4 == 0 else 'Tap'
+        name = f"motions/m{index:03d}.motion3.json"
+        motions[group].append({'File': name})
+        os.makedirs(os.path.join(root, 'motions'), exist_ok=True)
+        with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+            json.dump({'Meta': {'Duration': 1.0 + index, 'Fps': 30.0, 'Loop': index == 0}}, f)
+
+    model_path = os.path.join(root, 'test.model3.json')
+    with open(model_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'Version': 3,
+            'FileReferences': {'Moc': 'test.moc3', 'Textures': ['tex.png'], 'Motions': motions},
+            'Groups': [{'Name': 'EyeBlink', 'Ids': ['ParamEyeLOpen']}],
+            'HitAreas': [{'Id': 'HitArea', 'Name': 'Body'}]
+        }, f)
+    return model_path
+
+
+class _OpenCounter:
+    """统计 open() 调用的文件"""
+
+    def __init__(self):
+        self.paths = []
+        self._open = builtins.open
+
+    def __enter__(self):
+        def counting_open(path, *args, **kwargs):
+            self.paths.append(str(path))
+            return self._open(path, *args, **kwargs)
+        builtins.open = counting_open
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._open
+
+
+def test_index_hit_skips_motion_files():
+    """索引命中时只读取索引文件，结果与直接解析一致"""
+    print("\n" + "=" * 60)
+    print("测试: Live2D 模型信息索引")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        model_path = _make_model(root)
+        index_path = os.path.join(root, 'cache', 'index.json')
+
+        parsed = Live2DModelInfoExtractor(model_path, index=Live2DModelInfoIndex(index_path)).extract()
+        assert os.path.exists(index_path)
+
+        # 新的索引实例模拟下一次启动
+        with _OpenCounter() as counter:
+            extractor = Live2DModelInfoExtractor(model_path, index=Live2DModelInfoIndex(index_path))
+            cached = extractor.extract()
+        assert counter.paths == [index_path], counter.paths
+
+        assert cached == parsed
+        assert len(extractor.get_idle_motions()) == 5
+        assert extractor.get_idle_motions()[0].loop
+        assert extractor.get_tap_motions()[-1].duration == 20.0
+        assert cached.groups == {'EyeBlink': ['ParamEyeLOpen']}
+        assert cached.hit_areas[0].name == 'Body'
+    print("✓ 索引命中时不再解析动作文件")
+
+
+def test_index_invalidated_on_change():
+    """动作文件或模型文件变化时重新解析"""
+    with tempfile.TemporaryDirectory() as root:
+        model_path = _make_model(root, motion_count=4)
+        index = Live2DModelInfoIndex(os.path.join(root, 'index.json'))
+        Live2DModelInfoExtractor(model_path, index=index).extract()
+        assert index.get(model_path) is not None
+
+        motion_path = os.path.join(root, 'motions', 'm001.motion3.json')
+        with open(motion_path, 'w', encoding='utf-8') as f:
+            json.dump({'Meta': {'Duration': 9.5, 'Fps': 30.0}}, f)
+        assert index.get(model_path) is None
+
+        info = Live2DModelInfoExtractor(model_path, index=index).extract()
+        assert info.motions['Tap'][0].duration == 9.5
+        assert index.get(model_path) is not None
+
+        os.remove(motion_path)
+        assert index.get(model_path) is None
+    print("✓ 文件变化时索引失效")
+
+
+def test_corrupt_index_ignored():
+    """索引文件损坏时重新生成"""
+    with tempfile.TemporaryDirectory() as root:
+        model_path = _make_model(root, motion_count=2)
+        index_path = os.path.join(root, 'index.json')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write('{broken')
+
+        info = Live2DModelInfoExtractor(model_path, index=Live2DModelInfoIndex(index_path)).extract()
+        assert len(info.motions['Idle']) == 1
+        assert Live2DModelInfoIndex(index_path).get(model_path) == info
+    print("✓ 损坏的索引会被重新生成")
+
+
+if __name__ == "__main__":
+    test_index_hit_skips_motion_files()
+    test_index_invalidated_on_change()
+    test_corrupt_index_ignored()
+    print("\n所有测试通过")
@@ -0,0 +1,105 @@
+"""
+热路径日志限流测试
+验证延迟格式化、按调用位置限流、抑制计数和采样模式
+"""
+
+import sys
+import os
+import time
+import logging
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.util.log_throttle import ThrottledLogger
+
+
+class ListHandler(logging.Handler):
+    """收集日志记录"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _make_logger(name: str, level=logging.DEBUG):
+    test_logger = logging.getLogger(name)
+    test_logger.setLevel(level)
+    test_logger.propagate = False
+    handler = ListHandler()
+    test_logger.handlers = [handler]
+    return test_logger, handler
+
+
+def test_disabled_level_is_not_formatted():
+    """级别未启用时不调用消息函数、不格式化参数"""
+    print("\n" + "=" * 60)
+    print("测试: 日志限流")
+    print("=" * 60)
+
+    test_logger, handler = _make_logger("pet.test_throttle_level", logging.INFO)
+    hot_log = ThrottledLogger(test_logger, interval=0)
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("不应格式化")
+
+    def build():
+        raise AssertionError("不应求值")
+
+    for _ in range(100):
+        hot_log.debug("参数 %s", Exploding())
+        hot_log.debug(build)
+    assert handler.records == []
+
+    hot_log.info(lambda: "延迟求值")
+    assert handler.records[0].getMessage() == "延迟求值"
+    print("✓ 延迟格式化正常")
+
+
+def test_rate_limit_and_suppressed_count():
+    """同一调用位置在时间窗口内只输出一次，之后报告被抑制的条数"""
+    test_logger, handler = _make_logger("pet.test_throttle_rate")
+    hot_log = ThrottledLogger(test_logger, interval=0.2)
+
+    def frame(index):
+        hot_log.debug("第 %d 帧失败", index)
+
+    for index in range(50):
+        frame(index)
+    assert [r.getMessage() for r in handler.records] == ["第 0 帧失败"]
+    # 记录的位置是调用方，而不是限流包装
+    assert handler.records[0].funcName == "frame"
+
+    # 不同 key 分别限流
+    hot_log.debug("参数 %s", "A", key="A")
+    hot_log.debug("参数 %s", "B", key="B")
+    hot_log.debug("参数 %s", "A", key="A")
+    assert len(handler.records) == 3 and hot_log.suppressed_count("A") == 1
+
+    time.sleep(0.25)
+    frame(50)
+    assert handler.records[-1].getMessage() == "第 50 帧失败（已抑制 49 条相似日志）"
+    print("✓ 限流与抑制计数正常")
+
+
+def test_sampling():
+    """采样模式每 N 次调用只考虑 1 次"""
+    test_logger, handler = _make_logger("pet.test_throttle_sample")
+    hot_log = ThrottledLogger(test_logger, interval=0, sample_every=10)
+
+    for index in range(30):
+        hot_log.info("采样 %d", index)
+    messages = [r.getMessage() for r in handler.records]
+    assert messages == ["采样 0", "采样 10（已抑制 9 条相似日志）", "采样 20（已抑制 9 条相似日志）"]
+    print("✓ 采样模式正常")
+
+
+if __name__ == "__main__":
+    test_disabled_level_is_not_formatted()
+    test_rate_limit_and_suppressed_count()
+    test_sampling()
+    print("\n所有测试通过")
@@ -0,0 +1,166 @@
+"""
+日志队列测试
+验证日志在后台线程批量写入和格式化、DEBUG 日志的丢弃策略以及退出前的刷新
+"""
+
+import sys
+import os
+import queue
+import logging
+import threading
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.util.logger import (
+    logger,
+    flush_logging,
+    BatchFlushMixin,
+    BatchingQueueListener,
+    DroppingQueueHandler,
+)
+
+
+class RecordingHandler(logging.Handler):
+    """记录收到的日志和写入线程"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+        self.batch_flushes = 0
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+
+class BatchedRecordingHandler(BatchFlushMixin, RecordingHandler):
+    """统计批量刷新次数"""
+
+    def flush_batch(self):
+        self.batch_flushes += 1
+
+
+def _make_logger(name: str, maxsize: int):
+    """创建使用独立队列的测试 logger"""
+    log_queue = queue.Queue(maxsize=maxsize)
+    queue_handler = DroppingQueueHandler(log_queue)
+    handler = BatchedRecordingHandler()
+    listener = BatchingQueueListener(log_queue, handler, queue_handler=queue_handler)
+
+    test_logger = logging.getLogger(name)
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.propagate = False
+    test_logger.handlers = [queue_handler]
+    return test_logger, queue_handler, handler, listener
+
+
+def test_global_logger_uses_queue():
+    """全局 logger 只挂队列 Handler，日志由后台线程写入"""
+    print("\n" + "=" * 60)
+    print("测试: 日志队列")
+    print("=" * 60)
+
+    assert len(logger.handlers) == 1 and isinstance(logger.handlers[0], DroppingQueueHandler)
+    logger.debug("日志队列测试")
+    assert flush_logging()
+    print("✓ 全局 logger 使用队列")
+
+
+def test_background_batch_write():
+    """记录在日志线程中写入，每批只刷新一次"""
+    test_logger, _, handler, listener = _make_logger("pet.test_batch", maxsize=1000)
+
+    # 先放入记录再启动线程，保证它们在同一批中处理
+    for index in range(100):
+        test_logger.info(f"消息 {index}")
+    listener.start()
+    try:
+        assert listener.flush()
+    finally:
+        listener.stop()
+
+    assert handler.messages == [f"消息 {index}" for index in range(100)]
+    assert threading.current_thread().name not in handler.threads
+    assert 1 <= handler.batch_flushes < 100
+    print("✓ 后台批量写入正常")
+
+
+def test_drop_policy():
+    """队列繁忙时丢弃 DEBUG，保留 WARNING，并汇总丢弃条数"""
+    test_logger, queue_handler, handler, listener = _make_logger("pet.test_drop", maxsize=10)
+
+    for index in range(50):
+        test_logger.debug(f"调试 {index}")
+    for index in range(4):
+        test_logger.warning(f"警告 {index}")
+
+    # DEBUG 最多占用一半队列，WARNING 仍然可以进入
+    assert queue_handler.dropped == 45
+    listener.start()
+    try:
+        assert listener.flush()
+        test_logger.error("错误")
+        assert listener.flush()
+    finally:
+        listener.stop()
+
+    assert [m for m in handler.messages if m.startswith("调试")] == [f"调试 {i}" for i in range(5)]
+    assert [m for m in handler.messages if m.startswith("警告")] == [f"警告 {i}" for i in range(4)]
+    assert any("已丢弃 45 条" in m for m in handler.messages)
+    assert handler.messages[-1] == "错误"
+    print("✓ 丢弃策略正常")
+
+
+class Tracked:
+    """记录 __str__ 被调用的线程"""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "tracked"
+
+
+def test_formatting_deferred_to_listener():
+    """简单参数和异常堆栈在日志线程中格式化，其他参数在调用线程先拼成文本"""
+    test_logger, queue_handler, handler, listener = _make_logger("pet.test_prepare", maxsize=100)
+    formatted = []
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler.emit = lambda record: formatted.append((handler.format(record), threading.current_thread().name))
+
+    test_logger.info("数字 %d 文本 %s", 42, "abc")
+    tracked = Tracked()
+    test_logger.info("对象 %s", tracked)
+    try:
+        raise ValueError("坏值")
+    except ValueError:
+        test_logger.exception("出错 %s", "x")
+
+    plain, snapshot, failure = list(queue_handler.queue.queue)
+    assert plain.msg == "数字 %d 文本 %s" and plain.args == (42, "abc")
+    assert snapshot.msg == "对象 tracked" and snapshot.args is None
+    assert tracked.threads == [threading.current_thread().name]
+    assert failure.exc_info is not None and failure.exc_text is None
+
+    listener.start()
+    try:
+        assert listener.flush()
+    finally:
+        listener.stop()
+
+    caller = threading.current_thread().name
+    assert [text.splitlines()[0] for text, _ in formatted] == ["数字 42 文本 abc", "对象 tracked", "出错 x"]
+    assert "ValueError: 坏值" in formatted[2][0]
+    assert all(thread != caller for _, thread in formatted)
+    print("✓ 格式化在日志线程中进行")
+
+
+if __name__ == "__main__":
+    test_global_logger_uses_queue()
+    test_background_batch_write()
+    test_drop_policy()
+    test_formatting_deferred_to_listener()
+    print("\n所有测试通过")
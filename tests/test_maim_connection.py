@@ -0,0 +1,205 @@
+"""
+Maim 连接状态机测试
+验证 connected/disconnected 事件、断线自动重连、待发送队列补发与容量限制
+"""
+
+import sys
+import os
+import asyncio
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.chat.connection import MaimConnection, MaimConnectionState
+
+
+class FakeRouter:
+    """模拟 maim_message.Router，可手动断线"""
+
+    def __init__(self, connect_delay: float = 0.02, fail: bool = False):
+        self.connect_delay = connect_delay
+        self.fail = fail
+        self.connected = False
+        self.stopped = False
+        self.sent = []
+
+    async def run(self):
+        await asyncio.sleep(self.connect_delay)
+        if self.fail:
+            raise ConnectionError("refused")
+        self.connected = True
+        while not self.stopped:
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        self.stopped = True
+        self.connected = False
+
+    def check_connection(self, platform: str) -> bool:
+        return self.connected
+
+    async def send_message(self, message):
+        if not self.connected:
+            return False
+        self.sent.append(message)
+        return True
+
+
+def _make_connection(routers, **kwargs):
+    def factory():
+        routers.append(FakeRouter())
+        return routers[-1]
+
+    connection = MaimConnection(factory, 'desktop-pet', **kwargs)
+    connection.RECONNECT_GRACE = 0.1
+    return connection
+
+
+def test_connected_event_and_outbox_flush():
+    """连接前发送的消息进入队列，连接建立后按顺序补发"""
+    print("\n" + "=" * 60)
+    print("测试: connected 事件与待发送队列补发")
+    print("=" * 60)
+
+    async def scenario():
+        routers = []
+        connection = _make_connection(routers)
+        states = []
+        connection.add_listener(states.append)
+
+        assert connection.disconnected.is_set()
+        assert await connection.send("m1")
+        assert await connection.send("m2")
+        assert connection.pending_count() == 2
+
+        connection.start()
+        assert await connection.wait_connected(1.0)
+        assert connection.connected.is_set()
+        assert not connection.disconnected.is_set()
+        assert routers[0].sent == ["m1", "m2"]
+        assert connection.pending_count() == 0
+
+        assert await connection.send("m3")
+        assert routers[0].sent == ["m1", "m2", "m3"]
+
+        await connection.close()
+        assert states[0] == MaimConnectionState.CONNECTING
+        assert MaimConnectionState.CONNECTED in states
+        assert states[-1] == MaimConnectionState.CLOSED
+        assert not await connection.send("m4")
+
+    asyncio.run(scenario())
+    print("✓ 队列补发顺序正确")
+
+
+def test_auto_reconnect_after_drop():
+    """连接断开后后台自动重建 Router，期间消息排队并在重连后补发"""
+    print("\n" + "=" * 60)
+    print("测试: 断线自动重连")
+    print("=" * 60)
+
+    async def scenario():
+        routers = []
+        connection = _make_connection(routers)
+        connection.start()
+        assert await connection.wait_connected(1.0)
+
+        # 模拟服务端断开
+        routers[0].connected = False
+        await asyncio.wait_for(connection.disconnected.wait(), timeout=1.0)
+        assert await connection.send("during-reconnect")
+
+        assert await connection.wait_connected(2.0)
+        assert len(routers) == 2
+        assert routers[0].stopped
+        assert routers[1].sent == ["during-reconnect"]
+
+        await connection.close()
+
+    asyncio.run(scenario())
+    print("✓ 断线后自动重连并补发")
+
+
+def test_send_failure_while_connected():
+    """连接期间发送失败的消息进入队列，之后的发送不需要重连即可送达"""
+    async def scenario():
+        routers = []
+        connection = _make_connection(routers)
+        connection.start()
+        assert await connection.wait_connected(1.0)
+        router = routers[0]
+
+        # 模拟一次发送失败（连接状态不变）
+        original_send = router.send_message
+        async def failing_send(message):
+            return False
+        router.send_message = failing_send
+        assert await connection.send("lost")
+        assert connection.pending_count() == 1
+
+        router.send_message = original_send
+        assert await connection.send("next")
+        assert router.sent == ["lost", "next"]
+        assert connection.pending_count() == 0
+
+        # 没有新的发送时，后台监控也会补发积压
+        router.send_message = failing_send
+        assert await connection.send("queued")
+        router.send_message = original_send
+        await asyncio.sleep(connection.WATCH_INTERVAL * 3)
+        assert router.sent == ["lost", "next", "queued"]
+        assert len(routers) == 1
+
+        await connection.close()
+
+    asyncio.run(scenario())
+    print("✓ 连接期间发送失败后继续送达")
+
+
+def test_outbox_bounded():
+    """待发送队列满时丢弃最早的消息"""
+    async def scenario():
+        connection = _make_connection([], outbox_size=3)
+        for i in range(5):
+            assert await connection.send(f"m{i}")
+        assert list(connection._outbox) == ["m2", "m3", "m4"]
+        await connection.close()
+        assert connection.pending_count() == 0
+
+    asyncio.run(scenario())
+    print("✓ 队列容量限制正常")
+
+
+def test_backoff_after_failures():
+    """连接失败时按指数退避，并记录错误原因"""
+    async def scenario():
+        attempts = []
+
+        def factory():
+            attempts.append(asyncio.get_running_loop().time())
+            return FakeRouter(connect_delay=0, fail=True)
+
+        connection = MaimConnection(factory, 'desktop-pet', retry_interval=0.1)
+        assert connection._backoff_delay(1) <= 0.1 * 1.2
+        assert connection._backoff_delay(3) >= 0.4 * 0.8
+        assert connection._backoff_delay(50) <= MaimConnection.MAX_BACKOFF * 1.2
+
+        connection.start()
+        await asyncio.sleep(0.5)
+        assert not connection.is_connected()
+        assert connection.state == MaimConnectionState.RECONNECTING
+        assert "refused" in (connection.last_error or "")
+        assert 2 <= len(attempts) <= 4
+        await connection.close()
+
+    asyncio.run(scenario())
+    print("✓ 退避重连正常")
+
+
+if __name__ == "__main__":
+    test_connected_event_and_outbox_flush()
+    test_auto_reconnect_after_drop()
+    test_send_failure_while_connected()
+    test_outbox_bounded()
+    test_backoff_after_failures()
+    print("\n所有测试通过")
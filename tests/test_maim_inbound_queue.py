@@ -0,0 +1,136 @@
+"""
+Maim 入站消息队列测试
+验证突发消息合并为一次投递、顺序保持，以及图片在线程池中解码
+"""
+
+import sys
+import os
+import asyncio
+import base64
+import threading
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.chat import inbound
+from src.core.chat.inbound import InboundMessageQueue, convert_maim_message
+
+
+def _text_message(text: str) -> dict:
+    return {
+        'message_info': {'platform': 'desktop-pet', 'message_id': text, 'time': 0},
+        'message_segment': {'type': 'text', 'data': text},
+        'raw_message': text,
+    }
+
+
+def _png_base64() -> str:
+    from PyQt5.QtGui import QImage, QColor
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+
+    image = QImage(4, 4, QImage.Format_ARGB32)
+    image.fill(QColor(255, 0, 0))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return base64.b64encode(bytes(data)).decode()
+
+
+def test_burst_coalesced_in_order():
+    """窗口内的突发消息合并为一次投递，并保持到达顺序"""
+    print("\n" + "=" * 60)
+    print("测试: 突发消息合并")
+    print("=" * 60)
+
+    batches = []
+
+    async def scenario():
+        queue = InboundMessageQueue(emit=batches.append, window=0.05)
+        for i in range(5):
+            queue.put(_text_message(f"m{i}"))
+        await asyncio.sleep(0.2)
+        queue.put(_text_message("late"))
+        await queue.drain()
+
+    asyncio.run(scenario())
+
+    assert len(batches) == 2
+    assert [item['text'] for item in batches[0]] == ["m0", "m1", "m2", "m3", "m4"]
+    assert [item['text'] for item in batches[1]] == ["late"]
+    print("✓ 5 条突发消息合并为 1 次 UI 更新")
+
+
+def test_max_batch_flushes_immediately():
+    """达到单批上限时立即投递，批次之间顺序不乱"""
+    batches = []
+
+    async def scenario():
+        queue = InboundMessageQueue(emit=batches.append, window=10, max_batch=3)
+        for i in range(7):
+            queue.put(_text_message(str(i)))
+        await queue.drain()
+
+    asyncio.run(scenario())
+
+    flat = [item['text'] for batch in batches for item in batch]
+    assert flat == [str(i) for i in range(7)]
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    print("✓ 批次上限与顺序正常")
+
+
+def test_image_decoded_off_thread():
+    """图片消息在线程池中解码为 QImage"""
+    original = inbound._decode_image
+    threads = []
+
+    def tracking_decode(data):
+        threads.append(threading.current_thread())
+        return original(data)
+
+    inbound._decode_image = tracking_decode
+    try:
+        message = {
+            'message_info': {'platform': 'desktop-pet', 'message_id': 'img', 'time': 0},
+            'message_segment': {'type': 'seglist', 'data': [
+                {'type': 'text', 'data': '看图'},
+                {'type': 'image', 'data': _png_base64()},
+            ]},
+            'raw_message': '看图',
+        }
+        batches = []
+
+        async def scenario():
+            queue = InboundMessageQueue(emit=batches.append, window=0.01)
+            queue.put(message)
+            await queue.drain()
+
+        asyncio.run(scenario())
+    finally:
+        inbound._decode_image = original
+
+    item = batches[0][0]
+    assert item['text'] == '看图'
+    assert item['image'] is not None and item['image'].width() == 4
+    assert threads and threads[0] is not threading.main_thread()
+    print("✓ 图片在后台线程解码")
+
+
+def test_invalid_image_falls_back_to_placeholder():
+    """无法解码的图片回退为占位文本"""
+    message = {
+        'message_info': {'platform': 'desktop-pet', 'message_id': 'e', 'time': 0},
+        'message_segment': {'type': 'emoji', 'data': 'not-base64'},
+        'raw_message': '',
+    }
+    item = convert_maim_message(message)
+    assert item['text'] == '[emoji]'
+    assert item['image'] is None
+
+
+if __name__ == "__main__":
+    test_burst_coalesced_in_order()
+    test_max_batch_flushes_immediately()
+    test_image_decoded_off_thread()
+    test_invalid_image_falls_back_to_placeholder()
+    print("\n所有测试通过")
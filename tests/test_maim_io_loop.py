@@ -0,0 +1,132 @@
+"""
+Maim I/O 事件循环服务测试
+验证共享事件循环的复用，以及 Router 以任务形式在其上启停
+"""
+
+import sys
+import os
+import asyncio
+import threading
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.chat.io_loop import MaimIOLoop
+
+
+class FakeRouter:
+    """模拟 maim_message.Router：run() 启动后一小段时间才算连接成功"""
+
+    def __init__(self, connect_delay: float = 0.05):
+        self.connect_delay = connect_delay
+        self.connected = False
+        self.stopped = False
+        self.run_thread = None
+
+    async def run(self):
+        self.run_thread = threading.current_thread()
+        await asyncio.sleep(self.connect_delay)
+        self.connected = True
+        while not self.stopped:
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        self.stopped = True
+        self.connected = False
+
+    def check_connection(self, platform: str) -> bool:
+        return self.connected
+
+
+def test_io_loop_reused():
+    """多次 start 复用同一个线程和事件循环"""
+    print("\n" + "=" * 60)
+    print("测试: I/O 事件循环复用")
+    print("=" * 60)
+
+    service = MaimIOLoop(name="TestMaimIOLoop")
+    try:
+        assert service.start()
+        first_thread = service._thread
+        first_loop = service.loop
+
+        assert service.start()
+        assert service._thread is first_thread
+        assert service.loop is first_loop
+
+        async def where():
+            return threading.current_thread().name
+
+        assert asyncio.run(service.run(where())) == "TestMaimIOLoop"
+        print("✓ 事件循环复用正常")
+    finally:
+        service.stop()
+
+    assert not service.is_running()
+
+
+def test_router_hosted_on_shared_loop():
+    """ChatManager 在共享循环上启动/停止 Maim 连接，连接由事件通知"""
+    print("\n" + "=" * 60)
+    print("测试: Router 运行在共享 I/O 循环")
+    print("=" * 60)
+
+    from src.core.chat.manager import ChatManager
+    from src.core.chat import io_loop
+
+    manager = ChatManager()
+
+    async def scenario():
+        assert io_loop.maim_io_loop.start()
+        loop_thread = io_loop.maim_io_loop._thread
+
+        for _ in range(3):
+            routers = []
+
+            def factory():
+                routers.append(FakeRouter())
+                return routers[-1]
+
+            connection = await io_loop.maim_io_loop.run(
+                manager._start_maim_connection(factory, 'desktop-pet')
+            )
+            manager._maim_connection = connection
+            manager._maim_platform = 'desktop-pet'
+            assert await io_loop.maim_io_loop.run(connection.wait_connected(1.0), timeout=2)
+            assert routers[0].run_thread is loop_thread
+            assert manager._is_maim_connected()
+
+            await manager._cleanup_maim()
+            assert routers[0].stopped
+            assert io_loop.maim_io_loop._thread is loop_thread
+
+    asyncio.run(scenario())
+    print("✓ Router 启停均复用同一 I/O 线程")
+
+
+def test_router_connect_timeout():
+    """Router 迟迟未连接时等待超时返回失败"""
+    from src.core.chat.manager import ChatManager
+    from src.core.chat import io_loop
+
+    manager = ChatManager()
+
+    async def scenario():
+        assert io_loop.maim_io_loop.start()
+        connection = await io_loop.maim_io_loop.run(
+            manager._start_maim_connection(lambda: FakeRouter(connect_delay=10), 'desktop-pet')
+        )
+        manager._maim_connection = connection
+        assert not await io_loop.maim_io_loop.run(connection.wait_connected(0.2), timeout=2)
+        await manager._cleanup_maim()
+        assert connection.is_closed()
+
+    asyncio.run(scenario())
+    print("✓ 连接超时处理正常")
+
+
+if __name__ == "__main__":
+    test_io_loop_reused()
+    test_router_hosted_on_shared_loop()
+    test_router_connect_timeout()
+    print("\n所有测试通过")
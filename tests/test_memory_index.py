@@ -0,0 +1,136 @@
+"""
+语义记忆索引测试
+验证本地向量化、有上限的增量索引、与数据库同步以及 prompt 中的相关历史拼接
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+
+import numpy as np
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.memory import HashingEmbedder, MemoryIndex
+from src.core.prompt.manager import MEMORY_PREFIX
+from src.database import db_manager
+
+
+def _row(message_id: str, text: str, user_id: str = "0"):
+    return {"id": message_id, "user_id": user_id, "raw_message": text, "timestamp": 1700000000}
+
+
+def test_hashing_embedder():
+    """向量已归一化，相同词语的文本相似度更高"""
+    print("\n" + "=" * 60)
+    print("测试: 语义记忆索引")
+    print("=" * 60)
+
+    embedder = HashingEmbedder(dimension=256)
+    cat = embedder.embed("我家的猫喜欢吃鱼")
+    assert cat.dtype == np.float32 and cat.shape == (256,)
+    assert abs(float(np.linalg.norm(cat)) - 1.0) < 1e-5
+    assert float(cat @ embedder.embed("猫喜欢吃什么鱼")) > float(cat @ embedder.embed("明天要去上班开会"))
+    assert not embedder.embed("！？。").any()
+    # 哈希与进程无关，重启后结果一致
+    assert np.array_equal(cat, HashingEmbedder(dimension=256).embed("我家的猫喜欢吃鱼"))
+    print("✓ 哈希向量化正常")
+
+
+def test_bounded_index_search():
+    """按相似度检索，容量满后覆盖最早的消息，可排除指定消息"""
+    index = MemoryIndex(HashingEmbedder(dimension=256), max_entries=3)
+    assert index.memory_usage() == 0
+
+    index.add_many([
+        _row("a", "我的生日是五月三号"),
+        _row("b", "今天中午吃了拉面"),
+        _row("c", "周末想去爬山"),
+    ])
+    assert index.memory_usage() == 3 * 256 * 4
+
+    results = index.search("你还记得我的生日吗", top_k=2)
+    assert results[0][1]["id"] == "a"
+    assert index.search("你还记得我的生日吗", exclude_ids={"a"}, min_score=0.3) == []
+
+    index.add(_row("d", "晚饭吃了火锅"))
+    assert len(index) == 3
+    assert all(record["id"] != "a" for _, record in index.search("我的生日", top_k=3))
+
+    assert index.remove("d") and len(index) == 2
+    index.clear()
+    assert index.search("拉面") == [] and index.memory_usage() == 0
+    print("✓ 有上限的索引检索正常")
+
+
+def test_database_sync():
+    """启动时加载已有消息，之后保存、删除和清空的消息同步到索引"""
+    index = MemoryIndex(HashingEmbedder(dimension=256), max_entries=100)
+
+    def message(message_id, text):
+        return {
+            "message_info": {"message_id": message_id, "platform": "desktop-pet", "time": 1700000000,
+                             "user_info": {"user_id": "0"}},
+            "message_segment": {"type": "text", "data": text},
+            "raw_message": text,
+        }
+
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                await db_manager.save_message(message("old", "我养了一只橘猫"))
+                assert await index.start() == 1
+
+                await db_manager.save_message(message("new", "我最喜欢的颜色是蓝色"))
+                assert len(index) == 2
+                assert index.search("喜欢什么颜色")[0][1]["id"] == "new"
+
+                await db_manager.delete_message("new")
+                assert len(index) == 1
+                await db_manager.clear_all_messages()
+                assert len(index) == 0
+            finally:
+                index.stop()
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ 数据库同步正常")
+
+
+def test_prompt_recall(fixed_prompt_manager):
+    """相关历史拼接在最近上下文之前，不重复最近上下文和当前消息"""
+    prompt = fixed_prompt_manager(context_token_budget=0, memory={'enabled': True, 'top_k': 2, 'min_score': 0.2})
+    index = MemoryIndex(HashingEmbedder(dimension=256), max_entries=100)
+    index.add_many([
+        _row("birthday", "我的生日是五月三号"),
+        _row("recent", "我的生日快到了"),
+        _row("noise", "今天天气不错", user_id="pet"),
+    ])
+
+    # 未设置索引时不检索
+    assert len(prompt.build_messages("我的生日是哪天")) == 2
+
+    prompt.set_memory_index(index)
+    recent = [_row("recent", "我的生日快到了")]
+    messages = prompt.build_messages("我的生日是哪天", context_messages=recent)
+    assert [m["role"] for m in messages] == ["system", "system", "user", "user"]
+    assert messages[1]["content"].startswith(MEMORY_PREFIX)
+    assert "五月三号" in messages[1]["content"]
+    assert "快到了" not in messages[1]["content"] and "天气" not in messages[1]["content"]
+
+    prompt.config.memory.enabled = False
+    assert len(prompt.build_messages("我的生日是哪天", context_messages=recent)) == 3
+    print("✓ 相关历史拼接正常")
+
+
+if __name__ == "__main__":
+    from conftest import make_prompt_manager
+
+    test_hashing_embedder()
+    test_bounded_index_search()
+    test_database_sync()
+    test_prompt_recall(make_prompt_manager)
+    print("\n所有测试通过")
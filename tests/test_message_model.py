@@ -0,0 +1,70 @@
+"""
+标准消息类测试
+验证 __slots__ 消息模型的字典往返、可选字段以及序列化结果与对象互不影响
+"""
+
+import sys
+import os
+import dataclasses
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.models.message import MessageBase, UserInfo, Seg
+
+
+def _full_message_dict():
+    """包含所有可选信息的消息字典"""
+    message = MessageBase.create_sent_message("你好", user_nickname="测试")
+    data = message.to_dict()
+    info = data['message_info']
+    info['group_info'] = {'group_id': 'g1', 'group_name': '群'}
+    info['template_info'] = {'template_id': 't1', 'template_name': '模板', 'template_data': {'k': [1, 2]}}
+    info['sender_info'] = {'platform': 'qq', 'user_id': 's1', 'user_nickname': '发送者', 'user_cardname': ''}
+    info['receiver_info'] = {'platform': 'qq', 'user_id': 'r1', 'user_nickname': '接收者', 'user_cardname': ''}
+    info['additional_config'] = {'reply_to': 'm0'}
+    data['message_segment'] = {'type': 'seglist', 'data': [{'type': 'text', 'data': '你好'}]}
+    return data
+
+
+def test_round_trip():
+    """字典往返结果不变，且与 dataclasses.asdict 的结果一致"""
+    print("\n" + "=" * 60)
+    print("测试: 标准消息类")
+    print("=" * 60)
+
+    data = _full_message_dict()
+    message = MessageBase.from_dict(data)
+    assert message.to_dict() == data
+    assert dataclasses.asdict(message) == data
+    assert message.user_id == "0" and message.message_info.sender_info.user_id == "s1"
+
+    # 缺省字段
+    minimal = MessageBase.from_dict({'message_info': {'time': 1.0}, 'raw_message': '文本'})
+    assert minimal.message_info.group_info is None
+    assert minimal.message_info.format_info.content_format == ["text", "image", "emoji"]
+    assert minimal.message_segment == Seg(type='text', data='')
+    assert minimal.to_dict()['message_info']['group_info'] is None
+    print("✓ 字典往返正常")
+
+
+def test_slots_and_copy_semantics():
+    """对象没有 __dict__；修改序列化结果不影响原对象"""
+    message = MessageBase.from_dict(_full_message_dict())
+    assert not hasattr(message, '__dict__')
+    assert not hasattr(UserInfo(platform='p', user_id='u'), '__dict__')
+
+    data = message.to_dict()
+    data['message_segment']['data'][0]['data'] = '已修改'
+    data['message_info']['format_info']['content_format'].append('voice')
+    data['message_info']['template_info']['template_data']['k'].append(3)
+    assert message.message_segment.data[0]['data'] == '你好'
+    assert 'voice' not in message.message_info.format_info.content_format
+    assert message.message_info.template_info.template_data == {'k': [1, 2]}
+    print("✓ __slots__ 与复制语义正常")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_slots_and_copy_semantics()
+    print("\n所有测试通过")
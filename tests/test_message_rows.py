@@ -0,0 +1,111 @@
+"""
+数据库消息行测试
+验证 MessageRow 的延迟解析、字典兼容、显示文本以及 SQLite 查询返回的行视图
+"""
+
+import sys
+import os
+import json
+import asyncio
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import db_manager, MessageRow, MessageRowMapper
+from src.database.rows import _UNDECODED
+from src.shared.models.message import MessageBase
+from src.core.memory.index import message_to_record
+
+COLUMNS = ('id', 'platform', 'user_id', 'user_nickname', 'user_cardname', 'message_type',
+           'message_content', 'raw_message', 'timestamp', 'created_at')
+DESCRIPTION = [(name, None, None, None, None, None, None) for name in COLUMNS]
+
+
+def _values(message_id, content, raw_message='', user_id='0', message_type='text'):
+    return (message_id, 'desktop-pet', user_id, '测试', '', message_type,
+            json.dumps(content, ensure_ascii=False), raw_message, 1700000000.0, 1700000000.0)
+
+
+def test_lazy_row_view():
+    """只在访问 message_content 时解析 JSON，同一查询的行共用列索引"""
+    print("\n" + "=" * 60)
+    print("测试: 数据库消息行")
+    print("=" * 60)
+
+    mapper = MessageRowMapper()
+    rows = mapper.map_rows(DESCRIPTION, [
+        _values('a', '你好', raw_message='你好'),
+        _values('b', [{'type': 'text', 'data': '图片'}, {'type': 'image', 'data': 'base64'}],
+                user_id='1', message_type='seglist'),
+    ])
+    first, second = rows
+    assert first._index is second._index
+    assert mapper.map_row(DESCRIPTION, None) is None
+
+    # raw_message 不为空时显示文本不需要解析
+    assert first.text == '你好' and first.is_sent
+    assert first._content is _UNDECODED
+    assert first.message_content == '你好'
+
+    # raw_message 为空时从消息段中提取文本
+    assert second.text == '图片' and not second.is_sent
+    assert second.message_content[1]['type'] == 'image'
+
+    # 损坏的 JSON 保留原值
+    broken = MessageRow(('c', 'p', '0', '', '', 'text', '{bad', '', 0.0, 0.0), first._index)
+    assert broken.message_content == '{bad' and broken.text == '{bad'
+    print("✓ 延迟解析正常")
+
+
+def test_mapping_compatibility():
+    """按字典读取行数据的代码继续可用"""
+    row = MessageRowMapper().map_row(DESCRIPTION, _values('a', '你好', raw_message='你好'))
+    assert row['id'] == 'a' and row.get('user_id') == '0' and row.get('missing', 'x') == 'x'
+    assert 'raw_message' in row and len(row) == len(COLUMNS)
+    assert dict(row) == row.to_dict()
+    assert row.to_dict()['message_content'] == '你好'
+
+    message = row.to_message()
+    assert isinstance(message, MessageBase)
+    assert message.message_info.message_id == 'a' and message.user_id == '0'
+    assert message.message_segment.type == 'text' and message.message_content == '你好'
+
+    record = message_to_record(row)
+    assert record == {'id': 'a', 'user_id': '0', 'raw_message': '你好', 'timestamp': 1700000000.0}
+    print("✓ 字典兼容正常")
+
+
+def test_sqlite_rows():
+    """SQLite 查询返回 MessageRow"""
+    async def scenario():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert await db_manager.initialize('sqlite', path=os.path.join(temp_dir, 'chat.db'))
+            try:
+                message = MessageBase.create_sent_message("今天天气不错")
+                assert await db_manager.save_message(message)
+
+                rows = await db_manager.get_messages(limit=10)
+                assert len(rows) == 1 and isinstance(rows[0], MessageRow)
+                assert rows[0].text == "今天天气不错" and rows[0].is_sent
+
+                row = await db_manager.get_message_by_id(message.message_info.message_id)
+                assert row.message_content == "今天天气不错"
+                assert await db_manager.get_message_by_id("missing") is None
+
+                found = await db_manager.search_messages("天气")
+                assert [r.id for r in found] == [row.id]
+                after = await db_manager.get_messages_after(0)
+                assert [r.id for r in after] == [row.id]
+            finally:
+                await db_manager.close()
+
+    asyncio.run(scenario())
+    print("✓ SQLite 行视图正常")
+
+
+if __name__ == "__main__":
+    test_lazy_row_view()
+    test_mapping_compatibility()
+    test_sqlite_rows()
+    print("\n所有测试通过")
@@ -0,0 +1,114 @@
+"""
+动画调度器动作表测试
+验证预计算的可选动作表、按权重二分选择、预选下一个动作以及动作序号
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+from collections import Counter
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.frontend.core.models import live2d_model_info
+from src.frontend.core.models.live2d_model_info import Live2DModelInfoIndex
+from src.frontend.core.managers.animation_scheduler import AnimationScheduler
+
+
+def _make_model(root: str) -> str:
+    """生成包含 Idle/Tap/Flick 三个动作组的测试模型"""
+    groups = {'Idle': 2, 'Tap': 3, 'Flick': 1}
+    motions = {}
+    os.makedirs(os.path.join(root, 'motions'), exist_ok=True)
+    for group, count in groups.items():
+        motions[group] = []
+        for index in range(count):
+            name = f"motions/{group.lower()}_{index}.motion3.json"
+            motions[group].append({'File': name})
+            with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+                json.dump({'Meta': {'Duration': 2.0, 'Fps': 30.0}}, f)
+
+    model_path = os.path.join(root, 'test.model3.json')
+    with open(model_path, 'w', encoding='utf-8') as f:
+        json.dump({'Version': 3, 'FileReferences': {'Motions': motions}}, f)
+    return model_path
+
+
+def _make_scheduler(root: str, **kwargs) -> AnimationScheduler:
+    """创建使用临时索引的调度器（创建后恢复全局索引）"""
+    live2d_model_info._model_info_index = Live2DModelInfoIndex(os.path.join(root, 'index.json'))
+    try:
+        return AnimationScheduler(_make_model(root), **kwargs)
+    finally:
+        live2d_model_info._model_info_index = None
+
+
+def test_motion_table_rebuilt_on_filter_change():
+    """过滤条件和权重变化时重建动作表"""
+    print("\n" + "=" * 60)
+    print("测试: 调度器动作表")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        scheduler = _make_scheduler(root)
+        assert [m.group for m in scheduler._eligible_motions] == ['Tap', 'Tap', 'Tap', 'Flick']
+        assert scheduler._cumulative_weights == [1.0, 2.0, 3.0, 4.0]
+        assert scheduler.get_next_motion() in scheduler._eligible_motions
+
+        scheduler.set_group_whitelist(['Flick'])
+        assert [m.group for m in scheduler._eligible_motions] == ['Flick']
+        assert scheduler.get_next_motion().group == 'Flick'
+
+        scheduler.set_group_blacklist(['Flick'])
+        assert {m.group for m in scheduler._eligible_motions} == {'Tap'}
+
+        scheduler.set_group_blacklist([])
+        scheduler.set_group_weights({'Tap': 0, 'Flick': 2.5})
+        assert [m.group for m in scheduler._eligible_motions] == ['Flick']
+        assert scheduler._cumulative_weights == [2.5]
+
+        scheduler.set_group_weights({'Tap': 0, 'Flick': 0})
+        assert scheduler.get_next_motion() is None
+        scheduler._play_random_motion()
+        assert scheduler.get_current_state() == "idle"
+    print("✓ 动作表随过滤条件重建")
+
+
+def test_weighted_selection_and_prefetch():
+    """按权重选择，播放的是预选的动作，并立即预选下一个"""
+    random.seed(1234)
+    with tempfile.TemporaryDirectory() as root:
+        scheduler = _make_scheduler(root, group_weights={'Tap': 1.0, 'Flick': 9.0})
+
+        counts = Counter(scheduler._select_motion_by_weight().group for _ in range(6000))
+        # Tap 三个动作共 3/12，Flick 一个动作 9/12
+        assert abs(counts['Flick'] / 6000 - 0.75) < 0.03, counts
+
+        played = []
+        scheduler.motion_changed.connect(lambda group, file: played.append((group, file)))
+        expected = scheduler.get_next_motion()
+        scheduler._play_random_motion()
+        assert played == [(expected.group, expected.file)]
+        assert scheduler.get_current_state() == "random_motion"
+        assert scheduler.get_next_motion() is not None
+    print("✓ 按权重选择并预选下一个动作")
+
+
+def test_motion_numbers():
+    """动作序号对应 model3.json 中组内的位置"""
+    with tempfile.TemporaryDirectory() as root:
+        scheduler = _make_scheduler(root)
+        assert scheduler.get_motion_number('Tap', 'motions/tap_2.motion3.json') == 2
+        assert scheduler.get_motion_number('Idle', 'motions/idle_1.motion3.json') == 1
+        assert scheduler.get_motion_number('Flick', 'missing.motion3.json') == 0
+    print("✓ 动作序号正确")
+
+
+if __name__ == "__main__":
+    test_motion_table_rebuilt_on_filter_change()
+    test_weighted_selection_and_prefetch()
+    test_motion_numbers()
+    print("\n所有测试通过")
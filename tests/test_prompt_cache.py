@@ -0,0 +1,130 @@
+"""
+Prompt 增量构建测试
+验证历史消息按 ID 缓存格式化结果，以及 system prompt 固定部分的缓存
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.schema import Config, PromptConfig
+from src.core.prompt.manager import PromptManager
+
+
+class CountingPromptManager(PromptManager):
+    """使用固定配置，并统计消息文本规范化的次数"""
+
+    def __init__(self, **prompt_options):
+        super().__init__()
+        self.config = Config(Nickname="麦麦", userNickname="测试", prompt=PromptConfig(**prompt_options))
+        self.extract_calls = 0
+
+    def _load_runtime_config(self):
+        return self.config
+
+    def _extract_message_text(self, item, max_chars):
+        self.extract_calls += 1
+        return super()._extract_message_text(item, max_chars)
+
+
+def _history(count: int):
+    """生成带 ID 的历史消息，用户与桌宠交替"""
+    return [
+        {
+            "id": index + 1,
+            "user_id": "0" if index % 2 == 0 else "pet",
+            "raw_message": f"第{index}条消息",
+            "timestamp": 1700000000 + index,
+        }
+        for index in range(count)
+    ]
+
+
+def test_turns_formatted_once():
+    """重复构建时只格式化新增的消息"""
+    print("\n" + "=" * 60)
+    print("测试: Prompt 增量构建")
+    print("=" * 60)
+
+    manager = CountingPromptManager(context_limit=50, context_token_budget=0, include_time=False)
+    history = _history(10)
+
+    first = manager.build_messages("问题", context_messages=history)
+    assert manager.extract_calls == 10
+
+    history.append({"id": 11, "user_id": "0", "raw_message": "新消息", "timestamp": 1700000100})
+    second = manager.build_messages("问题", context_messages=history)
+    assert manager.extract_calls == 11
+    assert second[1:-2] == first[1:-1]
+    assert second[-2]["content"].endswith("测试: 新消息")
+
+    # 当前消息已经写入历史时仍然去重
+    third = manager.build_messages("新消息", context_messages=history)
+    assert manager.extract_calls == 11
+    assert third[1:-1] == first[1:-1]
+
+    # 没有 ID 的消息不缓存
+    anonymous = [{"user_id": "0", "raw_message": "匿名"}]
+    manager.build_messages("问题", context_messages=anonymous)
+    manager.build_messages("问题", context_messages=anonymous)
+    assert manager.extract_calls == 13
+    print("✓ 历史消息只格式化一次")
+
+
+def test_changed_turn_is_refreshed():
+    """消息内容或昵称变化时重新格式化"""
+    manager = CountingPromptManager(context_limit=50, context_token_budget=0, include_time=False)
+    history = _history(2)
+    manager.build_messages("问题", context_messages=history)
+
+    history[1] = dict(history[1], raw_message="修改后的消息")
+    messages = manager.build_messages("问题", context_messages=history)
+    assert manager.extract_calls == 3
+    assert messages[2]["content"].endswith("麦麦: 修改后的消息")
+
+    # 桌宠改名只影响桌宠的消息
+    manager.config.Nickname = "小麦"
+    messages = manager.build_messages("问题", context_messages=history)
+    assert manager.extract_calls == 4
+    assert messages[2]["content"].endswith("小麦: 修改后的消息")
+
+    # 没有 raw_message 的消息，message_content 变化也重新格式化
+    history[1] = dict(history[1], raw_message="", message_content="图片说明")
+    messages = manager.build_messages("问题", context_messages=history)
+    assert manager.extract_calls == 5
+    assert messages[2]["content"].endswith("小麦: 图片说明")
+
+    history[1] = dict(history[1], message_content="新的图片说明")
+    messages = manager.build_messages("问题", context_messages=history)
+    assert manager.extract_calls == 6
+    assert messages[2]["content"].endswith("小麦: 新的图片说明")
+    print("✓ 消息变化后重新格式化")
+
+
+def test_static_system_prompt_cached():
+    """system prompt 固定部分按人设与昵称缓存，时间行每次重新生成"""
+    manager = CountingPromptManager(include_time=True, persona="爱吃饭")
+
+    first = manager.build_messages("问题")[0]["content"]
+    static_prompt = manager._static_prompt
+    second = manager.build_messages("问题")[0]["content"]
+    assert first.startswith("当前时间：") and second.startswith("当前时间：")
+    assert first.split("\n", 1)[1] == second.split("\n", 1)[1] == static_prompt
+    assert manager._static_prompt is static_prompt
+
+    manager.config.prompt.persona = "爱睡觉"
+    changed = manager.build_messages("问题")[0]["content"]
+    assert "你的设定：爱睡觉" in changed and manager._static_prompt is not static_prompt
+
+    manager.config.prompt.include_time = False
+    assert manager.build_messages("问题")[0]["content"] == manager._static_prompt
+    print("✓ system prompt 缓存正常")
+
+
+if __name__ == "__main__":
+    test_turns_formatted_once()
+    test_changed_turn_is_refreshed()
+    test_static_system_prompt_cached()
+    print("\n所有测试通过")
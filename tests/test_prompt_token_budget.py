@@ -0,0 +1,95 @@
+"""
+Prompt token 预算测试
+验证 token 估算、按预算从最新消息往前装入上下文，以及估算结果的缓存
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.prompt.tokens import TokenCounter, estimate_tokens
+
+
+def _history(count: int):
+    """生成按时间正序的历史消息，用户与桌宠交替"""
+    return [
+        {"user_id": "0" if index % 2 == 0 else "pet", "raw_message": f"第{index}条消息" + "内容" * 20}
+        for index in range(count)
+    ]
+
+
+def test_estimate_tokens():
+    """中日韩字符按字计数，其他字符约 4 个 1 个 token"""
+    print("\n" + "=" * 60)
+    print("测试: Prompt token 预算")
+    print("=" * 60)
+
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("你好，世界") == 5
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("麦麦 says hi") == 2 + 2
+    print("✓ token 估算正常")
+
+
+def test_budget_keeps_newest_turns(fixed_prompt_manager):
+    """预算不足时保留最新的连续上下文"""
+    manager = fixed_prompt_manager(context_limit=20, context_token_budget=0)
+    history = _history(10)
+
+    unlimited = manager.build_messages("现在的问题", context_messages=history)
+    assert len(unlimited) == 12
+
+    base = manager.count_tokens([unlimited[0], unlimited[-1]])
+    turn = manager.count_tokens([unlimited[-2]])
+    budgeted = manager.build_messages("现在的问题", context_messages=history, token_budget=base + turn * 3)
+    context = budgeted[1:-1]
+    assert len(context) == 3
+    assert [m["content"] for m in context] == [m["content"] for m in unlimited[-4:-1]]
+    assert manager.count_tokens(budgeted) <= base + turn * 3
+
+    # 预算连 system 和当前消息都装不下时不拼接上下文
+    assert len(manager.build_messages("现在的问题", context_messages=history, token_budget=10)) == 2
+
+    # 配置中的预算作为默认值，条数限制仍然生效
+    manager.config.prompt.context_token_budget = base + turn * 5
+    assert len(manager.build_messages("现在的问题", context_messages=history)) == 7
+    manager.config.prompt.context_limit = 2
+    assert len(manager.build_messages("现在的问题", context_messages=history)) == 4
+    print("✓ 预算裁剪正常")
+
+
+def test_token_counts_are_cached(fixed_prompt_manager):
+    """重复构建时历史消息只估算一次；更换估算函数后清空缓存"""
+    calls = []
+
+    def counting_estimator(text):
+        calls.append(text)
+        return len(text)
+
+    manager = fixed_prompt_manager(context_limit=20, context_token_budget=100000)
+    manager.set_token_estimator(counting_estimator)
+    history = _history(10)
+
+    manager.build_messages("问题", context_messages=history)
+    first = len(calls)
+    manager.build_messages("问题", context_messages=history)
+    assert len(calls) == first
+
+    manager.set_token_estimator(None)
+    counter = TokenCounter(counting_estimator, cache_size=2)
+    for text in ("a", "b", "a", "c", "a", "b"):
+        counter.count(text)
+    assert calls[first:] == ["a", "b", "c", "b"]
+    assert counter.cache_info() == {"size": 2, "capacity": 2}
+    print("✓ token 计数缓存正常")
+
+
+if __name__ == "__main__":
+    from conftest import make_prompt_manager
+
+    test_estimate_tokens()
+    test_budget_keeps_newest_turns(make_prompt_manager)
+    test_token_counts_are_cached(make_prompt_manager)
+    print("\n所有测试通过")
@@ -0,0 +1,50 @@
+"""
+渲染循环基准冒烟测试
+在子进程中以少量迭代运行基准（假的 live2d 模块不会影响当前进程），确认基准本身可用
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BENCHMARK = os.path.join(PROJECT_ROOT, 'tests', 'benchmark_render_loop.py')
+
+
+def test_render_benchmark_runs():
+    """基准能跑完所有项目，并能与基线比较"""
+    print("\n" + "=" * 60)
+    print("测试: 渲染循环基准")
+    print("=" * 60)
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    with tempfile.TemporaryDirectory() as root:
+        output = os.path.join(root, 'bench.json')
+        result = subprocess.run(
+            [sys.executable, BENCHMARK, '--iterations', '40', '--json', output],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=300
+        )
+        assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+
+        with open(output, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        assert any(name.startswith('Live2DWidget.update_model') for name in results)
+        assert 'EventManager._smooth_update_live2d' in results
+        assert any(name.startswith('SpeechBubbleList.update_position') for name in results)
+        assert any(name.startswith('AnimationScheduler._select_motion_by_weight') for name in results)
+        for stats in results.values():
+            assert stats['p50_us'] <= stats['p95_us'] <= stats['max_us']
+
+        result = subprocess.run(
+            [sys.executable, BENCHMARK, '--iterations', '40', '--baseline', output, '--tolerance', '1000'],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=300
+        )
+        assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+    print("✓ 基准运行正常")
+
+
+if __name__ == "__main__":
+    test_render_benchmark_runs()
+    print("\n所有测试通过")
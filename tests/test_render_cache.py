@@ -0,0 +1,148 @@
+"""
+渲染器缓存测试
+验证切换渲染模式时挂起的渲染器被缓存、切回时直接恢复，以及超出预算后的淘汰
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from src.frontend.core.render.interfaces import IRenderer
+from src.frontend.core.render.static_renderer import StaticRenderer
+from src.frontend.core.managers.render_manager import RenderManager
+
+
+class CountingRenderer(IRenderer):
+    """记录调用次数的渲染器，代替需要 OpenGL 的 Live2D 渲染器"""
+
+    def __init__(self, memory_bytes: int):
+        self.memory_bytes = memory_bytes
+        self.calls = []
+
+    def initialize(self):
+        self.calls.append('initialize')
+
+    def attach(self, parent):
+        self.calls.append('attach')
+
+    def suspend(self):
+        self.calls.append('suspend')
+
+    def resume(self):
+        self.calls.append('resume')
+
+    def estimate_memory_bytes(self) -> int:
+        return self.memory_bytes
+
+    def cleanup(self):
+        self.calls.append('cleanup')
+
+    def set_animation_state(self, state: str):
+        pass
+
+    def set_expression(self, expression: str):
+        pass
+
+    def on_mouse_move(self, x: float, y: float):
+        pass
+
+
+class CachingRenderManager(RenderManager):
+    """使用 CountingRenderer 作为 Live2D 渲染器的渲染管理器"""
+
+    def __init__(self, parent, live2d_bytes: int):
+        self.live2d_bytes = live2d_bytes
+        self.built = []
+        super().__init__(parent)
+
+    def load_config(self):
+        super().load_config()
+        self.use_live2d = False
+        self.allow_switch = True
+        self.live2d_model_path = "fake.model3.json"
+
+    def _build_renderer(self, mode: str) -> IRenderer:
+        if mode == "live2d":
+            renderer = CountingRenderer(self.live2d_bytes)
+            self.built.append(renderer)
+            return renderer
+        return super()._build_renderer(mode)
+
+
+def _make_window():
+    """创建带渲染容器的父窗口"""
+    window = QWidget()
+    window.resize(200, 300)
+    window.render_container = QWidget(window)
+    window.render_container.resize(200, 300)
+    return window
+
+
+def test_switch_reuses_cached_renderers():
+    """来回切换模式时复用已初始化的渲染器"""
+    print("\n" + "=" * 60)
+    print("测试: 渲染器缓存")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = _make_window()
+    manager = CachingRenderManager(window, live2d_bytes=1024)
+    manager.renderer_cache_bytes = 64 * 1024 * 1024
+    manager.attach_to(window.render_container)
+    static_renderer = manager.renderer
+    assert isinstance(static_renderer, StaticRenderer)
+
+    manager.switch_mode("live2d")
+    assert manager.get_cache_info()['renderers'] == ["static"]
+    assert not static_renderer.label.isVisibleTo(window.render_container)
+
+    manager.switch_mode("static")
+    assert manager.renderer is static_renderer
+    assert static_renderer.label.isVisibleTo(window.render_container)
+
+    manager.switch_mode("live2d")
+    assert len(manager.built) == 1
+    assert manager.built[0].calls == ['initialize', 'attach', 'suspend', 'resume']
+
+    manager.cleanup()
+    assert manager.built[0].calls[-1] == 'cleanup'
+    assert manager.get_cache_info()['renderers'] == []
+    print("✓ 模式切换复用缓存的渲染器")
+
+
+def test_cache_eviction():
+    """超过预算的渲染器被清理，预算为 0 时不缓存"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = _make_window()
+    manager = CachingRenderManager(window, live2d_bytes=8 * 1024 * 1024)
+    manager.renderer_cache_bytes = 4 * 1024 * 1024
+    manager.attach_to(window.render_container)
+
+    static_renderer = manager.renderer
+    manager.switch_mode("live2d")
+    manager.switch_mode("static")
+    assert manager.renderer is static_renderer
+    assert manager.built[0].calls[-1] == 'cleanup'
+    assert manager.get_cache_info()['renderers'] == []
+
+    manager.switch_mode("live2d")
+    assert len(manager.built) == 2
+
+    manager.renderer_cache_bytes = 0
+    manager.switch_mode("static")
+    assert manager.built[1].calls[-1] == 'cleanup'
+    assert manager.get_cache_info()['renderers'] == []
+
+    manager.cleanup()
+    print("✓ 超出预算时淘汰渲染器")
+
+
+if __name__ == "__main__":
+    test_switch_reuses_cached_renderers()
+    test_cache_eviction()
+    print("\n所有测试通过")
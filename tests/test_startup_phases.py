@@ -0,0 +1,133 @@
+"""
+启动流程测试
+验证启动阶段计时、后台服务并行执行以及 HTTP keep-alive 会话复用
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.util.startup_profiler import StartupProfiler
+
+
+def test_profiler_report():
+    """阶段按开始时间排序，未结束的阶段标记为未完成"""
+    print("\n" + "=" * 60)
+    print("测试: 启动阶段计时")
+    print("=" * 60)
+
+    profiler = StartupProfiler()
+    with profiler.phase('ui'):
+        time.sleep(0.02)
+    profiler.start('backend')
+    profiler.end('backend')
+    profiler.end('imports')
+
+    rows = {row['phase']: row for row in profiler.report()}
+    assert rows['ui']['duration_ms'] >= 15
+    assert rows['imports']['start_ms'] == 0
+    assert rows['backend']['duration_ms'] is not None
+    starts = [row['start_ms'] for row in profiler.report()]
+    assert starts == sorted(starts)
+
+    profiler.start('pending')
+    assert {row['phase']: row for row in profiler.report()}['pending']['end_ms'] is None
+    profiler.log_report()
+    print("✓ 阶段报告正常")
+
+
+def test_backend_phases_run_concurrently():
+    """后台服务各阶段并行执行，总耗时接近最慢的阶段"""
+    import main
+    from src.util.startup_profiler import startup_profiler
+
+    startup_profiler.reset()
+
+    async def slow(delay):
+        await asyncio.sleep(delay)
+
+    async def scenario():
+        await asyncio.gather(
+            main._run_phase('database', slow(0.2)),
+            main._run_phase('chat_connect', slow(0.2)),
+        )
+
+    started = time.perf_counter()
+    asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    rows = {row['phase']: row for row in startup_profiler.report()}
+    assert elapsed < 0.35
+    assert rows['chat_connect']['start_ms'] < rows['database']['end_ms']
+    print(f"✓ 两个 200ms 阶段并行完成，总耗时 {elapsed * 1000:.0f}ms")
+
+
+def test_http_session_reused():
+    """同一事件循环中复用 keep-alive 会话，清理后关闭"""
+    from src.core.chat.manager import ChatManager
+
+    manager = ChatManager()
+
+    async def scenario():
+        first = manager._get_http_session()
+        second = manager._get_http_session()
+        assert first is second
+        await manager._close_http_session()
+        assert first.closed
+        assert manager._get_http_session() is not first
+        await manager._close_http_session()
+
+    asyncio.run(scenario())
+    print("✓ HTTP 会话复用正常")
+
+
+def test_http_session_closed_on_own_loop():
+    """事件循环结束或切换到其他事件循环时，旧会话在所属的事件循环中关闭"""
+    import threading
+    from src.core.chat.manager import ChatManager
+
+    manager = ChatManager()
+
+    async def get_session():
+        return manager._get_http_session()
+
+    # asyncio.run 结束前关闭会话
+    first = asyncio.run(get_session())
+    assert first.closed
+
+    # 另一个线程中仍在运行的事件循环：切换后由它自己关闭旧会话
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        second = asyncio.run_coroutine_threadsafe(get_session(), other_loop).result(timeout=2.0)
+
+        async def switch():
+            third = manager._get_http_session()
+            assert third is not second
+            for _ in range(100):
+                if second.closed:
+                    break
+                await asyncio.sleep(0.01)
+            assert second.closed
+            await manager._close_http_session()
+            assert third.closed
+
+        asyncio.run(switch())
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=2.0)
+        other_loop.close()
+    print("✓ 旧会话在所属事件循环中关闭")
+
+
+if __name__ == "__main__":
+    test_profiler_report()
+    test_backend_phases_run_concurrently()
+    test_http_session_reused()
+    test_http_session_closed_on_own_loop()
+    print("\n所有测试通过")